@@ -0,0 +1,48 @@
+"""Add instrumentation columns to finance_pipeline_steps.
+
+Persists per-step duration, SQL statement count, swallowed per-record
+exceptions and per-record latency so a run's detail view shows the same
+numbers as the finance_pipeline_* Prometheus series.
+
+Revision ID: 025
+Revises: 024
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "025"
+down_revision = "024"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "finance_pipeline_steps", sa.Column("duration_ms", sa.Float(), nullable=True)
+    )
+    op.add_column(
+        "finance_pipeline_steps",
+        sa.Column("query_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "finance_pipeline_steps",
+        sa.Column("errors_swallowed", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "finance_pipeline_steps",
+        sa.Column("record_latency_avg_ms", sa.Float(), nullable=True),
+    )
+    op.add_column(
+        "finance_pipeline_steps",
+        sa.Column("record_latency_max_ms", sa.Float(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("finance_pipeline_steps", "record_latency_max_ms")
+    op.drop_column("finance_pipeline_steps", "record_latency_avg_ms")
+    op.drop_column("finance_pipeline_steps", "errors_swallowed")
+    op.drop_column("finance_pipeline_steps", "query_count")
+    op.drop_column("finance_pipeline_steps", "duration_ms")
@@ -0,0 +1,27 @@
+"""Add composite index for latest-quote-per-counterparty lookups.
+
+Backs the ``ROW_NUMBER() OVER (PARTITION BY rfq_id, counterparty_id
+ORDER BY received_at DESC ...)`` query used for RFQ ranking.
+
+Revision ID: 026
+Revises: 025
+"""
+
+from alembic import op
+
+revision = "026"
+down_revision = "025"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_rfq_quotes_rfq_cp_received",
+        "rfq_quotes",
+        ["rfq_id", "counterparty_id", "received_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rfq_quotes_rfq_cp_received", table_name="rfq_quotes")
@@ -0,0 +1,62 @@
+"""Create the durable inbound WhatsApp message queue.
+
+Replaces the in-process deque when ``INBOUND_QUEUE_BACKEND=database`` so
+inbound messages survive restarts and can be shared across workers.
+
+Revision ID: 027
+Revises: 026
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "027"
+down_revision = "026"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "inbound_message_queue",
+        sa.Column("id", sa.Uuid(), primary_key=True, nullable=False),
+        sa.Column("message_id", sa.String(length=128), nullable=False, unique=True),
+        sa.Column("sender_key", sa.String(length=32), nullable=False),
+        sa.Column("from_phone", sa.String(length=32), nullable=False),
+        sa.Column("sender_name", sa.String(length=255), nullable=True),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("message_timestamp", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "processing", "done", "dead", name="inbound_queue_status"),
+            nullable=False,
+            server_default="pending",
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("enqueued_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("available_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("locked_by", sa.String(length=128), nullable=True),
+        sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+    )
+    op.create_index(
+        "ix_inbound_queue_status_available",
+        "inbound_message_queue",
+        ["status", "available_at"],
+    )
+    op.create_index(
+        "ix_inbound_queue_sender_status",
+        "inbound_message_queue",
+        ["sender_key", "status"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_inbound_queue_sender_status", table_name="inbound_message_queue")
+    op.drop_index(
+        "ix_inbound_queue_status_available", table_name="inbound_message_queue"
+    )
+    op.drop_table("inbound_message_queue")
+    sa.Enum(name="inbound_queue_status").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,95 @@
+"""Create the normalised-phone index for inbound sender-to-RFQ matching.
+
+One row per (phone_key, channel, rfq_id) pointing at the newest invitation,
+with the RFQ state denormalised so an inbound message resolves its active
+RFQs with a single indexed lookup.  Backfilled from ``rfq_invitations``.
+
+Revision ID: 029
+Revises: 028
+"""
+
+import uuid
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "029"
+down_revision = "028"
+branch_labels = None
+depends_on = None
+
+
+def _phone_key(phone: str) -> str:
+    # Same rule as app.services.inbound_worker_pool.sender_key.
+    digits = "".join(ch for ch in phone if ch.isdigit())
+    if digits.startswith("55") and len(digits) == 13 and digits[4] == "9":
+        digits = digits[:4] + digits[5:]
+    return digits
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        channel_type = postgresql.ENUM(name="rfq_invitation_channel", create_type=False)
+        state_type = postgresql.ENUM(name="rfq_state", create_type=False)
+    else:
+        channel_type = sa.Enum("whatsapp", name="rfq_invitation_channel")
+        state_type = sa.Enum(
+            "CREATED", "SENT", "QUOTED", "AWARDED", "CLOSED", name="rfq_state"
+        )
+
+    index = op.create_table(
+        "rfq_phone_index",
+        sa.Column("id", sa.Uuid(), primary_key=True, nullable=False),
+        sa.Column("phone_key", sa.String(length=32), nullable=False),
+        sa.Column("channel", channel_type, nullable=False),
+        sa.Column(
+            "rfq_id",
+            sa.Uuid(),
+            sa.ForeignKey("rfqs.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "invitation_id",
+            sa.Uuid(),
+            sa.ForeignKey("rfq_invitations.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("rfq_state", state_type, nullable=False),
+        sa.UniqueConstraint(
+            "phone_key", "channel", "rfq_id", name="uq_rfq_phone_index_phone_rfq"
+        ),
+    )
+    op.create_index(
+        "ix_rfq_phone_index_lookup",
+        "rfq_phone_index",
+        ["phone_key", "channel", "rfq_state"],
+    )
+
+    rows = bind.execute(
+        sa.text(
+            "SELECT i.id, i.rfq_id, i.recipient_phone, i.channel, r.state "
+            "FROM rfq_invitations i JOIN rfqs r ON r.id = i.rfq_id "
+            "ORDER BY i.created_at"
+        )
+    ).all()
+    latest: dict[tuple, dict] = {}
+    for invitation_id, rfq_id, phone, channel, state in rows:
+        key = (_phone_key(phone), str(channel), str(rfq_id))
+        latest[key] = {
+            "id": uuid.uuid4(),
+            "phone_key": key[0],
+            "channel": channel,
+            "rfq_id": rfq_id,
+            "invitation_id": invitation_id,
+            "rfq_state": state,
+        }
+    if latest:
+        op.bulk_insert(index, list(latest.values()))
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rfq_phone_index_lookup", table_name="rfq_phone_index")
+    op.drop_table("rfq_phone_index")
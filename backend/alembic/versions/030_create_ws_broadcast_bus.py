@@ -0,0 +1,40 @@
+"""Create the shared WebSocket broadcast sequence and payload spill table.
+
+``ws_broadcast_seq`` numbers broadcasts across all workers (Postgres only);
+``ws_broadcast_payloads`` holds events larger than a NOTIFY payload allows.
+
+Revision ID: 030
+Revises: 029
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "030"
+down_revision = "029"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE SEQUENCE IF NOT EXISTS ws_broadcast_seq")
+    op.create_table(
+        "ws_broadcast_payloads",
+        sa.Column("seq", sa.BigInteger(), primary_key=True, autoincrement=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index(
+        "ix_ws_broadcast_payloads_created_at", "ws_broadcast_payloads", ["created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_ws_broadcast_payloads_created_at", table_name="ws_broadcast_payloads"
+    )
+    op.drop_table("ws_broadcast_payloads")
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP SEQUENCE IF EXISTS ws_broadcast_seq")
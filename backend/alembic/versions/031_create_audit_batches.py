@@ -0,0 +1,65 @@
+"""Create Merkle batches for audit events.
+
+``audit_batches`` holds one signed Merkle root per sealed time window;
+``audit_batch_members`` maps each event to its leaf position.  Membership
+lives in its own table because ``audit_events`` is append-only.
+
+Revision ID: 031
+Revises: 030
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "031"
+down_revision = "030"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "audit_batches",
+        sa.Column("id", sa.Uuid(), primary_key=True, nullable=False),
+        sa.Column("window_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("window_end", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("event_count", sa.Integer(), nullable=False),
+        sa.Column("merkle_root", sa.String(length=64), nullable=False),
+        sa.Column("signature", sa.LargeBinary(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_audit_batches_window_start", "audit_batches", ["window_start"])
+    op.create_index("ix_audit_batches_window_end", "audit_batches", ["window_end"])
+    op.create_table(
+        "audit_batch_members",
+        sa.Column(
+            "event_id",
+            sa.Uuid(),
+            sa.ForeignKey("audit_events.id"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column(
+            "batch_id", sa.Uuid(), sa.ForeignKey("audit_batches.id"), nullable=False
+        ),
+        sa.Column("seq", sa.Integer(), nullable=False),
+        sa.UniqueConstraint(
+            "batch_id", "seq", name="uq_audit_batch_members_batch_seq"
+        ),
+    )
+    # Range verification and sealing select events by timestamp.
+    op.create_index("ix_audit_events_timestamp_utc", "audit_events", ["timestamp_utc"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_events_timestamp_utc", table_name="audit_events")
+    op.drop_table("audit_batch_members")
+    op.drop_index("ix_audit_batches_window_end", table_name="audit_batches")
+    op.drop_index("ix_audit_batches_window_start", table_name="audit_batches")
+    op.drop_table("audit_batches")
@@ -3,8 +3,9 @@ API dependency modules.
 
 This package contains FastAPI dependencies injected via ``Depends()``.
 
-Currently only ``audit`` lives here because it is a *route-level* dependency
-(injected per-endpoint to record audit trail events).
+``audit`` (records audit trail events) and ``conditional`` (ETag /
+conditional GET for read endpoints) live here because they are
+*route-level* dependencies, injected per-endpoint.
 
 Authentication dependencies (``get_current_user``, ``require_roles``) reside
 in ``app.core.auth`` because they are *application-wide* concerns shared by
@@ -13,4 +14,5 @@ middleware, startup hooks, and routes alike.
 
 __all__ = [
     "audit",
+    "conditional",
 ]
@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 from app.core.database import get_session
 from app.core.metrics import audit_events_total
 from app.services.audit_trail_service import AuditTrailService
+from app.services.audit_writer import get_audit_writer
 
 
 def mark_audit_success(request: Request, entity_id: uuid.UUID | None = None) -> None:
@@ -48,15 +49,29 @@ def audit_event(
                     status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                     detail="entity_id missing",
                 )
-            AuditTrailService.record(
-                session,
-                event_id=uuid.uuid4(),
-                entity_type=entity_type,
-                entity_id=entity_id,
-                event_type=event_type,
-                payload_raw=payload_text,
-                payload_obj=payload_obj,
-            )
+            writer = get_audit_writer()
+            if writer is None:
+                AuditTrailService.record(
+                    session,
+                    event_id=uuid.uuid4(),
+                    entity_type=entity_type,
+                    entity_id=entity_id,
+                    event_type=event_type,
+                    payload_raw=payload_text,
+                    payload_obj=payload_obj,
+                )
+            else:
+                # Written by the background writer — no second commit here.
+                writer.submit(
+                    AuditTrailService.build_row(
+                        event_id=uuid.uuid4(),
+                        entity_type=entity_type,
+                        entity_id=entity_id,
+                        event_type=event_type,
+                        payload_raw=payload_text,
+                        payload_obj=payload_obj,
+                    )
+                )
             audit_events_total.labels(entity_type=entity_type, event_type=event_type).inc()
 
         request.state.audit_commit = _commit_audit
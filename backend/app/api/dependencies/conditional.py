@@ -0,0 +1,188 @@
+"""Conditional GET (ETag / ``If-None-Match``) for read endpoints.
+
+Most read traffic is dashboards polling data that has not changed.  A read
+endpoint opts in by using :class:`ConditionalRoute` on its router and
+declaring ``conditional_get(Model, ...)`` — listing every model it reads —
+*after* its role dependency, so authorisation still runs first::
+
+    router = APIRouter(route_class=ConditionalRoute)
+
+    @router.get("")
+    def list_things(
+        _: None = Depends(require_any_role("trader")),
+        __: None = Depends(conditional_get(Thing)),
+        session: Session = Depends(get_session),
+    ): ...
+
+The dependency derives a weak ETag from the data versions of those tables
+(``app.services.data_versions``), the path and the sorted query string —
+no database access.  When it matches ``If-None-Match`` the request is
+answered ``304`` without running the endpoint; when the body for that ETag
+is cached it is served as is.  Otherwise the endpoint runs and the route
+adds ``ETag`` / ``Cache-Control`` to its ``200`` and caches the body.
+
+Versions are only trustworthy when every worker hears every commit, i.e.
+with the shared ``postgres`` bus.  On the in-process ``memory`` bus each
+worker would keep answering 304 (or serving its cached body) for data
+another worker has since changed, so by default the dependency does
+nothing there.
+
+Configurable via env vars:
+    HTTP_CONDITIONAL_GET   ``auto`` (default; on with a shared bus only) |
+                           ``on`` (single-worker deployments) | ``off``
+    HTTP_BODY_CACHE_SIZE   Default 512 — cached response bodies; 0 disables
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.metrics import conditional_get_total
+from app.services.data_versions import get_data_versions, watch
+
+
+class _ConditionalHitError(Exception):
+    """Raised by the dependency to answer without running the endpoint."""
+
+    def __init__(self, response: Response) -> None:
+        self.response = response
+
+
+class BodyCache:
+    """Small LRU of serialized ``200`` bodies keyed by ETag.
+
+    An ETag changes with every write to the tables behind it, so entries
+    never need invalidating — superseded ones just age out.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[bytes, str | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag: str) -> tuple[bytes, str | None] | None:
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is not None:
+                self._entries.move_to_end(etag)
+            return entry
+
+    def put(self, etag: str, body: bytes, media_type: str | None) -> None:
+        with self._lock:
+            self._entries[etag] = (body, media_type)
+            self._entries.move_to_end(etag)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_body_cache: BodyCache | None = None
+_body_cache_lock = threading.Lock()
+
+
+def get_body_cache() -> BodyCache | None:
+    """Return the process-wide body cache, or ``None`` when disabled."""
+    global _body_cache  # noqa: PLW0603
+    with _body_cache_lock:
+        if _body_cache is None:
+            size = int(os.getenv("HTTP_BODY_CACHE_SIZE", "512"))
+            if size <= 0:
+                return None
+            _body_cache = BodyCache(size)
+        return _body_cache
+
+
+def _enabled() -> bool:
+    mode = os.getenv("HTTP_CONDITIONAL_GET", "auto").strip().lower()
+    if mode == "auto":
+        return get_data_versions().shared
+    return mode == "on"
+
+
+def _etag(request: Request, versions: str) -> str:
+    query = urlencode(sorted(request.query_params.multi_items()))
+    digest = hashlib.sha256(
+        f"{request.url.path}?{query}|{versions}".encode()
+    ).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison (RFC 9110 §13.1.2).
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _validator_headers(etag: str) -> dict[str, str]:
+    # Every client must revalidate; shared caches must not store responses.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def conditional_get(*models: type) -> Callable:
+    """Dependency answering unchanged reads of *models* from their ETag."""
+    tables = sorted({t.name for model in models for t in model.__mapper__.tables})
+    watch(tables)
+
+    async def _dependency(request: Request) -> None:
+        if not _enabled():
+            return
+        etag = _etag(request, get_data_versions().token(tables))
+        request.state.etag = etag
+        if _matches(request.headers.get("if-none-match"), etag):
+            conditional_get_total.labels(result="not_modified").inc()
+            raise _ConditionalHitError(
+                Response(status_code=304, headers=_validator_headers(etag))
+            )
+        cache = get_body_cache()
+        cached = cache.get(etag) if cache is not None else None
+        if cached is not None:
+            body, media_type = cached
+            conditional_get_total.labels(result="cached").inc()
+            raise _ConditionalHitError(
+                Response(body, media_type=media_type, headers=_validator_headers(etag))
+            )
+        conditional_get_total.labels(result="miss").inc()
+
+    return _dependency
+
+
+class ConditionalRoute(APIRoute):
+    """Route class that completes :func:`conditional_get` — serves its
+    short-circuit responses and tags / caches the endpoint's ``200``."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def _handler(request: Request) -> Response:
+            try:
+                response = await handler(request)
+            except _ConditionalHitError as hit:
+                return hit.response
+            etag = getattr(request.state, "etag", None)
+            if etag is not None and response.status_code == 200:
+                response.headers.update(_validator_headers(etag))
+                cache = get_body_cache()
+                body = getattr(response, "body", None)
+                if cache is not None and isinstance(body, bytes):
+                    cache.put(etag, body, response.media_type)
+            return response
+
+        return _handler
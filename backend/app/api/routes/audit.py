@@ -9,7 +9,13 @@ from sqlalchemy.orm import Session
 
 from app.core.auth import require_role
 from app.core.database import get_session
-from app.schemas.audit import AuditEventListResponse, AuditEventRead
+from app.schemas.audit import (
+    AuditEventListResponse,
+    AuditEventRead,
+    AuditInclusionProof,
+    AuditRangeVerifyResponse,
+)
+from app.services.audit_batch_service import AuditBatchService
 from app.services.audit_trail_service import (
     AuditTrailService,
     _get_signing_key,
@@ -84,3 +90,41 @@ def verify_audit_event(
         if valid
         else "Signature mismatch — event may have been tampered with",
     )
+
+
+@router.get("/verify-range", response_model=AuditRangeVerifyResponse)
+def verify_audit_range(
+    start: datetime = Query(...),
+    end: datetime = Query(...),
+    include_proofs: bool = Query(False),
+    _: None = Depends(require_role("auditor")),
+    session: Session = Depends(get_session),
+) -> AuditRangeVerifyResponse:
+    """Verify every sealed batch and unbatched event in ``[start, end)``."""
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="end must be after start",
+        )
+    key = _get_signing_key()
+    if key is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AUDIT_SIGNING_KEY not configured — verification unavailable",
+        )
+    result = AuditBatchService.verify_range(
+        session, start=start, end=end, key=key, include_proofs=include_proofs
+    )
+    return AuditRangeVerifyResponse.model_validate(result)
+
+
+@router.get("/events/{event_id}/proof", response_model=AuditInclusionProof)
+def get_audit_event_proof(
+    event_id: UUID,
+    _: None = Depends(require_role("auditor")),
+    session: Session = Depends(get_session),
+) -> AuditInclusionProof:
+    """Merkle inclusion proof of an event against its batch root."""
+    return AuditInclusionProof.model_validate(
+        AuditBatchService.get_inclusion_proof(session, event_id)
+    )
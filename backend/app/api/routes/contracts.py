@@ -7,6 +7,7 @@ from app.core.auth import get_current_user, require_any_role, require_role
 from app.core.database import get_session
 from app.core.rate_limit import RATE_LIMIT_MUTATION, limiter
 from app.api.dependencies.audit import audit_event, mark_audit_success
+from app.api.dependencies.conditional import ConditionalRoute, conditional_get
 from app.schemas.contracts import (
     ContractLinkagesResponse,
     HedgeContractCreate,
@@ -18,10 +19,11 @@ from app.schemas.contracts import (
     LinkedOrderSummary,
 )
 from app.models.deal import Deal, DealLink, DealLinkedType
+from app.models.contracts import HedgeContract
 from app.models.orders import Order
 from app.services.contract_service import ContractService
 
-router = APIRouter()
+router = APIRouter(route_class=ConditionalRoute)
 
 
 @router.post(
@@ -62,6 +64,7 @@ def list_hedge_contracts(
     cursor: str | None = Query(None),
     limit: int = Query(50, ge=1, le=200),
     _: None = Depends(require_any_role("trader", "risk_manager", "auditor")),
+    __: None = Depends(conditional_get(HedgeContract)),
     session: Session = Depends(get_session),
 ) -> HedgeContractListResponse:
     return ContractService.list(
@@ -79,6 +82,7 @@ def list_hedge_contracts(
 def get_hedge_contract(
     contract_id: UUID,
     _: None = Depends(require_any_role("trader", "risk_manager", "auditor")),
+    __: None = Depends(conditional_get(HedgeContract)),
     session: Session = Depends(get_session),
 ) -> HedgeContractRead:
     contract = ContractService.get_by_id(session, contract_id)
@@ -178,6 +182,7 @@ def delete_hedge_contract(
 def get_contract_linkages(
     contract_id: UUID,
     _: None = Depends(require_any_role("trader", "risk_manager", "auditor")),
+    __: None = Depends(conditional_get(Deal, DealLink, Order)),
     session: Session = Depends(get_session),
 ) -> ContractLinkagesResponse:
     """Return deals and their linked orders for a given hedge contract."""
@@ -3,6 +3,7 @@ from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from app.api.dependencies.conditional import ConditionalRoute, conditional_get
 from app.core.auth import require_any_role
 from app.core.database import get_session
 from app.core.pagination import paginate
@@ -15,7 +16,7 @@ from app.schemas.counterparty import (
 )
 from app.services.counterparty_service import CounterpartyService
 
-router = APIRouter()
+router = APIRouter(route_class=ConditionalRoute)
 
 
 @router.post("", response_model=CounterpartyRead, status_code=status.HTTP_201_CREATED)
@@ -43,6 +44,7 @@ def list_counterparties(
     cursor: str | None = Query(None),
     limit: int = Query(50, ge=1, le=200),
     _: None = Depends(require_any_role("trader", "risk_manager", "auditor")),
+    __: None = Depends(conditional_get(Counterparty)),
     session: Session = Depends(get_session),
 ) -> CounterpartyListResponse:
     query = CounterpartyService.list(
@@ -68,6 +70,7 @@ def list_counterparties(
 def get_counterparty(
     counterparty_id: UUID,
     _: None = Depends(require_any_role("trader", "risk_manager", "auditor")),
+    __: None = Depends(conditional_get(Counterparty)),
     session: Session = Depends(get_session),
 ) -> CounterpartyRead:
     cp = CounterpartyService.get_by_id(session, counterparty_id)
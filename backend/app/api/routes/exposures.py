@@ -5,8 +5,13 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.api.dependencies.conditional import ConditionalRoute, conditional_get
 from app.core.auth import get_current_user, require_any_role
 from app.core.database import get_session
+from app.models.contracts import HedgeContract
+from app.models.exposure import ContractExposure, Exposure, HedgeExposure, HedgeTask
+from app.models.linkages import HedgeOrderLinkage
+from app.models.orders import Order
 from app.schemas.exposure import CommercialExposureRead, GlobalExposureRead
 from app.schemas.exposure_engine import (
     ExposureDetailRead,
@@ -19,7 +24,18 @@ from app.schemas.exposure_engine import (
 from app.services.exposure_engine import ExposureEngineService
 from app.services.exposure_service import ExposureService
 
-router = APIRouter()
+router = APIRouter(route_class=ConditionalRoute)
+
+# Every exposure read is derived from these tables.
+_exposure_inputs = conditional_get(
+    Order,
+    HedgeContract,
+    HedgeOrderLinkage,
+    Exposure,
+    ContractExposure,
+    HedgeExposure,
+    HedgeTask,
+)
 
 
 # ------------------------------------------------------------------
@@ -30,6 +46,7 @@ router = APIRouter()
 @router.get("/commercial", response_model=CommercialExposureRead)
 def get_commercial_exposure(
     _: None = Depends(require_any_role("risk_manager", "auditor")),
+    __: None = Depends(_exposure_inputs),
     session: Session = Depends(get_session),
 ) -> CommercialExposureRead:
     return ExposureService.compute_commercial_snapshot(session)
@@ -38,6 +55,7 @@ def get_commercial_exposure(
 @router.get("/global", response_model=GlobalExposureRead)
 def get_global_exposure(
     _: None = Depends(require_any_role("risk_manager", "auditor")),
+    __: None = Depends(_exposure_inputs),
     session: Session = Depends(get_session),
 ) -> GlobalExposureRead:
     return ExposureService.compute_global_snapshot(session)
@@ -61,6 +79,7 @@ def reconcile_exposures(
 def get_net_exposure(
     commodity: Optional[str] = Query(None),
     _user: dict = Depends(get_current_user),
+    _: None = Depends(_exposure_inputs),
     session: Session = Depends(get_session),
 ):
     items = ExposureEngineService.compute_net_exposure(session, commodity)
@@ -72,6 +91,7 @@ def list_hedge_tasks(
     cursor: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=200),
     _user: dict = Depends(get_current_user),
+    _: None = Depends(_exposure_inputs),
     session: Session = Depends(get_session),
 ):
     items, next_cursor = ExposureEngineService.list_pending_tasks(
@@ -103,6 +123,7 @@ def list_exposures(
     cursor: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=200),
     _user: dict = Depends(get_current_user),
+    _: None = Depends(_exposure_inputs),
     session: Session = Depends(get_session),
 ):
     items, next_cursor = ExposureEngineService.list_exposures(
@@ -171,6 +192,7 @@ def list_exposures(
 def get_exposure(
     exposure_id: UUID,
     _user: dict = Depends(get_current_user),
+    _: None = Depends(_exposure_inputs),
     session: Session = Depends(get_session),
 ):
     from app.models.orders import Order
@@ -7,6 +7,8 @@ from app.core.auth import require_any_role, require_role
 from app.core.database import get_session
 from app.core.rate_limit import RATE_LIMIT_MUTATION, limiter
 from app.api.dependencies.audit import audit_event, mark_audit_success
+from app.api.dependencies.conditional import ConditionalRoute, conditional_get
+from app.models.orders import Order, SoPoLink
 from app.schemas.orders import (
     OrderListResponse,
     OrderRead,
@@ -18,7 +20,7 @@ from app.schemas.orders import (
 )
 from app.services.order_service import OrderService
 
-router = APIRouter()
+router = APIRouter(route_class=ConditionalRoute)
 
 
 @router.post("/sales", response_model=OrderRead, status_code=status.HTTP_201_CREATED)
@@ -71,6 +73,7 @@ def list_orders(
     cursor: str | None = Query(None),
     limit: int = Query(50, ge=1, le=200),
     _: None = Depends(require_any_role("trader", "risk_manager", "auditor")),
+    __: None = Depends(conditional_get(Order)),
     session: Session = Depends(get_session),
 ) -> OrderListResponse:
     return OrderService.list_orders(
@@ -101,6 +104,7 @@ def list_sopo_links(
     cursor: str | None = Query(None),
     limit: int = Query(50, ge=1, le=200),
     _user: dict = Depends(require_any_role("trader", "risk_manager", "auditor")),
+    _: None = Depends(conditional_get(SoPoLink)),
     session: Session = Depends(get_session),
 ) -> SoPoLinkListResponse:
     return OrderService.list_sopo_links(session, cursor=cursor, limit=limit)
@@ -110,6 +114,7 @@ def list_sopo_links(
 def get_order(
     order_id: UUID,
     _: None = Depends(require_any_role("trader", "risk_manager", "auditor")),
+    __: None = Depends(conditional_get(Order)),
     session: Session = Depends(get_session),
 ) -> OrderRead:
     order = OrderService.get_by_id(session, order_id)
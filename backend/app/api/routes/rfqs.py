@@ -35,6 +35,7 @@ from app.schemas.rfq import (
     TradeRankingRead,
 )
 from app.api.routes.ws import manager as ws_manager
+from app.services.rfq_ranking_cache import ranking_cache
 from app.services.rfq_service import RFQService
 
 router = APIRouter()
@@ -287,8 +288,7 @@ def get_trade_ranking(
             failure_reason="Trade ranking is not defined for intent=SPREAD",
             ranking=[],
         )
-    latest = RFQService.get_latest_trade_quotes(session, rfq.id)
-    return RFQService.compute_trade_ranking(rfq, latest)
+    return ranking_cache.get_trade_ranking(session, rfq)
 
 
 @router.get("/{rfq_id}/ranking", response_model=SpreadRankingRead)
@@ -298,7 +298,7 @@ def get_spread_ranking(
     session: Session = Depends(get_session),
 ) -> SpreadRankingRead:
     rfq = RFQService.get(session, rfq_id)
-    return RFQService.compute_spread_ranking(session, rfq)
+    return ranking_cache.get_spread_ranking(session, rfq)
 
 
 @router.post("/{rfq_id}/actions/reject", response_model=RFQRead)
@@ -15,11 +15,15 @@ from __future__ import annotations
 
 import json
 import os
-from concurrent.futures import ThreadPoolExecutor
 
 from fastapi import APIRouter, HTTPException, Query, Request, status
+from starlette.concurrency import run_in_threadpool
 
+from app.core.database import SessionLocal
 from app.core.logging import get_logger
+from app.schemas.whatsapp import WhatsAppInboundMessage
+from app.services.inbound_queue import InboundQueue
+from app.services.inbound_worker_pool import BACKEND_DATABASE, get_queue_backend
 from app.services.whatsapp_providers import get_provider_name
 from app.services.webhook_processor import (
     enqueue_message,
@@ -32,31 +36,42 @@ from app.services.webhook_processor import (
 logger = get_logger()
 router = APIRouter()
 
-_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rfq-inbound")
-
-
-def _process_queue_in_background() -> None:
-    """Drain the inbound queue in a background thread so the webhook
-    returns 200 within Meta's 5-second window."""
-    from app.core.database import SessionLocal
-    from app.services.rfq_orchestrator import RFQOrchestrator
 
+def _persist_messages(messages: list[WhatsAppInboundMessage]) -> None:
     session = SessionLocal()
     try:
-        results = RFQOrchestrator.process_inbound_queue(session)
-        if results:
-            logger.info(
-                "webhook_background_processed",
-                processed_count=len(results),
-                statuses=[r.get("status") for r in results],
-            )
-    except Exception:
-        session.rollback()
-        logger.exception("webhook_background_processing_error")
+        for msg in messages:
+            InboundQueue.enqueue(session, msg)
+        session.commit()
     finally:
         session.close()
 
 
+async def _enqueue_messages(messages: list[WhatsAppInboundMessage]) -> None:
+    """Enqueue on the configured backend (``INBOUND_QUEUE_BACKEND``).
+
+    A failed database write propagates as a 500 so the provider redelivers
+    rather than the message being lost.
+    """
+    if get_queue_backend() == BACKEND_DATABASE:
+        await run_in_threadpool(_persist_messages, messages)
+        return
+    for msg in messages:
+        enqueue_message(msg)
+
+
+def _process_queue_in_background() -> None:
+    """Hand queued messages to the inbound worker pool so the webhook
+    returns 200 within Meta's 5-second window.
+
+    The pool processes different senders concurrently while preserving
+    per-sender order (see ``app.services.inbound_worker_pool``).
+    """
+    from app.services.inbound_worker_pool import get_inbound_pool
+
+    get_inbound_pool().pump()
+
+
 @router.get("/whatsapp")
 def verify_webhook(
     request: Request,
@@ -141,11 +156,11 @@ async def _receive_meta(request: Request) -> dict[str, str]:
         )
 
     messages = extract_messages(payload)
-    for msg in messages:
-        enqueue_message(msg)
+    await _enqueue_messages(messages)
 
     if messages:
-        _executor.submit(_process_queue_in_background)
+        # Off the event loop: with the database backend, pumping claims rows.
+        await run_in_threadpool(_process_queue_in_background)
 
     logger.info("webhook_processed", provider="meta", messages_received=len(messages))
     return {"status": "ok"}
@@ -179,11 +194,11 @@ async def _receive_twilio(request: Request) -> dict[str, str]:
         logger.warning("webhook_twilio_no_signature_verification")
 
     messages = extract_messages_twilio(form_params)
-    for msg in messages:
-        enqueue_message(msg)
+    await _enqueue_messages(messages)
 
     if messages:
-        _executor.submit(_process_queue_in_background)
+        # Off the event loop: with the database backend, pumping claims rows.
+        await run_in_threadpool(_process_queue_in_background)
 
     logger.info("webhook_processed", provider="twilio", messages_received=len(messages))
     return {"status": "ok"}
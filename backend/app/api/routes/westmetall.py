@@ -11,6 +11,7 @@ from app.core.auth import require_any_role, require_role
 from app.core.database import get_session
 from app.core.rate_limit import RATE_LIMIT_SCRAPING, limiter
 from app.api.dependencies.audit import audit_event
+from app.api.dependencies.conditional import ConditionalRoute, conditional_get
 from app.models.market_data import CashSettlementPrice
 from app.services.cash_settlement_prices import (
     ingest_westmetall_cash_settlement_bulk,
@@ -33,7 +34,7 @@ from app.schemas.market_data import (
 SYMBOL_MONTHLY_AVG = "LME_ALU_MONTHLY_AVG"
 _NS_MONTHLY = _uuid.UUID("b3a1c2d4-e5f6-4890-abcd-ef1234567890")
 
-router = APIRouter()
+router = APIRouter(route_class=ConditionalRoute)
 
 
 def _compute_monthly_averages(
@@ -93,6 +94,7 @@ def list_cash_settlement_prices(
     symbol: Optional[str] = Query(None, description="Symbol filter"),
     limit: int = Query(500, ge=1, le=5000),
     _: None = Depends(require_any_role("trader", "risk_manager", "auditor")),
+    __: None = Depends(conditional_get(CashSettlementPrice)),
     session: Session = Depends(get_session),
 ) -> list[CashSettlementPriceRead]:
     # Monthly average: compute dynamically from daily prices
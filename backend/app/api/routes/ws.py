@@ -6,6 +6,56 @@ Protocol:
   3. Server validates JWT → ack or close(1008)
   4. Client sends: {"action": "subscribe", "topic": "rfq", "id": "<rfq_id>"}
   5. Server pushes events filtered by subscription
+
+Topics: ``rfq`` (id = RFQ id) carries RFQ lifecycle and ranking events.
+``exposure`` (ids ``net`` / ``global``) and ``mtm`` (ids
+``hedge_contracts`` / ``orders``) carry the changed rows of those
+aggregates whenever the underlying data is written — see
+``app.services.live_aggregates``.  Subscribing to ``mtm`` or
+``exposure``/``global`` needs the same roles as the REST endpoints
+(``risk_manager`` or ``auditor``); otherwise the reply is a
+``subscription_error``.
+
+Fan-out: subscriptions are indexed by (topic, id), so a broadcast touches
+only its subscribers.  Each connection has its own outbound queue drained
+by a writer task — a slow or stalled client never delays the broadcaster
+or other clients.  When a connection's queue is full it is either closed
+(1013, the client reconnects and resyncs) or, with the ``drop`` policy,
+further events are dropped and the client is told how many it missed.
+
+Coalescing: events for a topic are held for ``WS_COALESCE_MS`` and sent
+together.  ``ranking_updated`` is last-value-wins — only the newest
+ranking in a window is pushed.  A client that subscribes with
+``"batch": true`` receives a window of several events as one JSON array
+frame (a single event is still a plain object); otherwise each event is
+its own frame.  Each frame is serialized once and shared by every
+subscriber.
+Subscribing with ``"encoding": "msgpack"`` (needs the optional ``msgpack``
+package) switches the connection's event frames to MessagePack binary
+frames; control replies stay JSON text.
+
+Resume: the last events of each topic are kept in a bounded ring buffer.
+After reconnecting and re-subscribing, a client sends
+``{"action": "resume", "since_seq": N}`` and gets the missed events of its
+subscriptions replayed, followed by ``resume_ack``.  Topics whose history
+no longer reaches back to N are listed in ``resume_ack.resync`` — the
+client reloads those over REST.  So are all of them when N is beyond the
+newest event this worker has seen (e.g. the in-process bus restarted its
+numbering after a deploy), or when the bus reports that events up to or
+after N may not have been delivered here.  Events already pushed live
+since the subscription are not replayed twice.
+
+Cross-worker: broadcasts go through the pub/sub bus in
+``app.services.ws_pubsub``, which also assigns ``seq``; every worker fans
+out what the bus delivers to its own sockets.
+
+Configurable via env vars:
+    WS_SEND_QUEUE_SIZE        Default 256 — queued events per connection
+    WS_SLOW_CONSUMER_POLICY   ``close`` (default) or ``drop``
+    WS_COALESCE_MS            Default 50 — ``0`` sends every event at once
+    WS_REPLAY_BUFFER_SIZE     Default 200 — events kept per topic
+    WS_REPLAY_MAX_TOPICS      Default 2000 — least recently active dropped
+    WS_AUTH_CONCURRENCY       Default 16 — handshakes validating at once
 """
 
 from __future__ import annotations
@@ -13,31 +63,45 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import os
 import time
-from typing import Any
+from collections import OrderedDict, deque
+from typing import Any, NamedTuple
 from uuid import UUID
 
 from fastapi import WebSocket, WebSocketDisconnect
-from jose import JWTError, jwt
 from starlette.websockets import WebSocketState
 
-from app.core.auth import JWKSCache, get_auth_settings
+from app.core.auth import can_verify_inline, get_auth_settings, verify_token
+from app.core.metrics import (
+    ws_auth_wait_seconds,
+    ws_connections,
+    ws_frame_events,
+    ws_messages_dropped_total,
+    ws_resume_total,
+    ws_send_queue_depth,
+    ws_slow_consumers_total,
+)
+from app.services.ws_pubsub import BroadcastEvent, PubSub, get_ws_pubsub
 
 logger = logging.getLogger(__name__)
 
-# Re-use the same JWKS cache as HTTP auth
-_jwks_cache = JWKSCache()
+try:
+    import msgpack
+except ImportError:  # optional — enables the compact binary encoding
+    msgpack = None
 
-# Monotonic sequence counter for gap detection
-_seq_counter = 0
-_seq_lock = asyncio.Lock()
+ENCODINGS = ("json", "msgpack") if msgpack is not None else ("json",)
 
+# Events where only the latest value in a coalescing window matters.
+_LAST_VALUE_EVENTS = frozenset({"ranking_updated"})
 
-async def _next_seq() -> int:
-    global _seq_counter
-    async with _seq_lock:
-        _seq_counter += 1
-        return _seq_counter
+# Roles needed to subscribe, by (topic, id) or (topic, None) for every id —
+# the same as the REST endpoints serving those aggregates.
+_SUBSCRIBE_ROLES: dict[tuple[str, str | None], frozenset[str]] = {
+    ("mtm", None): frozenset({"risk_manager", "auditor"}),
+    ("exposure", "global"): frozenset({"risk_manager", "auditor"}),
+}
 
 
 def _validate_token(token: str) -> dict[str, Any] | None:
@@ -51,54 +115,104 @@ def _validate_token(token: str) -> dict[str, Any] | None:
             "roles": ["trader", "risk_manager", "auditor"],
         }
     try:
-        header = jwt.get_unverified_header(token)
-        jwks = _jwks_cache.get(settings)
-        keys = jwks.get("keys", [])
-        kid = header.get("kid")
-        jwk = None
-        for key in keys:
-            if kid is None or key.get("kid") == kid:
-                jwk = key
-                break
-        if jwk is None:
-            return None
-        payload = jwt.decode(
-            token,
-            jwk,
-            algorithms=["RS256"],
-            audience=settings.audience,
-            issuer=settings.issuer,
-        )
-        return payload
-    except (JWTError, Exception):
+        return verify_token(token, settings)
+    except Exception:
         return None
 
 
-class ConnectionManager:
-    """Manages WebSocket connections, authentication, and subscriptions."""
+async def _validate_token_async(token: str) -> dict[str, Any] | None:
+    """``_validate_token`` without blocking the loop on a JWKS fetch.
 
-    def __init__(self) -> None:
+    Tokens already verified, or signed by a key in the cached key set, are
+    checked inline; otherwise the whole validation (fetch included) runs on
+    a worker thread.
+    """
+    settings = get_auth_settings()
+    if settings is None or can_verify_inline(token, settings):
+        return _validate_token(token)
+    return await asyncio.to_thread(_validate_token, token)
+
+
+class ConnectionManager:
+    """Manages WebSocket connections, authentication, and subscriptions.
+
+    All connection state is owned by the event loop that accepted the
+    sockets; events delivered on other threads or loops are handed over to
+    it.
+    """
+
+    def __init__(
+        self,
+        max_queue: int | None = None,
+        slow_consumer_policy: str | None = None,
+        pubsub: PubSub | None = None,
+        coalesce_ms: int | None = None,
+        auth_concurrency: int | None = None,
+    ) -> None:
         self._connections: dict[WebSocket, _ConnState] = {}
-        self._lock = asyncio.Lock()
+        self._topics: dict[tuple[str, str], set[WebSocket]] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._max_queue = max_queue or int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+        self._slow_policy = (
+            slow_consumer_policy or os.getenv("WS_SLOW_CONSUMER_POLICY", "close")
+        ).lower()
+        if coalesce_ms is None:
+            coalesce_ms = int(os.getenv("WS_COALESCE_MS", "50"))
+        self._coalesce = coalesce_ms / 1000
+        self._pending: dict[tuple[str, str], list[_PendingEvent]] = {}
+        self._replay_size = int(os.getenv("WS_REPLAY_BUFFER_SIZE", "200"))
+        self._replay_max_topics = int(os.getenv("WS_REPLAY_MAX_TOPICS", "2000"))
+        self._history: OrderedDict[tuple[str, str], _TopicHistory] = OrderedDict()
+        # Every event after this seq has been recorded (None until the
+        # first event arrives — this worker cannot vouch for earlier ones).
+        self._replay_floor: int | None = None
+        # Highest seq this worker knows to exist; a resume past it comes
+        # from an earlier numbering and cannot be replayed.
+        self._last_seq = 0
+        self._auth_concurrency = auth_concurrency or int(
+            os.getenv("WS_AUTH_CONCURRENCY", "16")
+        )
+        # Semaphores are bound to a loop; rebuilt if the manager is reused
+        # on another one (tests).
+        self._auth_slots: tuple[asyncio.AbstractEventLoop, asyncio.Semaphore] | None = (
+            None
+        )
+        self._pubsub = pubsub
+        if pubsub is not None:
+            pubsub.subscribe(self._deliver)
+            pubsub.subscribe_gaps(self._on_gap)
 
     async def connect(self, ws: WebSocket) -> None:
         await ws.accept()
-        async with self._lock:
-            self._connections[ws] = _ConnState()
+        self._loop = asyncio.get_running_loop()
+        state = _ConnState()
+        state.writer = self._loop.create_task(self._write_loop(ws, state))
+        self._connections[ws] = state
+        ws_connections.set(len(self._connections))
 
     async def disconnect(self, ws: WebSocket) -> None:
-        async with self._lock:
-            self._connections.pop(ws, None)
+        self._forget(ws)
 
     async def authenticate(self, ws: WebSocket, token: str) -> bool:
-        claims = _validate_token(token)
+        """Validate *token* for *ws*.
+
+        At most ``WS_AUTH_CONCURRENCY`` handshakes validate at once; the
+        rest wait their turn, so a reconnect storm after a deploy cannot
+        fill the thread pool with JWKS fetches.
+        """
+        loop = asyncio.get_running_loop()
+        if self._auth_slots is None or self._auth_slots[0] is not loop:
+            self._auth_slots = (loop, asyncio.Semaphore(self._auth_concurrency))
+        waited = time.perf_counter()
+        async with self._auth_slots[1]:
+            ws_auth_wait_seconds.observe(time.perf_counter() - waited)
+            claims = await _validate_token_async(token)
         if claims is None:
             return False
-        async with self._lock:
-            state = self._connections.get(ws)
-            if state:
-                state.authenticated = True
-                state.user = claims
+        state = self._connections.get(ws)
+        if state:
+            state.authenticated = True
+            state.user = claims
         return True
 
     def is_authenticated(self, ws: WebSocket) -> bool:
@@ -109,63 +223,355 @@ class ConnectionManager:
         state = self._connections.get(ws)
         return state.user if state else None
 
-    async def subscribe(self, ws: WebSocket, topic: str, topic_id: str) -> None:
-        async with self._lock:
-            state = self._connections.get(ws)
-            if state:
-                state.subscriptions.add((topic, topic_id))
+    def may_subscribe(self, ws: WebSocket, topic: str, topic_id: str) -> bool:
+        """Whether the user of *ws* holds a role *topic* / *topic_id* requires."""
+        required = _SUBSCRIBE_ROLES.get((topic, topic_id)) or _SUBSCRIBE_ROLES.get(
+            (topic, None)
+        )
+        if required is None:
+            return True
+        user = self.get_user(ws) or {}
+        return not required.isdisjoint(user.get("roles") or [])
+
+    async def subscribe(
+        self,
+        ws: WebSocket,
+        topic: str,
+        topic_id: str,
+        encoding: str | None = None,
+        batch: bool | None = None,
+    ) -> None:
+        """Subscribe *ws*; *encoding* (one of ``ENCODINGS``) and *batch*
+        (array frames for coalesced windows) apply to all of the
+        connection's event frames."""
+        state = self._connections.get(ws)
+        if state:
+            if encoding is not None:
+                state.encoding = encoding
+            if batch is not None:
+                state.batch = batch
+            state.subscriptions.add((topic, topic_id))
+            self._topics.setdefault((topic, topic_id), set()).add(ws)
 
     async def unsubscribe(self, ws: WebSocket, topic: str, topic_id: str) -> None:
-        async with self._lock:
-            state = self._connections.get(ws)
-            if state:
-                state.subscriptions.discard((topic, topic_id))
+        state = self._connections.get(ws)
+        if state:
+            state.subscriptions.discard((topic, topic_id))
+            state.first_live.pop((topic, topic_id), None)
+            self._unindex(ws, (topic, topic_id))
+
+    def resume(self, ws: WebSocket, since_seq: int) -> None:
+        """Replay events after *since_seq* for the subscriptions of *ws*.
+
+        Queues the missed events in ``seq`` order, then a ``resume_ack``
+        listing the topics that could not be replayed.
+        """
+        state = self._connections.get(ws)
+        if state is None:
+            return
+        floor = self._replay_floor
+        replay: list[tuple[int, str]] = []
+        resync: list[dict[str, str]] = []
+        for key in sorted(state.subscriptions):
+            history = self._history.get(key)
+            evicted_upto = history.evicted_upto if history else 0
+            if (
+                floor is None
+                or since_seq < max(floor, evicted_upto)
+                or since_seq > self._last_seq
+            ):
+                resync.append({"topic": key[0], "id": key[1]})
+                continue
+            if history is None:
+                continue
+            first_live = state.first_live.get(key)
+            replay.extend(
+                (seq, message)
+                for seq, message in history.events
+                if seq > since_seq and (first_live is None or seq < first_live)
+            )
+        replay.sort(key=lambda item: item[0])
+        for _, message in replay:
+            state.queue.put_nowait(message)
+        ws_resume_total.labels(result="resync" if resync else "replayed").inc()
+        self.reply(
+            ws,
+            {
+                "type": "resume_ack",
+                "since_seq": since_seq,
+                "replayed": len(replay),
+                "resync": resync,
+            },
+        )
+
+    def reply(self, ws: WebSocket, payload: dict[str, Any]) -> None:
+        """Queue a direct reply behind any events already queued for *ws*.
+
+        Replies are never dropped — they are bounded by the client's own
+        requests — and keep their order relative to broadcast events.
+        """
+        state = self._connections.get(ws)
+        if state:
+            state.queue.put_nowait(json.dumps(payload))
 
     async def broadcast(
         self, topic: str, topic_id: str, event: str, data: dict[str, Any]
     ) -> None:
-        """Broadcast an event to all connections subscribed to (topic, topic_id)."""
-        seq = await _next_seq()
-        message = json.dumps(
-            {
-                "event": event,
-                "rfq_id": topic_id,
-                "data": data,
-                "timestamp": _iso_now(),
-                "seq": seq,
-            }
-        )
-        async with self._lock:
-            targets = [
-                ws
-                for ws, state in self._connections.items()
-                if state.authenticated and (topic, topic_id) in state.subscriptions
-            ]
-        for ws in targets:
-            try:
-                if ws.client_state == WebSocketState.CONNECTED:
-                    await ws.send_text(message)
-            except Exception:
-                logger.debug("ws_send_failed", exc_info=True)
+        """Broadcast an event to all connections subscribed to (topic, topic_id).
+
+        Published on the bus, so subscribers on every worker receive it.
+        """
+        bus = self._bus()
+        try:
+            if bus.blocking:
+                await asyncio.to_thread(bus.publish, topic, topic_id, event, data)
+            else:
+                bus.publish(topic, topic_id, event, data)
+        except Exception:
+            logger.warning("ws_publish_failed", exc_info=True)
+
+    def broadcast_nowait(
+        self, topic: str, topic_id: str, event: str, data: dict[str, Any]
+    ) -> None:
+        """Publish from synchronous code (threadpool routes, scheduler jobs).
+
+        On the event loop itself a blocking bus is published from a task
+        instead, so the loop never waits on it.
+        """
+        bus = self._bus()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not None and bus.blocking:
+            running.create_task(self.broadcast(topic, topic_id, event, data))
+        else:
+            bus.publish(topic, topic_id, event, data)
 
     @property
     def active_count(self) -> int:
         return len(self._connections)
 
+    # -- internals --
+
+    def _bus(self) -> PubSub:
+        if self._pubsub is None:
+            self._pubsub = get_ws_pubsub()
+            self._pubsub.subscribe(self._deliver)
+            self._pubsub.subscribe_gaps(self._on_gap)
+        return self._pubsub
+
+    def _deliver(self, evt: BroadcastEvent) -> None:
+        """Bus handler: hand *evt* to the loop that owns the sockets."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        payload = {
+            "event": evt.event,
+            "rfq_id": evt.topic_id,
+            "data": evt.data,
+            "timestamp": evt.timestamp,
+            "seq": evt.seq,
+        }
+        pending = _PendingEvent(evt.seq, evt.event, payload, json.dumps(payload))
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        key = (evt.topic, evt.topic_id)
+        if on_loop:
+            self._fan_out(key, pending)
+        else:
+            loop.call_soon_threadsafe(self._fan_out, key, pending)
+
+    def _on_gap(self, seq: int) -> None:
+        """Bus gap handler: events up to *seq* may never have reached us."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._raise_floor, seq)
+
+    def _raise_floor(self, seq: int) -> None:
+        self._replay_floor = max(self._replay_floor or 0, seq)
+        self._last_seq = max(self._last_seq, seq)
+
+    def _fan_out(self, key: tuple[str, str], pending: _PendingEvent) -> None:
+        self._record(key, pending.seq, pending.text)
+        if self._coalesce <= 0:
+            self._send_frame(key, [pending])
+            return
+        window = self._pending.get(key)
+        if window is None:
+            window = self._pending[key] = []
+            asyncio.get_running_loop().call_later(self._coalesce, self._flush, key)
+        if pending.event in _LAST_VALUE_EVENTS:
+            window[:] = [p for p in window if p.event != pending.event]
+        window.append(pending)
+
+    def _flush(self, key: tuple[str, str]) -> None:
+        window = self._pending.pop(key, None)
+        if window:
+            self._send_frame(key, window)
+
+    def _send_frame(self, key: tuple[str, str], events: list[_PendingEvent]) -> None:
+        """Queue one frame carrying *events* for every subscriber of *key*."""
+        subscribers = self._topics.get(key)
+        if not subscribers:
+            return
+        ws_frame_events.observe(len(events))
+        # Built on first use and shared: (encoding, batch) -> frames.
+        frames: dict[tuple[str, bool], list[str | bytes]] = {}
+        for ws in list(subscribers):
+            state = self._connections.get(ws)
+            if state is None or not state.authenticated:
+                continue
+            state.first_live.setdefault(key, events[0].seq)
+            variant = (state.encoding, state.batch and len(events) > 1)
+            if variant not in frames:
+                frames[variant] = _encode_frames(events, *variant)
+            depth = state.queue.qsize()
+            ws_send_queue_depth.observe(depth)
+            if depth < self._max_queue:
+                if state.dropped:
+                    # Tell the client where the gap is, in stream order.
+                    notice = {"type": "messages_dropped", "count": state.dropped}
+                    state.queue.put_nowait(json.dumps(notice))
+                    state.dropped = 0
+                for frame in frames[variant]:
+                    state.queue.put_nowait(frame)
+            else:
+                self._on_queue_full(ws, state)
+
+    def _record(self, key: tuple[str, str], seq: int, message: str) -> None:
+        if self._replay_floor is None:
+            self._replay_floor = seq - 1
+        self._last_seq = max(self._last_seq, seq)
+        history = self._history.get(key)
+        if history is None:
+            history = self._history[key] = _TopicHistory(self._replay_size)
+        else:
+            self._history.move_to_end(key)
+        history.append(seq, message)
+        while len(self._history) > self._replay_max_topics:
+            _, evicted = self._history.popitem(last=False)
+            # That topic's history is gone; older resumes must resync.
+            self._replay_floor = max(self._replay_floor, evicted.events[-1][0])
+
+    def _on_queue_full(self, ws: WebSocket, state: _ConnState) -> None:
+        ws_messages_dropped_total.labels(reason="queue_full").inc()
+        if self._slow_policy == "drop":
+            if state.dropped == 0:
+                ws_slow_consumers_total.labels(action="flagged").inc()
+            state.dropped += 1
+            return
+        ws_slow_consumers_total.labels(action="closed").inc()
+        logger.warning("ws_slow_consumer_closed", extra={"queued": state.queue.qsize()})
+        self._forget(ws)
+        asyncio.get_running_loop().create_task(self._close(ws))
+
+    async def _write_loop(self, ws: WebSocket, state: _ConnState) -> None:
+        try:
+            while True:
+                message = await state.queue.get()
+                if isinstance(message, bytes):
+                    await ws.send_bytes(message)
+                else:
+                    await ws.send_text(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            ws_messages_dropped_total.labels(reason="send_failed").inc()
+            logger.debug("ws_send_failed", exc_info=True)
+            self._forget(ws)
+
+    @staticmethod
+    async def _close(ws: WebSocket) -> None:
+        try:
+            if ws.client_state == WebSocketState.CONNECTED:
+                await ws.close(code=1013, reason="Slow consumer")
+        except Exception:
+            logger.debug("ws_close_failed", exc_info=True)
+
+    def _forget(self, ws: WebSocket) -> None:
+        state = self._connections.pop(ws, None)
+        if state is None:
+            return
+        for key in state.subscriptions:
+            self._unindex(ws, key)
+        if state.writer is not None:
+            state.writer.cancel()
+        ws_connections.set(len(self._connections))
+
+    def _unindex(self, ws: WebSocket, key: tuple[str, str]) -> None:
+        subscribers = self._topics.get(key)
+        if subscribers is not None:
+            subscribers.discard(ws)
+            if not subscribers:
+                del self._topics[key]
+
+
+def _encode_frames(
+    events: list[_PendingEvent], encoding: str, batch: bool
+) -> list[str | bytes]:
+    """The frames carrying *events*: one array frame when *batch*, else one
+    frame per event."""
+    if encoding == "msgpack":
+        if batch:
+            return [msgpack.packb([e.payload for e in events])]
+        return [msgpack.packb(e.payload) for e in events]
+    if batch:
+        return ["[" + ",".join(e.text for e in events) + "]"]
+    return [e.text for e in events]
+
+
+class _PendingEvent(NamedTuple):
+    seq: int
+    event: str
+    payload: dict[str, Any]
+    text: str
+
+
+class _TopicHistory:
+    """Most recent ``(seq, message)`` pairs broadcast on one topic."""
+
+    __slots__ = ("events", "evicted_upto")
+
+    def __init__(self, size: int) -> None:
+        self.events: deque[tuple[int, str]] = deque(maxlen=size)
+        self.evicted_upto = 0
+
+    def append(self, seq: int, message: str) -> None:
+        if len(self.events) == self.events.maxlen:
+            self.evicted_upto = self.events[0][0]
+        self.events.append((seq, message))
+
 
 class _ConnState:
-    __slots__ = ("authenticated", "user", "subscriptions")
+    __slots__ = (
+        "authenticated",
+        "batch",
+        "dropped",
+        "encoding",
+        "first_live",
+        "queue",
+        "subscriptions",
+        "user",
+        "writer",
+    )
 
     def __init__(self) -> None:
         self.authenticated = False
         self.user: dict[str, Any] | None = None
         self.subscriptions: set[tuple[str, str]] = set()
-
-
-def _iso_now() -> str:
-    from datetime import datetime, timezone
-
-    return datetime.now(timezone.utc).isoformat()
+        # Unbounded as a queue; broadcasts enforce the bound themselves so
+        # direct replies are never refused.
+        self.queue: asyncio.Queue[str | bytes] = asyncio.Queue()
+        self.writer: asyncio.Task | None = None
+        self.dropped = 0
+        # seq of the first live event queued per subscription (resume skips it)
+        self.first_live: dict[tuple[str, str], int] = {}
+        self.encoding = "json"
+        self.batch = False
 
 
 # Singleton — import this from services to broadcast events
@@ -217,7 +623,7 @@ async def websocket_endpoint(ws: WebSocket) -> None:
             try:
                 msg = json.loads(raw)
             except json.JSONDecodeError:
-                await ws.send_text(json.dumps({"type": "error", "reason": "invalid_json"}))
+                manager.reply(ws, {"type": "error", "reason": "invalid_json"})
                 continue
 
             action = msg.get("action")
@@ -226,31 +632,63 @@ async def websocket_endpoint(ws: WebSocket) -> None:
             if action == "subscribe":
                 topic = msg.get("topic", "")
                 topic_id = msg.get("id", "")
-                if topic and topic_id:
-                    await manager.subscribe(ws, topic, topic_id)
-                    await ws.send_text(
-                        json.dumps({"type": "subscription_ack", "topic": topic, "id": topic_id})
+                encoding = msg.get("encoding")
+                batch = msg.get("batch")
+                if encoding is not None and encoding not in ENCODINGS:
+                    manager.reply(
+                        ws,
+                        {
+                            "type": "subscription_error",
+                            "reason": f"unsupported encoding: {encoding}",
+                        },
                     )
-                else:
-                    await ws.send_text(
-                        json.dumps({"type": "subscription_error", "reason": "missing topic or id"})
+                elif batch is not None and type(batch) is not bool:
+                    manager.reply(
+                        ws, {"type": "subscription_error", "reason": "invalid batch"}
+                    )
+                elif not (topic and topic_id):
+                    manager.reply(
+                        ws, {"type": "subscription_error", "reason": "missing topic or id"}
                     )
+                elif not manager.may_subscribe(ws, topic, topic_id):
+                    manager.reply(
+                        ws,
+                        {
+                            "type": "subscription_error",
+                            "topic": topic,
+                            "id": topic_id,
+                            "reason": "forbidden",
+                        },
+                    )
+                else:
+                    await manager.subscribe(ws, topic, topic_id, encoding, batch)
+                    ack = {"type": "subscription_ack", "topic": topic, "id": topic_id}
+                    if encoding is not None:
+                        ack["encoding"] = encoding
+                    if batch is not None:
+                        ack["batch"] = batch
+                    manager.reply(ws, ack)
 
             elif action == "unsubscribe":
                 topic = msg.get("topic", "")
                 topic_id = msg.get("id", "")
                 await manager.unsubscribe(ws, topic, topic_id)
-                await ws.send_text(
-                    json.dumps({"type": "unsubscription_ack", "topic": topic, "id": topic_id})
+                manager.reply(
+                    ws, {"type": "unsubscription_ack", "topic": topic, "id": topic_id}
                 )
 
+            elif action == "resume":
+                since_seq = msg.get("since_seq")
+                if type(since_seq) is int and since_seq >= 0:
+                    manager.resume(ws, since_seq)
+                else:
+                    manager.reply(ws, {"type": "error", "reason": "invalid since_seq"})
+
             elif action == "ping":
-                await ws.send_text(json.dumps({"type": "pong"}))
+                manager.reply(ws, {"type": "pong"})
 
             else:
-                await ws.send_text(
-                    json.dumps({"type": "error", "reason": f"unknown action: {action}"})
-                )
+                manager.reply(ws, {"type": "error", "reason": f"unknown action: {action}"})
 
     except WebSocketDisconnect:
         pass
@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
 import os
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
 import httpx
 from fastapi import Depends, HTTPException, Request, status
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+from jose.exceptions import JWKError
 
+from app.core.metrics import auth_claims_cache_total, jwks_refresh_total
 
 JWKS_CACHE_TTL_SECONDS = 300
+JWKS_FORCED_REFRESH_SECONDS = 30
 
 logger = logging.getLogger(__name__)
 
@@ -57,23 +66,126 @@ def get_auth_settings() -> AuthSettings | None:
 
 
 class JWKSCache:
-    def __init__(self) -> None:
+    """JWKS document plus the public-key objects built from it.
+
+    Key objects are constructed once per ``kid`` and reused until the next
+    refresh, so verification does not re-parse the JWK on every token.
+
+    Once a key set is loaded, an expired one keeps being served while a
+    background thread revalidates it — requests never wait on the TTL
+    refresh.  Only the first load blocks.  A token signed with a ``kid``
+    the set does not contain (key rotation) forces an immediate refresh,
+    at most once per ``forced_refresh_seconds``.  Concurrent refreshes
+    collapse into one fetch.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = JWKS_CACHE_TTL_SECONDS,
+        forced_refresh_seconds: float = JWKS_FORCED_REFRESH_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._forced_interval = forced_refresh_seconds
+        self._clock = clock
         self._jwks: dict[str, Any] | None = None
-        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._keys: dict[str | None, Key] = {}
+        self._lock = threading.Lock()  # held for the duration of a fetch
+        self._state_lock = threading.Lock()
+        self._refreshing = False
+        self._last_forced: float | None = None
+
+    def is_fresh(self) -> bool:
+        return self._jwks is not None and self._clock() < self._fetched_at + self._ttl
+
+    def knows(self, kid: str | None) -> bool:
+        """True when a token signed with *kid* can be checked without a fetch."""
+        jwks = self._jwks
+        return jwks is not None and (
+            kid in self._keys or _select_jwk(jwks, kid) is not None
+        )
 
     def get(self, settings: AuthSettings) -> dict[str, Any]:
-        now = time.time()
-        if self._jwks is None or now >= self._expires_at:
-            self._jwks = self._fetch_jwks(settings.jwks_url)
-            self._expires_at = now + JWKS_CACHE_TTL_SECONDS
-        return self._jwks
+        jwks = self._jwks
+        if jwks is None:
+            self._refresh(settings, trigger="initial")
+            return self._jwks
+        if not self.is_fresh():
+            self._refresh_in_background(settings)
+        return jwks
+
+    async def get_async(self, settings: AuthSettings) -> dict[str, Any]:
+        """Like :meth:`get`, but a blocking first load runs on a worker thread."""
+        if self._jwks is not None:
+            return self.get(settings)
+        return await asyncio.to_thread(self.get, settings)
+
+    def public_key(self, settings: AuthSettings, kid: str | None) -> Key:
+        """Verification key for *kid*, constructed once per JWKS refresh."""
+        jwks = self.get(settings)
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+        jwk_data = _select_jwk(jwks, kid)
+        if jwk_data is None and self._refresh(settings, trigger="unknown_kid"):
+            jwk_data = _select_jwk(self._jwks, kid)
+        if jwk_data is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token key"
+            )
+        try:
+            key = jwk.construct(jwk_data, "RS256")
+        except JWKError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token key",
+            ) from exc
+        self._keys[kid] = key
+        return key
+
+    def _refresh(self, settings: AuthSettings, trigger: str) -> bool:
+        """Fetch the key set unless another caller just did; True if fetched."""
+        requested = self._clock()
+        with self._lock:
+            now = self._clock()
+            if trigger == "unknown_kid":
+                if (
+                    self._last_forced is not None
+                    and now - self._last_forced < self._forced_interval
+                ):
+                    return False
+                self._last_forced = now
+            elif self._jwks is not None and self._fetched_at >= requested:
+                return False  # refreshed while we waited for the lock
+            jwks = self._fetch_jwks(settings.jwks_url)
+            self._jwks, self._keys = jwks, {}
+            self._fetched_at = self._clock()
+        jwks_refresh_total.labels(trigger=trigger).inc()
+        return True
+
+    def _refresh_in_background(self, settings: AuthSettings) -> None:
+        with self._state_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run() -> None:
+            try:
+                self._refresh(settings, trigger="background")
+            except HTTPException:
+                logger.warning("JWKS background refresh failed; serving cached keys")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="jwks-refresh", daemon=True).start()
 
     @staticmethod
     def _fetch_jwks(jwks_url: str) -> dict[str, Any]:
-        # NOTE: This is a synchronous HTTP call, but all routes using
-        # get_current_user are sync def, so FastAPI runs them in a thread
-        # pool — the event loop is NOT blocked. The TTL cache further
-        # limits the frequency of actual HTTP requests.
+        # NOTE: This is a synchronous HTTP call. Only the first load and
+        # unknown-kid refreshes run on the request path; HTTP routes using
+        # get_current_user are sync def (thread pool) and the WebSocket
+        # handshake moves such validations to a worker thread.
         try:
             response = httpx.get(jwks_url, timeout=5.0)
             response.raise_for_status()
@@ -85,7 +197,61 @@ class JWKSCache:
             ) from exc
 
 
-_jwks_cache = JWKSCache()
+class VerifiedClaimsCache:
+    """Claims of tokens whose signature has already been verified.
+
+    Keyed by a SHA-256 of the token (and the issuer / audience it was
+    checked against) and kept until the token's ``exp``, so repeat
+    requests with the same bearer token skip the RSA verification.
+    Least recently used entries are dropped beyond ``max_entries``.
+    """
+
+    def __init__(
+        self, max_entries: int = 10_000, clock: Callable[[], float] = time.time
+    ) -> None:
+        self._max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[bytes, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str, settings: AuthSettings) -> bytes:
+        return hashlib.sha256(
+            f"{settings.issuer}\0{settings.audience}\0{token}".encode()
+        ).digest()
+
+    def get(self, key: bytes) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return dict(entry[1])
+
+    def put(self, key: bytes, claims: dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        if self._max_entries <= 0 or not isinstance(exp, (int, float)):
+            return
+        with self._lock:
+            self._entries[key] = (float(exp), dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_jwks_cache = JWKSCache(
+    forced_refresh_seconds=float(os.getenv("JWKS_FORCED_REFRESH_SECONDS", "30"))
+)
+_claims_cache = VerifiedClaimsCache(
+    max_entries=int(os.getenv("AUTH_CLAIMS_CACHE_SIZE", "10000"))
+)
 
 
 def _extract_token(request: Request) -> str:
@@ -104,31 +270,34 @@ def _extract_token(request: Request) -> str:
     return parts[1]
 
 
-def _select_jwk(jwks: dict[str, Any], kid: str | None) -> dict[str, Any]:
+def _select_jwk(jwks: dict[str, Any], kid: str | None) -> dict[str, Any] | None:
     keys = jwks.get("keys", [])
     for key in keys:
         if kid is None or key.get("kid") == kid:
             return key
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token key"
-    )
+    return None
 
 
-_ANONYMOUS_USER: dict[str, Any] = {
-    "sub": "anonymous",
-    "name": "Anonymous (auth disabled)",
-    "roles": ["trader", "risk_manager", "auditor"],
-}
+def _unverified_kid(token: str) -> str | None:
+    try:
+        return jwt.get_unverified_header(token).get("kid")
+    except JWTError:
+        return None
 
 
-def get_current_user(
-    request: Request,
-    settings: AuthSettings | None = Depends(get_auth_settings),
-) -> dict[str, Any]:
-    if not _auth_enabled() or settings is None:
-        return _ANONYMOUS_USER
+def verify_token(token: str, settings: AuthSettings) -> dict[str, Any]:
+    """Return the token's verified claims; raise 401 if it is not valid.
+
+    Claims of tokens verified earlier are served from the claims cache
+    until the token expires.
+    """
+    cache_key = VerifiedClaimsCache.key(token, settings)
+    claims = _claims_cache.get(cache_key)
+    if claims is not None:
+        auth_claims_cache_total.labels(result="hit").inc()
+        return claims
+    auth_claims_cache_total.labels(result="miss").inc()
 
-    token = _extract_token(request)
     try:
         header = jwt.get_unverified_header(token)
     except JWTError as exc:
@@ -136,13 +305,12 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         ) from exc
 
-    jwks = _jwks_cache.get(settings)
-    jwk = _select_jwk(jwks, header.get("kid"))
+    key = _jwks_cache.public_key(settings, header.get("kid"))
 
     try:
         payload = jwt.decode(
             token,
-            jwk,
+            key,
             algorithms=["RS256"],
             audience=settings.audience,
             issuer=settings.issuer,
@@ -152,9 +320,35 @@ def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         ) from exc
 
+    _claims_cache.put(cache_key, payload)
     return payload
 
 
+def can_verify_inline(token: str, settings: AuthSettings) -> bool:
+    """True when :func:`verify_token` will not fetch the JWKS for *token*."""
+    if _claims_cache.get(VerifiedClaimsCache.key(token, settings)) is not None:
+        return True
+    return _jwks_cache.knows(_unverified_kid(token))
+
+
+_ANONYMOUS_USER: dict[str, Any] = {
+    "sub": "anonymous",
+    "name": "Anonymous (auth disabled)",
+    "roles": ["trader", "risk_manager", "auditor"],
+}
+
+
+def get_current_user(
+    request: Request,
+    settings: AuthSettings | None = Depends(get_auth_settings),
+) -> dict[str, Any]:
+    if not _auth_enabled() or settings is None:
+        return _ANONYMOUS_USER
+
+    token = _extract_token(request)
+    return verify_token(token, settings)
+
+
 def require_role(role: str):
     return require_any_role(role)
 
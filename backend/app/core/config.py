@@ -22,6 +22,8 @@ class Settings(BaseSettings):
     jwt_issuer: str = Field("", description="Leave empty to disable JWT auth")
     jwt_audience: str = Field("")
     jwks_url: str = Field("")
+    jwks_forced_refresh_seconds: float = Field(30.0)
+    auth_claims_cache_size: int = Field(10000)
 
     # ── CORS ──────────────────────────────────────────────────────
     cors_allow_origins: str = Field(
@@ -36,6 +38,15 @@ class Settings(BaseSettings):
 
     # ── Audit ─────────────────────────────────────────────────────
     audit_signing_key: str = Field("", description="HMAC key for audit event signatures")
+    audit_writer_mode: str = Field("async")
+    audit_queue_size: int = Field(10000)
+    audit_batch_size: int = Field(200)
+    audit_flush_interval_ms: int = Field(200)
+    audit_wal_path: str = Field("")
+    audit_batch_window_minutes: int = Field(60)
+    audit_batch_grace_seconds: int = Field(300)
+    audit_batch_seal_minutes: int = Field(15)
+    audit_verify_workers: int = Field(8)
 
     # ── Scheduler ─────────────────────────────────────────────────
     scheduler_disabled: str = Field("")
@@ -45,10 +56,51 @@ class Settings(BaseSettings):
     rfq_timeout_hours: int = Field(24)
     rfq_reminder_threshold: float = Field(0.5)
 
+    # ── Inbound WhatsApp worker pool ──────────────────────────────
+    inbound_max_workers: int = Field(4)
+    inbound_max_buffered: int = Field(200)
+    inbound_backpressure_depth: int = Field(1000)
+    inbound_queue_backend: str = Field("memory")
+    inbound_visibility_timeout_seconds: int = Field(300)
+    inbound_max_attempts: int = Field(5)
+    inbound_queue_poll_seconds: int = Field(5)
+    rfq_phone_index_ttl_seconds: float = Field(15.0)
+
+    # ── Outbound WhatsApp ─────────────────────────────────────────
+    whatsapp_send_concurrency: int = Field(8)
+    whatsapp_provider_rate: float = Field(20.0)
+    whatsapp_provider_burst: float = Field(20.0)
+    whatsapp_destination_rate: float = Field(0.2)
+    whatsapp_destination_burst: float = Field(5.0)
+    whatsapp_throttle_max_retries: int = Field(3)
+
+    # ── WebSocket ─────────────────────────────────────────────────
+    ws_send_queue_size: int = Field(256)
+    ws_slow_consumer_policy: str = Field("close")
+    ws_coalesce_ms: int = Field(50)
+    ws_replay_buffer_size: int = Field(200)
+    ws_replay_max_topics: int = Field(2000)
+    ws_pubsub_backend: str = Field("memory")
+    ws_pubsub_channel: str = Field("ws_events")
+    ws_auth_concurrency: int = Field(16)
+    ws_live_aggregates_disabled: str = Field("")
+    ws_live_aggregates_debounce_ms: int = Field(250)
+
+    # ── Conditional GET ───────────────────────────────────────────
+    data_versions_channel: str = Field("data_versions")
+    http_body_cache_size: int = Field(512)
+
     # ── Azure OpenAI ──────────────────────────────────────────────
     azure_openai_endpoint: str = Field("")
     azure_openai_api_key: str = Field("")
     azure_openai_deployment: str = Field("gpt-4o-mini")
+    llm_cache_max_entries: int = Field(4096)
+    llm_cache_ttl_seconds: int = Field(86400)
+    llm_cache_persist: str = Field("")
+    llm_batch_max_size: int = Field(16)
+    llm_batch_window_ms: int = Field(50)
+    llm_max_concurrency: int = Field(8)
+    llm_call_deadline_seconds: float = Field(12.0)
 
     # ── WhatsApp (Meta) ───────────────────────────────────────────
     whatsapp_api_url: str = Field("https://graph.facebook.com/v21.0")
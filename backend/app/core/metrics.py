@@ -1,4 +1,4 @@
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 
 audit_events_total = Counter(
@@ -7,8 +7,228 @@ audit_events_total = Counter(
     ["entity_type", "event_type"],
 )
 
+audit_writer_queue_depth = Gauge(
+    "audit_writer_queue_depth",
+    "Audit events queued for the background writer",
+)
+
+audit_writer_batch_size = Histogram(
+    "audit_writer_batch_size",
+    "Audit events written per multi-row insert",
+    buckets=(1, 5, 10, 25, 50, 100, 200, 500),
+)
+
+audit_writer_inline_total = Counter(
+    "audit_writer_inline_total",
+    "Audit events written inline by the request instead of the background writer",
+    ["reason"],  # queue_full
+)
+
+audit_batches_sealed_total = Counter(
+    "audit_batches_sealed_total",
+    "Merkle batches of audit events sealed",
+)
+
+audit_verify_range_seconds = Histogram(
+    "audit_verify_range_seconds",
+    "Wall time of one audit range verification",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
 request_latency_seconds = Histogram(
     "request_latency_seconds",
     "Request latency in seconds",
     ["method", "path", "status"],
-)
\ No newline at end of file
+)
+
+# ── Auth ──────────────────────────────────────────────────────────
+
+auth_claims_cache_total = Counter(
+    "auth_claims_cache_total",
+    "Bearer-token verifications answered from / missing the verified-claims cache",
+    ["result"],  # hit | miss
+)
+
+jwks_refresh_total = Counter(
+    "jwks_refresh_total",
+    "JWKS fetches from the identity provider",
+    ["trigger"],  # initial | background | unknown_kid
+)
+
+# ── Finance pipeline ──────────────────────────────────────────────
+
+finance_pipeline_step_duration_seconds = Histogram(
+    "finance_pipeline_step_duration_seconds",
+    "Finance pipeline step wall-clock duration in seconds",
+    ["step"],
+)
+
+finance_pipeline_record_latency_seconds = Histogram(
+    "finance_pipeline_record_latency_seconds",
+    "Per-record compute latency inside a finance pipeline step",
+    ["step"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+finance_pipeline_step_queries_total = Counter(
+    "finance_pipeline_step_queries_total",
+    "SQL statements executed by finance pipeline steps",
+    ["step"],
+)
+
+finance_pipeline_swallowed_errors_total = Counter(
+    "finance_pipeline_swallowed_errors_total",
+    "Per-record exceptions skipped (not failing the step) in finance pipeline steps",
+    ["step"],
+)
+
+
+# ── Inbound WhatsApp processing ───────────────────────────────────
+
+inbound_message_wait_seconds = Histogram(
+    "inbound_message_wait_seconds",
+    "Time an inbound message waits in its sender sub-queue before processing",
+)
+
+inbound_message_processing_seconds = Histogram(
+    "inbound_message_processing_seconds",
+    "Inbound message processing latency (matching, LLM parse, quote creation)",
+    ["status"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+inbound_queue_depth = Gauge(
+    "inbound_queue_depth",
+    "Inbound messages waiting in the webhook queue (not yet dispatched)",
+)
+
+inbound_messages_in_flight = Gauge(
+    "inbound_messages_in_flight",
+    "Inbound messages dispatched to worker sub-queues and not yet finished",
+)
+
+inbound_queue_settled_total = Counter(
+    "inbound_queue_settled_total",
+    "Durable inbound queue items settled by a worker",
+    ["outcome"],  # done | retry | dead
+)
+
+
+# ── Outbound WhatsApp ─────────────────────────────────────────────
+
+whatsapp_send_wait_seconds = Histogram(
+    "whatsapp_send_wait_seconds",
+    "Time an outbound WhatsApp send waits for a rate-limit slot",
+    ["priority"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0),
+)
+
+whatsapp_send_throttled_total = Counter(
+    "whatsapp_send_throttled_total",
+    "Outbound WhatsApp sends rejected by the provider's rate limit",
+    ["provider"],
+)
+
+
+# ── LLM ───────────────────────────────────────────────────────────
+
+llm_request_seconds = Histogram(
+    "llm_request_seconds",
+    "Azure OpenAI call latency, including retries and waiting for a slot",
+    ["outcome"],  # ok | error | saturated | circuit_open
+    buckets=(0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 12.0, 20.0),
+)
+
+llm_circuit_state = Gauge(
+    "llm_circuit_state",
+    "Azure OpenAI circuit breaker state (0 closed, 1 open, 2 half-open)",
+)
+
+llm_cache_lookups_total = Counter(
+    "llm_cache_lookups_total",
+    "LLM response cache lookups",
+    ["kind", "result"],  # kind: classify | parse; result: hit | persistent_hit | miss
+)
+
+quote_fast_parse_total = Counter(
+    "quote_fast_parse_total",
+    "Inbound quote messages tried by the deterministic fast-path parser",
+    ["result"],  # parsed | fallback
+)
+
+llm_cache_entries = Gauge(
+    "llm_cache_entries",
+    "Entries held in the in-memory LLM response cache",
+)
+
+llm_batch_size = Histogram(
+    "llm_batch_size",
+    "LLM calls sent together in one micro-batched request",
+    buckets=(1, 2, 4, 8, 16, 32),
+)
+
+llm_batch_fallback_total = Counter(
+    "llm_batch_fallback_total",
+    "Batched LLM items whose answer was missing or malformed (retried singly)",
+)
+
+
+# ── WebSocket ─────────────────────────────────────────────────────
+
+ws_connections = Gauge(
+    "ws_connections",
+    "Open WebSocket connections on this worker",
+)
+
+ws_send_queue_depth = Histogram(
+    "ws_send_queue_depth",
+    "Outbound messages already queued for a connection when a broadcast is enqueued",
+    buckets=(0, 1, 4, 16, 64, 128, 256, 512),
+)
+
+ws_messages_dropped_total = Counter(
+    "ws_messages_dropped_total",
+    "Broadcast messages not delivered to a WebSocket connection",
+    ["reason"],  # queue_full | send_failed
+)
+
+ws_slow_consumers_total = Counter(
+    "ws_slow_consumers_total",
+    "WebSocket connections whose send queue filled up",
+    ["action"],  # closed | flagged
+)
+
+ws_resume_total = Counter(
+    "ws_resume_total",
+    "WebSocket resume requests",
+    ["result"],  # replayed | resync
+)
+
+ws_frame_events = Histogram(
+    "ws_frame_events",
+    "Broadcast events carried by one WebSocket frame after coalescing",
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+
+ws_auth_wait_seconds = Histogram(
+    "ws_auth_wait_seconds",
+    "Time a WebSocket handshake waited for an authentication slot",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+ws_live_aggregate_refresh_seconds = Histogram(
+    "ws_live_aggregate_refresh_seconds",
+    "Time to recompute and diff the exposure / MTM aggregates pushed over WebSocket",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+data_version_bumps_total = Counter(
+    "data_version_bumps_total",
+    "Table versions bumped by committed writes",
+)
+
+conditional_get_total = Counter(
+    "conditional_get_total",
+    "Conditional GET outcomes",
+    ["result"],  # not_modified | cached | miss
+)
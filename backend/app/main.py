@@ -16,6 +16,14 @@ from app.core.database import engine
 from app.core.logging import configure_logging, get_logger
 from app.core.metrics import request_latency_seconds
 from app.core.rate_limit import limiter, rate_limit_exceeded_handler
+from app.services.audit_writer import get_audit_writer, shutdown_audit_writer
+from app.services.data_versions import get_data_versions, shutdown_data_versions
+from app.services.inbound_worker_pool import shutdown_inbound_pool
+from app.services.live_aggregates import shutdown_live_aggregates
+from app.services.rfq_phone_index import shutdown_phone_index
+from app.services.rfq_ranking_cache import shutdown_ranking_cache
+from app.services.whatsapp_providers import shutdown_outbound
+from app.services.ws_pubsub import shutdown_ws_pubsub
 from app.tasks.scheduler import start_scheduler, stop_scheduler
 
 from app.api.routes import (
@@ -46,8 +54,18 @@ validate_auth_config()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     start_scheduler()
+    get_audit_writer()  # replays a write-ahead file left by a crash
+    get_data_versions()
     yield
     stop_scheduler()
+    shutdown_inbound_pool()
+    shutdown_outbound()
+    shutdown_live_aggregates()
+    shutdown_ws_pubsub()
+    shutdown_data_versions()
+    shutdown_ranking_cache()
+    shutdown_phone_index()
+    shutdown_audit_writer()
 
 
 _cfg = get_settings()
@@ -1,4 +1,4 @@
-from app.models.audit import AuditEvent
+from app.models.audit import AuditBatch, AuditBatchMember, AuditEvent
 from app.models.contracts import (
     HedgeClassification,
     HedgeContract,
@@ -35,7 +35,9 @@ from app.models.exposure import (
     HedgeTaskAction,
     HedgeTaskStatus,
 )
+from app.models.inbound_queue import InboundQueueItem, InboundQueueStatus
 from app.models.linkages import HedgeOrderLinkage
+from app.models.llm_cache import LLMResponseCacheEntry
 from app.models.market_data import CashSettlementPrice
 from app.models.mtm import MTMObjectType, MTMSnapshot
 from app.models.orders import (
@@ -55,12 +57,16 @@ from app.models.rfqs import (
     RFQInvitation,
     RFQInvitationChannel,
     RFQInvitationStatus,
+    RFQPhoneIndexEntry,
     RFQSequence,
     RFQState,
     RFQStateEvent,
 )
+from app.models.ws_broadcast import WSBroadcastPayload
 
 __all__ = [
+    "AuditBatch",
+    "AuditBatchMember",
     "AuditEvent",
     "ContractExposure",
     "Counterparty",
@@ -83,7 +89,10 @@ __all__ = [
     "HedgeTask",
     "HedgeTaskAction",
     "HedgeTaskStatus",
+    "InboundQueueItem",
+    "InboundQueueStatus",
     "KycStatus",
+    "LLMResponseCacheEntry",
     "SanctionsStatus",
     "RiskRating",
     "CashFlowBaselineSnapshot",
@@ -105,6 +114,7 @@ __all__ = [
     "RFQInvitation",
     "RFQInvitationChannel",
     "RFQInvitationStatus",
+    "RFQPhoneIndexEntry",
     "RFQQuote",
     "RFQSequence",
     "RFQState",
@@ -113,4 +123,5 @@ __all__ = [
     "FinancePipelineStep",
     "PipelineRunStatus",
     "PipelineStepStatus",
+    "WSBroadcastPayload",
 ]
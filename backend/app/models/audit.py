@@ -1,7 +1,16 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, JSON, LargeBinary, String, Text
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Integer,
+    JSON,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
@@ -9,16 +18,49 @@ from sqlalchemy.sql import func
 from app.models.base import Base
 
 
+class AuditBatch(Base):
+    """A time window of audit events sealed under one signed Merkle root."""
+
+    __tablename__ = "audit_batches"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    window_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    window_end: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    merkle_root: Mapped[str] = mapped_column(String(length=64), nullable=False)
+    signature: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+
 class AuditEvent(Base):
     __tablename__ = "audit_events"
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     timestamp_utc: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
     )
     entity_type: Mapped[str] = mapped_column(Text, nullable=False)
     entity_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     event_type: Mapped[str] = mapped_column(Text, nullable=False)
     payload: Mapped[object] = mapped_column(JSON, nullable=False)
     checksum: Mapped[str] = mapped_column(String(length=64), nullable=False)
-    signature: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
\ No newline at end of file
+    signature: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+
+
+class AuditBatchMember(Base):
+    """Leaf *seq* of a batch's Merkle tree (``audit_events`` is append-only)."""
+
+    __tablename__ = "audit_batch_members"
+    __table_args__ = (
+        UniqueConstraint("batch_id", "seq", name="uq_audit_batch_members_batch_seq"),
+    )
+
+    event_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("audit_events.id"), primary_key=True
+    )
+    batch_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("audit_batches.id"), nullable=False
+    )
+    seq: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -11,6 +11,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     Enum,
+    Float,
     ForeignKey,
     Integer,
     String,
@@ -111,4 +112,21 @@ class FinancePipelineStep(Base):
     records_processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # Instrumentation (mirrors the finance_pipeline_* Prometheus series)
+    duration_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    query_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    errors_swallowed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    record_latency_avg_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    record_latency_max_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+
     run: Mapped["FinancePipelineRun"] = relationship(back_populates="steps")
+
+    @property
+    def timings(self) -> dict:
+        return {
+            "duration_ms": self.duration_ms,
+            "query_count": self.query_count or 0,
+            "errors_swallowed": self.errors_swallowed or 0,
+            "record_latency_avg_ms": self.record_latency_avg_ms,
+            "record_latency_max_ms": self.record_latency_max_ms,
+        }
@@ -0,0 +1,63 @@
+"""Durable inbound WhatsApp message queue."""
+
+from __future__ import annotations
+
+import enum
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.utils import now_utc
+from app.models.base import Base
+
+
+class InboundQueueStatus(enum.Enum):
+    pending = "pending"
+    processing = "processing"
+    done = "done"
+    dead = "dead"
+
+
+class InboundQueueItem(Base):
+    __tablename__ = "inbound_message_queue"
+    __table_args__ = (
+        Index("ix_inbound_queue_status_available", "status", "available_at"),
+        Index("ix_inbound_queue_sender_status", "sender_key", "status"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    message_id: Mapped[str] = mapped_column(String(128), nullable=False, unique=True)
+    sender_key: Mapped[str] = mapped_column(String(32), nullable=False)
+    from_phone: Mapped[str] = mapped_column(String(32), nullable=False)
+    sender_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    message_timestamp: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    status: Mapped[InboundQueueStatus] = mapped_column(
+        Enum(InboundQueueStatus, name="inbound_queue_status"),
+        nullable=False,
+        default=InboundQueueStatus.pending,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Client-side default: microsecond resolution keeps per-sender FIFO order.
+    enqueued_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=now_utc, nullable=False
+    )
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=now_utc, nullable=False
+    )
+    locked_by: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    locked_until: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    processed_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -0,0 +1,25 @@
+"""Persistent tier of the LLM response cache."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.utils import now_utc
+from app.models.base import Base
+
+
+class LLMResponseCacheEntry(Base):
+    __tablename__ = "llm_response_cache"
+    __table_args__ = (Index("ix_llm_response_cache_expires_at", "expires_at"),)
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    prompt_version: Mapped[str] = mapped_column(String(32), nullable=False)
+    response: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=now_utc
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import DateTime, Float, ForeignKey, String
+from sqlalchemy import DateTime, Float, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import Mapped, mapped_column
@@ -10,6 +10,11 @@ from app.models.base import Base
 
 class RFQQuote(Base):
     __tablename__ = "rfq_quotes"
+    __table_args__ = (
+        # Serves the latest-quote-per-counterparty window
+        # (PARTITION BY rfq_id, counterparty_id ORDER BY received_at DESC).
+        Index("ix_rfq_quotes_rfq_cp_received", "rfq_id", "counterparty_id", "received_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     rfq_id: Mapped[uuid.UUID] = mapped_column(
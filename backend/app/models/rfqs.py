@@ -1,7 +1,17 @@
 import enum
 import uuid
 
-from sqlalchemy import Date, DateTime, Enum, Float, ForeignKey, String, Text
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -133,6 +143,43 @@ class RFQInvitation(Base):
     rfq: Mapped["RFQ"] = relationship(back_populates="invitations")
 
 
+class RFQPhoneIndexEntry(Base):
+    """Sender-matching index: one row per (normalised phone, channel, RFQ).
+
+    Maintained by ``app.services.rfq_phone_index`` on invitation inserts and
+    RFQ state changes; ``invitation_id`` is the newest invitation sent to
+    that phone for the RFQ.
+    """
+
+    __tablename__ = "rfq_phone_index"
+    __table_args__ = (
+        UniqueConstraint(
+            "phone_key", "channel", "rfq_id", name="uq_rfq_phone_index_phone_rfq"
+        ),
+        Index("ix_rfq_phone_index_lookup", "phone_key", "channel", "rfq_state"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    phone_key: Mapped[str] = mapped_column(String(length=32), nullable=False)
+    channel: Mapped[RFQInvitationChannel] = mapped_column(
+        Enum(RFQInvitationChannel, name="rfq_invitation_channel"),
+        nullable=False,
+    )
+    rfq_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("rfqs.id", ondelete="CASCADE"), nullable=False
+    )
+    invitation_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("rfq_invitations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    rfq_state: Mapped[RFQState] = mapped_column(
+        Enum(RFQState, name="rfq_state"), nullable=False
+    )
+
+
 class RFQStateEvent(Base):
     __tablename__ = "rfq_state_events"
 
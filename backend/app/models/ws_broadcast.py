@@ -0,0 +1,22 @@
+"""Spill table for WebSocket broadcast events too large for a NOTIFY payload."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.utils import now_utc
+from app.models.base import Base
+
+
+class WSBroadcastPayload(Base):
+    __tablename__ = "ws_broadcast_payloads"
+    __table_args__ = (Index("ix_ws_broadcast_payloads_created_at", "created_at"),)
+
+    seq: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=now_utc
+    )
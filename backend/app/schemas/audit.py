@@ -3,7 +3,7 @@ from __future__ import annotations
 import base64
 import uuid
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
@@ -33,3 +33,40 @@ class AuditEventRead(BaseModel):
 class AuditEventListResponse(BaseModel):
     events: list[AuditEventRead] = Field(default_factory=list)
     next_cursor: str | None = Field(None, max_length=256)
+
+
+class AuditProofStep(BaseModel):
+    side: Literal["left", "right"]
+    hash: str = Field(..., max_length=64)
+
+
+class AuditInclusionProof(BaseModel):
+    event_id: uuid.UUID
+    batch_id: uuid.UUID
+    seq: int
+    leaf_hash: str = Field(..., max_length=64)
+    merkle_root: str = Field(..., max_length=64)
+    path: list[AuditProofStep] = Field(default_factory=list)
+    valid: bool | None = None
+
+
+class AuditBatchVerification(BaseModel):
+    batch_id: uuid.UUID
+    window_start: datetime
+    window_end: datetime
+    event_count: int
+    merkle_root: str = Field(..., max_length=64)
+    root_valid: bool
+    signature_valid: bool
+    invalid_event_ids: list[uuid.UUID] = Field(default_factory=list)
+
+
+class AuditRangeVerifyResponse(BaseModel):
+    start: datetime
+    end: datetime
+    valid: bool
+    events_verified: int
+    batches: list[AuditBatchVerification] = Field(default_factory=list)
+    unbatched_event_count: int
+    invalid_unbatched_event_ids: list[uuid.UUID] = Field(default_factory=list)
+    proofs: list[AuditInclusionProof] | None = None
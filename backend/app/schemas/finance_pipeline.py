@@ -9,6 +9,14 @@ from typing import Optional
 from pydantic import BaseModel, ConfigDict
 
 
+class PipelineStepTimings(BaseModel):
+    duration_ms: float | None = None
+    query_count: int = 0
+    errors_swallowed: int = 0
+    record_latency_avg_ms: float | None = None
+    record_latency_max_ms: float | None = None
+
+
 class PipelineStepRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -21,6 +29,7 @@ class PipelineStepRead(BaseModel):
     finished_at: Optional[datetime] = None
     records_processed: int = 0
     error_message: Optional[str] = None
+    timings: PipelineStepTimings = PipelineStepTimings()
 
 
 class PipelineRunRead(BaseModel):
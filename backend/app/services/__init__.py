@@ -1,5 +1,7 @@
 __all__ = [
+    "audit_batch_service",
     "audit_trail_service",
+    "audit_writer",
     "cash_settlement_prices",
     "cashflow_analytic_service",
     "cashflow_baseline_service",
@@ -7,12 +9,18 @@ __all__ = [
     "cashflow_projection_service",
     "contract_service",
     "counterparty_service",
+    "data_versions",
     "deal_engine",
     "exposure_engine",
     "exposure_service",
     "finance_pipeline_service",
+    "inbound_queue",
+    "inbound_worker_pool",
     "linkage_service",
+    "live_aggregates",
     "llm_agent",
+    "llm_batcher",
+    "llm_cache",
     "lme_calendar",
     "mtm_contract_service",
     "mtm_order_service",
@@ -21,13 +29,18 @@ __all__ = [
     "pl_calculation_service",
     "pl_snapshot_service",
     "price_lookup_service",
+    "quote_fast_parser",
     "rfq_engine",
     "rfq_message_builder",
     "rfq_orchestrator",
+    "rfq_phone_index",
+    "rfq_ranking_cache",
     "rfq_service",
     "scenario_whatif_service",
     "webhook_processor",
     "westmetall_cash_settlement",
     "whatsapp_providers",
+    "whatsapp_send_scheduler",
     "whatsapp_service",
+    "ws_pubsub",
 ]
@@ -0,0 +1,399 @@
+"""Merkle batches of audit events and range verification.
+
+Verifying audit history one ``/audit/events/{id}/verify`` call at a time
+does not scale to months of events.  Instead, closed time windows of
+events are sealed into :class:`AuditBatch` rows:
+
+- Leaves are ``SHA-256(0x00 || event id || checksum)`` in
+  ``(timestamp_utc, id)`` order; inner nodes are
+  ``SHA-256(0x01 || left || right)``, and an odd node is carried up
+  unchanged.  The leaf position of every event is stored in
+  ``audit_batch_members`` (``audit_events`` itself is append-only).
+- The root, together with the event count, is signed with
+  ``AUDIT_SIGNING_KEY`` (same HMAC as the per-event signatures).
+- A window is sealed ``grace`` after it closes, so events still queued in
+  the background audit writer land in it.  Events written later than
+  that (e.g. replayed from the write-ahead file) go into an extra batch
+  for the same window.
+
+:meth:`AuditBatchService.verify_range` loads a range's batches in one
+query and verifies them in a thread pool — recomputed root vs stored
+root, root signature, and each event's own signature — optionally
+returning an inclusion proof per event.
+
+Configurable via env vars:
+    AUDIT_BATCH_WINDOW_MINUTES   Default 60
+    AUDIT_BATCH_GRACE_SECONDS    Default 300
+    AUDIT_BATCH_SEAL_MINUTES     Default 15 — scheduler interval
+    AUDIT_VERIFY_WORKERS         Default 8
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.core.metrics import audit_batches_sealed_total, audit_verify_range_seconds
+from app.core.utils import now_utc
+from app.models.audit import AuditBatch, AuditBatchMember, AuditEvent
+from app.services.audit_trail_service import (
+    _get_signing_key,
+    compute_signature,
+    verify_signature,
+)
+
+logger = get_logger()
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def leaf_hash(event_id: UUID, checksum: str) -> bytes:
+    return hashlib.sha256(b"\x00" + event_id.bytes + checksum.encode("ascii")).digest()
+
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def merkle_levels(leaves: list[bytes]) -> list[list[bytes]]:
+    """Every level of the tree, leaves first and the root level last."""
+    levels = [leaves or [hashlib.sha256(b"").digest()]]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parent = [
+            _node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            parent.append(level[-1])
+        levels.append(parent)
+    return levels
+
+
+def inclusion_proof(levels: list[list[bytes]], index: int) -> list[dict[str, str]]:
+    """Sibling hashes from leaf *index* up to the root."""
+    path = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append(
+                {
+                    "side": "left" if sibling < index else "right",
+                    "hash": level[sibling].hex(),
+                }
+            )
+        index //= 2
+    return path
+
+
+def verify_inclusion(
+    leaf: bytes, path: Iterable[dict[str, str]], root_hex: str
+) -> bool:
+    node = leaf
+    for step in path:
+        sibling = bytes.fromhex(step["hash"])
+        node = (
+            _node_hash(sibling, node)
+            if step["side"] == "left"
+            else _node_hash(node, sibling)
+        )
+    return node.hex() == root_hex
+
+
+def root_message(merkle_root: str, event_count: int) -> str:
+    """What the batch signature covers."""
+    return f"{merkle_root}:{event_count}"
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes.
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def _window_floor(value: datetime, window: timedelta) -> datetime:
+    offset = (_as_utc(value) - _EPOCH) // window
+    return _EPOCH + offset * window
+
+
+@dataclass
+class _BatchWork:
+    batch_id: UUID
+    window_start: datetime
+    window_end: datetime
+    event_count: int
+    merkle_root: str
+    signature: bytes | None
+    # (event id, seq, checksum, event signature), in seq order
+    members: list[tuple[UUID, int, str, bytes | None]]
+
+
+class AuditBatchService:
+    """Stateless service for sealing and verifying audit batches."""
+
+    # ------------------------------------------------------------------
+    # Sealing
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def seal_pending(
+        db: Session,
+        *,
+        window: timedelta | None = None,
+        grace: timedelta | None = None,
+        now: datetime | None = None,
+    ) -> list[AuditBatch]:
+        """Seal every unbatched event of windows closed at least *grace* ago."""
+        window = window or timedelta(
+            minutes=int(os.getenv("AUDIT_BATCH_WINDOW_MINUTES", "60"))
+        )
+        if grace is None:
+            grace = timedelta(
+                seconds=int(os.getenv("AUDIT_BATCH_GRACE_SECONDS", "300"))
+            )
+        cutoff = _window_floor((now or now_utc()) - grace, window)
+
+        rows = db.execute(
+            select(AuditEvent.id, AuditEvent.timestamp_utc, AuditEvent.checksum)
+            .outerjoin(AuditBatchMember, AuditBatchMember.event_id == AuditEvent.id)
+            .where(
+                AuditBatchMember.event_id.is_(None),
+                AuditEvent.timestamp_utc < cutoff,
+            )
+            .order_by(AuditEvent.timestamp_utc, AuditEvent.id)
+        ).all()
+
+        windows: dict[datetime, list[tuple[UUID, str]]] = {}
+        for event_id, ts, checksum in rows:
+            start = _window_floor(ts, window)
+            windows.setdefault(start, []).append((event_id, checksum))
+
+        key = _get_signing_key()
+        sealed = []
+        for start, events in windows.items():
+            root = merkle_levels([leaf_hash(i, c) for i, c in events])[-1][0].hex()
+            batch = AuditBatch(
+                window_start=start,
+                window_end=start + window,
+                event_count=len(events),
+                merkle_root=root,
+                signature=(
+                    compute_signature(root_message(root, len(events)), key)
+                    if key
+                    else None
+                ),
+            )
+            db.add(batch)
+            try:
+                db.flush()
+                db.execute(
+                    insert(AuditBatchMember),
+                    [
+                        {"event_id": event_id, "batch_id": batch.id, "seq": seq}
+                        for seq, (event_id, _) in enumerate(events)
+                    ],
+                )
+                db.commit()
+            except IntegrityError:
+                # Another worker sealed these events first.
+                db.rollback()
+                logger.info("audit_batch_seal_conflict", window_start=start.isoformat())
+                continue
+            sealed.append(batch)
+            audit_batches_sealed_total.inc()
+            logger.info(
+                "audit_batch_sealed",
+                batch_id=str(batch.id),
+                window_start=start.isoformat(),
+                event_count=len(events),
+            )
+        return sealed
+
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def verify_range(
+        db: Session,
+        *,
+        start: datetime,
+        end: datetime,
+        key: bytes,
+        include_proofs: bool = False,
+        workers: int | None = None,
+    ) -> dict[str, Any]:
+        """Verify every batch overlapping ``[start, end)`` and every unbatched
+        event in it."""
+        started = time.perf_counter()
+        batches = db.scalars(
+            select(AuditBatch)
+            .where(AuditBatch.window_start < end, AuditBatch.window_end > start)
+            .order_by(AuditBatch.window_start, AuditBatch.created_at)
+        ).all()
+
+        work = {
+            b.id: _BatchWork(
+                batch_id=b.id,
+                window_start=b.window_start,
+                window_end=b.window_end,
+                event_count=b.event_count,
+                merkle_root=b.merkle_root,
+                signature=b.signature,
+                members=[],
+            )
+            for b in batches
+        }
+        if work:
+            members = db.execute(
+                select(
+                    AuditBatchMember.batch_id,
+                    AuditEvent.id,
+                    AuditBatchMember.seq,
+                    AuditEvent.checksum,
+                    AuditEvent.signature,
+                )
+                .join(AuditEvent, AuditEvent.id == AuditBatchMember.event_id)
+                .where(AuditBatchMember.batch_id.in_(list(work)))
+                .order_by(AuditBatchMember.batch_id, AuditBatchMember.seq)
+            ).all()
+            for batch_id, event_id, seq, checksum, signature in members:
+                work[batch_id].members.append((event_id, seq, checksum, signature))
+
+        unbatched = db.execute(
+            select(AuditEvent.id, AuditEvent.checksum, AuditEvent.signature)
+            .outerjoin(AuditBatchMember, AuditBatchMember.event_id == AuditEvent.id)
+            .where(
+                AuditBatchMember.event_id.is_(None),
+                AuditEvent.timestamp_utc >= start,
+                AuditEvent.timestamp_utc < end,
+            )
+        ).all()
+
+        workers = workers or int(os.getenv("AUDIT_VERIFY_WORKERS", "8"))
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            results = list(
+                pool.map(
+                    lambda w: _verify_batch(w, key, include_proofs), work.values()
+                )
+            )
+            invalid_unbatched = [
+                event_id
+                for chunk in pool.map(
+                    lambda rows: _invalid_signatures(rows, key),
+                    [unbatched[i : i + 1000] for i in range(0, len(unbatched), 1000)],
+                )
+                for event_id in chunk
+            ]
+
+        batch_proofs = [r.pop("proofs") for r in results]
+        valid = not invalid_unbatched and all(
+            r["root_valid"] and r["signature_valid"] and not r["invalid_event_ids"]
+            for r in results
+        )
+        audit_verify_range_seconds.observe(time.perf_counter() - started)
+        return {
+            "start": start,
+            "end": end,
+            "valid": valid,
+            "events_verified": sum(r["event_count"] for r in results) + len(unbatched),
+            "batches": results,
+            "unbatched_event_count": len(unbatched),
+            "invalid_unbatched_event_ids": invalid_unbatched,
+            "proofs": (
+                [p for chunk in batch_proofs for p in chunk] if include_proofs else None
+            ),
+        }
+
+    @staticmethod
+    def get_inclusion_proof(db: Session, event_id: UUID) -> dict[str, Any]:
+        """Inclusion proof of one sealed event against its batch root."""
+        member = db.get(AuditBatchMember, event_id)
+        if member is None:
+            if db.get(AuditEvent, event_id) is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Audit event not found",
+                )
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Audit event is not sealed into a batch yet",
+            )
+        batch = db.get(AuditBatch, member.batch_id)
+        rows = db.execute(
+            select(AuditEvent.id, AuditEvent.checksum)
+            .join(AuditBatchMember, AuditBatchMember.event_id == AuditEvent.id)
+            .where(AuditBatchMember.batch_id == batch.id)
+            .order_by(AuditBatchMember.seq)
+        ).all()
+        levels = merkle_levels([leaf_hash(i, c) for i, c in rows])
+        leaf = levels[0][member.seq]
+        path = inclusion_proof(levels, member.seq)
+        return {
+            "event_id": event_id,
+            "batch_id": batch.id,
+            "seq": member.seq,
+            "leaf_hash": leaf.hex(),
+            "merkle_root": batch.merkle_root,
+            "path": path,
+            "valid": verify_inclusion(leaf, path, batch.merkle_root),
+        }
+
+
+def _invalid_signatures(
+    rows: Iterable[tuple[UUID, str, bytes | None]], key: bytes
+) -> list[UUID]:
+    return [
+        event_id
+        for event_id, checksum, signature in rows
+        if signature is None or not verify_signature(checksum, signature, key)
+    ]
+
+
+def _verify_batch(work: _BatchWork, key: bytes, include_proofs: bool) -> dict[str, Any]:
+    seqs = [seq for _, seq, _, _ in work.members]
+    contiguous = seqs == list(range(len(seqs)))
+    levels = merkle_levels([leaf_hash(i, c) for i, _, c, _ in work.members])
+    root = levels[-1][0].hex()
+    proofs = []
+    if include_proofs:
+        proofs = [
+            {
+                "event_id": event_id,
+                "batch_id": work.batch_id,
+                "seq": seq,
+                "leaf_hash": levels[0][seq].hex(),
+                "merkle_root": work.merkle_root,
+                "path": inclusion_proof(levels, seq),
+            }
+            for event_id, seq, _, _ in work.members
+        ]
+    return {
+        "batch_id": work.batch_id,
+        "window_start": work.window_start,
+        "window_end": work.window_end,
+        "event_count": work.event_count,
+        "merkle_root": work.merkle_root,
+        "root_valid": contiguous
+        and len(work.members) == work.event_count
+        and root == work.merkle_root,
+        "signature_valid": work.signature is not None
+        and verify_signature(
+            root_message(work.merkle_root, work.event_count), work.signature, key
+        ),
+        "invalid_event_ids": _invalid_signatures(
+            ((i, c, s) for i, _, c, s in work.members), key
+        ),
+        "proofs": proofs,
+    }
@@ -75,26 +75,48 @@ class AuditTrailService:
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Audit event already exists",
             )
-        checksum = hashlib.sha256(payload_raw.encode("utf-8")).hexdigest()
-
-        signing_key = _get_signing_key()
-        signature = compute_signature(checksum, signing_key) if signing_key else None
-
         audit_event = AuditEvent(
-            id=event_id,
-            timestamp_utc=now_utc(),
-            entity_type=entity_type,
-            entity_id=entity_id,
-            event_type=event_type,
-            payload=payload_obj,
-            checksum=checksum,
-            signature=signature,
+            **AuditTrailService.build_row(
+                event_id=event_id,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                event_type=event_type,
+                payload_raw=payload_raw,
+                payload_obj=payload_obj,
+            )
         )
         db.add(audit_event)
         db.commit()
         db.refresh(audit_event)
         return audit_event
 
+    @staticmethod
+    def build_row(
+        *,
+        event_id: uuid.UUID,
+        entity_type: str,
+        entity_id: uuid.UUID,
+        event_type: str,
+        payload_raw: str,
+        payload_obj: object,
+    ) -> dict:
+        """Column values of an audit event, checksummed and signed."""
+        checksum = hashlib.sha256(payload_raw.encode("utf-8")).hexdigest()
+
+        signing_key = _get_signing_key()
+        signature = compute_signature(checksum, signing_key) if signing_key else None
+
+        return {
+            "id": event_id,
+            "timestamp_utc": now_utc(),
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "event_type": event_type,
+            "payload": payload_obj,
+            "checksum": checksum,
+            "signature": signature,
+        }
+
     @staticmethod
     def list_events(
         db: Session,
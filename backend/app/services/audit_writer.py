@@ -0,0 +1,361 @@
+"""Asynchronous, batched writer for audit events.
+
+``AuditTrailService.record`` inserts and commits every audit event inline,
+so each mutation request pays for a second transaction.  With the writer
+the ``audit_event`` dependency only checksums and signs the event and
+hands the row to a bounded in-memory queue; a background thread drains
+the queue and writes up to ``batch_size`` rows per multi-row ``INSERT``
+and commit.
+
+- When the queue is full the caller writes its own event inline, as
+  before — audit events are never dropped to relieve pressure.
+- With ``AUDIT_WAL_PATH`` set, each event is first appended (and
+  fsync'd) to a local write-ahead file, one per process
+  (``<AUDIT_WAL_PATH>.<pid>``) and locked by it for as long as it runs.
+  On start a writer replays every such file whose lock it can take — left
+  by a process that died — then removes it; its own file is truncated
+  whenever every event in it has been committed.  Rows already in the
+  table are skipped on replay, so an event is written at most once.
+- ``shutdown_audit_writer`` (FastAPI lifespan) writes whatever is still
+  queued before the process exits.
+
+Configurable via env vars:
+    AUDIT_WRITER_MODE           ``async`` (default) | ``sync`` — inline writes
+    AUDIT_QUEUE_SIZE            Default 10000
+    AUDIT_BATCH_SIZE            Default 200
+    AUDIT_FLUSH_INTERVAL_MS     Default 200
+    AUDIT_WAL_PATH              Unset by default (no write-ahead file)
+"""
+
+from __future__ import annotations
+
+import base64
+import contextlib
+import glob
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from datetime import datetime
+from typing import IO, Any
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.core.metrics import (
+    audit_writer_batch_size,
+    audit_writer_inline_total,
+    audit_writer_queue_depth,
+)
+from app.models.audit import AuditEvent
+
+try:
+    import fcntl
+except ImportError:  # not on Windows — files of other processes are left alone
+    fcntl = None
+
+logger = get_logger()
+
+MODE_ASYNC = "async"
+MODE_SYNC = "sync"
+
+_RETRY_BACKOFF_MAX = 30.0
+
+
+class AuditWriter:
+    """Queues audit rows and inserts them in batches on a background thread."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_queue: int = 10_000,
+        batch_size: int = 200,
+        flush_interval: float = 0.2,
+        wal_path: str | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=max_queue)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._wal_path = f"{wal_path}.{os.getpid()}" if wal_path else None
+        self._wal_file: IO[str] | None = None
+        self._wal_lock = threading.Lock()
+        # Events appended to the WAL / committed since it was last truncated.
+        self._wal_appended = 0
+        self._wal_committed = 0
+        self._idle = threading.Condition()
+        self._in_flight = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._unwritten: list[dict[str, Any]] = []
+        if wal_path:
+            self._open_wal()
+            self._recover(wal_path)
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="audit-writer", daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, row: dict[str, Any]) -> None:
+        """Accept one event row (as built by ``AuditTrailService.build_row``)."""
+        if self._wal_path:
+            self._wal_append(row)
+        with self._idle:
+            self._in_flight += 1
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            audit_writer_inline_total.labels(reason="queue_full").inc()
+            try:
+                self._write([row])
+            except Exception:
+                # The caller sees the error, as with inline writes; stop
+                # waiting for this event so the WAL can still be truncated.
+                if self._wal_path:
+                    self._wal_commit(1)
+                raise
+            finally:
+                self._done(1)
+            return
+        audit_writer_queue_depth.set(self._queue.qsize())
+        self.start()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every accepted event is committed (tests, shutdown)."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._in_flight == 0, timeout=timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Write what is queued, then stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        batch, self._unwritten = self._unwritten, []
+        batch = batch or self._drain(block=False)
+        while batch:
+            try:
+                self._write(batch)
+            except Exception:
+                # Still in the write-ahead file, if one is configured.
+                logger.error(
+                    "audit_writer_shutdown_flush_failed",
+                    batch_size=len(batch),
+                    exc_info=True,
+                )
+            self._done(len(batch))
+            batch = self._drain(block=False)
+        self._close_wal()
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        backoff = 1.0
+        batch: list[dict[str, Any]] = []
+        while not self._stop.is_set():
+            if not batch:
+                batch = self._drain(block=True)
+                if not batch:
+                    continue
+            try:
+                self._write(batch)
+            except Exception:
+                logger.error(
+                    "audit_writer_batch_failed", batch_size=len(batch), exc_info=True
+                )
+                # Keep the batch and retry; the queue fills up behind it
+                # and callers fall back to inline writes meanwhile.
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, _RETRY_BACKOFF_MAX)
+                continue
+            backoff = 1.0
+            self._done(len(batch))
+            batch = []
+        # Stopped while retrying — close() makes a last attempt.
+        self._unwritten = batch
+
+    def _drain(self, block: bool) -> list[dict[str, Any]]:
+        batch: list[dict[str, Any]] = []
+        try:
+            if block:
+                batch.append(self._queue.get(timeout=self._flush_interval))
+            deadline = time.monotonic() + self._flush_interval
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                if block and remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        audit_writer_queue_depth.set(self._queue.qsize())
+        return batch
+
+    def _write(self, rows: list[dict[str, Any]]) -> None:
+        with self._session_factory() as session:
+            existing = set(
+                session.scalars(
+                    select(AuditEvent.id).where(
+                        AuditEvent.id.in_([row["id"] for row in rows])
+                    )
+                )
+            )
+            fresh = [row for row in rows if row["id"] not in existing]
+            if fresh:
+                session.execute(insert(AuditEvent), fresh)
+                session.commit()
+        audit_writer_batch_size.observe(len(rows))
+        if self._wal_path:
+            self._wal_commit(len(rows))
+
+    def _done(self, count: int) -> None:
+        with self._idle:
+            self._in_flight -= count
+            if self._in_flight == 0:
+                self._idle.notify_all()
+
+    # -- write-ahead file --
+
+    def _open_wal(self) -> None:
+        fh = open(self._wal_path, "a+", encoding="utf-8")  # noqa: SIM115
+        if fcntl is not None:
+            try:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                fh.close()
+                raise RuntimeError(f"audit WAL {self._wal_path} is in use") from None
+        self._wal_file = fh
+
+    def _close_wal(self) -> None:
+        with self._wal_lock:
+            fh, self._wal_file = self._wal_file, None
+            if fh is None:
+                return
+            if self._wal_committed >= self._wal_appended:
+                os.remove(self._wal_path)
+            fh.close()
+
+    def _wal_append(self, row: dict[str, Any]) -> None:
+        line = json.dumps(_encode_row(row), separators=(",", ":")) + "\n"
+        with self._wal_lock:
+            self._wal_file.write(line)
+            self._wal_file.flush()
+            os.fsync(self._wal_file.fileno())
+            self._wal_appended += 1
+
+    def _wal_commit(self, count: int) -> None:
+        with self._wal_lock:
+            self._wal_committed += count
+            if self._wal_committed >= self._wal_appended and self._wal_file:
+                self._wal_file.truncate(0)
+                self._wal_appended = self._wal_committed = 0
+
+    def _recover(self, base_path: str) -> None:
+        """Replay our own file (a previous process with our pid), the
+        unsuffixed file of older versions and those of dead processes."""
+        self._wal_file.seek(0)
+        self._replay(self._wal_file.readlines())
+        self._wal_file.truncate(0)
+        if fcntl is None:
+            return
+        for path in [base_path, *sorted(glob.glob(glob.escape(base_path) + ".*"))]:
+            suffix = path[len(base_path) + 1 :]
+            if path == self._wal_path or (path != base_path and not suffix.isdigit()):
+                continue
+            try:
+                fh = open(path, encoding="utf-8")  # noqa: SIM115
+            except FileNotFoundError:
+                continue
+            with fh:
+                try:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    continue  # a live process's file
+                self._replay(fh.readlines())
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(path)
+
+    def _replay(self, lines: list[str]) -> None:
+        rows = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                rows.append(_decode_row(json.loads(line)))
+            except (ValueError, KeyError):
+                # A torn last line from a crash mid-append.
+                logger.warning("audit_wal_line_skipped")
+        for start in range(0, len(rows), self._batch_size):
+            self._write(rows[start : start + self._batch_size])
+        if rows:
+            logger.info("audit_wal_recovered", events=len(rows))
+
+
+def _encode_row(row: dict[str, Any]) -> dict[str, Any]:
+    return {
+        **row,
+        "id": str(row["id"]),
+        "entity_id": str(row["entity_id"]),
+        "timestamp_utc": row["timestamp_utc"].isoformat(),
+        "signature": (
+            base64.b64encode(row["signature"]).decode("ascii")
+            if row["signature"] is not None
+            else None
+        ),
+    }
+
+
+def _decode_row(raw: dict[str, Any]) -> dict[str, Any]:
+    return {
+        **raw,
+        "id": uuid.UUID(raw["id"]),
+        "entity_id": uuid.UUID(raw["entity_id"]),
+        "timestamp_utc": datetime.fromisoformat(raw["timestamp_utc"]),
+        "signature": (
+            base64.b64decode(raw["signature"]) if raw["signature"] is not None else None
+        ),
+    }
+
+
+_writer: AuditWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditWriter | None:
+    """Return the process-wide writer, or ``None`` in ``sync`` mode."""
+    global _writer  # noqa: PLW0603
+    with _writer_lock:
+        if _writer is None:
+            mode = os.getenv("AUDIT_WRITER_MODE", MODE_ASYNC).strip().lower()
+            if mode == MODE_SYNC:
+                return None
+            from app.core.database import SessionLocal
+
+            _writer = AuditWriter(
+                SessionLocal,
+                max_queue=int(os.getenv("AUDIT_QUEUE_SIZE", "10000")),
+                batch_size=int(os.getenv("AUDIT_BATCH_SIZE", "200")),
+                flush_interval=float(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "200"))
+                / 1000,
+                wal_path=os.getenv("AUDIT_WAL_PATH") or None,
+            )
+            _writer.start()
+        return _writer
+
+
+def shutdown_audit_writer() -> None:
+    """Write every queued event and stop (FastAPI lifespan shutdown)."""
+    global _writer
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
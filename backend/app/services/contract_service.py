@@ -32,6 +32,13 @@ from app.schemas.contracts import (
     HedgeLegPriceType,
     HedgeLegSide as HedgeLegSideSchema,
 )
+from app.services.rfq_engine import (
+    MONTHS_EN,
+    Leg,
+    PriceType,
+    Side,
+    compute_leg_dates_batch,
+)
 
 
 def _generate_reference() -> str:
@@ -258,3 +265,63 @@ class ContractService:
         session.commit()
         session.refresh(contract)
         return contract
+
+    # ── Settlement-date backfill ──────────────────────────────────────
+
+    @staticmethod
+    def backfill_settlement_dates(session: Session, *, chunk_size: int = 1000) -> int:
+        """Fill ``settlement_date`` on live contracts that lack one.
+
+        The settlement date is the PPT of the floating leg: 2nd business day
+        after the pricing month for ``avg``, fixing date + 2 business days
+        for ``c2r``.  Contracts without the needed period fields (including
+        ``avginter``, which stores no window end) are left untouched.
+        Processes ``chunk_size`` contracts per commit and returns the number
+        updated.
+        """
+        updated = 0
+        last_id: UUID | None = None
+        while True:
+            query = session.query(HedgeContract).filter(
+                HedgeContract.settlement_date.is_(None),
+                HedgeContract.deleted_at.is_(None),
+            )
+            if last_id is not None:
+                query = query.filter(HedgeContract.id > last_id)
+            chunk = query.order_by(HedgeContract.id).limit(chunk_size).all()
+            if not chunk:
+                return updated
+            last_id = chunk[-1].id
+
+            pending = [(c, leg) for c in chunk if (leg := _floating_leg(c)) is not None]
+            dates = compute_leg_dates_batch(leg for _, leg in pending)
+            for (contract, _), leg_dates in zip(pending, dates, strict=True):
+                if leg_dates.ppt is not None:
+                    contract.settlement_date = leg_dates.ppt
+                    updated += 1
+            session.commit()
+
+
+def _floating_leg(contract: HedgeContract) -> Leg | None:
+    """Engine leg for the contract's floating side, if its period is known."""
+    convention = (contract.float_pricing_convention or "").lower()
+    side = Side(contract.variable_leg_side.value)
+    if convention == "avg":
+        month, year = contract.pricing_period_month, contract.pricing_period_year
+        if month is None or year is None or not 1 <= month <= 12:
+            return None
+        return Leg(
+            side=side,
+            price_type=PriceType.AVG,
+            quantity_mt=contract.quantity_mt,
+            month_name=MONTHS_EN[month - 1],
+            year=year,
+        )
+    if convention == "c2r" and contract.fixing_date is not None:
+        return Leg(
+            side=side,
+            price_type=PriceType.C2R,
+            quantity_mt=contract.quantity_mt,
+            fixing_date=contract.fixing_date,
+        )
+    return None
@@ -0,0 +1,213 @@
+"""Per-table data versions, bumped when a transaction that wrote the table
+commits.
+
+Read endpoints derive their ETags from the versions of the tables they read
+(see ``app.api.dependencies.conditional``), so an unchanged poll can be
+answered without querying the database.
+
+- Only tables registered with :func:`watch` are tracked, so frequent
+  writes nobody reads through an ETag (queue polling, audit events) cost
+  nothing.
+- Writes are staged on the SQLAlchemy session — ORM objects in
+  ``after_flush``, ORM-enabled ``insert()`` / ``update()`` / ``delete()``
+  statements in ``do_orm_execute`` — and only bump versions once the
+  transaction commits; a rollback discards them.  Raw SQL (``text()``)
+  and writes made outside the application are not seen.
+- Every bump is published on a cross-worker bus (``create_pubsub``, same
+  backend as the WebSocket bus, separate channel) and a table's version
+  is the bus ``seq`` of its latest bump.  With the ``postgres`` backend
+  ``seq`` is global, so every worker computes the same ETag; versions
+  start at the sequence value when the worker starts, so a restarted
+  worker never matches an ETag issued before it started.  With
+  ``memory`` (single worker) an epoch generated at start-up is part of
+  every ETag instead.
+- Other workers learn of a commit when its notification arrives, so for
+  that short window they may still answer 304 for the previous version.
+  When a worker's listener reconnects, every version is raised to the
+  sequence value at that point, since bumps in between were not heard.
+- With ``memory`` each worker only hears its own commits, so
+  :attr:`DataVersions.shared` is false and ETags are off unless forced
+  (``HTTP_CONDITIONAL_GET``, see ``app.api.dependencies.conditional``).
+
+Configurable via env vars:
+    DATA_VERSIONS_CHANNEL   Default ``data_versions`` — bus channel
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from collections.abc import Iterable
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.logging import get_logger
+from app.core.metrics import data_version_bumps_total
+from app.services.ws_pubsub import BroadcastEvent, PostgresPubSub, PubSub, create_pubsub
+
+logger = get_logger()
+
+TOPIC = "data_versions"
+
+_PENDING_KEY = "data_versions_pending"
+
+_watched: frozenset[str] = frozenset()
+_watched_lock = threading.Lock()
+
+
+def watch(tables: Iterable[str]) -> None:
+    """Start tracking writes to *tables* (called at route definition)."""
+    global _watched  # noqa: PLW0603
+    with _watched_lock:
+        _watched = _watched | frozenset(tables)
+
+
+class DataVersions:
+    """Version counters per table name."""
+
+    def __init__(self, bus: PubSub | None = None, baseline: int = 0) -> None:
+        self._bus = bus
+        self._baseline = baseline
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._epoch = "" if isinstance(bus, PostgresPubSub) else uuid.uuid4().hex[:12]
+        if bus is not None:
+            bus.subscribe(self._on_event)
+            bus.subscribe_gaps(self._on_gap)
+
+    @property
+    def shared(self) -> bool:
+        """Whether commits made by every worker process reach this registry."""
+        return self._bus is not None and self._bus.shared
+
+    def get(self, tables: Iterable[str]) -> dict[str, int]:
+        with self._lock:
+            return {t: self._versions.get(t, self._baseline) for t in sorted(tables)}
+
+    def token(self, tables: Iterable[str]) -> str:
+        """Compact, comparable form of :meth:`get` for ETags."""
+        with self._lock:
+            epoch = self._epoch
+        versions = ",".join(f"{t}={v}" for t, v in self.get(tables).items())
+        return f"{epoch}:{versions}"
+
+    def bump(self, tables: Iterable[str]) -> None:
+        tables = sorted(set(tables))
+        if not tables:
+            return
+        data_version_bumps_total.inc(len(tables))
+        if self._bus is None:
+            with self._lock:
+                for t in tables:
+                    self._versions[t] = self._versions.get(t, self._baseline) + 1
+            return
+        try:
+            evt = self._bus.publish(TOPIC, TOPIC, "bumped", {"tables": tables})
+        except Exception:
+            # Other workers will not hear of this commit; at least never
+            # answer 304 here for data this worker knows has changed.
+            logger.warning("data_versions_publish_failed", tables=tables, exc_info=True)
+            with self._lock:
+                self._epoch = uuid.uuid4().hex[:12]
+            return
+        # Apply now instead of waiting for our own notification, so the
+        # writer's next read already sees the new version.
+        self._apply(tables, evt.seq)
+
+    def close(self) -> None:
+        if self._bus is not None:
+            self._bus.close()
+
+    def _on_event(self, evt: BroadcastEvent) -> None:
+        if evt.topic == TOPIC:
+            self._apply(evt.data.get("tables", []), evt.seq)
+
+    def _on_gap(self, seq: int) -> None:
+        with self._lock:
+            self._baseline = max(self._baseline, seq)
+            for t, v in self._versions.items():
+                self._versions[t] = max(v, seq)
+
+    def _apply(self, tables: Iterable[str], seq: int) -> None:
+        with self._lock:
+            for t in tables:
+                if seq > self._versions.get(t, self._baseline):
+                    self._versions[t] = seq
+
+
+# ---------------------------------------------------------------------------
+# Change detection (session events)
+# ---------------------------------------------------------------------------
+
+
+def _stage(session: Session, tables: Iterable[str]) -> None:
+    tables = _watched.intersection(tables)
+    if tables:
+        session.info.setdefault(_PENDING_KEY, set()).update(tables)
+
+
+@event.listens_for(Session, "after_flush")
+def _stage_flushed(session: Session, _flush_context) -> None:
+    tables: set[str] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        mapper = getattr(obj, "__mapper__", None)
+        if mapper is not None:
+            tables.update(t.name for t in mapper.tables)
+    if tables:
+        _stage(session, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _stage_statement(state: ORMExecuteState) -> None:
+    if (state.is_insert or state.is_update or state.is_delete) and state.bind_mapper:
+        _stage(state.session, (t.name for t in state.bind_mapper.tables))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    tables = session.info.pop(_PENDING_KEY, None)
+    if tables:
+        get_data_versions().bump(tables)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+_versions: DataVersions | None = None
+_versions_lock = threading.Lock()
+
+
+def get_data_versions() -> DataVersions:
+    """Return the process-wide registry, creating it on first use."""
+    global _versions  # noqa: PLW0603
+    with _versions_lock:
+        if _versions is None:
+            bus = create_pubsub(os.getenv("DATA_VERSIONS_CHANNEL", TOPIC))
+            _versions = DataVersions(bus, baseline=_bus_baseline(bus))
+        return _versions
+
+
+def _bus_baseline(bus: PubSub) -> int:
+    if not isinstance(bus, PostgresPubSub):
+        return 0
+    from app.core.database import engine
+
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT last_value FROM ws_broadcast_seq")
+        ).scalar_one()
+
+
+def shutdown_data_versions() -> None:
+    """Stop the bus listener (FastAPI lifespan shutdown) and forget the registry."""
+    global _versions
+    with _versions_lock:
+        versions, _versions = _versions, None
+    if versions is not None:
+        versions.close()
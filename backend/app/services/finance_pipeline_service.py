@@ -2,12 +2,25 @@
 
 from __future__ import annotations
 
+import time
 import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
 from typing import Optional
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
+from app.core.metrics import (
+    finance_pipeline_record_latency_seconds,
+    finance_pipeline_step_duration_seconds,
+    finance_pipeline_step_queries_total,
+    finance_pipeline_swallowed_errors_total,
+)
 from app.models.contracts import HedgeContract, HedgeContractStatus
 from app.models.finance_pipeline import (
     FinancePipelineRun,
@@ -19,6 +32,52 @@ from app.models.finance_pipeline import (
 from app.models.market_data import CashSettlementPrice
 
 
+@dataclass
+class _StepStats:
+    """Counters collected while a single pipeline step executes."""
+
+    step_name: str
+    queries: int = 0
+    errors_swallowed: int = 0
+    record_latencies: list[float] = field(default_factory=list)
+
+
+_active_step: ContextVar[_StepStats | None] = ContextVar(
+    "finance_pipeline_active_step", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_step_query(conn, cursor, statement, parameters, context, executemany):
+    stats = _active_step.get()
+    if stats is not None:
+        stats.queries += 1
+
+
+@contextmanager
+def _timed_record() -> Iterator[None]:
+    """Time one record's computation and count it as swallowed if it raises.
+
+    Exceptions are suppressed: per-record failures (missing prices, etc.)
+    must not fail the whole step.
+    """
+    stats = _active_step.get()
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        if stats is not None:
+            stats.errors_swallowed += 1
+            finance_pipeline_swallowed_errors_total.labels(step=stats.step_name).inc()
+    finally:
+        elapsed = time.perf_counter() - start
+        if stats is not None:
+            stats.record_latencies.append(elapsed)
+            finance_pipeline_record_latency_seconds.labels(step=stats.step_name).observe(
+                elapsed
+            )
+
+
 class FinancePipelineService:
     """Runs the daily finance pipeline — 6 sequential steps, idempotent & resumable."""
 
@@ -78,10 +137,15 @@ class FinancePipelineService:
             step.started_at = datetime.now(timezone.utc)
             db.flush()
 
+            stats = _StepStats(step_name=step.step_name)
+            token = _active_step.set(stats)
+            start = time.perf_counter()
             try:
                 records = FinancePipelineService._execute_step(
                     db, step.step_name, run_date, run
                 )
+                _active_step.reset(token)
+                FinancePipelineService._apply_stats(step, stats, start)
                 step.status = PipelineStepStatus.completed
                 step.records_processed = records
                 step.finished_at = datetime.now(timezone.utc)
@@ -90,6 +154,8 @@ class FinancePipelineService:
                 )
                 db.flush()
             except Exception as exc:  # noqa: BLE001
+                _active_step.reset(token)
+                FinancePipelineService._apply_stats(step, stats, start)
                 step.status = PipelineStepStatus.failed
                 step.error_message = str(exc)[:500]
                 step.finished_at = datetime.now(timezone.utc)
@@ -121,6 +187,31 @@ class FinancePipelineService:
     def get_run(db: Session, run_id: uuid.UUID) -> Optional[FinancePipelineRun]:
         return db.get(FinancePipelineRun, run_id)
 
+    @staticmethod
+    def _apply_stats(
+        step: FinancePipelineStep, stats: _StepStats, start: float
+    ) -> None:
+        """Export *stats* to Prometheus and persist them on the step row."""
+        duration = time.perf_counter() - start
+        finance_pipeline_step_duration_seconds.labels(step=stats.step_name).observe(
+            duration
+        )
+        finance_pipeline_step_queries_total.labels(step=stats.step_name).inc(
+            stats.queries
+        )
+        step.duration_ms = round(duration * 1000, 3)
+        step.query_count = stats.queries
+        step.errors_swallowed = stats.errors_swallowed
+        if stats.record_latencies:
+            latencies = stats.record_latencies
+            step.record_latency_avg_ms = round(
+                sum(latencies) / len(latencies) * 1000, 3
+            )
+            step.record_latency_max_ms = round(max(latencies) * 1000, 3)
+        else:
+            step.record_latency_avg_ms = None
+            step.record_latency_max_ms = None
+
     # ------------------------------------------------------------------
     # step implementations
     # ------------------------------------------------------------------
@@ -168,11 +259,10 @@ class FinancePipelineService:
         )
         processed = 0
         for contract in contracts:
-            try:
+            # skip contracts that can't be MTM'd (missing prices, etc.)
+            with _timed_record():
                 compute_mtm_for_contract(db, contract.id, run_date)
                 processed += 1
-            except Exception:  # noqa: BLE001
-                pass  # skip contracts that can't be MTM'd (missing prices, etc.)
         return processed
 
     @staticmethod
@@ -187,7 +277,7 @@ class FinancePipelineService:
         )
         processed = 0
         for contract in contracts:
-            try:
+            with _timed_record():
                 create_pl_snapshot(
                     db,
                     entity_type="hedge_contract",
@@ -196,8 +286,6 @@ class FinancePipelineService:
                     period_end=run_date,
                 )
                 processed += 1
-            except Exception:  # noqa: BLE001
-                pass
         return processed
 
     @staticmethod
@@ -209,13 +297,13 @@ class FinancePipelineService:
             create_cashflow_baseline_snapshot,
         )
 
-        try:
+        processed = 0
+        with _timed_record():
             create_cashflow_baseline_snapshot(
                 db, as_of_date=run_date, correlation_id=str(run.id)
             )
-            return 1
-        except Exception:  # noqa: BLE001
-            return 0
+            processed = 1
+        return processed
 
     @staticmethod
     def _step_risk_flags(db: Session, run_date: date, run: FinancePipelineRun) -> int:
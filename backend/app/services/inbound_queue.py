@@ -0,0 +1,269 @@
+"""Durable inbound message queue — database-backed, shared by all workers.
+
+The in-process ``webhook_processor`` deque loses messages on restart,
+drops them when full and is invisible to other uvicorn workers.  With
+``INBOUND_QUEUE_BACKEND=database`` the webhook writes each message to
+``inbound_message_queue`` instead, and every worker's
+``InboundWorkerPool`` claims batches from it:
+
+- **Claim** — ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent workers
+  never block on (or double-claim) the same rows.  SQLite ignores the
+  locking clause; the claim ``UPDATE`` is guarded by the row's
+  ``attempts`` value instead, so a lost race just skips the row.
+- **Visibility timeout** — a claimed row is ``processing`` until
+  ``locked_until``; if the worker dies, the row becomes claimable again.
+- **Retries** — a failed row goes back to ``pending`` with exponential
+  backoff; after ``max_attempts`` it is parked as ``dead`` for review.
+- **Per-sender order** — only a sender's oldest unsettled row can be
+  claimed, and a sender with a row in flight (or waiting for a retry) is
+  skipped until that row settles, so a counterparty's refresh never
+  overtakes its first quote, even across workers.  A claimer that skips a
+  head row locked by another claimer does not see the next row as a head
+  either — the locked row is still ``pending`` to it — so ``SKIP LOCKED``
+  cannot hand a sender's second message to a second worker.
+
+Configurable via env vars:
+    INBOUND_VISIBILITY_TIMEOUT_SECONDS   Default 300
+    INBOUND_MAX_ATTEMPTS                 Default 5
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased
+
+from app.core.logging import get_logger
+from app.core.metrics import inbound_queue_settled_total
+from app.core.utils import now_utc
+from app.models.inbound_queue import InboundQueueItem, InboundQueueStatus
+from app.schemas.whatsapp import WhatsAppInboundMessage
+
+logger = get_logger()
+
+_RETRY_BASE_SECONDS = 5
+_RETRY_MAX_SECONDS = 300
+
+
+def _visibility_timeout() -> timedelta:
+    return timedelta(
+        seconds=int(os.getenv("INBOUND_VISIBILITY_TIMEOUT_SECONDS", "300"))
+    )
+
+
+def _max_attempts() -> int:
+    return int(os.getenv("INBOUND_MAX_ATTEMPTS", "5"))
+
+
+@dataclass(frozen=True)
+class ClaimedMessage:
+    """A claimed queue row, detached from the session that claimed it."""
+
+    item_id: UUID
+    attempts: int
+    message: WhatsAppInboundMessage
+
+
+class InboundQueue:
+    """Producer / consumer API over ``inbound_message_queue``."""
+
+    @staticmethod
+    def enqueue(session: Session, msg: WhatsAppInboundMessage) -> bool:
+        """Persist *msg*; return ``False`` if its ``message_id`` is known.
+
+        WhatsApp may redeliver webhooks — the unique ``message_id`` makes
+        the insert idempotent.  The caller must ``session.commit()``.
+        """
+        from app.services.inbound_worker_pool import sender_key
+
+        exists = session.execute(
+            select(InboundQueueItem.id).where(
+                InboundQueueItem.message_id == msg.message_id
+            )
+        ).first()
+        if exists is not None:
+            logger.debug("inbound_queue_duplicate_skipped", message_id=msg.message_id)
+            return False
+
+        item = InboundQueueItem(
+            message_id=msg.message_id,
+            sender_key=sender_key(msg.from_phone),
+            from_phone=msg.from_phone,
+            sender_name=msg.sender_name,
+            text=msg.text,
+            message_timestamp=msg.timestamp,
+        )
+        try:
+            with session.begin_nested():
+                session.add(item)
+        except IntegrityError:
+            # Concurrent redelivery won the insert.
+            logger.debug("inbound_queue_duplicate_skipped", message_id=msg.message_id)
+            return False
+        return True
+
+    @staticmethod
+    def claim(session: Session, worker_id: str, limit: int) -> list[ClaimedMessage]:
+        """Claim up to *limit* ready messages for *worker_id* and commit.
+
+        At most one message per sender — its oldest unsettled one.  Rows
+        come back in enqueue order.
+        """
+        if limit <= 0:
+            return []
+        now = now_utc()
+        item = InboundQueueItem
+
+        in_flight = and_(
+            item.status == InboundQueueStatus.processing, item.locked_until > now
+        )
+        backing_off = and_(
+            item.status == InboundQueueStatus.pending, item.available_at > now
+        )
+        blocked_senders = select(item.sender_key).where(or_(in_flight, backing_off))
+        ready = or_(
+            and_(item.status == InboundQueueStatus.pending, item.available_at <= now),
+            and_(item.status == InboundQueueStatus.processing, item.locked_until <= now),
+        )
+        earlier = aliased(InboundQueueItem)
+        has_earlier = (
+            select(earlier.id)
+            .where(
+                earlier.sender_key == item.sender_key,
+                earlier.status.in_(
+                    (InboundQueueStatus.pending, InboundQueueStatus.processing)
+                ),
+                or_(
+                    earlier.enqueued_at < item.enqueued_at,
+                    and_(earlier.enqueued_at == item.enqueued_at, earlier.id < item.id),
+                ),
+            )
+            .exists()
+        )
+
+        rows = session.execute(
+            select(item.id, item.attempts)
+            .where(ready, item.sender_key.not_in(blocked_senders), ~has_earlier)
+            .order_by(item.enqueued_at, item.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+
+        locked_until = now + _visibility_timeout()
+        claimed_ids: list[UUID] = []
+        for item_id, attempts in rows:
+            result = session.execute(
+                update(item)
+                .where(item.id == item_id, item.attempts == attempts, ready)
+                .values(
+                    status=InboundQueueStatus.processing,
+                    attempts=attempts + 1,
+                    locked_by=worker_id,
+                    locked_until=locked_until,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                claimed_ids.append(item_id)
+
+        claimed: list[ClaimedMessage] = []
+        if claimed_ids:
+            items = session.scalars(
+                select(item)
+                .where(item.id.in_(claimed_ids))
+                .order_by(item.enqueued_at, item.id)
+            ).all()
+            claimed = [
+                ClaimedMessage(
+                    item_id=row.id,
+                    attempts=row.attempts,
+                    message=WhatsAppInboundMessage(
+                        message_id=row.message_id,
+                        from_phone=row.from_phone,
+                        timestamp=row.message_timestamp,
+                        text=row.text,
+                        sender_name=row.sender_name,
+                    ),
+                )
+                for row in items
+            ]
+        session.commit()
+        return claimed
+
+    @staticmethod
+    def complete(session: Session, item_id: UUID) -> None:
+        """Mark a claimed message as processed and commit."""
+        session.execute(
+            update(InboundQueueItem)
+            .where(InboundQueueItem.id == item_id)
+            .values(
+                status=InboundQueueStatus.done,
+                processed_at=now_utc(),
+                locked_by=None,
+                locked_until=None,
+                last_error=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        inbound_queue_settled_total.labels(outcome="done").inc()
+
+    @staticmethod
+    def fail(session: Session, claimed: ClaimedMessage, error: str) -> InboundQueueStatus:
+        """Schedule a retry for a failed message, or dead-letter it; commit.
+
+        Returns the row's new status.
+        """
+        now = now_utc()
+        if claimed.attempts >= _max_attempts():
+            status = InboundQueueStatus.dead
+            values: dict = {"processed_at": now}
+        else:
+            status = InboundQueueStatus.pending
+            delay = min(
+                _RETRY_BASE_SECONDS * 2 ** (claimed.attempts - 1), _RETRY_MAX_SECONDS
+            )
+            values = {"available_at": now + timedelta(seconds=delay)}
+
+        session.execute(
+            update(InboundQueueItem)
+            .where(InboundQueueItem.id == claimed.item_id)
+            .values(
+                status=status,
+                locked_by=None,
+                locked_until=None,
+                last_error=error[:2000],
+                **values,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+
+        outcome = "dead" if status == InboundQueueStatus.dead else "retry"
+        inbound_queue_settled_total.labels(outcome=outcome).inc()
+        if status == InboundQueueStatus.dead:
+            logger.error(
+                "inbound_queue_dead_lettered",
+                message_id=claimed.message.message_id,
+                attempts=claimed.attempts,
+                error=error,
+            )
+        return status
+
+    @staticmethod
+    def depth(session: Session) -> int:
+        """Messages not yet settled (pending or in flight)."""
+        return session.scalar(
+            select(func.count())
+            .select_from(InboundQueueItem)
+            .where(
+                InboundQueueItem.status.in_(
+                    (InboundQueueStatus.pending, InboundQueueStatus.processing)
+                )
+            )
+        ) or 0
@@ -0,0 +1,302 @@
+"""Inbound worker pool — concurrent processing of inbound WhatsApp messages.
+
+``RFQOrchestrator.process_inbound_queue`` handles messages one at a time,
+and each one can block for seconds on LLM calls.  This pool processes
+messages concurrently while keeping per-sender ordering:
+
+- Messages are pulled from the ``webhook_processor`` queue into keyed
+  sub-queues (one per normalised sender phone).
+- At most one worker owns a key at a time and drains its sub-queue in
+  arrival order, so a counterparty's refresh never overtakes its first
+  quote.  Different senders run in parallel, up to ``max_workers``.
+- At most ``max_buffered`` messages are held in sub-queues; the rest stay
+  in the webhook queue until a worker frees capacity (backpressure).  A
+  warning is logged once the webhook queue reaches
+  ``backpressure_depth``.
+
+The source queue is either the in-process ``webhook_processor`` deque
+(``memory``, default) or the durable ``inbound_message_queue`` table
+(``database``, see ``app.services.inbound_queue``).  With the database
+backend, each message is marked done or failed (retry / dead-letter)
+after its handler runs, and several processes can share the load.
+
+Configurable via env vars:
+    INBOUND_QUEUE_BACKEND         ``memory`` | ``database`` (default memory)
+    INBOUND_MAX_WORKERS           Default 4
+    INBOUND_MAX_BUFFERED          Default 200
+    INBOUND_BACKPRESSURE_DEPTH    Default 1000
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.core.metrics import (
+    inbound_message_processing_seconds,
+    inbound_message_wait_seconds,
+    inbound_messages_in_flight,
+    inbound_queue_depth,
+)
+from app.schemas.whatsapp import WhatsAppInboundMessage
+from app.services.inbound_queue import ClaimedMessage, InboundQueue
+from app.services.webhook_processor import dequeue_message, queue_depth
+
+logger = get_logger()
+
+MessageHandler = Callable[[Session, WhatsAppInboundMessage], dict]
+
+BACKEND_MEMORY = "memory"
+BACKEND_DATABASE = "database"
+
+
+def get_queue_backend() -> str:
+    """Return the configured inbound queue backend (``INBOUND_QUEUE_BACKEND``)."""
+    backend = os.getenv("INBOUND_QUEUE_BACKEND", BACKEND_MEMORY).strip().lower()
+    return BACKEND_DATABASE if backend == BACKEND_DATABASE else BACKEND_MEMORY
+
+
+def sender_key(phone: str) -> str:
+    """Normalise *phone* so every format of one sender maps to one key.
+
+    Meta sends ``5511...``, Twilio ``+5511...``, and Brazilian mobiles may
+    arrive with or without the leading ``9`` — all collapse to the 8-digit
+    form.  The RFQ phone index is keyed the same way.
+    """
+    digits = "".join(ch for ch in phone if ch.isdigit())
+    if digits.startswith("55") and len(digits) == 13 and digits[4] == "9":
+        digits = digits[:4] + digits[5:]
+    return digits
+
+
+def _default_handler(session: Session, msg: WhatsAppInboundMessage) -> dict:
+    from app.services.rfq_orchestrator import RFQOrchestrator
+
+    return RFQOrchestrator._process_single_message(session, msg)
+
+
+def _default_session_factory() -> Session:
+    from app.core.database import SessionLocal
+
+    return SessionLocal()
+
+
+class InboundWorkerPool:
+    """Keyed, bounded-concurrency consumer of the inbound message queue."""
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_buffered: int = 200,
+        backpressure_depth: int = 1000,
+        handler: MessageHandler | None = None,
+        session_factory: Callable[[], Session] | None = None,
+        backend: str = BACKEND_MEMORY,
+    ) -> None:
+        self._backend = backend
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self._max_buffered = max_buffered
+        self._backpressure_depth = backpressure_depth
+        self._handler = handler or _default_handler
+        self._session_factory = session_factory or _default_session_factory
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="rfq-inbound"
+        )
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending: dict[str, deque[_Entry]] = {}
+        self._active: set[str] = set()
+        self._buffered = 0
+
+    def pump(self) -> int:
+        """Move queued messages into sender sub-queues and start workers.
+
+        Non-blocking — safe to call from the webhook request path.
+        Returns the number of messages dispatched.
+        """
+        if self._backend == BACKEND_DATABASE:
+            return self._pump_database()
+
+        moved = 0
+        to_start: list[str] = []
+        with self._lock:
+            while self._buffered < self._max_buffered:
+                msg = dequeue_message()
+                if msg is None:
+                    break
+                self._buffer(msg, None, to_start)
+                moved += 1
+            buffered = self._buffered
+
+        self._after_pump(queue_depth(), buffered, to_start)
+        return moved
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Block until every dispatched message is processed (tests, shutdown)."""
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: self._buffered == 0 and not self._active, timeout=timeout
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+
+    def _pump_database(self) -> int:
+        # Reserve capacity first so the claim query runs outside the lock.
+        with self._lock:
+            reserved = self._max_buffered - self._buffered
+            self._buffered += max(reserved, 0)
+        claimed: list[ClaimedMessage] = []
+        depth = 0
+        session = self._session_factory()
+        try:
+            claimed = InboundQueue.claim(session, self._worker_id, reserved)
+            depth = InboundQueue.depth(session)
+        except Exception:
+            session.rollback()
+            logger.exception("inbound_queue_claim_error")
+        finally:
+            session.close()
+
+        to_start: list[str] = []
+        with self._lock:
+            self._buffered -= max(reserved, 0)
+            for item in claimed:
+                self._buffer(item.message, item, to_start)
+            buffered = self._buffered
+            if not self._buffered and not self._active:
+                self._idle.notify_all()
+
+        self._after_pump(max(depth - buffered, 0), buffered, to_start)
+        return len(claimed)
+
+    def _buffer(
+        self,
+        msg: WhatsAppInboundMessage,
+        claimed: ClaimedMessage | None,
+        to_start: list[str],
+    ) -> None:
+        # Caller holds self._lock.
+        key = sender_key(msg.from_phone)
+        self._pending.setdefault(key, deque()).append(
+            (msg, time.monotonic(), claimed)
+        )
+        self._buffered += 1
+        if key not in self._active:
+            self._active.add(key)
+            to_start.append(key)
+
+    def _after_pump(self, depth: int, buffered: int, to_start: list[str]) -> None:
+        inbound_queue_depth.set(depth)
+        inbound_messages_in_flight.set(buffered)
+        if depth >= self._backpressure_depth:
+            logger.warning(
+                "inbound_queue_backpressure",
+                queue_depth=depth,
+                buffered=buffered,
+            )
+
+        for key in to_start:
+            self._executor.submit(self._run_key, key)
+
+    def _next(self, key: str) -> _Entry | None:
+        with self._lock:
+            queue = self._pending.get(key)
+            if not queue:
+                self._pending.pop(key, None)
+                self._active.discard(key)
+                self._idle.notify_all()
+                return None
+            return queue.popleft()
+
+    def _run_key(self, key: str) -> None:
+        session = self._session_factory()
+        try:
+            while (item := self._next(key)) is not None:
+                msg, enqueued_at, claimed = item
+                started = time.monotonic()
+                inbound_message_wait_seconds.observe(started - enqueued_at)
+                error: str | None = None
+                try:
+                    result = self._handler(session, msg)
+                    status = str(result.get("status", "unknown"))
+                except Exception as exc:
+                    session.rollback()
+                    status = "error"
+                    error = f"{type(exc).__name__}: {exc}"
+                    logger.exception(
+                        "inbound_message_processing_error",
+                        message_id=msg.message_id,
+                    )
+                if claimed is not None:
+                    self._settle(session, claimed, error)
+                elapsed = time.monotonic() - started
+                inbound_message_processing_seconds.labels(status=status).observe(elapsed)
+                logger.info(
+                    "inbound_message_processed",
+                    message_id=msg.message_id,
+                    status=status,
+                    latency_ms=round(elapsed * 1000, 1),
+                )
+                with self._lock:
+                    self._buffered -= 1
+                # Capacity freed — pull in anything held back by backpressure.
+                self.pump()
+        finally:
+            session.close()
+
+    def _settle(
+        self, session: Session, claimed: ClaimedMessage, error: str | None
+    ) -> None:
+        try:
+            if error is None:
+                InboundQueue.complete(session, claimed.item_id)
+            else:
+                InboundQueue.fail(session, claimed, error)
+        except Exception:
+            # The visibility timeout hands the row to another claim.
+            session.rollback()
+            logger.exception(
+                "inbound_queue_settle_error", message_id=claimed.message.message_id
+            )
+
+
+_Entry = tuple[WhatsAppInboundMessage, float, ClaimedMessage | None]
+
+_pool: InboundWorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_inbound_pool() -> InboundWorkerPool:
+    """Return the process-wide pool, creating it on first use."""
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is None:
+            _pool = InboundWorkerPool(
+                max_workers=int(os.getenv("INBOUND_MAX_WORKERS", "4")),
+                max_buffered=int(os.getenv("INBOUND_MAX_BUFFERED", "200")),
+                backpressure_depth=int(os.getenv("INBOUND_BACKPRESSURE_DEPTH", "1000")),
+                backend=get_queue_backend(),
+            )
+        return _pool
+
+
+def shutdown_inbound_pool() -> None:
+    """Stop the process-wide pool (FastAPI lifespan shutdown)."""
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+            _pool = None
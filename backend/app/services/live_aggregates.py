@@ -0,0 +1,415 @@
+"""Server-pushed exposure and MTM aggregates for the ``exposure`` / ``mtm``
+WebSocket topics.
+
+Dashboards used to poll ``/exposures/net``, ``/exposures/global`` and the
+MTM endpoints every few seconds, each poll recomputing the same
+aggregates.  Instead, commits that write orders, hedge contracts,
+linkages, exposures or cash-settlement prices mark the affected
+aggregates dirty; a background thread waits ``debounce`` so a burst of
+commits shares one recompute, recomputes each dirty aggregate **once**
+and publishes only the rows that differ from what it last published:
+
+=============  ==================  ===================================
+topic          id                  rows keyed by
+=============  ==================  ===================================
+``exposure``   ``net``             commodity (``/exposures/net`` rows)
+``exposure``   ``global``          one row (``/exposures/global``)
+``mtm``        ``hedge_contracts`` contract id (``MTMResultResponse``)
+``mtm``        ``orders``          order id (``MTMResultResponse``)
+=============  ==================  ===================================
+
+Each push is an ``exposure_updated`` / ``mtm_updated`` event with
+``{"rows": [...], "removed": [keys], "calculated_at": ..., "origin": ...}``.
+Rows are absolute values, not deltas, so a row pushed twice (e.g. by two
+workers that both saw the change) is harmless.
+
+Each worker diffs against what *it* last published, but commits made on
+another worker are pushed by that worker.  So when a push from another
+``origin`` arrives on the bus for an aggregate — or the bus listener
+reconnects and pushes may have been missed — this worker's baseline for
+it is stale, and its next recompute pushes every row instead of a diff.  Clients load the initial state
+over REST and apply pushes on top; MTM is valued as of today (UTC), with
+the same D-1 price lookup as the MTM endpoints.
+
+Writes are staged on the SQLAlchemy session and only count once the
+transaction commits, so a rolled-back write never triggers a recompute.
+
+Configurable via env vars:
+    WS_LIVE_AGGREGATES_DISABLED      ``1`` turns pushing off (tests)
+    WS_LIVE_AGGREGATES_DEBOUNCE_MS   Default 250
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.core.metrics import ws_live_aggregate_refresh_seconds
+from app.core.utils import now_utc
+from app.models.contracts import HedgeContract, HedgeContractStatus
+from app.models.exposure import Exposure
+from app.models.linkages import HedgeOrderLinkage
+from app.models.market_data import CashSettlementPrice
+from app.models.orders import Order, OrderPricingConvention, PriceType
+from app.schemas.mtm import MTMObjectType, MTMResultResponse
+from app.services.exposure_engine import ExposureEngineService
+from app.services.exposure_service import ExposureService
+from app.services.mtm_order_service import DEFAULT_COMMODITY
+from app.services.price_lookup_service import (
+    get_cash_settlement_price_d1,
+    resolve_symbol,
+)
+from app.services.ws_pubsub import BroadcastEvent, PubSub
+
+logger = get_logger()
+
+TOPIC_EXPOSURE = "exposure"
+TOPIC_MTM = "mtm"
+
+# Every (topic, id) this module publishes.
+_AGGREGATES = (
+    (TOPIC_EXPOSURE, "net"),
+    (TOPIC_EXPOSURE, "global"),
+    (TOPIC_MTM, "hedge_contracts"),
+    (TOPIC_MTM, "orders"),
+)
+
+Publish = Callable[[str, str, str, dict[str, Any]], None]
+
+# Which aggregates a write to each model can change.
+_AFFECTS: dict[type, frozenset[str]] = {
+    Order: frozenset({TOPIC_EXPOSURE, TOPIC_MTM}),
+    HedgeContract: frozenset({TOPIC_EXPOSURE, TOPIC_MTM}),
+    HedgeOrderLinkage: frozenset({TOPIC_EXPOSURE}),
+    Exposure: frozenset({TOPIC_EXPOSURE}),
+    CashSettlementPrice: frozenset({TOPIC_MTM}),
+}
+
+_PENDING_KEY = "live_aggregates_pending"
+
+_MTM_CONTRACT_STATUSES = (
+    HedgeContractStatus.active,
+    HedgeContractStatus.partially_settled,
+)
+_MTM_ORDER_CONVENTIONS = (
+    OrderPricingConvention.avg,
+    OrderPricingConvention.avginter,
+    OrderPricingConvention.c2r,
+)
+
+
+class LiveAggregates:
+    """Recomputes dirty aggregates and publishes the rows that changed."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        publish: Publish,
+        debounce_seconds: float = 0.25,
+        background: bool = True,
+        bus: PubSub | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._publish = publish
+        self._debounce = debounce_seconds
+        self._background = background
+        self._cond = threading.Condition()
+        self._dirty: set[str] = set()
+        self._stop = False
+        self._thread: threading.Thread | None = None
+        # (topic, id) -> {row key: row} as last published by this worker.
+        self._published: dict[tuple[str, str], dict[str, dict[str, Any]]] = {}
+        # Aggregates whose baseline another worker's push has overtaken.
+        self._stale: set[tuple[str, str]] = set()
+        self._refresh_lock = threading.Lock()
+        self._origin = uuid.uuid4().hex
+        if bus is not None:
+            bus.subscribe(self._on_event)
+            bus.subscribe_gaps(self._on_gap)
+
+    @property
+    def pending(self) -> frozenset[str]:
+        with self._cond:
+            return frozenset(self._dirty)
+
+    def mark_dirty(self, topics: set[str]) -> None:
+        """Schedule a recompute of *topics* (called after commit)."""
+        with self._cond:
+            self._dirty |= topics
+            if self._background and self._thread is None and not self._stop:
+                self._thread = threading.Thread(
+                    target=self._run, name="ws-live-aggregates", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def flush_pending(self) -> None:
+        """Recompute everything marked dirty so far, on the calling thread."""
+        with self._cond:
+            topics, self._dirty = self._dirty, set()
+        if topics:
+            self.refresh(topics)
+
+    def refresh(self, topics: set[str]) -> None:
+        """Recompute *topics* once and publish the changed rows."""
+        with self._refresh_lock:
+            started = time.perf_counter()
+            with self._session_factory() as session:
+                if TOPIC_EXPOSURE in topics:
+                    self._refresh_exposure(session)
+                if TOPIC_MTM in topics:
+                    self._refresh_mtm(session)
+            ws_live_aggregate_refresh_seconds.observe(time.perf_counter() - started)
+
+    def close(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._dirty and not self._stop:
+                    self._cond.wait()
+                if self._stop:
+                    return
+                # Let the rest of a burst of commits land first.
+                deadline = time.monotonic() + self._debounce
+                while not self._stop and (remaining := deadline - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+                if self._stop:
+                    return
+            try:
+                self.flush_pending()
+            except Exception:
+                logger.warning("live_aggregates_refresh_failed", exc_info=True)
+
+    def _on_event(self, evt: BroadcastEvent) -> None:
+        key = (evt.topic, evt.topic_id)
+        if key in _AGGREGATES and evt.data.get("origin") != self._origin:
+            with self._cond:
+                self._stale.add(key)
+
+    def _on_gap(self, _seq: int) -> None:
+        with self._cond:
+            self._stale.update(_AGGREGATES)
+
+    def _refresh_exposure(self, session: Session) -> None:
+        net = ExposureEngineService.compute_net_exposure(session)
+        self._publish_changes(
+            TOPIC_EXPOSURE,
+            "net",
+            "exposure_updated",
+            {str(row["commodity"]): row for row in net},
+        )
+        try:
+            snapshot = ExposureService.compute_global_snapshot(session)
+        except HTTPException as exc:
+            # Inconsistent residuals — the REST endpoint answers 409 too.
+            logger.warning("live_aggregates_global_skipped", detail=exc.detail)
+            return
+        snapshot.pop("calculation_timestamp", None)
+        self._publish_changes(
+            TOPIC_EXPOSURE, "global", "exposure_updated", {"global": snapshot}
+        )
+
+    def _refresh_mtm(self, session: Session) -> None:
+        as_of = now_utc().date()
+        prices: dict[str, Decimal | None] = {}
+
+        contracts: dict[str, dict[str, Any]] = {}
+        for contract in session.query(HedgeContract).filter(
+            HedgeContract.deleted_at.is_(None),
+            HedgeContract.status.in_(_MTM_CONTRACT_STATUSES),
+            HedgeContract.fixed_price_value.isnot(None),
+        ):
+            price = _price_d1(session, prices, contract.commodity, as_of)
+            if price is not None:
+                contracts[str(contract.id)] = _mtm_row(
+                    MTMObjectType.hedge_contract,
+                    contract.id,
+                    as_of,
+                    price,
+                    contract.fixed_price_value,
+                    contract.quantity_mt,
+                )
+        self._publish_changes(TOPIC_MTM, "hedge_contracts", "mtm_updated", contracts)
+
+        orders: dict[str, dict[str, Any]] = {}
+        price = _price_d1(session, prices, DEFAULT_COMMODITY, as_of)
+        if price is not None:
+            for order in session.query(Order).filter(
+                Order.deleted_at.is_(None),
+                Order.price_type == PriceType.variable,
+                Order.pricing_convention.in_(_MTM_ORDER_CONVENTIONS),
+                Order.avg_entry_price.isnot(None),
+            ):
+                orders[str(order.id)] = _mtm_row(
+                    MTMObjectType.order,
+                    order.id,
+                    as_of,
+                    price,
+                    order.avg_entry_price,
+                    order.quantity_mt,
+                )
+        self._publish_changes(TOPIC_MTM, "orders", "mtm_updated", orders)
+
+    def _publish_changes(
+        self, topic: str, topic_id: str, event_name: str, rows: dict[str, dict]
+    ) -> None:
+        with self._cond:
+            stale = (topic, topic_id) in self._stale
+            self._stale.discard((topic, topic_id))
+        previous = self._published.get((topic, topic_id), {})
+        if stale:
+            changed = list(rows.values())
+        else:
+            changed = [row for key, row in rows.items() if previous.get(key) != row]
+        removed = [key for key in previous if key not in rows]
+        self._published[(topic, topic_id)] = rows
+        if not changed and not removed:
+            return
+        self._publish(
+            topic,
+            topic_id,
+            event_name,
+            {
+                "rows": changed,
+                "removed": removed,
+                "calculated_at": now_utc().isoformat(),
+                "origin": self._origin,
+            },
+        )
+
+
+def _price_d1(
+    session: Session, memo: dict[str, Decimal | None], commodity: str, as_of: date
+) -> Decimal | None:
+    """D-1 price for *commodity*, once per symbol; ``None`` when unavailable."""
+    try:
+        symbol = resolve_symbol(commodity)
+    except HTTPException:
+        return None
+    if symbol not in memo:
+        try:
+            memo[symbol] = get_cash_settlement_price_d1(
+                session, symbol=symbol, as_of_date=as_of
+            )
+        except HTTPException:
+            memo[symbol] = None
+    return memo[symbol]
+
+
+def _mtm_row(
+    object_type: MTMObjectType,
+    object_id: Any,
+    as_of: date,
+    price_d1: Decimal,
+    entry: float,
+    quantity: float,
+) -> dict[str, Any]:
+    # Same arithmetic as compute_mtm_for_contract / compute_mtm_for_order.
+    entry_price = Decimal(str(entry))
+    quantity_mt = Decimal(str(quantity))
+    return MTMResultResponse(
+        object_type=object_type,
+        object_id=str(object_id),
+        as_of_date=as_of,
+        mtm_value=quantity_mt * (price_d1 - entry_price),
+        price_d1=price_d1,
+        entry_price=entry_price,
+        quantity_mt=quantity_mt,
+    ).model_dump(mode="json")
+
+
+def _broadcast(topic: str, topic_id: str, event_name: str, data: dict[str, Any]) -> None:
+    from app.api.routes.ws import manager
+
+    manager.broadcast_nowait(topic, topic_id, event_name, data)
+
+
+# ---------------------------------------------------------------------------
+# Change detection (session events)
+# ---------------------------------------------------------------------------
+
+
+@event.listens_for(Session, "after_flush")
+def _stage_writes(session: Session, _flush_context) -> None:
+    topics: set[str] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        affected = _AFFECTS.get(type(obj))
+        if affected and (obj not in session.dirty or session.is_modified(obj)):
+            topics |= affected
+    if topics:
+        session.info.setdefault(_PENDING_KEY, set()).update(topics)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    topics = session.info.pop(_PENDING_KEY, None)
+    if topics:
+        aggregates = get_live_aggregates()
+        if aggregates is not None:
+            aggregates.mark_dirty(topics)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+_aggregates: LiveAggregates | None = None
+_aggregates_lock = threading.Lock()
+
+
+def get_live_aggregates() -> LiveAggregates | None:
+    """Return the process-wide publisher, or ``None`` when disabled."""
+    global _aggregates  # noqa: PLW0603
+    with _aggregates_lock:
+        if _aggregates is None:
+            if os.getenv("WS_LIVE_AGGREGATES_DISABLED", "").strip() in (
+                "1",
+                "true",
+                "yes",
+            ):
+                return None
+            from app.core.database import SessionLocal
+            from app.services.ws_pubsub import get_ws_pubsub
+
+            _aggregates = LiveAggregates(
+                SessionLocal,
+                _broadcast,
+                debounce_seconds=float(
+                    os.getenv("WS_LIVE_AGGREGATES_DEBOUNCE_MS", "250")
+                )
+                / 1000,
+                bus=get_ws_pubsub(),
+            )
+        return _aggregates
+
+
+def shutdown_live_aggregates() -> None:
+    """Stop the recompute thread (FastAPI lifespan shutdown) and forget it."""
+    global _aggregates
+    with _aggregates_lock:
+        aggregates, _aggregates = _aggregates, None
+    if aggregates is not None:
+        aggregates.close()
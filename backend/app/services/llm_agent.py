@@ -10,27 +10,49 @@ Configuration via environment variables:
 - ``AZURE_OPENAI_API_KEY``
 - ``AZURE_OPENAI_DEPLOYMENT`` (default: ``gpt-4o-mini``)
 
+Classification and parse responses are cached (see ``app.services.llm_cache``),
+so a message seen before does not hit Azure OpenAI again.  Cache misses that
+arrive together are micro-batched into one request (``app.services.llm_batcher``).
+
+Every request is protected by:
+
+- a **circuit breaker** — after ``CB_FAILURE_THRESHOLD`` consecutive
+  transport failures, calls fail fast with ``LLMCircuitOpenError`` for
+  ``CB_COOLDOWN_SECONDS``; then one probe call is let through (half-open);
+- a **concurrency limit** — at most ``LLM_MAX_CONCURRENCY`` requests in
+  flight per process;
+- a **deadline** — waiting for a slot, every retry and every backoff share
+  one ``LLM_CALL_DEADLINE_SECONDS`` budget (default 12).
+
 The agent is designed to be cost-efficient (< $0.001 per call with GPT-4o-mini)
 and includes a confidence threshold (0.85) for automatic processing.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import threading
+import time
 from decimal import Decimal, InvalidOperation
 from typing import Any
 
 import httpx
 from tenacity import (
+    RetryCallState,
     retry,
     retry_if_exception_type,
     stop_after_attempt,
+    stop_any,
     wait_exponential,
 )
 
 from app.core.logging import get_logger
+from app.core.metrics import llm_circuit_state, llm_request_seconds
 from app.schemas.llm import LLMClassifyResult, MessageIntent, ParsedQuote
+from app.services.llm_batcher import get_llm_batcher
+from app.services.llm_cache import get_llm_cache, make_key
 
 logger = get_logger()
 
@@ -40,6 +62,13 @@ logger = get_logger()
 
 CONFIDENCE_THRESHOLD = 0.85
 
+_MAX_TOKENS = 500
+# Output ceiling of the deployment (gpt-4o-mini); a batch whose answers
+# may not fit is split into several requests.
+_BATCH_MAX_TOKENS = 16384
+# The {"id": ..., "output": ...} wrapper around each answer in a batch.
+_BATCH_ITEM_OVERHEAD_TOKENS = 20
+
 _CLASSIFY_SYSTEM_PROMPT = """You are an expert commodity trading assistant.
 Classify the following message from a counterparty responding to an RFQ
 (Request for Quote) into one of these intents:
@@ -76,6 +105,17 @@ Rules:
 - Support both Portuguese (PT-BR) and English messages.
 """
 
+# Appended to the system prompt when several messages share one request.
+_BATCH_INSTRUCTIONS = """
+You will receive several independent inputs as a JSON array of
+{"id": <integer>, "input": "<text>"}. Apply the instructions above to each
+input separately, as if it were the only one.
+
+Respond ONLY with a JSON object:
+{"results": [{"id": <integer>, "output": <the JSON object for that input>}, ...]}
+with exactly one result per input id.
+"""
+
 _GENERATE_TEMPLATES = {
     "rfq_request": (
         "Prezado(a) {recipient_name},\n\n"
@@ -156,19 +196,121 @@ def _get_deployment() -> str:
     return os.getenv("AZURE_OPENAI_DEPLOYMENT", "gpt-4o-mini")
 
 
+def _get_max_concurrency() -> int:
+    return int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+
+def _get_call_deadline() -> float:
+    return float(os.getenv("LLM_CALL_DEADLINE_SECONDS", "12"))
+
+
+# ── Circuit breaker state ──────────────────────────────────────────────
+_CB_LOCK = threading.Lock()
+_CB_FAILURE_COUNT = 0
+_CB_OPEN_UNTIL: float = 0.0
+_CB_PROBING = False
+CB_FAILURE_THRESHOLD = 5
+CB_COOLDOWN_SECONDS = 30.0
+
+_CB_CLOSED, _CB_OPEN, _CB_HALF_OPEN = 0, 1, 2
+
+
+def _cb_record_success() -> None:
+    global _CB_FAILURE_COUNT, _CB_OPEN_UNTIL, _CB_PROBING  # noqa: PLW0603
+    with _CB_LOCK:
+        _CB_FAILURE_COUNT = 0
+        _CB_OPEN_UNTIL = 0.0
+        _CB_PROBING = False
+    llm_circuit_state.set(_CB_CLOSED)
+
+
+def _cb_record_failure() -> None:
+    global _CB_FAILURE_COUNT, _CB_OPEN_UNTIL, _CB_PROBING  # noqa: PLW0603
+    with _CB_LOCK:
+        _CB_FAILURE_COUNT += 1
+        _CB_PROBING = False
+        if _CB_FAILURE_COUNT < CB_FAILURE_THRESHOLD:
+            return
+        _CB_OPEN_UNTIL = time.monotonic() + CB_COOLDOWN_SECONDS
+    llm_circuit_state.set(_CB_OPEN)
+    logger.warning(
+        "llm_circuit_breaker_opened",
+        failure_count=_CB_FAILURE_COUNT,
+        cooldown_seconds=CB_COOLDOWN_SECONDS,
+    )
+
+
+def _cb_check() -> None:
+    """Raise ``LLMCircuitOpenError`` unless this call may go through."""
+    global _CB_PROBING  # noqa: PLW0603
+    with _CB_LOCK:
+        if not _CB_OPEN_UNTIL:
+            return
+        remaining = _CB_OPEN_UNTIL - time.monotonic()
+        if remaining <= 0 and not _CB_PROBING:
+            _CB_PROBING = True  # half-open: this call is the probe
+            llm_circuit_state.set(_CB_HALF_OPEN)
+            return
+    raise LLMCircuitOpenError(
+        f"LLM circuit breaker open — {CB_FAILURE_THRESHOLD} consecutive failures. "
+        f"Try again in {max(int(remaining), 0)}s."
+    )
+
+
+def _cb_release_probe() -> None:
+    """Give up a half-open probe that never reached the service."""
+    global _CB_PROBING  # noqa: PLW0603
+    with _CB_LOCK:
+        _CB_PROBING = False
+
+
+def reset_circuit_breaker() -> None:
+    """Reset circuit breaker state — for testing only."""
+    _cb_record_success()
+
+
+_semaphore: threading.BoundedSemaphore | None = None
+_semaphore_lock = threading.Lock()
+
+
+def _get_semaphore() -> threading.BoundedSemaphore:
+    global _semaphore  # noqa: PLW0603
+    with _semaphore_lock:
+        if _semaphore is None:
+            _semaphore = threading.BoundedSemaphore(max(_get_max_concurrency(), 1))
+        return _semaphore
+
+
+_backoff = wait_exponential(multiplier=1, min=1, max=8)
+
+
+def _stop_at_deadline(retry_state: RetryCallState) -> bool:
+    """Stop retrying once the next backoff would overrun the call's deadline."""
+    deadline = retry_state.kwargs.get("deadline")
+    return deadline is not None and time.monotonic() + _backoff(retry_state) >= deadline
+
+
 @retry(
     retry=retry_if_exception_type((httpx.TimeoutException, httpx.HTTPStatusError)),
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=1, max=8),
+    stop=stop_any(stop_after_attempt(3), _stop_at_deadline),
+    wait=_backoff,
     reraise=True,
 )
 def _call_openai_with_retry(
     url: str,
     headers: dict[str, str],
     body: dict[str, Any],
+    deadline: float | None = None,
 ) -> dict[str, Any]:
-    """HTTP call with exponential-backoff retry on transient failures."""
-    resp = httpx.post(url, json=body, headers=headers, timeout=30.0)
+    """HTTP call with exponential-backoff retry on transient failures.
+
+    Each attempt's timeout is clipped to what is left before *deadline*
+    (a ``time.monotonic()`` value).
+    """
+    timeout = 30.0
+    if deadline is not None:
+        timeout = max(min(timeout, deadline - time.monotonic()), 0.1)
+    resp = httpx.post(url, json=body, headers=headers, timeout=timeout)
     resp.raise_for_status()
     data = resp.json()
     content = data["choices"][0]["message"]["content"]
@@ -178,11 +320,14 @@ def _call_openai_with_retry(
 def _call_openai(
     system_prompt: str,
     user_prompt: str,
+    max_tokens: int = _MAX_TOKENS,
 ) -> dict[str, Any]:
     """Call Azure OpenAI chat completions and return the parsed JSON response.
 
-    Retries up to 3 times with exponential backoff on transient failures.
-    Raises ``LLMUnavailableError`` if all attempts fail.
+    Retries up to 3 times with exponential backoff on transient failures,
+    within the per-call deadline.  Raises ``LLMCircuitOpenError`` without
+    calling out while the breaker is open, and ``LLMUnavailableError`` if
+    no slot frees up in time or all attempts fail.
     """
     endpoint = _get_endpoint()
     api_key = _get_api_key()
@@ -205,18 +350,144 @@ def _call_openai(
             {"role": "user", "content": user_prompt},
         ],
         "temperature": 0.1,
-        "max_tokens": 500,
+        "max_tokens": max_tokens,
         "response_format": {"type": "json_object"},
     }
 
+    started = time.monotonic()
+    deadline = started + _get_call_deadline()
+    try:
+        _cb_check()
+    except LLMCircuitOpenError:
+        llm_request_seconds.labels(outcome="circuit_open").observe(0)
+        raise
+
+    semaphore = _get_semaphore()
+    if not semaphore.acquire(timeout=max(deadline - started, 0)):
+        _cb_release_probe()
+        llm_request_seconds.labels(outcome="saturated").observe(
+            time.monotonic() - started
+        )
+        logger.error("llm_concurrency_limit_deadline_exceeded")
+        raise LLMUnavailableError("No Azure OpenAI slot free before the deadline")
+
+    outcome = "error"
     try:
-        return _call_openai_with_retry(url, headers, body)
+        result = _call_openai_with_retry(url, headers, body, deadline=deadline)
+        outcome = "ok"
+        _cb_record_success()
+        return result
     except httpx.TimeoutException:
+        _cb_record_failure()
         logger.error("llm_timeout_after_retries")
         raise LLMUnavailableError("Azure OpenAI request timed out after retries")
-    except (httpx.HTTPError, KeyError, json.JSONDecodeError) as exc:
+    except httpx.HTTPError as exc:
+        _cb_record_failure()
         logger.error("llm_call_failed_after_retries", error=str(exc), exc_info=True)
         raise LLMUnavailableError(f"Azure OpenAI call failed: {exc}") from exc
+    except (KeyError, IndexError, TypeError, json.JSONDecodeError) as exc:
+        # The service answered; only the payload was unusable.
+        _cb_record_success()
+        logger.error("llm_response_unusable", error=str(exc), exc_info=True)
+        raise LLMResponseError(f"Azure OpenAI response unusable: {exc}") from exc
+    except Exception:
+        # Anything unexpected counts against the service, so a half-open
+        # probe never stays claimed.
+        _cb_record_failure()
+        logger.error("llm_call_failed_unexpectedly", exc_info=True)
+        raise
+    finally:
+        semaphore.release()
+        llm_request_seconds.labels(outcome=outcome).observe(time.monotonic() - started)
+
+
+def _call_openai_batch(
+    system_prompt: str,
+    user_prompts: list[str],
+) -> list[dict[str, Any] | None]:
+    """Answer several prompts in one request; ``None`` where an answer is unusable.
+
+    ``max_tokens`` is sized to the batch — ``_MAX_TOKENS`` per answer — and
+    prompts whose answers would not fit in ``_BATCH_MAX_TOKENS`` go out in
+    further requests.  A response that is not JSON at all leaves every
+    answer of that request ``None``, so its callers fall back to single
+    calls.  Raises ``LLMUnavailableError`` if a request itself fails.
+    """
+    per_item = _MAX_TOKENS + _BATCH_ITEM_OVERHEAD_TOKENS
+    chunk = max(_BATCH_MAX_TOKENS // per_item, 1)
+    outputs: list[dict[str, Any] | None] = []
+    for start in range(0, len(user_prompts), chunk):
+        prompts = user_prompts[start : start + chunk]
+        outputs += _call_openai_chunk(system_prompt, prompts, per_item * len(prompts))
+    return outputs
+
+
+def _call_openai_chunk(
+    system_prompt: str, user_prompts: list[str], max_tokens: int
+) -> list[dict[str, Any] | None]:
+    payload = json.dumps(
+        [{"id": i, "input": prompt} for i, prompt in enumerate(user_prompts)],
+        ensure_ascii=False,
+    )
+    outputs: list[dict[str, Any] | None] = [None] * len(user_prompts)
+    try:
+        response = _call_openai(
+            system_prompt + _BATCH_INSTRUCTIONS, payload, max_tokens=max_tokens
+        )
+    except LLMResponseError:
+        return outputs
+    results = response.get("results")
+    if not isinstance(results, list):
+        return outputs
+    for entry in results:
+        if not isinstance(entry, dict) or not isinstance(entry.get("output"), dict):
+            continue
+        idx = entry.get("id")
+        if isinstance(idx, int) and 0 <= idx < len(outputs):
+            outputs[idx] = entry["output"]
+    return outputs
+
+
+def _batched_call(system_prompt: str, user_prompt: str) -> dict[str, Any]:
+    # These resolve the module globals at call time, so tests patching
+    # ``_call_openai`` also patch the batcher.
+    def single(sp: str, up: str) -> dict[str, Any]:
+        return _call_openai(sp, up)
+
+    def batch(sp: str, ups: list[str]) -> list[dict[str, Any] | None]:
+        return _call_openai_batch(sp, ups)
+
+    return get_llm_batcher(single, batch).call(system_prompt, user_prompt)
+
+
+def _prompt_version(system_prompt: str) -> str:
+    """Short hash of the prompt and model; part of every cache key."""
+    material = f"{_get_deployment()}\x1f{system_prompt}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+def _cached_call(
+    kind: str,
+    system_prompt: str,
+    user_prompt: str,
+    text: str,
+    context: str = "",
+) -> dict[str, Any]:
+    """``_call_openai`` behind the response cache.
+
+    *text* is the counterparty message (normalised into the key) and
+    *context* anything else the answer depends on.
+    """
+    cache = get_llm_cache()
+    version = _prompt_version(system_prompt)
+    key = make_key(kind, version, text, context)
+    cached = cache.get(kind, key)
+    if cached is not None:
+        logger.debug("llm_cache_hit", kind=kind)
+        return cached
+    result = _batched_call(system_prompt, user_prompt)
+    cache.put(kind, key, version, result)
+    return result
 
 
 # ---------------------------------------------------------------------------
@@ -228,6 +499,14 @@ class LLMUnavailableError(Exception):
     """Raised when the LLM backend is not reachable or not configured."""
 
 
+class LLMCircuitOpenError(LLMUnavailableError):
+    """Raised without calling out while the LLM circuit breaker is open."""
+
+
+class LLMResponseError(LLMUnavailableError):
+    """Raised when the LLM answered but its payload could not be read."""
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -243,7 +522,7 @@ class LLMAgent:
         Returns a :class:`LLMClassifyResult` with intent, confidence, and
         optional reasoning.
         """
-        result = _call_openai(_CLASSIFY_SYSTEM_PROMPT, message)
+        result = _cached_call("classify", _CLASSIFY_SYSTEM_PROMPT, message, message)
 
         intent_str = result.get("intent", "OTHER").upper()
         try:
@@ -282,7 +561,13 @@ class LLMAgent:
             f"Counterparty: {sender_name}\n\n"
             f"Message:\n{raw_message}"
         )
-        result = _call_openai(_PARSE_SYSTEM_PROMPT, user_prompt)
+        result = _cached_call(
+            "parse",
+            _PARSE_SYSTEM_PROMPT,
+            user_prompt,
+            raw_message,
+            context=f"{rfq_context}\x1f{sender_name}",
+        )
 
         intent_str = result.get("intent", "OTHER").upper()
         try:
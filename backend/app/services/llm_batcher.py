@@ -0,0 +1,146 @@
+"""Micro-batching of LLM calls for bursts of inbound messages.
+
+When an RFQ round closes, dozens of replies land within seconds and each
+one needs its own classify / parse call.  :class:`LLMBatcher` holds calls
+for a short window (or until ``max_batch_size`` are waiting), then sends
+every call that shares a system prompt as **one** request and hands each
+caller its own result:
+
+- The batch function (``llm_agent._call_openai_batch``) returns one
+  result per input, or ``None`` where the model's answer for that input
+  is missing or malformed — or where the whole response could not be
+  read; those callers fall back to a single call.
+- A call that ends up alone in its window is made by the caller itself,
+  exactly as without batching.
+- An exception from the batch request (transport failure, circuit open)
+  is raised in every caller — retrying each item singly would only
+  multiply the load on an unhealthy backend.
+
+Callers block in :meth:`LLMBatcher.call`; they are worker-pool threads,
+never the event loop.
+
+Configurable via env vars:
+    LLM_BATCH_MAX_SIZE     Default 16  — ``1`` disables batching.
+    LLM_BATCH_WINDOW_MS    Default 50  — ``0`` disables batching.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+from app.core.logging import get_logger
+from app.core.metrics import llm_batch_fallback_total, llm_batch_size
+
+logger = get_logger()
+
+SingleCall = Callable[[str, str], dict[str, Any]]
+BatchCall = Callable[[str, list[str]], list[dict[str, Any] | None]]
+
+_Item = tuple[str, "Future[dict[str, Any] | None]"]
+
+
+class LLMBatcher:
+    """Collects concurrent calls per system prompt into batched requests."""
+
+    def __init__(
+        self,
+        call_single: SingleCall,
+        call_batch: BatchCall,
+        max_batch_size: int = 16,
+        window_seconds: float = 0.05,
+    ) -> None:
+        self._call_single = call_single
+        self._call_batch = call_batch
+        self._max_batch_size = max_batch_size
+        self._window = window_seconds
+        self._lock = threading.Lock()
+        self._pending: dict[str, list[_Item]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_batch_size > 1 and self._window > 0
+
+    def call(self, system_prompt: str, user_prompt: str) -> dict[str, Any]:
+        """Return the model's JSON answer for one prompt, batching if possible."""
+        if not self.enabled:
+            return self._call_single(system_prompt, user_prompt)
+
+        future: Future[dict[str, Any] | None] = Future()
+        full: list[_Item] | None = None
+        with self._lock:
+            batch = self._pending.setdefault(system_prompt, [])
+            batch.append((user_prompt, future))
+            if len(batch) >= self._max_batch_size:
+                full = self._pending.pop(system_prompt)
+            elif len(batch) == 1:
+                timer = threading.Timer(
+                    self._window, self._flush_window, args=(system_prompt, batch)
+                )
+                timer.daemon = True
+                timer.start()
+
+        if full is not None:
+            self._run(system_prompt, full)
+        result = future.result()
+        if result is None:
+            return self._call_single(system_prompt, user_prompt)
+        return result
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+
+    def _flush_window(self, system_prompt: str, batch: list[_Item]) -> None:
+        with self._lock:
+            if self._pending.get(system_prompt) is not batch:
+                return  # already sent because it filled up
+            del self._pending[system_prompt]
+        self._run(system_prompt, batch)
+
+    def _run(self, system_prompt: str, batch: list[_Item]) -> None:
+        llm_batch_size.observe(len(batch))
+        if len(batch) == 1:
+            batch[0][1].set_result(None)  # the caller makes its own call
+            return
+
+        try:
+            results = self._call_batch(system_prompt, [prompt for prompt, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+
+        results = list(results)[: len(batch)]
+        results += [None] * (len(batch) - len(results))
+        missing = 0
+        for (_, future), result in zip(batch, results, strict=True):
+            if result is None:
+                missing += 1
+            future.set_result(result)
+        if missing:
+            llm_batch_fallback_total.inc(missing)
+            logger.warning(
+                "llm_batch_partial_fallback", batch_size=len(batch), missing=missing
+            )
+
+
+_batcher: LLMBatcher | None = None
+_batcher_lock = threading.Lock()
+
+
+def get_llm_batcher(call_single: SingleCall, call_batch: BatchCall) -> LLMBatcher:
+    """Return the process-wide batcher, creating it on first use."""
+    global _batcher  # noqa: PLW0603
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = LLMBatcher(
+                call_single,
+                call_batch,
+                max_batch_size=int(os.getenv("LLM_BATCH_MAX_SIZE", "16")),
+                window_seconds=float(os.getenv("LLM_BATCH_WINDOW_MS", "50")) / 1000,
+            )
+        return _batcher
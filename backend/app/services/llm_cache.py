@@ -0,0 +1,219 @@
+"""LLM response cache — skip Azure OpenAI for messages already seen.
+
+Counterparties repeat themselves: "flat", "2450", "sem interesse", the
+same refresh sent to every open RFQ.  ``LLMAgent.classify_intent`` and
+``LLMAgent.parse_quote_message`` look up the raw JSON response here
+before calling the model.
+
+- **Key** — SHA-256 over the call kind, the prompt version (a hash of the
+  system prompt and deployment, so editing either invalidates old
+  entries), the normalised message text and any context the answer
+  depends on (RFQ context and counterparty name for parsing).  Message
+  text is NFKC-normalised, case-folded and whitespace-collapsed.
+- **Memory tier** — a bounded LRU with a per-entry TTL, per process.
+- **Persistent tier** — optional ``llm_response_cache`` table shared by
+  all workers and kept across restarts; consulted on a memory miss.
+
+Only successful responses are cached; ``LLMUnavailableError`` is never
+stored.  Lookups are counted in ``llm_cache_lookups_total``.
+
+Configurable via env vars:
+    LLM_CACHE_MAX_ENTRIES    Default 4096   — ``0`` disables the cache.
+    LLM_CACHE_TTL_SECONDS    Default 86400
+    LLM_CACHE_PERSIST        ``1`` to enable the database tier.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.core.metrics import llm_cache_entries, llm_cache_lookups_total
+from app.core.utils import now_utc
+from app.models.llm_cache import LLMResponseCacheEntry
+
+logger = get_logger()
+
+Clock = Callable[[], float]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of a message for cache keys."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def make_key(kind: str, prompt_version: str, text: str, context: str = "") -> str:
+    """Cache key for one LLM call; *context* is hashed verbatim."""
+    material = "\x1f".join((kind, prompt_version, normalize_text(text), context))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _default_session_factory() -> Session:
+    from app.core.database import SessionLocal
+
+    return SessionLocal()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes.
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + optional table) cache of LLM JSON responses."""
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl_seconds: float = 86400,
+        persist: bool = False,
+        session_factory: Callable[[], Session] | None = None,
+        clock: Clock = time.monotonic,
+    ) -> None:
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._persist = persist
+        self._session_factory = session_factory or _default_session_factory
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._ttl > 0
+
+    def get(self, kind: str, key: str) -> dict[str, Any] | None:
+        """Return a copy of the cached response for *key*, or ``None``."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, response = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    llm_cache_lookups_total.labels(kind=kind, result="hit").inc()
+                    return copy.deepcopy(response)
+                del self._entries[key]
+
+        if self._persist:
+            stored = self._load(key)
+            if stored is not None:
+                response, remaining = stored
+                self._remember(key, response, remaining)
+                llm_cache_lookups_total.labels(kind=kind, result="persistent_hit").inc()
+                return copy.deepcopy(response)
+
+        llm_cache_lookups_total.labels(kind=kind, result="miss").inc()
+        return None
+
+    def put(
+        self, kind: str, key: str, prompt_version: str, response: dict[str, Any]
+    ) -> None:
+        """Store *response* under *key* in both tiers."""
+        if not self.enabled:
+            return
+        response = copy.deepcopy(response)
+        self._remember(key, response, self._ttl)
+        if self._persist:
+            self._store(kind, key, prompt_version, response)
+
+    def clear(self) -> None:
+        """Drop the memory tier (the table expires on its own)."""
+        with self._lock:
+            self._entries.clear()
+        llm_cache_entries.set(0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: str, response: dict[str, Any], ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            size = len(self._entries)
+        llm_cache_entries.set(size)
+
+    def _load(self, key: str) -> tuple[dict[str, Any], float] | None:
+        session = self._session_factory()
+        try:
+            row = session.get(LLMResponseCacheEntry, key)
+            if row is None:
+                return None
+            remaining = (_as_utc(row.expires_at) - now_utc()).total_seconds()
+            if remaining <= 0:
+                session.delete(row)
+                session.commit()
+                return None
+            return dict(row.response), remaining
+        except Exception:
+            session.rollback()
+            logger.warning("llm_cache_load_failed", exc_info=True)
+            return None
+        finally:
+            session.close()
+
+    def _store(
+        self, kind: str, key: str, prompt_version: str, response: dict[str, Any]
+    ) -> None:
+        session = self._session_factory()
+        try:
+            now = now_utc()
+            session.merge(
+                LLMResponseCacheEntry(
+                    cache_key=key,
+                    kind=kind,
+                    prompt_version=prompt_version,
+                    response=response,
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=self._ttl),
+                )
+            )
+            session.commit()
+        except Exception:
+            # A concurrent worker stored the same key, or the table is
+            # missing — the memory tier still has the entry.
+            session.rollback()
+            logger.warning("llm_cache_store_failed", exc_info=True)
+        finally:
+            session.close()
+
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the process-wide cache, creating it on first use."""
+    global _cache  # noqa: PLW0603
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache(
+                max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "4096")),
+                ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")),
+                persist=os.getenv("LLM_CACHE_PERSIST", "").strip().lower()
+                in ("1", "true", "yes"),
+            )
+        return _cache
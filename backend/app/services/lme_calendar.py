@@ -3,6 +3,11 @@
 Provides holiday-aware date arithmetic required by the RFQ engine for
 computing PPT (Prompt Payment Terms) settlement dates.
 
+Business days from 2025 through 2035 are precomputed per calendar (flags,
+running counts and ordinals), so shifting by N business days, the n-th
+business day of a month and range counts are index lookups rather than
+day-by-day loops.  The table is rebuilt lazily after ``add_holidays()``.
+
 The holiday set is pluggable.  A built-in constant ``LME_HOLIDAYS`` covers
 official LME non-trading days from 2025 through 2035.  Load additional
 holidays via ``add_holidays()`` or pass them at construction time.
@@ -16,8 +21,9 @@ Usage:
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from datetime import date, timedelta
-from typing import Iterable, Optional, Set
+from typing import Optional, Set
 
 
 # ---------------------------------------------------------------------------
@@ -50,6 +56,45 @@ LME_HOLIDAYS: set[str] = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Precomputed horizon
+#
+# Business days inside [HORIZON_START, HORIZON_END] are tabulated once per
+# calendar so date arithmetic is an index lookup; dates outside the horizon
+# fall back to stepping day by day.
+# ---------------------------------------------------------------------------
+
+HORIZON_START = date(2025, 1, 1)
+HORIZON_END = date(2035, 12, 31)
+
+
+class _BusinessDayTable:
+    """Business-day flags, running counts and ordinals over the horizon."""
+
+    __slots__ = ("base", "days", "flags", "rank")
+
+    def __init__(self, holidays: set[str]) -> None:
+        self.base = HORIZON_START.toordinal()
+        size = HORIZON_END.toordinal() - self.base + 1
+        self.flags = bytearray(size)
+        # rank[i] = business days in [HORIZON_START, HORIZON_START + i]
+        self.rank: list[int] = [0] * size
+        # days[k] = ordinal of the (k+1)-th business day in the horizon
+        self.days: list[int] = []
+        count = 0
+        for i in range(size):
+            d = date.fromordinal(self.base + i)
+            if d.weekday() < 5 and d.isoformat() not in holidays:
+                self.flags[i] = 1
+                self.days.append(self.base + i)
+                count += 1
+            self.rank[i] = count
+
+    def index(self, d: date) -> int | None:
+        i = d.toordinal() - self.base
+        return i if 0 <= i < len(self.flags) else None
+
+
 # ---------------------------------------------------------------------------
 # Calendar class
 # ---------------------------------------------------------------------------
@@ -63,20 +108,127 @@ class LMECalendar:
 
     def __init__(self, holidays_iso: Optional[Iterable[str]] = None) -> None:
         self._holidays: Set[str] = set(holidays_iso) if holidays_iso is not None else set()
+        self._table: _BusinessDayTable | None = None
+
+    def _tab(self) -> _BusinessDayTable:
+        table = self._table
+        if table is None:
+            table = self._table = _BusinessDayTable(self._holidays)
+        return table
 
     # -- queries --
 
     def is_business_day(self, d: date) -> bool:
         """Return True if *d* is a working day on the LME."""
+        table = self._tab()
+        i = table.index(d)
+        if i is not None:
+            return bool(table.flags[i])
         if d.weekday() >= 5:  # Saturday = 5, Sunday = 6
             return False
         return d.isoformat() not in self._holidays
 
+    def add_business_days(self, start: date, n: int) -> date:
+        """Shift *start* by *n* business days (negative *n* goes backwards)."""
+        table = self._tab()
+        i = table.index(start)
+        if i is not None:
+            if n > 0:
+                k = table.rank[i] + n - 1
+                if k < len(table.days):
+                    return date.fromordinal(table.days[k])
+            elif n < 0:
+                k = table.rank[i] - table.flags[i] + n
+                if k >= 0:
+                    return date.fromordinal(table.days[k])
+            else:
+                return start
+        return self._step(start, n)
+
+    def nth_business_day_of_month(self, year: int, month: int, n: int) -> date:
+        """*n*-th business day of *month* (1-based); ``n=-1`` is the last one.
+
+        Raises ``ValueError`` if the month has fewer than ``abs(n)`` business
+        days.
+        """
+        first = date(year, month, 1)
+        last = (
+            date(year, 12, 31)
+            if month == 12
+            else date(year, month + 1, 1) - timedelta(days=1)
+        )
+        table = self._tab()
+        lo, hi = table.index(first), table.index(last)
+        if lo is not None and hi is not None:
+            before = table.rank[lo] - table.flags[lo]
+            count = table.rank[hi] - before
+            if 0 < n <= count:
+                return date.fromordinal(table.days[before + n - 1])
+            if 0 < -n <= count:
+                return date.fromordinal(table.days[table.rank[hi] + n])
+        else:
+            days = self.business_days(first, last)
+            if 0 < n <= len(days) or 0 < -n <= len(days):
+                return days[n - 1 if n > 0 else n]
+        raise ValueError(f"{year}-{month:02d} has no business day #{n}")
+
+    def count_business_days(self, start: date, end: date) -> int:
+        """Number of business days in ``[start, end]`` (both inclusive)."""
+        if end < start:
+            return 0
+        table = self._tab()
+        count = 0
+        lo, hi = max(start, HORIZON_START), min(end, HORIZON_END)
+        if lo <= hi:
+            i, j = table.index(lo), table.index(hi)
+            count += table.rank[j] - table.rank[i] + table.flags[i]
+        for d in self._outside_horizon(start, end):
+            count += self.is_business_day(d)
+        return count
+
+    def business_days(self, start: date, end: date) -> list[date]:
+        """All business days in ``[start, end]`` (both inclusive), in order."""
+        if end < start:
+            return []
+        table = self._tab()
+        outside = list(self._outside_horizon(start, end))
+        result = [d for d in outside if d < HORIZON_START and self.is_business_day(d)]
+        lo, hi = max(start, HORIZON_START), min(end, HORIZON_END)
+        if lo <= hi:
+            i, j = table.index(lo), table.index(hi)
+            first = table.rank[i] - table.flags[i]
+            result.extend(date.fromordinal(o) for o in table.days[first:table.rank[j]])
+        result.extend(d for d in outside if d > HORIZON_END and self.is_business_day(d))
+        return result
+
     # -- mutations --
 
     def add_holidays(self, holidays_iso: Iterable[str]) -> None:
         """Merge additional ISO-date strings into the holiday set."""
         self._holidays.update(holidays_iso)
+        self._table = None
+
+    # -- fallbacks outside the horizon --
+
+    def _step(self, start: date, n: int) -> date:
+        d = start
+        step = timedelta(days=1 if n > 0 else -1)
+        remaining = abs(n)
+        while remaining:
+            d += step
+            if self.is_business_day(d):
+                remaining -= 1
+        return d
+
+    @staticmethod
+    def _outside_horizon(start: date, end: date) -> Iterator[date]:
+        d = start
+        while d <= end:
+            if d < HORIZON_START or d > HORIZON_END:
+                yield d
+                d += timedelta(days=1)
+            else:
+                d = HORIZON_END + timedelta(days=1)
 
 
 # ---------------------------------------------------------------------------
@@ -86,16 +238,28 @@ class LMECalendar:
 def add_business_days(start: date, n: int, cal: LMECalendar) -> date:
     """Return the date that is *n* business days after *start*.
 
-    Counts forward day-by-day, skipping non-business days (weekends +
-    holidays).  ``start`` itself is **not** counted.
+    Skips non-business days (weekends + holidays).  ``start`` itself is
+    **not** counted.  A negative *n* counts backwards.
+    """
+    return cal.add_business_days(start, n)
+
+
+def subtract_business_days(start: date, n: int, cal: LMECalendar) -> date:
+    """Return the date that is *n* business days before *start*."""
+    return cal.add_business_days(start, -n)
+
+
+def nth_business_day_of_month(
+    year: int,
+    month_index_0: int,
+    n: int,
+    cal: LMECalendar,
+) -> date:
+    """*n*-th business day of the indicated month; ``n=-1`` is the last.
+
+    ``month_index_0`` is zero-based, as elsewhere in this module.
     """
-    d = start
-    counted = 0
-    while counted < n:
-        d += timedelta(days=1)
-        if cal.is_business_day(d):
-            counted += 1
-    return d
+    return cal.nth_business_day_of_month(year, month_index_0 + 1, n)
 
 
 def second_business_day_of_next_month(
@@ -113,18 +277,8 @@ def second_business_day_of_next_month(
         Zero-based month index (0 = January … 11 = December).
     """
     if month_index_0 == 11:
-        y2, m2 = year + 1, 1
-    else:
-        y2, m2 = year, month_index_0 + 2  # datetime.date month is 1-based
-
-    d = date(y2, m2, 1)
-    count = 0
-    while True:
-        if cal.is_business_day(d):
-            count += 1
-            if count == 2:
-                return d
-        d += timedelta(days=1)
+        return cal.nth_business_day_of_month(year + 1, 1, 2)
+    return cal.nth_business_day_of_month(year, month_index_0 + 2, 2)
 
 
 def last_business_day_of_month(
@@ -136,13 +290,17 @@ def last_business_day_of_month(
 
     Useful for auto-filling fixing dates when Fix is paired with AVG.
     """
-    if month_index_0 == 11:
-        d = date(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        d = date(year, month_index_0 + 2, 1) - timedelta(days=1)
-    while not cal.is_business_day(d):
-        d -= timedelta(days=1)
-    return d
+    return cal.nth_business_day_of_month(year, month_index_0 + 1, -1)
+
+
+def count_business_days(start: date, end: date, cal: LMECalendar) -> int:
+    """Number of business days in ``[start, end]`` (both inclusive)."""
+    return cal.count_business_days(start, end)
+
+
+def business_days_between(start: date, end: date, cal: LMECalendar) -> list[date]:
+    """Business days in ``[start, end]`` (both inclusive), in order."""
+    return cal.business_days(start, end)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,240 @@
+"""Deterministic fast-path quote parser — runs before the LLM.
+
+Most counterparty replies are a bare price or premium: ``2450 USD``,
+``2.450,50 USD/MT``, ``+15 USD/MT``, ``-10``, ``flat``.  Sending those
+through ``LLMAgent.classify_intent`` and ``parse_quote_message`` costs two
+round trips (1-3 s) for an answer a regular expression can give.
+
+:meth:`QuoteFastParser.parse` matches the *whole* message against a small
+grammar (PT-BR and EN)::
+
+    [lead-in] [currency] [sign] NUMBER [unit] [convention]
+    [premium word] flat | par [unit] [convention]
+
+- lead-in: ``preço``, ``price``, ``oferta``, ``offer``, ``bid``, ``premium``,
+  ``prêmio``, ``desconto``, ``discount`` … (optionally followed by ``:``)
+- currency / unit: ``USD``, ``US$``, ``$``, optionally followed by a ton
+  unit — ``USD/MT``, ``USD/t``, ``USD per ton``, ``USD pmt``.  A ton unit
+  on its own (``500 mt``, ``1500 toneladas``) is a quantity, not a price.
+- convention: ``avg`` / ``média``, ``avginter``, ``c2r``
+
+Numbers accept both decimal conventions (``2450.50``, ``2450,50``,
+``2.450,50``, ``2,450.50``); a lone separator followed by exactly three
+digits is a thousands separator.  A signed number, a premium/discount word
+or ``flat`` makes it a premium; otherwise it is a fixed price, which must
+carry a currency — a bare number may as well be a year, a quantity or a
+reference.
+
+Anything else — extra words, several numbers, a price without currency, a
+value outside the plausible range for a price or premium — returns
+``None`` and the caller falls back to the LLM.
+Every number in the result is checked against the numbers actually present
+in the text (:func:`numbers_in_text`), the same anti-hallucination rule the
+orchestrator applies to LLM output.
+
+Premiums are parsed but not auto-booked: ``RFQQuote`` only stores an
+outright price, so the orchestrator takes the fast path for fixed prices
+only and sends premium replies through the LLM and its guards.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from decimal import Decimal, InvalidOperation
+
+from app.core.logging import get_logger
+from app.core.metrics import quote_fast_parse_total
+from app.schemas.llm import MessageIntent, ParsedQuote
+
+logger = get_logger()
+
+# Unsigned numbers below this are more likely a premium typed without a
+# sign (or a quantity) than an absolute USD/MT price — leave them to the LLM.
+_MIN_FIXED_PRICE = Decimal("100")
+# Beyond these a value is a typo, a quantity or a reference number rather
+# than a USD/MT price or premium.
+_MAX_FIXED_PRICE = Decimal("50000")
+_MAX_PREMIUM = Decimal("1000")
+
+_NUMBER = (
+    r"\d{1,3}(?:[.,]\d{3})+(?:[.,]\d{1,2})?"  # 2.450 / 2,450.50 / 2.450,50
+    r"|\d+(?:[.,]\d{1,2})?"  # 2450 / 2450.5 / 2450,50
+)
+_CURRENCY = r"(?:usd|us\$|\$)"
+_TON = r"(?:mt|t|ton|tons|tonne|tonelada|toneladas)"
+_UNIT = rf"(?:{_CURRENCY}\s*(?:(?:/|per\s+|por\s+)\s*{_TON}|pmt)?)"
+_CONVENTION = r"(?:avginter|avg|average|media|média|c2r)"
+_PREMIUM_WORDS = r"(?:premium|premio|prêmio|over|acima)"
+_DISCOUNT_WORDS = r"(?:discount|desconto|under|abaixo)"
+_PRICE_WORDS = r"(?:preço|preco|price|oferta|offer|ofereço|ofereco|bid|cotação|cotacao|quote)"
+
+_QUOTE_RE = re.compile(
+    rf"""^
+    (?:(?P<price_word>{_PRICE_WORDS})\s*:?\s*)?
+    (?:(?P<premium_word>{_PREMIUM_WORDS})\s*:?\s*
+      |(?P<discount_word>{_DISCOUNT_WORDS})\s*:?\s*)?
+    (?:(?P<currency>{_CURRENCY})\s*)?
+    (?P<sign>[+-])?\s*
+    (?P<number>{_NUMBER})
+    (?:\s*(?P<unit>{_UNIT})
+      |(?(currency)\s*(?P<ton>(?:/|per\s+|por\s+)\s*{_TON}|pmt)))?
+    (?:\s*(?P<convention>{_CONVENTION}))?
+    $""",
+    re.VERBOSE,
+)
+
+_FLAT_RE = re.compile(
+    rf"""^
+    (?:(?:{_PREMIUM_WORDS})\s*:?\s*)?
+    (?:flat|par)
+    (?:\s*(?P<unit>{_UNIT}))?
+    (?:\s*(?P<convention>{_CONVENTION}))?
+    $""",
+    re.VERBOSE,
+)
+
+_NUMBER_TOKEN_RE = re.compile(rf"(?<![\d.,])(?:{_NUMBER})(?![\d])")
+
+_CONVENTIONS = {
+    "avg": "avg",
+    "average": "avg",
+    "media": "avg",
+    "média": "avg",
+    "avginter": "avginter",
+    "c2r": "c2r",
+}
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.rstrip(".!;").strip()
+
+
+def to_decimal(token: str) -> Decimal | None:
+    """Parse a PT-BR or EN formatted number (``2.450,50`` / ``2,450.50``)."""
+    separators = [i for i, ch in enumerate(token) if ch in ".,"]
+    if not separators:
+        digits = token
+    else:
+        last = separators[-1]
+        decimals = len(token) - last - 1
+        if (len(separators) == 1 and decimals == 3) or token.count(token[last]) > 1:
+            # "2.450" / "1,234,567" — thousands separators, no decimals.
+            digits = token.replace(".", "").replace(",", "")
+        else:
+            integer = token[:last].replace(".", "").replace(",", "")
+            digits = f"{integer}.{token[last + 1:]}"
+    try:
+        return Decimal(digits)
+    except InvalidOperation:
+        return None
+
+
+def numbers_in_text(text: str) -> set[Decimal]:
+    """Every number literally written in *text*, in either locale."""
+    found: set[Decimal] = set()
+    for token in _NUMBER_TOKEN_RE.findall(text):
+        value = to_decimal(token)
+        if value is not None:
+            found.add(value)
+    return found
+
+
+class QuoteFastParser:
+    """Regex / grammar parser for short, well-formed quote messages."""
+
+    @staticmethod
+    def parse(raw_message: str, sender_name: str = "Unknown") -> ParsedQuote | None:
+        """Return a :class:`ParsedQuote`, or ``None`` to defer to the LLM."""
+        text = _normalize(raw_message)
+        parsed = QuoteFastParser._parse_flat(text, sender_name)
+        if parsed is None:
+            parsed = QuoteFastParser._parse_number(text, raw_message, sender_name)
+        quote_fast_parse_total.labels(
+            result="parsed" if parsed is not None else "fallback"
+        ).inc()
+        if parsed is not None:
+            logger.debug(
+                "quote_fast_parsed",
+                fixed_price_value=str(parsed.fixed_price_value),
+                premium_discount=str(parsed.premium_discount),
+                confidence=parsed.confidence,
+            )
+        return parsed
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_flat(text: str, sender_name: str) -> ParsedQuote | None:
+        match = _FLAT_RE.match(text)
+        if match is None:
+            return None
+        return QuoteFastParser._quote(
+            sender_name,
+            confidence=0.95,
+            premium_discount=Decimal("0"),
+            unit=match["unit"],
+            convention=match["convention"],
+        )
+
+    @staticmethod
+    def _parse_number(
+        text: str, raw_message: str, sender_name: str
+    ) -> ParsedQuote | None:
+        match = _QUOTE_RE.match(text)
+        if match is None:
+            return None
+        value = to_decimal(match["number"])
+        if value is None or value not in numbers_in_text(raw_message):
+            return None
+
+        explicit = bool(match["unit"] or match["currency"] or match["price_word"])
+        if match["sign"] or match["premium_word"] or match["discount_word"]:
+            if value > _MAX_PREMIUM:
+                return None
+            negative = match["sign"] == "-" or (
+                match["discount_word"] is not None and match["sign"] != "+"
+            )
+            return QuoteFastParser._quote(
+                sender_name,
+                confidence=0.97 if explicit else 0.92,
+                premium_discount=-value if negative else value,
+                unit=match["unit"] or match["currency"],
+                convention=match["convention"],
+            )
+
+        if not (match["unit"] or match["currency"]):
+            return None
+        if not _MIN_FIXED_PRICE <= value <= _MAX_FIXED_PRICE:
+            return None
+        return QuoteFastParser._quote(
+            sender_name,
+            confidence=0.97 if explicit else 0.9,
+            fixed_price_value=value,
+            unit=match["unit"] or match["currency"],
+            convention=match["convention"],
+        )
+
+    @staticmethod
+    def _quote(
+        sender_name: str,
+        confidence: float,
+        fixed_price_value: Decimal | None = None,
+        premium_discount: Decimal | None = None,
+        unit: str | None = None,
+        convention: str | None = None,
+    ) -> ParsedQuote:
+        return ParsedQuote(
+            intent=MessageIntent.quote,
+            confidence=confidence,
+            fixed_price_value=fixed_price_value,
+            fixed_price_unit="USD/MT" if unit else None,
+            float_pricing_convention=_CONVENTIONS.get(convention or ""),
+            premium_discount=premium_discount,
+            counterparty_name=sender_name[:200],
+            notes="fast-path parse",
+        )
@@ -32,10 +32,14 @@ Changes from legacy
 * ``_compute_pair_overrides`` extracted as a top-level helper — called once
   from both ``generate_rfq_text`` and ``compute_trade_ppt_dates``
   (was duplicated in the legacy code).
+* Batch APIs (``compute_leg_dates_batch``, ``compute_trade_ppt_dates_batch``)
+  for bulk previews and settlement-date backfills; calendar results are
+  memoized per batch on the fields that determine them.
 """
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from datetime import date
 from enum import Enum
@@ -45,6 +49,7 @@ from app.services.lme_calendar import (
     LMECalendar,
     add_business_days,
     lme_calendar,
+    nth_business_day_of_month,
     second_business_day_of_next_month,
 )
 
@@ -202,11 +207,15 @@ def compute_ppt_for_leg(leg: Leg, cal: LMECalendar) -> Optional[date]:
 # ─────────────────────────────────────────────────────────────────────────────
 
 
+PPTFn = Callable[[Leg, LMECalendar], date | None]
+
+
 def _compute_pair_overrides(
     leg_a: Leg,
     leg_b: Optional[Leg],
     cal: LMECalendar,
     sync_ppt: bool,
+    ppt_fn: PPTFn = compute_ppt_for_leg,
 ) -> Tuple[Leg, Optional[Leg]]:
     """Adjust fixing-date / PPT on paired legs according to LME conventions.
 
@@ -220,14 +229,16 @@ def _compute_pair_overrides(
     3. **Fix paired with C2R** → the Fix leg inherits the C2R PPT.
     4. **sync_ppt + AVGInter** → the other leg's PPT is overridden by the
        AVGInter PPT.
+
+    ``ppt_fn`` lets batch callers substitute a memoized PPT computation.
     """
     if leg_b is None:
         return leg_a, None
 
     a, b = leg_a, leg_b
 
-    ppt_a = compute_ppt_for_leg(a, cal)
-    ppt_b = compute_ppt_for_leg(b, cal)
+    ppt_a = ppt_fn(a, cal)
+    ppt_b = ppt_fn(b, cal)
 
     # --- AVGInter ↔ Fix/C2R ---
     if (
@@ -269,7 +280,7 @@ def _compute_pair_overrides(
     if sync_ppt and a.price_type == PriceType.AVG_INTER:
         b = Leg(**{**b.__dict__, "ppt": ppt_a})
     if sync_ppt and b.price_type == PriceType.AVG_INTER:
-        a = Leg(**{**a.__dict__, "ppt": compute_ppt_for_leg(b, cal)})
+        a = Leg(**{**a.__dict__, "ppt": ppt_fn(b, cal)})
 
     return a, b
 
@@ -718,3 +729,153 @@ def compute_trade_ppt_dates(
     pts = [d for d in (ppt1, ppt2) if d is not None]
     trade_ppt = max(pts) if pts else None
     return {"leg1_ppt": ppt1, "leg2_ppt": ppt2, "trade_ppt": trade_ppt}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Batch computation (bulk previews / settlement-date backfills)
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class LegDates:
+    """Calendar dates derived from a single leg.
+
+    ``window_start`` / ``window_end`` bound the averaging window (first and
+    last business day of the month for AVG, the given range for AVGInter)
+    and ``window_business_days`` counts the pricing days inside it.  For
+    Fix / C2R the window is empty.
+    """
+
+    ppt: date | None
+    fixing_date: date | None
+    window_start: date | None = None
+    window_end: date | None = None
+    window_business_days: int = 0
+
+
+class _LegDateMemo:
+    """Memoizes calendar results on the leg fields that determine them.
+
+    Bulk inputs repeat the same (price type, month, year, dates) many times
+    over — one memo per batch turns those into dict hits.
+    """
+
+    def __init__(self, cal: LMECalendar) -> None:
+        self.cal = cal
+        self._ppt: dict[tuple, date | None] = {}
+        self._dates: dict[tuple, LegDates] = {}
+
+    @staticmethod
+    def _key(leg: Leg) -> tuple:
+        return (
+            leg.price_type,
+            leg.month_name,
+            leg.year,
+            leg.start_date,
+            leg.end_date,
+            leg.fixing_date,
+            leg.ppt,
+        )
+
+    def ppt(self, leg: Leg, _cal: LMECalendar | None = None) -> date | None:
+        key = self._key(leg)
+        try:
+            return self._ppt[key]
+        except KeyError:
+            value = self._ppt[key] = compute_ppt_for_leg(leg, self.cal)
+            return value
+
+    def dates(self, leg: Leg) -> LegDates:
+        key = self._key(leg)
+        cached = self._dates.get(key)
+        if cached is None:
+            cached = self._dates[key] = self._compute_dates(leg)
+        return cached
+
+    def _compute_dates(self, leg: Leg) -> LegDates:
+        ppt = self.ppt(leg)
+        if leg.price_type == PriceType.AVG:
+            idx = MONTH_INDEX.get(leg.month_name or "")
+            if idx is None or leg.year is None:
+                return LegDates(ppt=ppt, fixing_date=None)
+            start = nth_business_day_of_month(leg.year, idx, 1, self.cal)
+            end = nth_business_day_of_month(leg.year, idx, -1, self.cal)
+            return LegDates(
+                ppt=ppt,
+                fixing_date=end,
+                window_start=start,
+                window_end=end,
+                window_business_days=self.cal.count_business_days(start, end),
+            )
+        if leg.price_type == PriceType.AVG_INTER:
+            if leg.start_date is None or leg.end_date is None:
+                return LegDates(ppt=ppt, fixing_date=None)
+            return LegDates(
+                ppt=ppt,
+                fixing_date=leg.end_date,
+                window_start=leg.start_date,
+                window_end=leg.end_date,
+                window_business_days=self.cal.count_business_days(
+                    leg.start_date, leg.end_date
+                ),
+            )
+        return LegDates(ppt=ppt, fixing_date=leg.fixing_date)
+
+
+def compute_leg_dates_batch(
+    legs: Iterable[Leg],
+    cal: LMECalendar | None = None,
+) -> list[LegDates]:
+    """Compute PPT, fixing date and averaging window for many legs at once.
+
+    Legs are taken as-is (no pairing overrides); use
+    ``compute_trade_ppt_dates_batch`` for paired trades.  Results are in
+    input order.
+    """
+    memo = _LegDateMemo(cal or lme_calendar())
+    return [memo.dates(leg) for leg in legs]
+
+
+def compute_trade_ppt_dates_batch(
+    trades: Iterable[RfqTrade],
+    cal: LMECalendar | None = None,
+) -> list[dict]:
+    """Batch counterpart of ``compute_trade_ppt_dates``.
+
+    Returns one dict per trade, in input order, with the same keys plus
+    ``"error"``: ``None`` for valid trades, otherwise the first validation
+    message (and all dates ``None``) — one bad trade does not fail the
+    batch.
+    """
+    memo = _LegDateMemo(cal or lme_calendar())
+    results: dict[RfqTrade, dict] = {}
+    out: list[dict] = []
+    for trade in trades:
+        cached = results.get(trade)
+        if cached is None:
+            cached = results[trade] = _trade_ppt_dates(trade, memo)
+        out.append(dict(cached))
+    return out
+
+
+def _trade_ppt_dates(trade: RfqTrade, memo: _LegDateMemo) -> dict:
+    errs = validate_trade(trade)
+    if errs:
+        return {
+            "leg1_ppt": None,
+            "leg2_ppt": None,
+            "trade_ppt": None,
+            "error": errs[0].message,
+        }
+    l1_adj, l2_adj = _compute_pair_overrides(
+        trade.leg1, trade.leg2, memo.cal, trade.sync_ppt, memo.ppt
+    )
+    ppt1 = memo.ppt(l1_adj)
+    ppt2 = memo.ppt(l2_adj) if l2_adj else None
+    pts = [d for d in (ppt1, ppt2) if d is not None]
+    return {
+        "leg1_ppt": ppt1,
+        "leg2_ppt": ppt2,
+        "trade_ppt": max(pts) if pts else None,
+        "error": None,
+    }
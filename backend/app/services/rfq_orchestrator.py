@@ -19,6 +19,8 @@ It does NOT replace the RFQ Service — it delegates to it.
 from __future__ import annotations
 
 import re
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
 from uuid import UUID
 
 from sqlalchemy.orm import Session
@@ -37,8 +39,15 @@ from app.models.quotes import RFQQuote
 from app.schemas.llm import MessageIntent, ParsedQuote
 from app.schemas.rfq import RFQQuoteCreate, FloatPricingConvention
 from app.schemas.whatsapp import WhatsAppInboundMessage
-from app.services.llm_agent import LLMAgent, LLMUnavailableError
+from app.services.llm_agent import (
+    LLMAgent,
+    LLMCircuitOpenError,
+    LLMUnavailableError,
+)
+from app.services.quote_fast_parser import QuoteFastParser, numbers_in_text
+from app.services.rfq_phone_index import get_phone_index
 from app.services.rfq_service import RFQService
+from app.services.whatsapp_send_scheduler import SendPriority
 from app.services.whatsapp_service import WhatsAppService
 from app.services.webhook_processor import dequeue_message
 
@@ -110,27 +119,6 @@ class RFQOrchestrator:
     # Helpers — anti-hallucination guards
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _phone_variants(phone: str) -> list[str]:
-        """Return a list of phone number variants to match against.
-
-        Brazilian mobiles can be stored as 9-digit (+55XX9XXXXXXXX)
-        but the Twilio sandbox sends replies from 8-digit (+55XXXXXXXXXX).
-        This generates both variants so the DB lookup succeeds.
-        """
-        variants = [phone]
-        raw = phone.lstrip("+")
-        if raw.startswith("55") and len(raw) >= 12:
-            area_code = raw[2:4]
-            digits = raw[4:]
-            if len(digits) == 9 and digits[0] == "9":
-                # 9-digit → also try 8-digit
-                variants.append(f"+55{area_code}{digits[1:]}")
-            elif len(digits) == 8:
-                # 8-digit → also try 9-digit
-                variants.append(f"+55{area_code}9{digits}")
-        return variants
-
     @staticmethod
     def _is_trivial_message(text: str) -> bool:
         """Return True if *text* is a common greeting / acknowledgment
@@ -170,7 +158,11 @@ class RFQOrchestrator:
         for c in candidates:
             if c in raw_text:
                 return True
-        return False
+        # Thousands separators ("2.450,50", "2,450.50") hide the plain digits.
+        try:
+            return Decimal(str(price_value)) in numbers_in_text(raw_text)
+        except InvalidOperation:
+            return False
 
     # ------------------------------------------------------------------
     # 1. Dispatch outbound WhatsApp for all whatsapp invitations
@@ -180,6 +172,7 @@ class RFQOrchestrator:
     def dispatch_whatsapp_invitations(session: Session, rfq_id: UUID) -> dict[str, str]:
         """Send WhatsApp messages for all pending whatsapp invitations.
 
+        Sends run concurrently (``WhatsAppService.send_text_messages``).
         Returns a dict mapping ``recipient_phone → send_status``.
         """
         invitations = (
@@ -192,12 +185,12 @@ class RFQOrchestrator:
             .all()
         )
 
+        sends = WhatsAppService.send_text_messages(
+            [(inv.recipient_phone, inv.message_body) for inv in invitations]
+        )
+
         results: dict[str, str] = {}
-        for inv in invitations:
-            result = WhatsAppService.send_text_message(
-                phone=inv.recipient_phone,
-                text=inv.message_body,
-            )
+        for inv, result in zip(invitations, sends, strict=True):
             if result.success:
                 inv.send_status = RFQInvitationStatus.sent
                 inv.provider_message_id = (
@@ -232,6 +225,10 @@ class RFQOrchestrator:
         3. If confidence >= 0.85 and intent is QUOTE, auto-create a quote.
         4. Otherwise, flag for human review.
 
+        Serial, single-session drain.  The webhook path uses
+        ``inbound_worker_pool`` instead, which runs different senders
+        concurrently while keeping per-sender order.
+
         Returns a list of processing results for observability.
         """
         results: list[dict] = []
@@ -252,26 +249,15 @@ class RFQOrchestrator:
         msg: WhatsAppInboundMessage,
     ) -> dict:
         """Process one inbound WhatsApp message."""
-        # Find the RFQ by matching sender phone to invitation recipient_phone.
-        # Brazilian mobiles can appear in 8-digit or 9-digit format, so we
-        # check both variants.
-        # Join with RFQ to only match invitations whose RFQ is in a quotable
-        # state (SENT or QUOTED), preventing replies from being attributed
-        # to stale/old RFQs.
-        # ORDER BY RFQ.created_at DESC (not invitation.created_at) so the
-        # NEWEST RFQ wins — refresh actions create many invitation rows and
-        # would otherwise cause the wrong RFQ to be selected.
-        phone_variants = RFQOrchestrator._phone_variants(msg.from_phone)
+        # Find the RFQ by matching the sender's normalised phone (8- and
+        # 9-digit Brazilian mobiles collapse to one key) against the phone
+        # index, which only lists RFQs in a quotable state (SENT or QUOTED)
+        # so replies are never attributed to stale/old RFQs.  Matches come
+        # newest RFQ first — refresh actions create many invitation rows,
+        # and the index keeps only the newest one per RFQ.
+        matches = get_phone_index().active_matches(session, msg.from_phone)
         invitation = (
-            session.query(RFQInvitation)
-            .join(RFQ, RFQInvitation.rfq_id == RFQ.id)
-            .filter(
-                RFQInvitation.recipient_phone.in_(phone_variants),
-                RFQInvitation.channel == RFQInvitationChannel.whatsapp,
-                RFQ.state.in_([RFQState.sent, RFQState.quoted]),
-            )
-            .order_by(RFQ.created_at.desc(), RFQInvitation.created_at.desc())
-            .first()
+            session.get(RFQInvitation, matches[0].invitation_id) if matches else None
         )
 
         if not invitation:
@@ -287,21 +273,11 @@ class RFQOrchestrator:
             }
 
         # ── Guard: warn when multiple active RFQs match the same phone ──
-        active_rfq_count = (
-            session.query(func.count(distinct(RFQ.id)))
-            .join(RFQInvitation, RFQInvitation.rfq_id == RFQ.id)
-            .filter(
-                RFQInvitation.recipient_phone.in_(phone_variants),
-                RFQInvitation.channel == RFQInvitationChannel.whatsapp,
-                RFQ.state.in_([RFQState.sent, RFQState.quoted]),
-            )
-            .scalar()
-        )
-        if active_rfq_count > 1:
+        if len(matches) > 1:
             logger.warning(
                 "orchestrator_multi_rfq_same_phone",
                 from_phone=msg.from_phone,
-                active_rfq_count=active_rfq_count,
+                active_rfq_count=len(matches),
                 selected_rfq_id=str(invitation.rfq_id),
                 selected_rfq_number=invitation.rfq_number,
             )
@@ -333,11 +309,30 @@ class RFQOrchestrator:
                 "text": msg.text,
             }
 
+        sender_name = msg.sender_name or invitation.recipient_name
+
+        # ── Fast path: plain fixed-price replies skip the LLM ──
+        # Only outright prices that name a currency are booked from here.
+        # ``RFQQuote`` has no premium field, so a premium (``+15``, ``flat``)
+        # would be stored as an outright price — those go through the LLM
+        # and Guard 3 like any other reply.
+        parsed = QuoteFastParser.parse(msg.text, sender_name=sender_name)
+        if parsed is not None and (
+            parsed.fixed_price_value is None
+            or not LLMAgent.should_auto_create_quote(parsed)
+        ):
+            parsed = None
+        fast_path = parsed is not None
+
         # ── Guard 2: classify intent FIRST ──
-        try:
-            classification = LLMAgent.classify_intent(msg.text)
-        except LLMUnavailableError:
-            classification = None  # proceed with parse_quote as fallback
+        classification = None
+        if not fast_path:
+            try:
+                classification = LLMAgent.classify_intent(msg.text)
+            except LLMCircuitOpenError:
+                return RFQOrchestrator._llm_circuit_open(msg, rfq)
+            except LLMUnavailableError:
+                pass  # proceed with parse_quote as fallback
 
         if classification and classification.intent != MessageIntent.quote:
             logger.info(
@@ -373,35 +368,37 @@ class RFQOrchestrator:
                 "confidence": classification.confidence,
             }
 
-        # Build RFQ context for the LLM
-        rfq_context = (
-            f"RFQ: {rfq.rfq_number}\n"
-            f"Commodity: {rfq.commodity}\n"
-            f"Quantity: {rfq.quantity_mt} MT\n"
-            f"Direction: {rfq.direction.value}\n"
-            f"Delivery: {rfq.delivery_window_start} to {rfq.delivery_window_end}"
-        )
-
-        try:
-            parsed = LLMAgent.parse_quote_message(
-                rfq_context=rfq_context,
-                raw_message=msg.text,
-                sender_name=msg.sender_name or invitation.recipient_name,
-            )
-        except LLMUnavailableError as exc:
-            logger.error(
-                "orchestrator_llm_unavailable",
-                rfq_id=str(rfq.id),
-                error=str(exc),
+        if not fast_path:
+            # Build RFQ context for the LLM
+            rfq_context = (
+                f"RFQ: {rfq.rfq_number}\n"
+                f"Commodity: {rfq.commodity}\n"
+                f"Quantity: {rfq.quantity_mt} MT\n"
+                f"Direction: {rfq.direction.value}\n"
+                f"Delivery: {rfq.delivery_window_start} to {rfq.delivery_window_end}"
             )
-            return {
-                "message_id": msg.message_id,
-                "status": "llm_unavailable",
-                "rfq_id": str(rfq.id),
-            }
+            try:
+                parsed = LLMAgent.parse_quote_message(
+                    rfq_context=rfq_context,
+                    raw_message=msg.text,
+                    sender_name=sender_name,
+                )
+            except LLMCircuitOpenError:
+                return RFQOrchestrator._llm_circuit_open(msg, rfq)
+            except LLMUnavailableError as exc:
+                logger.error(
+                    "orchestrator_llm_unavailable",
+                    rfq_id=str(rfq.id),
+                    error=str(exc),
+                )
+                return {
+                    "message_id": msg.message_id,
+                    "status": "llm_unavailable",
+                    "rfq_id": str(rfq.id),
+                }
 
         logger.info(
-            "orchestrator_llm_parsed",
+            "orchestrator_fast_parsed" if fast_path else "orchestrator_llm_parsed",
             rfq_id=str(rfq.id),
             intent=parsed.intent.value,
             confidence=parsed.confidence,
@@ -414,7 +411,11 @@ class RFQOrchestrator:
                 if parsed.fixed_price_value is not None
                 else (parsed.premium_discount or 0)
             )
-            if not RFQOrchestrator._price_appears_in_text(price_val, msg.text):
+            # The fast path only books prices it read from the text, so
+            # only LLM output is checked.
+            if not fast_path and not RFQOrchestrator._price_appears_in_text(
+                price_val, msg.text
+            ):
                 logger.warning(
                     "orchestrator_hallucinated_price_blocked",
                     rfq_id=str(rfq.id),
@@ -497,6 +498,22 @@ class RFQOrchestrator:
             "parsed": parsed.model_dump(mode="json"),
         }
 
+    @staticmethod
+    def _llm_circuit_open(msg: WhatsAppInboundMessage, rfq: RFQ) -> dict:
+        """Hand the message to a human at once instead of waiting on the LLM."""
+        logger.warning(
+            "orchestrator_llm_circuit_open",
+            rfq_id=str(rfq.id),
+            message_id=msg.message_id,
+        )
+        return {
+            "message_id": msg.message_id,
+            "status": "needs_human_review",
+            "rfq_id": str(rfq.id),
+            "reason": "llm_circuit_open",
+            "text": msg.text,
+        }
+
     @staticmethod
     def _auto_create_quote(
         session: Session,
@@ -527,6 +544,8 @@ class RFQOrchestrator:
 
         try:
             quote = RFQService.submit_quote(session, rfq.id, quote_payload)
+            # submit_quote stages the ranking-cache update; this commit applies
+            # it and pushes ``ranking_updated`` to WebSocket subscribers.
             session.commit()
             logger.info(
                 "orchestrator_auto_quote_created",
@@ -604,6 +623,7 @@ class RFQOrchestrator:
         WhatsAppService.send_text_message(
             phone=invitation.recipient_phone,
             text=message,
+            priority=SendPriority.award,
         )
 
     @staticmethod
@@ -634,12 +654,73 @@ class RFQOrchestrator:
                 recipient_name=inv.recipient_name,
                 rfq_number=rfq.rfq_number,
             )
-            WhatsAppService.send_text_message(phone=inv.recipient_phone, text=message)
+            WhatsAppService.send_text_message(
+                phone=inv.recipient_phone,
+                text=message,
+                priority=SendPriority.reject,
+            )
 
     # ------------------------------------------------------------------
     # 4. Check timeouts — called by the scheduled task
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _sent_rfq_response_stats(
+        session: Session,
+        created_before: datetime | None = None,
+    ) -> list:
+        """Response statistics for every live SENT RFQ in a single statement.
+
+        Invitations and quotes are each pre-aggregated per ``rfq_id`` and
+        LEFT JOINed onto ``rfqs``, so the cost is one round-trip regardless
+        of how many RFQs are open (and without an invitation-by-quote
+        cross product).  Both aggregates are restricted to the selected
+        RFQs, so invitations and quotes of closed RFQs are never scanned.
+        Each row exposes ``id``, ``rfq_number``, ``total_recipients``
+        (distinct invitation phones) and ``responded`` (distinct quoting
+        counterparties — the size of the latest-quote map).
+        """
+        live = [RFQ.state == RFQState.sent, RFQ.deleted_at.is_(None)]
+        if created_before is not None:
+            live.append(RFQ.created_at <= created_before)
+        live_ids = session.query(RFQ.id).filter(*live).scalar_subquery()
+
+        invitation_stats = (
+            session.query(
+                RFQInvitation.rfq_id.label("rfq_id"),
+                func.count(distinct(RFQInvitation.recipient_phone)).label(
+                    "total_recipients"
+                ),
+            )
+            .filter(RFQInvitation.rfq_id.in_(live_ids))
+            .group_by(RFQInvitation.rfq_id)
+            .subquery()
+        )
+        quote_stats = (
+            session.query(
+                RFQQuote.rfq_id.label("rfq_id"),
+                func.count(distinct(RFQQuote.counterparty_id)).label("responded"),
+            )
+            .filter(RFQQuote.rfq_id.in_(live_ids))
+            .group_by(RFQQuote.rfq_id)
+            .subquery()
+        )
+
+        query = (
+            session.query(
+                RFQ.id,
+                RFQ.rfq_number,
+                func.coalesce(invitation_stats.c.total_recipients, 0).label(
+                    "total_recipients"
+                ),
+                func.coalesce(quote_stats.c.responded, 0).label("responded"),
+            )
+            .outerjoin(invitation_stats, invitation_stats.c.rfq_id == RFQ.id)
+            .outerjoin(quote_stats, quote_stats.c.rfq_id == RFQ.id)
+            .filter(*live)
+        )
+        return query.order_by(RFQ.created_at, RFQ.id).all()
+
     @staticmethod
     def check_rfq_timeouts(
         session: Session,
@@ -651,29 +732,18 @@ class RFQOrchestrator:
         Returns a list of dicts with rfq_id, rfq_number, quotes_count
         for observability and UI alerting.
         """
-        from datetime import timedelta
-
         cutoff = now_utc() - timedelta(hours=timeout_hours)
 
-        stale_rfqs = (
-            session.query(RFQ)
-            .filter(
-                RFQ.state == RFQState.sent,
-                RFQ.created_at <= cutoff,
-                RFQ.deleted_at.is_(None),
-            )
-            .all()
-        )
-
         flagged: list[dict] = []
-        for rfq in stale_rfqs:
-            latest_quotes = RFQService.get_latest_trade_quotes(session, rfq.id)
+        for row in RFQOrchestrator._sent_rfq_response_stats(
+            session, created_before=cutoff
+        ):
             flagged.append(
                 {
-                    "rfq_id": str(rfq.id),
-                    "rfq_number": rfq.rfq_number,
-                    "quotes_count": len(latest_quotes),
-                    "has_quotes": bool(latest_quotes),
+                    "rfq_id": str(row.id),
+                    "rfq_number": row.rfq_number,
+                    "quotes_count": row.responded,
+                    "has_quotes": row.responded > 0,
                     "hours_elapsed": timeout_hours,
                 }
             )
@@ -701,43 +771,23 @@ class RFQOrchestrator:
         Does NOT auto-send reminders — the trader decides via the
         Refresh action in the UI.  Returns observability data.
         """
-        sent_rfqs = (
-            session.query(RFQ)
-            .filter(
-                RFQ.state == RFQState.sent,
-                RFQ.deleted_at.is_(None),
-            )
-            .all()
-        )
-
         flagged: list[dict] = []
-        for rfq in sent_rfqs:
-            invitations = (
-                session.query(RFQInvitation)
-                .filter(RFQInvitation.rfq_id == rfq.id)
-                .all()
-            )
-            if not invitations:
+        for row in RFQOrchestrator._sent_rfq_response_stats(session):
+            if not row.total_recipients:
                 continue
 
-            unique_recipients = {inv.recipient_phone for inv in invitations}
-            quotes = RFQService.get_latest_trade_quotes(session, rfq.id)
-            responded = set(quotes.keys())
-            response_rate = (
-                len(responded) / len(unique_recipients) if unique_recipients else 0
-            )
-
+            response_rate = row.responded / row.total_recipients
             if response_rate >= min_response_rate:
                 continue
 
             flagged.append(
                 {
-                    "rfq_id": str(rfq.id),
-                    "rfq_number": rfq.rfq_number,
-                    "total_recipients": len(unique_recipients),
-                    "responded": len(responded),
+                    "rfq_id": str(row.id),
+                    "rfq_number": row.rfq_number,
+                    "total_recipients": row.total_recipients,
+                    "responded": row.responded,
                     "response_rate": round(response_rate, 2),
-                    "non_responders": len(unique_recipients - responded),
+                    "non_responders": max(row.total_recipients - row.responded, 0),
                 }
             )
 
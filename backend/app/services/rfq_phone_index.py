@@ -0,0 +1,271 @@
+"""Phone → active RFQ index for inbound sender matching.
+
+Every inbound WhatsApp message has to find the RFQ its sender is replying
+to.  Matching on ``rfq_invitations.recipient_phone`` needs an ``IN`` list
+of phone variants, a join on ``rfqs`` and a second ``count(distinct)``
+query, on a table that grows with every refresh.  Instead:
+
+- ``rfq_phone_index`` holds one row per (normalised phone, channel, RFQ)
+  with the RFQ's state, behind a composite index on
+  ``(phone_key, channel, rfq_state)``.  Rows are written from SQLAlchemy
+  flush events — a new invitation upserts its row, an RFQ state change
+  updates every row of that RFQ — so no service has to remember to.
+- :class:`RFQPhoneIndex` answers "which RFQs is this phone active on,
+  newest first" with one indexed query, and keeps the answer per phone in
+  a small in-process map.  Entries for the phones touched by a commit are
+  dropped after that commit and the phones are announced on a cross-worker
+  bus (``create_pubsub``, separate channel), so the other workers drop
+  theirs too; when a worker's listener reconnects it drops everything.
+  Entries also expire after ``ttl_seconds``, which bounds staleness with
+  the in-process ``memory`` bus and for writes made outside the ORM.
+
+Phones are normalised with ``sender_key`` (digits only, Brazilian mobiles
+without the extra ``9``), the same key the inbound queue uses.
+
+Configurable via env vars:
+    RFQ_PHONE_INDEX_CHANNEL       Default ``rfq_phone_index`` — bus channel
+    RFQ_PHONE_INDEX_TTL_SECONDS   Default 15 — ``0`` disables the map.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session, attributes
+
+from app.core.logging import get_logger
+from app.models.rfqs import (
+    RFQ,
+    RFQInvitation,
+    RFQInvitationChannel,
+    RFQPhoneIndexEntry,
+    RFQState,
+)
+from app.services.inbound_worker_pool import sender_key
+from app.services.ws_pubsub import BroadcastEvent, PubSub, create_pubsub
+
+logger = get_logger()
+
+Clock = Callable[[], float]
+
+TOPIC = "rfq_phone_index"
+
+ACTIVE_STATES = (RFQState.sent, RFQState.quoted)
+
+_PENDING_KEY = "rfq_phone_index_pending"
+_MAX_PHONES = 10_000
+
+
+@dataclass(frozen=True)
+class PhoneMatch:
+    """An RFQ the phone can quote on, and the newest invitation sent to it."""
+
+    rfq_id: uuid.UUID
+    invitation_id: uuid.UUID
+
+
+class RFQPhoneIndex:
+    """Indexed lookup of a sender's active RFQs, with a per-phone memo."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 15.0,
+        max_phones: int = _MAX_PHONES,
+        clock: Clock = time.monotonic,
+        bus: PubSub | None = None,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_phones = max_phones
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._active: OrderedDict[tuple[str, str], tuple[float, list[PhoneMatch]]] = (
+            OrderedDict()
+        )
+        # Bumped on every invalidation; a lookup only memoises its result
+        # if nothing was invalidated while it queried.
+        self._version = 0
+        self._origin = uuid.uuid4().hex
+        self._bus = bus
+        if bus is not None:
+            bus.subscribe(self._on_event)
+            bus.subscribe_gaps(lambda _seq: self.clear())
+
+    def active_matches(
+        self,
+        session: Session,
+        phone: str,
+        channel: RFQInvitationChannel = RFQInvitationChannel.whatsapp,
+    ) -> list[PhoneMatch]:
+        """RFQs in SENT / QUOTED with an invitation to *phone*, newest RFQ first."""
+        key = (sender_key(phone), channel.value)
+        with self._lock:
+            entry = self._active.get(key)
+            if entry is not None and entry[0] > self._clock():
+                self._active.move_to_end(key)
+                return list(entry[1])
+            version = self._version
+
+        idx = RFQPhoneIndexEntry
+        rows = session.execute(
+            select(idx.rfq_id, idx.invitation_id)
+            .join(RFQ, RFQ.id == idx.rfq_id)
+            .where(
+                idx.phone_key == key[0],
+                idx.channel == channel,
+                idx.rfq_state.in_(ACTIVE_STATES),
+            )
+            .order_by(RFQ.created_at.desc(), RFQ.id)
+        ).all()
+        matches = [PhoneMatch(rfq_id=r, invitation_id=i) for r, i in rows]
+
+        if self._ttl > 0:
+            with self._lock:
+                if version == self._version:
+                    self._active[key] = (self._clock() + self._ttl, matches)
+                    self._active.move_to_end(key)
+                    while len(self._active) > self._max_phones:
+                        self._active.popitem(last=False)
+        return list(matches)
+
+    def invalidate(self, phone_keys: set[str]) -> None:
+        """Forget memoised matches for *phone_keys* (already normalised),
+        here and on every other worker.
+        """
+        self._forget(phone_keys)
+        if self._bus is None:
+            return
+        try:
+            self._bus.publish(
+                TOPIC,
+                TOPIC,
+                "invalidated",
+                {"origin": self._origin, "phones": sorted(phone_keys)},
+            )
+        except Exception:
+            logger.warning("rfq_phone_index_announce_failed", exc_info=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._active.clear()
+
+    def close(self) -> None:
+        """Stop listening for other workers' invalidations and empty the map."""
+        bus, self._bus = self._bus, None
+        if bus is not None:
+            bus.close()
+        self.clear()
+
+    def _on_event(self, evt: BroadcastEvent) -> None:
+        if evt.topic == TOPIC and evt.data.get("origin") != self._origin:
+            self._forget(set(evt.data.get("phones", [])))
+
+    def _forget(self, phone_keys: set[str]) -> None:
+        with self._lock:
+            self._version += 1
+            for key in [k for k in self._active if k[0] in phone_keys]:
+                del self._active[key]
+
+
+# ---------------------------------------------------------------------------
+# Index maintenance (flush events)
+# ---------------------------------------------------------------------------
+
+
+def _upsert_invitation(session: Session, inv: RFQInvitation) -> str:
+    phone_key = sender_key(inv.recipient_phone)
+    conn = session.connection()
+    idx = RFQPhoneIndexEntry.__table__
+    rfqs = RFQ.__table__
+    state = conn.execute(select(rfqs.c.state).where(rfqs.c.id == inv.rfq_id)).scalar()
+    if state is None:
+        return phone_key
+    result = conn.execute(
+        update(idx)
+        .where(
+            idx.c.phone_key == phone_key,
+            idx.c.channel == inv.channel,
+            idx.c.rfq_id == inv.rfq_id,
+        )
+        .values(invitation_id=inv.id, rfq_state=state)
+    )
+    if result.rowcount == 0:
+        conn.execute(
+            insert(idx).values(
+                id=uuid.uuid4(),
+                phone_key=phone_key,
+                channel=inv.channel,
+                rfq_id=inv.rfq_id,
+                invitation_id=inv.id,
+                rfq_state=state,
+            )
+        )
+    return phone_key
+
+
+def _sync_rfq_state(session: Session, rfq: RFQ) -> set[str]:
+    conn = session.connection()
+    idx = RFQPhoneIndexEntry.__table__
+    conn.execute(
+        update(idx).where(idx.c.rfq_id == rfq.id).values(rfq_state=rfq.state)
+    )
+    return set(
+        conn.execute(select(idx.c.phone_key).where(idx.c.rfq_id == rfq.id)).scalars()
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_index(session: Session, _flush_context) -> None:
+    touched: set[str] = set()
+    for obj in session.new:
+        if isinstance(obj, RFQInvitation):
+            touched.add(_upsert_invitation(session, obj))
+    for obj in session.dirty:
+        if isinstance(obj, RFQ) and attributes.get_history(obj, "state").has_changes():
+            touched |= _sync_rfq_state(session, obj)
+    if touched:
+        session.info.setdefault(_PENDING_KEY, set()).update(touched)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    touched = session.info.pop(_PENDING_KEY, None)
+    if touched:
+        get_phone_index().invalidate(touched)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+_index: RFQPhoneIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_phone_index() -> RFQPhoneIndex:
+    """Return the process-wide index, creating it on first use."""
+    global _index  # noqa: PLW0603
+    with _index_lock:
+        if _index is None:
+            _index = RFQPhoneIndex(
+                ttl_seconds=float(os.getenv("RFQ_PHONE_INDEX_TTL_SECONDS", "15")),
+                bus=create_pubsub(os.getenv("RFQ_PHONE_INDEX_CHANNEL", TOPIC)),
+            )
+        return _index
+
+
+def shutdown_phone_index() -> None:
+    """Stop the index's bus listener (FastAPI lifespan shutdown) and forget it."""
+    global _index
+    with _index_lock:
+        index, _index = _index, None
+    if index is not None:
+        index.close()
@@ -0,0 +1,339 @@
+"""In-memory RFQ ranking cache, maintained incrementally on quote writes.
+
+Traders poll ``/rfqs/{id}/trade-ranking`` and ``/rfqs/{id}/ranking`` while
+an RFQ is live.  Instead of re-querying and re-sorting every quote on each
+poll, the cache keeps per RFQ:
+
+- the latest quote per counterparty (``RFQQuoteRead`` snapshots), and
+- the materialised ``TradeRankingRead`` built from them by
+  ``RFQService.rank_trade_quotes`` — so tie / unit-mismatch failure codes
+  are identical to the uncached path.
+
+Reads return the materialised ranking (O(1)).  Writes are staged on the
+SQLAlchemy session and applied only after the transaction commits, so a
+rolled-back quote never reaches the cache.  Each applied trade-ranking
+change is pushed over the WebSocket ``ConnectionManager`` as a
+``ranking_updated`` event on the ``rfq`` topic.
+
+Spread rankings depend on two trade RFQs; they are cached on first read
+and dropped whenever either leg changes.
+
+The cache is per process.  Every applied change is announced on a
+cross-worker bus (``create_pubsub``, same backend as the WebSocket bus,
+separate channel) and the other workers drop their copy of that RFQ; when
+a worker's listener reconnects it drops everything, since announcements
+may have been missed.  With the in-process ``memory`` bus other workers
+never hear of a change, so entries also expire after a short TTL.  Award
+and auto-award still rank from the database so contracts are never
+created from cached state.
+
+Configurable via env vars:
+    RFQ_RANKING_CHANNEL             Default ``rfq_rankings`` — bus channel
+    RFQ_RANKING_CACHE_TTL_SECONDS   Default 5 without a shared bus, no
+                                    expiry with one; ``0`` never expires
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.logging import get_logger
+from app.models.quotes import RFQQuote
+from app.models.rfqs import RFQ, RFQDirection, RFQIntent
+from app.schemas.rfq import RFQQuoteRead, SpreadRankingRead, TradeRankingRead
+from app.services.rfq_service import RFQService
+from app.services.ws_pubsub import BroadcastEvent, PubSub, create_pubsub
+
+logger = get_logger()
+
+TOPIC = "rfq_ranking"
+
+_PENDING_KEY = "rfq_ranking_cache_pending"
+_MAX_ENTRIES = 1024
+_DEFAULT_TTL_SECONDS = 5.0
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; freshly assigned values are aware.
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def _recency(quote: RFQQuoteRead) -> tuple[datetime, datetime, str]:
+    """Same ordering key as ``select_latest_quotes_by_counterparty``."""
+    return (_as_utc(quote.received_at), _as_utc(quote.created_at), str(quote.id))
+
+
+@dataclass
+class _TradeBook:
+    rfq_id: UUID
+    direction: RFQDirection
+    latest: dict[str, RFQQuoteRead]
+    ranking: TradeRankingRead
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def build(
+        cls, rfq_id: UUID, direction: RFQDirection, latest: dict[str, RFQQuoteRead]
+    ) -> _TradeBook:
+        ranking = RFQService.rank_trade_quotes(rfq_id, direction, latest)
+        return cls(rfq_id=rfq_id, direction=direction, latest=latest, ranking=ranking)
+
+    def apply(self, quote: RFQQuoteRead) -> bool:
+        """Fold *quote* in; return False when an equal-or-newer quote is held."""
+        current = self.latest.get(quote.counterparty_id)
+        if current is not None and _recency(current) >= _recency(quote):
+            return False
+        self.latest[quote.counterparty_id] = quote
+        self.ranking = RFQService.rank_trade_quotes(
+            self.rfq_id, self.direction, self.latest
+        )
+        return True
+
+
+class RFQRankingCache:
+    """Process-local ranking cache keyed by RFQ id."""
+
+    def __init__(
+        self, max_entries: int = _MAX_ENTRIES, bus: PubSub | None = None
+    ) -> None:
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._books: OrderedDict[UUID, _TradeBook] = OrderedDict()
+        self._spreads: OrderedDict[UUID, tuple[SpreadRankingRead, float]] = OrderedDict()
+        self._spread_deps: dict[UUID, set[UUID]] = {}
+        # Bumped on every applied write; a read that loaded from the DB only
+        # stores its result if no write landed in between.
+        self._version = 0
+        self._origin = uuid.uuid4().hex
+        self._bus: PubSub | None = None
+        self._ttl: float | None = None
+        self._bus_lock = threading.Lock()
+        if bus is not None:
+            self._attach(bus)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_trade_ranking(self, session: Session, rfq: RFQ) -> TradeRankingRead:
+        self._ensure_bus()
+        with self._lock:
+            book = self._books.get(rfq.id)
+            if book is not None and self._fresh(book.loaded_at):
+                self._books.move_to_end(rfq.id)
+                return book.ranking
+            version = self._version
+
+        latest = {
+            cp: RFQQuoteRead.model_validate(q)
+            for cp, q in RFQService.get_latest_trade_quotes(session, rfq.id).items()
+        }
+        book = _TradeBook.build(rfq.id, rfq.direction, latest)
+        with self._lock:
+            if version == self._version:
+                self._store(self._books, rfq.id, book)
+        return book.ranking
+
+    def get_spread_ranking(self, session: Session, rfq: RFQ) -> SpreadRankingRead:
+        self._ensure_bus()
+        with self._lock:
+            cached = self._spreads.get(rfq.id)
+            if cached is not None and self._fresh(cached[1]):
+                self._spreads.move_to_end(rfq.id)
+                return cached[0]
+            version = self._version
+
+        loaded_at = time.monotonic()
+        ranking = RFQService.compute_spread_ranking(session, rfq)
+        if rfq.intent != RFQIntent.spread:
+            return ranking
+        with self._lock:
+            if version == self._version:
+                self._store(self._spreads, rfq.id, (ranking, loaded_at))
+                for trade_id in (rfq.buy_trade_id, rfq.sell_trade_id):
+                    if trade_id is not None:
+                        self._spread_deps.setdefault(trade_id, set()).add(rfq.id)
+        return ranking
+
+    # ------------------------------------------------------------------
+    # Writes (staged on the session, applied after commit)
+    # ------------------------------------------------------------------
+
+    def record_quote(self, session: Session, rfq: RFQ, quote: RFQQuote) -> None:
+        """Stage a newly persisted *quote*; call after ``session.flush()``."""
+        # Reload so the snapshot carries exactly what the database returns
+        # (server-side created_at, driver datetime handling).
+        session.refresh(quote)
+        snapshot = RFQQuoteRead.model_validate(quote)
+        # Capture plain values: ORM attributes are expired once committed.
+        rfq_id, direction = rfq.id, rfq.direction
+        with self._lock:
+            book = self._books.get(rfq_id)
+            cached = book is not None and self._fresh(book.loaded_at)
+        if cached:
+            _stage(session, lambda: self._apply_quote(rfq_id, snapshot))
+            return
+        # No (fresh) book: build a complete one inside the transaction so
+        # the pushed ranking reflects every quote, not just this one.
+        self._stage_rebuild(session, rfq_id, direction)
+
+    def rebuild(self, session: Session, rfq: RFQ) -> None:
+        """Stage a ranking rebuilt from the database, pushed after commit —
+        for writes that cannot be folded in (e.g. a quote was deleted)."""
+        session.flush()
+        self._stage_rebuild(session, rfq.id, rfq.direction)
+
+    def invalidate(self, session: Session, rfq_id: UUID) -> None:
+        """Stage removal of *rfq_id*."""
+        _stage(session, lambda: self._drop(rfq_id))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._books.clear()
+            self._spreads.clear()
+            self._spread_deps.clear()
+            self._version += 1
+
+    def close(self) -> None:
+        """Stop listening for other workers' changes and empty the cache."""
+        with self._bus_lock:
+            bus, self._bus = self._bus, None
+        if bus is not None:
+            bus.close()
+        self.clear()
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+
+    def _ensure_bus(self) -> None:
+        if self._bus is None:
+            self._attach(None)
+
+    def _attach(self, bus: PubSub | None) -> None:
+        with self._bus_lock:
+            if self._bus is not None:
+                return
+            if bus is None:
+                bus = create_pubsub(os.getenv("RFQ_RANKING_CHANNEL", "rfq_rankings"))
+            bus.subscribe(self._on_event)
+            bus.subscribe_gaps(lambda _seq: self.clear())
+            default = None if bus.shared else _DEFAULT_TTL_SECONDS
+            raw = os.getenv("RFQ_RANKING_CACHE_TTL_SECONDS")
+            ttl = float(raw) if raw else default
+            self._ttl = ttl or None
+            self._bus = bus
+
+    def _fresh(self, loaded_at: float) -> bool:
+        return self._ttl is None or time.monotonic() - loaded_at < self._ttl
+
+    def _announce(self, rfq_id: UUID) -> None:
+        bus = self._bus
+        if bus is None:
+            return
+        try:
+            bus.publish(TOPIC, str(rfq_id), "changed", {"origin": self._origin})
+        except Exception:
+            logger.warning("rfq_ranking_announce_failed", rfq_id=str(rfq_id), exc_info=True)
+
+    def _on_event(self, evt: BroadcastEvent) -> None:
+        if evt.topic == TOPIC and evt.data.get("origin") != self._origin:
+            self._forget(UUID(evt.topic_id))
+
+    def _stage_rebuild(
+        self, session: Session, rfq_id: UUID, direction: RFQDirection
+    ) -> None:
+        latest = {
+            cp: RFQQuoteRead.model_validate(q)
+            for cp, q in RFQService.get_latest_trade_quotes(session, rfq_id).items()
+        }
+        _stage(
+            session,
+            lambda: self._install_book(_TradeBook.build(rfq_id, direction, latest)),
+        )
+
+    def _store(self, table: OrderedDict, key: UUID, value: object) -> None:
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self._max_entries:
+            table.popitem(last=False)
+
+    def _drop_dependent_spreads(self, trade_id: UUID) -> None:
+        for spread_id in self._spread_deps.pop(trade_id, set()):
+            self._spreads.pop(spread_id, None)
+
+    def _apply_quote(self, rfq_id: UUID, quote: RFQQuoteRead) -> None:
+        with self._lock:
+            self._version += 1
+            self._drop_dependent_spreads(rfq_id)
+            book = self._books.get(rfq_id)
+            applied = book is not None and book.apply(quote)
+            ranking = book.ranking if applied else None
+        self._announce(rfq_id)
+        if ranking is not None:
+            _push(rfq_id, ranking)
+
+    def _install_book(self, book: _TradeBook) -> None:
+        with self._lock:
+            self._version += 1
+            self._drop_dependent_spreads(book.rfq_id)
+            self._store(self._books, book.rfq_id, book)
+        self._announce(book.rfq_id)
+        _push(book.rfq_id, book.ranking)
+
+    def _drop(self, rfq_id: UUID) -> None:
+        self._forget(rfq_id)
+        self._announce(rfq_id)
+
+    def _forget(self, rfq_id: UUID) -> None:
+        with self._lock:
+            self._version += 1
+            self._drop_dependent_spreads(rfq_id)
+            self._books.pop(rfq_id, None)
+            self._spreads.pop(rfq_id, None)
+
+
+def _stage(session: Session, op: Callable[[], None]) -> None:
+    session.info.setdefault(_PENDING_KEY, []).append(op)
+
+
+def _push(rfq_id: UUID, ranking: TradeRankingRead) -> None:
+    from app.api.routes.ws import manager
+
+    try:
+        manager.broadcast_nowait(
+            "rfq", str(rfq_id), "ranking_updated", ranking.model_dump(mode="json")
+        )
+    except Exception:
+        logger.warning("rfq_ranking_push_failed", rfq_id=str(rfq_id), exc_info=True)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    for op in session.info.pop(_PENDING_KEY, []):
+        op()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# Singleton — shared by the RFQ routes and services
+ranking_cache = RFQRankingCache()
+
+
+def shutdown_ranking_cache() -> None:
+    """Stop the cache's bus listener (FastAPI lifespan shutdown)."""
+    ranking_cache.close()
@@ -13,7 +13,8 @@ from datetime import date
 from uuid import UUID
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased
 
 from app.models.contracts import HedgeClassification, HedgeContract, HedgeLegSide
 from app.models.counterparty import Counterparty, CounterpartyType
@@ -43,6 +44,7 @@ from app.schemas.rfq import (
 )
 from app.services.exposure_service import ExposureService
 from app.services.linkage_service import LinkageService
+from app.services.whatsapp_send_scheduler import SendPriority
 from app.services.whatsapp_service import WhatsAppService
 from app.core.logging import get_logger
 from app.core.utils import now_utc
@@ -130,10 +132,47 @@ class RFQService:
             latest[current_cp] = best
         return latest
 
+    @staticmethod
+    def get_latest_quotes_for_rfqs(
+        session: Session, rfq_ids: list[UUID]
+    ) -> dict[UUID, dict[str, RFQQuote]]:
+        """Latest quote per counterparty for each RFQ in *rfq_ids*, in one query.
+
+        Database-side equivalent of ``select_latest_quotes_by_counterparty``:
+        ``ROW_NUMBER() OVER (PARTITION BY rfq_id, counterparty_id ORDER BY
+        received_at DESC, created_at DESC, id DESC)`` keeps only row 1, so
+        superseded quotes are never loaded.  RFQs without quotes map to ``{}``.
+        """
+        result: dict[UUID, dict[str, RFQQuote]] = {rid: {} for rid in rfq_ids}
+        if not rfq_ids:
+            return result
+
+        row_number = (
+            func.row_number()
+            .over(
+                partition_by=(RFQQuote.rfq_id, RFQQuote.counterparty_id),
+                order_by=(
+                    RFQQuote.received_at.desc(),
+                    RFQQuote.created_at.desc(),
+                    RFQQuote.id.desc(),
+                ),
+            )
+            .label("rn")
+        )
+        ranked = (
+            select(RFQQuote, row_number)
+            .where(RFQQuote.rfq_id.in_(rfq_ids))
+            .subquery()
+        )
+        latest_quote = aliased(RFQQuote, ranked)
+        rows = session.execute(select(latest_quote).where(ranked.c.rn == 1)).scalars()
+        for quote in rows:
+            result.setdefault(quote.rfq_id, {})[quote.counterparty_id] = quote
+        return result
+
     @staticmethod
     def get_latest_trade_quotes(session: Session, rfq_id: UUID) -> dict[str, RFQQuote]:
-        quotes = session.query(RFQQuote).filter(RFQQuote.rfq_id == rfq_id).all()
-        return RFQService.select_latest_quotes_by_counterparty(quotes)
+        return RFQService.get_latest_quotes_for_rfqs(session, [rfq_id])[rfq_id]
 
     @staticmethod
     def determine_contract_legs(
@@ -151,9 +190,22 @@ class RFQService:
     def compute_trade_ranking(
         rfq: RFQ, latest_quotes: dict[str, RFQQuote]
     ) -> TradeRankingRead:
+        return RFQService.rank_trade_quotes(rfq.id, rfq.direction, latest_quotes)
+
+    @staticmethod
+    def rank_trade_quotes(
+        rfq_id: UUID,
+        direction: RFQDirection,
+        latest_quotes: dict[str, RFQQuote] | dict[str, RFQQuoteRead],
+    ) -> TradeRankingRead:
+        """Rank the latest quote per counterparty for a trade RFQ.
+
+        Accepts ORM quotes or ``RFQQuoteRead`` snapshots so the in-memory
+        ranking cache produces exactly the same payloads and failure codes.
+        """
         if not latest_quotes:
             return TradeRankingRead(
-                rfq_id=rfq.id,
+                rfq_id=rfq_id,
                 status="FAILURE",
                 failure_code=TradeRankingFailureCode.no_eligible_quotes,
                 failure_reason="Zero eligible quotes",
@@ -166,7 +218,7 @@ class RFQService:
             canonical = RFQService.canonicalize_fixed_price_unit(q.fixed_price_unit)
             if not canonical:
                 return TradeRankingRead(
-                    rfq_id=rfq.id,
+                    rfq_id=rfq_id,
                     status="FAILURE",
                     failure_code=TradeRankingFailureCode.non_comparable,
                     failure_reason="Non-canonical fixed_price_unit",
@@ -176,21 +228,21 @@ class RFQService:
 
         if len(set(canonical_units)) != 1:
             return TradeRankingRead(
-                rfq_id=rfq.id,
+                rfq_id=rfq_id,
                 status="FAILURE",
                 failure_code=TradeRankingFailureCode.non_comparable,
                 failure_reason="fixed_price_unit mismatch",
                 ranking=[],
             )
 
-        reverse = rfq.direction == RFQDirection.sell
+        reverse = direction == RFQDirection.sell
         ordered = sorted(
             quotes, key=lambda q: float(q.fixed_price_value), reverse=reverse
         )
         values = [float(q.fixed_price_value) for q in ordered]
         if len(set(values)) != len(values):
             return TradeRankingRead(
-                rfq_id=rfq.id,
+                rfq_id=rfq_id,
                 status="FAILURE",
                 failure_code=TradeRankingFailureCode.tie,
                 failure_reason="Tie detected",
@@ -201,7 +253,7 @@ class RFQService:
             TradeRankingEntry(rank=i + 1, quote=RFQQuoteRead.model_validate(q))
             for i, q in enumerate(ordered)
         ]
-        return TradeRankingRead(rfq_id=rfq.id, status="SUCCESS", ranking=ranking)
+        return TradeRankingRead(rfq_id=rfq_id, status="SUCCESS", ranking=ranking)
 
     @staticmethod
     def compute_spread_ranking(session: Session, rfq: RFQ) -> SpreadRankingRead:
@@ -234,13 +286,11 @@ class RFQService:
                 ranking=[],
             )
 
-        buy_quotes = session.query(RFQQuote).filter(RFQQuote.rfq_id == buy_rfq.id).all()
-        sell_quotes = (
-            session.query(RFQQuote).filter(RFQQuote.rfq_id == sell_rfq.id).all()
+        latest_by_rfq = RFQService.get_latest_quotes_for_rfqs(
+            session, [buy_rfq.id, sell_rfq.id]
         )
-
-        buy_latest = RFQService.select_latest_quotes_by_counterparty(buy_quotes)
-        sell_latest = RFQService.select_latest_quotes_by_counterparty(sell_quotes)
+        buy_latest = latest_by_rfq[buy_rfq.id]
+        sell_latest = latest_by_rfq[sell_rfq.id]
 
         eligible_counterparties = sorted(
             set(buy_latest.keys()) & set(sell_latest.keys())
@@ -416,6 +466,8 @@ class RFQService:
         session.add(rfq)
         session.flush()
 
+        # Validate every recipient before sending anything.
+        recipients: list[tuple[Counterparty, str]] = []
         for invitation in payload.invitations:
             # Look up counterparty from DB to get whatsapp_phone
             cp = session.get(Counterparty, invitation.counterparty_id)
@@ -430,12 +482,6 @@ class RFQService:
                     detail=f"Counterparty {cp.name} has no WhatsApp phone number",
                 )
 
-            phone = cp.whatsapp_phone
-            idem_key = f"{rfq.rfq_number}:{cp.id}"
-            send_status = RFQInvitationStatus.queued
-            provider_message_id = ""
-
-            # --- Send WhatsApp message ---
             # Use the preview text matching the counterparty language:
             # bank_br → Portuguese, all others → English LME
             fallback_body = (
@@ -448,11 +494,17 @@ class RFQService:
                 message_body = payload.text_en
             else:
                 message_body = fallback_body
+            recipients.append((cp, message_body))
 
-            result = WhatsAppService.send_text_message(
-                phone=phone,
-                text=message_body,
-            )
+        # --- Send WhatsApp messages (concurrent fan-out) ---
+        results = WhatsAppService.send_text_messages(
+            [(cp.whatsapp_phone, body) for cp, body in recipients]
+        )
+
+        for (cp, message_body), result in zip(recipients, results, strict=True):
+            phone = cp.whatsapp_phone
+            idem_key = f"{rfq.rfq_number}:{cp.id}"
+            provider_message_id = ""
             if result.success:
                 send_status = RFQInvitationStatus.sent
                 provider_message_id = result.provider_message_id or ""
@@ -569,6 +621,10 @@ class RFQService:
         session.add(quote)
         session.flush()
 
+        from app.services.rfq_ranking_cache import ranking_cache
+
+        ranking_cache.record_quote(session, rfq, quote)
+
         if rfq.state == RFQState.sent:
             rfq.state = RFQState.quoted
             session.add(
@@ -593,15 +649,20 @@ class RFQService:
             )
             .all()
         )
+        trade_ids = {
+            trade_id
+            for spread_rfq in parent_spreads
+            for trade_id in (spread_rfq.buy_trade_id, spread_rfq.sell_trade_id)
+            if trade_id is not None
+        }
+        latest_by_rfq = RFQService.get_latest_quotes_for_rfqs(
+            session, list(trade_ids)
+        )
         for spread_rfq in parent_spreads:
             if spread_rfq.buy_trade_id is None or spread_rfq.sell_trade_id is None:
                 continue
-            buy_latest = RFQService.get_latest_trade_quotes(
-                session, spread_rfq.buy_trade_id
-            )
-            sell_latest = RFQService.get_latest_trade_quotes(
-                session, spread_rfq.sell_trade_id
-            )
+            buy_latest = latest_by_rfq[spread_rfq.buy_trade_id]
+            sell_latest = latest_by_rfq[spread_rfq.sell_trade_id]
             if set(buy_latest.keys()) & set(sell_latest.keys()):
                 spread_rfq.state = RFQState.quoted
                 session.add(
@@ -733,6 +794,7 @@ class RFQService:
                 result = WhatsAppService.send_text_message(
                     phone=current_phone,
                     text=message_body,
+                    priority=SendPriority.refresh,
                 )
                 if result.success:
                     send_status = RFQInvitationStatus.sent
@@ -808,7 +870,9 @@ class RFQService:
         if cp and cp.whatsapp_phone:
             msg = _pick_action_message(cp, "reject")
             result = WhatsAppService.send_text_message(
-                phone=cp.whatsapp_phone, text=msg
+                phone=cp.whatsapp_phone,
+                text=msg,
+                priority=SendPriority.reject,
             )
             if result.success:
                 _logger.info(
@@ -827,6 +891,10 @@ class RFQService:
 
         session.delete(quote)
 
+        from app.services.rfq_ranking_cache import ranking_cache
+
+        ranking_cache.rebuild(session, rfq)
+
         # Check if there are remaining quotes — if none, revert to SENT
         remaining = (
             session.query(RFQQuote)
@@ -907,6 +975,7 @@ class RFQService:
             result = WhatsAppService.send_text_message(
                 phone=current_phone,
                 text=message_body,
+                priority=SendPriority.refresh,
             )
             if result.success:
                 send_status = RFQInvitationStatus.sent
@@ -1010,7 +1079,9 @@ class RFQService:
         if cp and cp.whatsapp_phone:
             msg = _pick_action_message(cp, "contract")
             result = WhatsAppService.send_text_message(
-                phone=cp.whatsapp_phone, text=msg
+                phone=cp.whatsapp_phone,
+                text=msg,
+                priority=SendPriority.award,
             )
             if result.success:
                 _logger.info(
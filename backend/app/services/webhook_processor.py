@@ -10,8 +10,9 @@ Supports two inbound providers:
 - **Meta Cloud API** — HMAC-SHA256 via ``X-Hub-Signature-256``
 - **Twilio**         — Request signature via ``X-Twilio-Signature``
 
-The queue is an in-process :class:`collections.deque` for now; it can be
-swapped for a durable message broker (Service Bus, Redis Streams) when needed.
+The queue here is an in-process :class:`collections.deque`.  Deployments
+with several workers set ``INBOUND_QUEUE_BACKEND=database`` to use the
+durable table in ``app.services.inbound_queue`` instead.
 """
 
 from __future__ import annotations
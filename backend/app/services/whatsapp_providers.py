@@ -9,13 +9,32 @@ Supports multiple backends for outbound WhatsApp messaging:
 The active provider is selected via the ``WHATSAPP_PROVIDER`` environment
 variable.  All providers implement :class:`WhatsAppProviderBase` and return
 :class:`WhatsAppSendResult`.
+
+Each provider also has ``*_async`` send methods.  Meta and Twilio run them
+on a shared keep-alive :class:`httpx.AsyncClient`, so a fan-out of N
+invitations costs about one provider round-trip instead of N sequential
+connect + request cycles.  Sync callers reach the async methods through
+:func:`run_outbound`, which runs coroutines on a dedicated background
+event loop that owns the client.
+
+Configurable via env vars:
+    WHATSAPP_SEND_CONCURRENCY          Default 8 — connections / sends in flight
+    WHATSAPP_OUTBOUND_TIMEOUT_SECONDS  Default 300 — longest a sync caller
+                                       waits on ``run_outbound``
 """
 
 from __future__ import annotations
 
 import abc
+import asyncio
+import json
 import os
-from typing import Any
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable
+from concurrent.futures import Future
+from typing import Any, TypeVar
 
 import httpx
 
@@ -24,6 +43,93 @@ from app.schemas.whatsapp import WhatsAppSendResult
 
 logger = get_logger()
 
+_T = TypeVar("_T")
+_SEND_TIMEOUT = 15.0
+
+
+# ---------------------------------------------------------------------------
+# Shared async HTTP client + outbound event loop
+# ---------------------------------------------------------------------------
+
+_outbound_loop: asyncio.AbstractEventLoop | None = None
+_outbound_thread: threading.Thread | None = None
+_outbound_lock = threading.Lock()
+_async_client: httpx.AsyncClient | None = None
+
+
+def _max_connections() -> int:
+    return int(os.getenv("WHATSAPP_SEND_CONCURRENCY", "8"))
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the keep-alive client; call only from the outbound loop."""
+    global _async_client  # noqa: PLW0603
+    if _async_client is None or _async_client.is_closed:
+        limit = _max_connections()
+        _async_client = httpx.AsyncClient(
+            timeout=_SEND_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=limit, max_keepalive_connections=limit
+            ),
+        )
+    return _async_client
+
+
+def _get_outbound_loop() -> asyncio.AbstractEventLoop:
+    global _outbound_loop, _outbound_thread
+    with _outbound_lock:
+        if _outbound_loop is None or _outbound_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="whatsapp-outbound", daemon=True
+            )
+            thread.start()
+            _outbound_loop, _outbound_thread = loop, thread
+        return _outbound_loop
+
+
+def _outbound_timeout() -> float:
+    return float(os.getenv("WHATSAPP_OUTBOUND_TIMEOUT_SECONDS", "300"))
+
+
+def run_outbound(coro: Awaitable[_T], timeout: float | None = None) -> _T:
+    """Run *coro* on the outbound loop and block until it finishes.
+
+    Raises :class:`TimeoutError` (and cancels *coro*) after *timeout*
+    seconds, default ``WHATSAPP_OUTBOUND_TIMEOUT_SECONDS``.  Code already
+    on the outbound loop must ``await`` instead — blocking there would
+    wait on itself forever.
+    """
+    if threading.current_thread() is _outbound_thread:
+        if asyncio.iscoroutine(coro):
+            coro.close()
+        raise RuntimeError("run_outbound() called on the outbound loop; await instead")
+    future: Future[_T] = asyncio.run_coroutine_threadsafe(
+        coro, _get_outbound_loop()  # type: ignore[arg-type]
+    )
+    try:
+        return future.result(timeout=_outbound_timeout() if timeout is None else timeout)
+    except TimeoutError:
+        future.cancel()
+        raise
+
+
+def shutdown_outbound() -> None:
+    """Close the shared client and stop the outbound loop (lifespan shutdown)."""
+    global _outbound_loop, _outbound_thread, _async_client  # noqa: PLW0603
+    with _outbound_lock:
+        loop, thread = _outbound_loop, _outbound_thread
+        _outbound_loop = _outbound_thread = None
+    if loop is None:
+        return
+    if _async_client is not None:
+        asyncio.run_coroutine_threadsafe(_async_client.aclose(), loop).result()
+        _async_client = None
+    loop.call_soon_threadsafe(loop.stop)
+    if thread is not None:
+        thread.join(timeout=5)
+    loop.close()
+
 
 # ---------------------------------------------------------------------------
 # Abstract base
@@ -47,6 +153,26 @@ class WhatsAppProviderBase(abc.ABC):
     ) -> WhatsAppSendResult:
         """Send a pre-approved template message."""
 
+    async def send_text_message_async(self, phone: str, text: str) -> WhatsAppSendResult:
+        """Async variant of :meth:`send_text_message`.
+
+        The default runs the blocking method in a worker thread; HTTP
+        providers override it to use the shared :class:`httpx.AsyncClient`.
+        """
+        return await asyncio.to_thread(self.send_text_message, phone, text)
+
+    async def send_template_message_async(
+        self,
+        phone: str,
+        template_name: str,
+        params: list[str] | None = None,
+        language_code: str = "pt_BR",
+    ) -> WhatsAppSendResult:
+        """Async variant of :meth:`send_template_message`."""
+        return await asyncio.to_thread(
+            self.send_template_message, phone, template_name, params, language_code
+        )
+
 
 # ---------------------------------------------------------------------------
 # Fake / test provider
@@ -54,9 +180,42 @@ class WhatsAppProviderBase(abc.ABC):
 
 
 class FakeWhatsAppProvider(WhatsAppProviderBase):
-    """No-op provider that logs calls but never makes HTTP requests."""
+    """No-op provider that logs calls but never makes HTTP requests.
+
+    Pass *max_per_window* to simulate a provider rate limit: sends beyond
+    that many per *window_seconds* fail with Meta's throughput error
+    (``130429``), as a real provider would answer with HTTP 429.
+    """
+
+    def __init__(
+        self,
+        max_per_window: int | None = None,
+        window_seconds: float = 1.0,
+    ) -> None:
+        self._max_per_window = max_per_window
+        self._window = window_seconds
+        self._sent_at: deque[float] = deque()
+        self._rate_lock = threading.Lock()
+
+    def _rate_limited(self) -> WhatsAppSendResult | None:
+        if self._max_per_window is None:
+            return None
+        now = time.monotonic()
+        with self._rate_lock:
+            while self._sent_at and now - self._sent_at[0] >= self._window:
+                self._sent_at.popleft()
+            if len(self._sent_at) >= self._max_per_window:
+                return WhatsAppSendResult(
+                    success=False,
+                    error_code="130429",
+                    error_message="Rate limit hit (simulated)",
+                )
+            self._sent_at.append(now)
+        return None
 
     def send_text_message(self, phone: str, text: str) -> WhatsAppSendResult:
+        if (limited := self._rate_limited()) is not None:
+            return limited
         logger.info("whatsapp_fake_send", to=phone, msg_type="text")
         return WhatsAppSendResult(
             success=True,
@@ -70,6 +229,8 @@ class FakeWhatsAppProvider(WhatsAppProviderBase):
         params: list[str] | None = None,
         language_code: str = "pt_BR",
     ) -> WhatsAppSendResult:
+        if (limited := self._rate_limited()) is not None:
+            return limited
         logger.info(
             "whatsapp_fake_send",
             to=phone,
@@ -81,6 +242,20 @@ class FakeWhatsAppProvider(WhatsAppProviderBase):
             provider_message_id=f"fake-{phone}",
         )
 
+    # No I/O — skip the thread hop of the base-class async defaults.
+
+    async def send_text_message_async(self, phone: str, text: str) -> WhatsAppSendResult:
+        return self.send_text_message(phone, text)
+
+    async def send_template_message_async(
+        self,
+        phone: str,
+        template_name: str,
+        params: list[str] | None = None,
+        language_code: str = "pt_BR",
+    ) -> WhatsAppSendResult:
+        return self.send_template_message(phone, template_name, params, language_code)
+
 
 # ---------------------------------------------------------------------------
 # Meta Cloud API provider (original implementation)
@@ -115,22 +290,22 @@ class MetaWhatsAppProvider(WhatsAppProviderBase):
             "Content-Type": "application/json",
         }
 
-    def send_text_message(self, phone: str, text: str) -> WhatsAppSendResult:
-        payload = {
+    @staticmethod
+    def _text_payload(phone: str, text: str) -> dict[str, Any]:
+        return {
             "messaging_product": "whatsapp",
             "to": phone,
             "type": "text",
             "text": {"body": text},
         }
-        return self._send(payload)
 
-    def send_template_message(
-        self,
+    @staticmethod
+    def _template_payload(
         phone: str,
         template_name: str,
-        params: list[str] | None = None,
-        language_code: str = "pt_BR",
-    ) -> WhatsAppSendResult:
+        params: list[str] | None,
+        language_code: str,
+    ) -> dict[str, Any]:
         components: list[dict[str, Any]] = []
         if params:
             components.append(
@@ -139,7 +314,7 @@ class MetaWhatsAppProvider(WhatsAppProviderBase):
                     "parameters": [{"type": "text", "text": p} for p in params],
                 }
             )
-        payload = {
+        return {
             "messaging_product": "whatsapp",
             "to": phone,
             "type": "template",
@@ -149,12 +324,61 @@ class MetaWhatsAppProvider(WhatsAppProviderBase):
                 "components": components,
             },
         }
-        return self._send(payload)
+
+    def send_text_message(self, phone: str, text: str) -> WhatsAppSendResult:
+        return self._send(self._text_payload(phone, text))
+
+    def send_template_message(
+        self,
+        phone: str,
+        template_name: str,
+        params: list[str] | None = None,
+        language_code: str = "pt_BR",
+    ) -> WhatsAppSendResult:
+        return self._send(
+            self._template_payload(phone, template_name, params, language_code)
+        )
+
+    async def send_text_message_async(self, phone: str, text: str) -> WhatsAppSendResult:
+        return await self._send_async(self._text_payload(phone, text))
+
+    async def send_template_message_async(
+        self,
+        phone: str,
+        template_name: str,
+        params: list[str] | None = None,
+        language_code: str = "pt_BR",
+    ) -> WhatsAppSendResult:
+        return await self._send_async(
+            self._template_payload(phone, template_name, params, language_code)
+        )
 
     def _send(self, payload: dict[str, Any]) -> WhatsAppSendResult:
         url = self._build_url()
         headers = self._headers()
+        self._log_attempt(payload)
 
+        try:
+            response = httpx.post(
+                url, json=payload, headers=headers, timeout=_SEND_TIMEOUT
+            )
+            return self._parse_response(response, payload)
+        except Exception as exc:
+            return self._exception_result(exc, payload)
+
+    async def _send_async(self, payload: dict[str, Any]) -> WhatsAppSendResult:
+        url = self._build_url()
+        headers = self._headers()
+        self._log_attempt(payload)
+
+        try:
+            response = await get_async_client().post(url, json=payload, headers=headers)
+            return self._parse_response(response, payload)
+        except Exception as exc:
+            return self._exception_result(exc, payload)
+
+    @staticmethod
+    def _log_attempt(payload: dict[str, Any]) -> None:
         logger.info(
             "whatsapp_send_attempt",
             provider="meta",
@@ -162,58 +386,63 @@ class MetaWhatsAppProvider(WhatsAppProviderBase):
             msg_type=payload.get("type"),
         )
 
-        try:
-            response = httpx.post(url, json=payload, headers=headers, timeout=15.0)
-            data = response.json()
-
-            if response.is_success:
-                msg_id = ""
-                messages = data.get("messages", [])
-                if messages:
-                    msg_id = messages[0].get("id", "")
-                logger.info(
-                    "whatsapp_send_success",
-                    provider="meta",
-                    to=payload.get("to"),
-                    provider_message_id=msg_id,
-                )
-                return WhatsAppSendResult(success=True, provider_message_id=msg_id)
+    @staticmethod
+    def _parse_response(
+        response: httpx.Response, payload: dict[str, Any]
+    ) -> WhatsAppSendResult:
+        data = response.json()
 
-            error = data.get("error", {})
-            logger.error(
-                "whatsapp_send_api_error",
+        if response.is_success:
+            msg_id = ""
+            messages = data.get("messages", [])
+            if messages:
+                msg_id = messages[0].get("id", "")
+            logger.info(
+                "whatsapp_send_success",
                 provider="meta",
                 to=payload.get("to"),
-                status=response.status_code,
-                error_code=str(error.get("code", "")),
-                error_message=error.get("message", ""),
-            )
-            return WhatsAppSendResult(
-                success=False,
-                error_code=str(error.get("code", "")),
-                error_message=error.get("message", "Unknown API error"),
+                provider_message_id=msg_id,
             )
+            return WhatsAppSendResult(success=True, provider_message_id=msg_id)
+
+        error = data.get("error", {})
+        logger.error(
+            "whatsapp_send_api_error",
+            provider="meta",
+            to=payload.get("to"),
+            status=response.status_code,
+            error_code=str(error.get("code", "")),
+            error_message=error.get("message", ""),
+        )
+        return WhatsAppSendResult(
+            success=False,
+            error_code=str(error.get("code", "")),
+            error_message=error.get("message", "Unknown API error"),
+        )
 
-        except httpx.TimeoutException:
+    @staticmethod
+    def _exception_result(
+        exc: Exception, payload: dict[str, Any]
+    ) -> WhatsAppSendResult:
+        if isinstance(exc, httpx.TimeoutException):
             logger.error("whatsapp_send_timeout", provider="meta", to=payload.get("to"))
             return WhatsAppSendResult(
                 success=False,
                 error_code="TIMEOUT",
                 error_message="Request timed out",
             )
-        except Exception as exc:
-            logger.error(
-                "whatsapp_send_exception",
-                provider="meta",
-                to=payload.get("to"),
-                error=str(exc),
-                exc_info=True,
-            )
-            return WhatsAppSendResult(
-                success=False,
-                error_code="INTERNAL",
-                error_message=str(exc)[:500],
-            )
+        logger.error(
+            "whatsapp_send_exception",
+            provider="meta",
+            to=payload.get("to"),
+            error=str(exc),
+            exc_info=exc,
+        )
+        return WhatsAppSendResult(
+            success=False,
+            error_code="INTERNAL",
+            error_message=str(exc)[:500],
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -364,6 +593,27 @@ class TwilioWhatsAppProvider(WhatsAppProviderBase):
         params: list[str] | None = None,
         language_code: str = "pt_BR",
     ) -> WhatsAppSendResult:
+        return self._send(phone=phone, **self._template_content(template_name, params))
+
+    async def send_text_message_async(self, phone: str, text: str) -> WhatsAppSendResult:
+        return await self._send_async(phone=phone, body=text)
+
+    async def send_template_message_async(
+        self,
+        phone: str,
+        template_name: str,
+        params: list[str] | None = None,
+        language_code: str = "pt_BR",
+    ) -> WhatsAppSendResult:
+        return await self._send_async(
+            phone=phone, **self._template_content(template_name, params)
+        )
+
+    @staticmethod
+    def _template_content(
+        template_name: str, params: list[str] | None
+    ) -> dict[str, Any]:
+        """Return ``_send`` kwargs for a template message."""
         # Twilio uses Content Templates via ContentSid, but also accepts
         # the simpler approach of sending the rendered body directly.
         # For now we send variable-substituted text.  If you have a
@@ -375,11 +625,7 @@ class TwilioWhatsAppProvider(WhatsAppProviderBase):
             variables = {}
             if params:
                 variables = {str(i + 1): p for i, p in enumerate(params)}
-            return self._send(
-                phone=phone,
-                content_sid=content_sid,
-                content_variables=variables,
-            )
+            return {"content_sid": content_sid, "content_variables": variables}
 
         # Fallback: send as plain text (template body must be rendered
         # by the caller — e.g. RFQ orchestrator already builds the text).
@@ -391,7 +637,7 @@ class TwilioWhatsAppProvider(WhatsAppProviderBase):
             template_name=template_name,
             hint="Set TWILIO_CONTENT_SID_<NAME> for Content Templates",
         )
-        return self._send(phone=phone, body=body)
+        return {"body": body}
 
     def _send(
         self,
@@ -413,6 +659,73 @@ class TwilioWhatsAppProvider(WhatsAppProviderBase):
         **Reactive fallback** (kept as safety-net): if the API returns
         error 63015 synchronously, retry with the alternative BR format.
         """
+        prepared = self._prepare(phone, body, content_sid, content_variables, _is_retry)
+        if isinstance(prepared, WhatsAppSendResult):
+            return prepared
+        url, data = prepared
+
+        try:
+            response = httpx.post(
+                url,
+                data=data,
+                auth=(self._account_sid(), self._auth_token()),
+                timeout=_SEND_TIMEOUT,
+            )
+            result, retry_to = self._parse_response(response, data["To"], _is_retry)
+        except Exception as exc:
+            return self._exception_result(exc, data["To"])
+
+        if retry_to:
+            return self._send(
+                phone=retry_to,
+                body=body,
+                content_sid=content_sid,
+                content_variables=content_variables,
+                _is_retry=True,
+            )
+        return result
+
+    async def _send_async(
+        self,
+        phone: str,
+        body: str | None = None,
+        content_sid: str | None = None,
+        content_variables: dict | None = None,
+        _is_retry: bool = False,
+    ) -> WhatsAppSendResult:
+        """Async :meth:`_send` on the shared keep-alive client."""
+        prepared = self._prepare(phone, body, content_sid, content_variables, _is_retry)
+        if isinstance(prepared, WhatsAppSendResult):
+            return prepared
+        url, data = prepared
+
+        try:
+            response = await get_async_client().post(
+                url, data=data, auth=(self._account_sid(), self._auth_token())
+            )
+            result, retry_to = self._parse_response(response, data["To"], _is_retry)
+        except Exception as exc:
+            return self._exception_result(exc, data["To"])
+
+        if retry_to:
+            return await self._send_async(
+                phone=retry_to,
+                body=body,
+                content_sid=content_sid,
+                content_variables=content_variables,
+                _is_retry=True,
+            )
+        return result
+
+    def _prepare(
+        self,
+        phone: str,
+        body: str | None,
+        content_sid: str | None,
+        content_variables: dict | None,
+        _is_retry: bool,
+    ) -> tuple[str, dict[str, str]] | WhatsAppSendResult:
+        """Build ``(url, form data)``, or a failed result on bad config/input."""
         to_number = self._normalize_phone(phone)
 
         # ---- Proactive sandbox normalisation for Brazilian numbers ----
@@ -443,8 +756,6 @@ class TwilioWhatsAppProvider(WhatsAppProviderBase):
         if content_sid:
             data["ContentSid"] = content_sid
             if content_variables:
-                import json
-
                 data["ContentVariables"] = json.dumps(content_variables)
         elif body:
             data["Body"] = body
@@ -462,89 +773,82 @@ class TwilioWhatsAppProvider(WhatsAppProviderBase):
             msg_type="content_template" if content_sid else "text",
             is_retry=_is_retry,
         )
+        return url, data
 
-        try:
-            response = httpx.post(
-                url,
-                data=data,
-                auth=(self._account_sid(), self._auth_token()),
-                timeout=15.0,
-            )
-            resp_json = response.json()
-
-            if response.status_code in (200, 201):
-                msg_sid = resp_json.get("sid", "")
-                logger.info(
-                    "whatsapp_send_success",
-                    provider="twilio",
-                    to=to_number,
-                    provider_message_id=msg_sid,
-                    twilio_status=resp_json.get("status"),
-                )
-                return WhatsAppSendResult(
-                    success=True,
-                    provider_message_id=msg_sid,
-                )
-
-            error_code = str(resp_json.get("code", response.status_code))
-            error_msg = resp_json.get("message", "Unknown Twilio error")
-
-            # ----- Brazilian phone fallback (sandbox workaround) -----
-            # Error 63015 = recipient not in sandbox / session expired.
-            # Brazilian mobiles have 8-digit and 9-digit variants that
-            # map to the same canonical E.164.  Retry with the alternate
-            # format if we haven't already.
-            if error_code == "63015" and not _is_retry:
-                alt = self._brazilian_phone_variant(to_number)
-                if alt:
-                    logger.warning(
-                        "whatsapp_br_phone_retry",
-                        provider="twilio",
-                        original_to=to_number,
-                        retry_to=alt,
-                    )
-                    return self._send(
-                        phone=alt,
-                        body=body,
-                        content_sid=content_sid,
-                        content_variables=content_variables,
-                        _is_retry=True,
-                    )
+    def _parse_response(
+        self, response: httpx.Response, to_number: str, _is_retry: bool
+    ) -> tuple[WhatsAppSendResult | None, str | None]:
+        """Return ``(result, None)``, or ``(None, alt_phone)`` to retry."""
+        resp_json = response.json()
 
-            logger.error(
-                "whatsapp_send_api_error",
+        if response.status_code in (200, 201):
+            msg_sid = resp_json.get("sid", "")
+            logger.info(
+                "whatsapp_send_success",
                 provider="twilio",
                 to=to_number,
-                status=response.status_code,
-                error_code=error_code,
-                error_message=error_msg,
+                provider_message_id=msg_sid,
+                twilio_status=resp_json.get("status"),
             )
-            return WhatsAppSendResult(
+            return WhatsAppSendResult(success=True, provider_message_id=msg_sid), None
+
+        error_code = str(resp_json.get("code", response.status_code))
+        error_msg = resp_json.get("message", "Unknown Twilio error")
+
+        # ----- Brazilian phone fallback (sandbox workaround) -----
+        # Error 63015 = recipient not in sandbox / session expired.
+        # Brazilian mobiles have 8-digit and 9-digit variants that
+        # map to the same canonical E.164.  Retry with the alternate
+        # format if we haven't already.
+        if error_code == "63015" and not _is_retry:
+            alt = self._brazilian_phone_variant(to_number)
+            if alt:
+                logger.warning(
+                    "whatsapp_br_phone_retry",
+                    provider="twilio",
+                    original_to=to_number,
+                    retry_to=alt,
+                )
+                return None, alt
+
+        logger.error(
+            "whatsapp_send_api_error",
+            provider="twilio",
+            to=to_number,
+            status=response.status_code,
+            error_code=error_code,
+            error_message=error_msg,
+        )
+        return (
+            WhatsAppSendResult(
                 success=False,
                 error_code=error_code,
                 error_message=error_msg,
-            )
+            ),
+            None,
+        )
 
-        except httpx.TimeoutException:
+    @staticmethod
+    def _exception_result(exc: Exception, to_number: str) -> WhatsAppSendResult:
+        if isinstance(exc, httpx.TimeoutException):
             logger.error("whatsapp_send_timeout", provider="twilio", to=to_number)
             return WhatsAppSendResult(
                 success=False,
                 error_code="TIMEOUT",
                 error_message="Request timed out",
             )
-        except Exception as exc:
-            logger.error(
-                "whatsapp_send_exception",
-                provider="twilio",
-                to=to_number,
-                error=str(exc),
-                exc_info=True,
-            )
-            return WhatsAppSendResult(
-                success=False,
-                error_code="INTERNAL",
-                error_message=str(exc)[:500],
-            )
+        logger.error(
+            "whatsapp_send_exception",
+            provider="twilio",
+            to=to_number,
+            error=str(exc),
+            exc_info=exc,
+        )
+        return WhatsAppSendResult(
+            success=False,
+            error_code="INTERNAL",
+            error_message=str(exc)[:500],
+        )
 
 
 # ---------------------------------------------------------------------------
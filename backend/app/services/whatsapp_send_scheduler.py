@@ -0,0 +1,340 @@
+"""Outbound WhatsApp send scheduler — rate limits, priority lanes, 429 retry.
+
+Meta and Twilio cap throughput per sending number and per recipient; going
+over returns a rate-limit error and the message is lost.  Every send made
+through ``WhatsAppService`` first acquires a slot here:
+
+- **Token buckets** — one per provider (account throughput) and one per
+  ``(provider, destination)`` pair (per-recipient pacing).
+- **Priority lanes** — waiters are granted in :class:`SendPriority` order,
+  so award and reject notifications go out ahead of invitations, and
+  invitations ahead of refresh reminders.
+- **Deferral** — a throttled result (see :func:`is_throttled`) pauses the
+  offending bucket and the send is re-queued, up to ``max_retries``.
+
+The scheduler runs on the outbound event loop from ``whatsapp_providers``;
+sync callers go through :meth:`OutboundScheduler.send_sync`.
+
+Configurable via env vars (``0`` disables a limit):
+    WHATSAPP_PROVIDER_RATE        Default 20   — sends/second per provider.
+    WHATSAPP_PROVIDER_BURST       Default 20
+    WHATSAPP_DESTINATION_RATE     Default 0.2  — sends/second per recipient.
+    WHATSAPP_DESTINATION_BURST    Default 5
+    WHATSAPP_THROTTLE_MAX_RETRIES Default 3
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from app.core.logging import get_logger
+from app.core.metrics import whatsapp_send_throttled_total, whatsapp_send_wait_seconds
+from app.schemas.whatsapp import WhatsAppSendResult
+from app.services.whatsapp_providers import run_outbound
+
+logger = get_logger()
+
+Clock = Callable[[], float]
+
+# Provider error codes meaning "slow down" rather than "this message is bad".
+#   Meta:   4 / 80007 app or WABA rate limit, 130429 throughput,
+#           131048 spam rate limit, 131056 pair (recipient) rate limit
+#   Twilio: 20429 too many requests, 63018 channel rate limit
+_THROTTLE_CODES = frozenset(
+    {"429", "4", "80007", "130429", "131048", "131056", "20429", "63018"}
+)
+_PAIR_THROTTLE_CODES = frozenset({"131056"})
+
+_MAX_DESTINATIONS = 10_000
+
+
+class SendPriority(IntEnum):
+    """Outbound lanes; lower value is sent first."""
+
+    award = 0
+    reject = 1
+    invitation = 2
+    refresh = 3
+
+
+def is_throttled(result: WhatsAppSendResult) -> bool:
+    """Return True when *result* is a provider rate-limit rejection."""
+    return not result.success and (result.error_code or "") in _THROTTLE_CODES
+
+
+class TokenBucket:
+    """Classic token bucket; ``rate <= 0`` means unlimited."""
+
+    def __init__(self, rate: float, capacity: float, clock: Clock = time.monotonic) -> None:
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._held_until = 0.0
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available (``0`` if one is now)."""
+        now = self._clock()
+        held = max(self._held_until - now, 0.0)
+        if self.rate <= 0:
+            return held
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+        if self._tokens >= 1:
+            return held
+        return max(held, (1 - self._tokens) / self.rate)
+
+    def consume(self) -> None:
+        if self.rate > 0:
+            self._tokens -= 1
+
+    def hold(self, seconds: float) -> None:
+        """Grant nothing for *seconds* (the provider told us to back off)."""
+        self._held_until = max(self._held_until, self._clock() + seconds)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    provider: str = field(compare=False)
+    destination: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    queued_at: float = field(compare=False)
+
+
+class OutboundScheduler:
+    """Grants send slots by priority within provider/destination limits."""
+
+    def __init__(
+        self,
+        provider_rate: float = 20.0,
+        provider_burst: float = 20.0,
+        destination_rate: float = 0.2,
+        destination_burst: float = 5.0,
+        max_retries: int = 3,
+        retry_base_seconds: float = 1.0,
+        clock: Clock = time.monotonic,
+    ) -> None:
+        self._provider_rate = provider_rate
+        self._provider_burst = provider_burst
+        self._destination_rate = destination_rate
+        self._destination_burst = destination_burst
+        self._max_retries = max_retries
+        self._retry_base = retry_base_seconds
+        self._clock = clock
+        self._providers: dict[str, TokenBucket] = {}
+        self._destinations: OrderedDict[tuple[str, str], TokenBucket] = OrderedDict()
+        self._waiting: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task | None = None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def acquire(
+        self, provider: str, destination: str, priority: SendPriority
+    ) -> None:
+        """Wait for a send slot; must run on the scheduler's event loop."""
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            priority=int(priority),
+            seq=next(self._seq),
+            provider=provider,
+            destination=destination,
+            future=loop.create_future(),
+            queued_at=self._clock(),
+        )
+        heapq.heappush(self._waiting, waiter)
+        self._ensure_dispatcher()
+        self._wakeup.set()
+        await waiter.future
+        whatsapp_send_wait_seconds.labels(priority=priority.name).observe(
+            self._clock() - waiter.queued_at
+        )
+
+    async def send(
+        self,
+        provider: str,
+        destination: str,
+        priority: SendPriority,
+        send: Callable[[], Awaitable[WhatsAppSendResult]],
+    ) -> WhatsAppSendResult:
+        """Acquire a slot and run *send*, re-queueing throttled results."""
+        attempt = 0
+        while True:
+            await self.acquire(provider, destination, priority)
+            result = await send()
+            if not self._should_retry(provider, destination, result, attempt):
+                return result
+            attempt += 1
+
+    def send_sync(
+        self,
+        provider: str,
+        destination: str,
+        priority: SendPriority,
+        send: Callable[[], WhatsAppSendResult],
+    ) -> WhatsAppSendResult:
+        """Blocking :meth:`send` for callers outside the outbound loop."""
+        attempt = 0
+        while True:
+            run_outbound(self.acquire(provider, destination, priority))
+            result = send()
+            if not run_outbound(
+                self._should_retry_async(provider, destination, result, attempt)
+            ):
+                return result
+            attempt += 1
+
+    # ------------------------------------------------------------------
+    # internals
+    # ------------------------------------------------------------------
+
+    async def _should_retry_async(
+        self,
+        provider: str,
+        destination: str,
+        result: WhatsAppSendResult,
+        attempt: int,
+    ) -> bool:
+        # Runs on the loop so bucket state is only touched from one thread.
+        return self._should_retry(provider, destination, result, attempt)
+
+    def _should_retry(
+        self,
+        provider: str,
+        destination: str,
+        result: WhatsAppSendResult,
+        attempt: int,
+    ) -> bool:
+        if not is_throttled(result):
+            return False
+        whatsapp_send_throttled_total.labels(provider=provider).inc()
+        if attempt >= self._max_retries:
+            logger.error(
+                "whatsapp_send_throttled_giving_up",
+                provider=provider,
+                to=destination,
+                error_code=result.error_code,
+                attempts=attempt + 1,
+            )
+            return False
+
+        delay = self._retry_base * 2**attempt
+        if result.error_code in _PAIR_THROTTLE_CODES:
+            self._destination_bucket(provider, destination).hold(delay)
+        else:
+            self._provider_bucket(provider).hold(delay)
+        logger.warning(
+            "whatsapp_send_throttled",
+            provider=provider,
+            to=destination,
+            error_code=result.error_code,
+            retry_in_seconds=delay,
+            attempt=attempt + 1,
+        )
+        return True
+
+    def _provider_bucket(self, provider: str) -> TokenBucket:
+        bucket = self._providers.get(provider)
+        if bucket is None:
+            bucket = TokenBucket(self._provider_rate, self._provider_burst, self._clock)
+            self._providers[provider] = bucket
+        return bucket
+
+    def _destination_bucket(self, provider: str, destination: str) -> TokenBucket:
+        key = (provider, destination)
+        bucket = self._destinations.get(key)
+        if bucket is None:
+            bucket = TokenBucket(
+                self._destination_rate, self._destination_burst, self._clock
+            )
+            self._destinations[key] = bucket
+            while len(self._destinations) > _MAX_DESTINATIONS:
+                self._destinations.popitem(last=False)
+        else:
+            self._destinations.move_to_end(key)
+        return bucket
+
+    def _ensure_dispatcher(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or the outbound loop was restarted.
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._dispatcher = None
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        """Grant slots until nobody is waiting, then exit (restarted on demand)."""
+        assert self._wakeup is not None
+        while True:
+            self._wakeup.clear()
+            delay = self._grant_ready()
+            if not self._waiting:
+                return
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+
+    def _grant_ready(self) -> float:
+        """Grant every waiter that may send now, highest priority first.
+
+        Returns the seconds until the next remaining waiter could go.
+        """
+        next_delay = math.inf
+        remaining: list[_Waiter] = []
+        for waiter in sorted(self._waiting):
+            if waiter.future.done():  # cancelled by its caller
+                continue
+            provider_bucket = self._provider_bucket(waiter.provider)
+            destination_bucket = self._destination_bucket(
+                waiter.provider, waiter.destination
+            )
+            wait = max(provider_bucket.wait_time(), destination_bucket.wait_time())
+            if wait <= 0:
+                provider_bucket.consume()
+                destination_bucket.consume()
+                waiter.future.set_result(None)
+            else:
+                remaining.append(waiter)
+                next_delay = min(next_delay, wait)
+        self._waiting = remaining  # sorted, so still a valid heap
+        return next_delay
+
+
+_scheduler: OutboundScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_send_scheduler() -> OutboundScheduler:
+    """Return the process-wide scheduler, creating it on first use."""
+    global _scheduler  # noqa: PLW0603
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = OutboundScheduler(
+                provider_rate=float(os.getenv("WHATSAPP_PROVIDER_RATE", "20")),
+                provider_burst=float(os.getenv("WHATSAPP_PROVIDER_BURST", "20")),
+                destination_rate=float(os.getenv("WHATSAPP_DESTINATION_RATE", "0.2")),
+                destination_burst=float(os.getenv("WHATSAPP_DESTINATION_BURST", "5")),
+                max_retries=int(os.getenv("WHATSAPP_THROTTLE_MAX_RETRIES", "3")),
+            )
+        return _scheduler
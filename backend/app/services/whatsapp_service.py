@@ -6,7 +6,10 @@ Delegates to the configured provider backend:
 - ``twilio`` — Twilio WhatsApp API
 - ``fake`` / ``mock`` / ``test`` — No-op for testing
 
-The provider is selected via ``WHATSAPP_PROVIDER`` env var.
+The provider is selected via ``WHATSAPP_PROVIDER`` env var.  Every send
+is paced by the outbound scheduler (``whatsapp_send_scheduler``): provider
+and per-recipient token buckets, priority lanes, and retry of throttled
+sends.
 
 Legacy helper functions (``_api_url``, ``_access_token``, ``_phone_number_id``)
 are preserved for backward compatibility with existing tests.
@@ -14,6 +17,7 @@ are preserved for backward compatibility with existing tests.
 
 from __future__ import annotations
 
+import asyncio
 import os
 from typing import Any
 
@@ -25,7 +29,9 @@ from app.services.whatsapp_providers import (
     WhatsAppProviderBase,
     get_provider,
     get_provider_name,
+    run_outbound,
 )
+from app.services.whatsapp_send_scheduler import SendPriority, get_send_scheduler
 
 logger = get_logger()
 
@@ -58,6 +64,10 @@ def _phone_number_id() -> str:
     return os.getenv("WHATSAPP_PHONE_NUMBER_ID", "")
 
 
+def _send_concurrency() -> int:
+    return max(1, int(os.getenv("WHATSAPP_SEND_CONCURRENCY", "8")))
+
+
 # ---------------------------------------------------------------------------
 # Public API — facade delegating to the active provider
 # ---------------------------------------------------------------------------
@@ -96,6 +106,7 @@ class WhatsAppService:
         template_name: str,
         params: list[str] | None = None,
         language_code: str = "pt_BR",
+        priority: SendPriority = SendPriority.invitation,
     ) -> WhatsAppSendResult:
         """Send a pre-approved WhatsApp template message.
 
@@ -109,17 +120,28 @@ class WhatsAppService:
             Positional parameters to inject into the template body.
         language_code:
             BCP-47 language code for the template (default ``pt_BR``).
+        priority:
+            Outbound lane (award / reject ahead of invitations and refreshes).
         """
         provider = WhatsAppService._get_provider()
-        return provider.send_template_message(
-            phone=phone,
-            template_name=template_name,
-            params=params,
-            language_code=language_code,
+        return get_send_scheduler().send_sync(
+            get_provider_name(),
+            phone,
+            priority,
+            lambda: provider.send_template_message(
+                phone=phone,
+                template_name=template_name,
+                params=params,
+                language_code=language_code,
+            ),
         )
 
     @staticmethod
-    def send_text_message(phone: str, text: str) -> WhatsAppSendResult:
+    def send_text_message(
+        phone: str,
+        text: str,
+        priority: SendPriority = SendPriority.invitation,
+    ) -> WhatsAppSendResult:
         """Send a free-form text message via WhatsApp.
 
         Parameters
@@ -128,6 +150,72 @@ class WhatsAppService:
             Recipient phone number in E.164 format.
         text:
             Message body (max 4096 chars per WhatsApp limits).
+        priority:
+            Outbound lane (award / reject ahead of invitations and refreshes).
+        """
+        provider = WhatsAppService._get_provider()
+        return get_send_scheduler().send_sync(
+            get_provider_name(),
+            phone,
+            priority,
+            lambda: provider.send_text_message(phone=phone, text=text),
+        )
+
+    @staticmethod
+    async def send_text_message_async(
+        phone: str,
+        text: str,
+        priority: SendPriority = SendPriority.invitation,
+    ) -> WhatsAppSendResult:
+        """Async :meth:`send_text_message` on the shared keep-alive client.
+
+        Must run on the outbound loop (see ``run_outbound``).
         """
         provider = WhatsAppService._get_provider()
-        return provider.send_text_message(phone=phone, text=text)
+        return await get_send_scheduler().send(
+            get_provider_name(),
+            phone,
+            priority,
+            lambda: provider.send_text_message_async(phone=phone, text=text),
+        )
+
+    @staticmethod
+    def send_text_messages(
+        messages: list[tuple[str, str]],
+        max_concurrency: int | None = None,
+        priority: SendPriority = SendPriority.invitation,
+    ) -> list[WhatsAppSendResult]:
+        """Send ``(phone, text)`` pairs concurrently; results keep input order.
+
+        At most *max_concurrency* sends are in flight at once (default
+        ``WHATSAPP_SEND_CONCURRENCY``, 8).  A send that raises is reported
+        as a failed result rather than aborting the batch.
+        """
+        if not messages:
+            return []
+        limit = max_concurrency or _send_concurrency()
+        return run_outbound(WhatsAppService._send_bounded(messages, limit, priority))
+
+    @staticmethod
+    async def _send_bounded(
+        messages: list[tuple[str, str]], limit: int, priority: SendPriority
+    ) -> list[WhatsAppSendResult]:
+        semaphore = asyncio.Semaphore(limit)
+
+        async def _one(phone: str, text: str) -> WhatsAppSendResult:
+            async with semaphore:
+                try:
+                    return await WhatsAppService.send_text_message_async(
+                        phone=phone, text=text, priority=priority
+                    )
+                except Exception as exc:
+                    logger.error(
+                        "whatsapp_send_exception", to=phone, error=str(exc), exc_info=exc
+                    )
+                    return WhatsAppSendResult(
+                        success=False,
+                        error_code="INTERNAL",
+                        error_message=str(exc)[:500],
+                    )
+
+        return list(await asyncio.gather(*(_one(p, t) for p, t in messages)))
@@ -0,0 +1,301 @@
+"""Cross-worker pub/sub for WebSocket broadcasts.
+
+Each uvicorn worker owns its own sockets, so an RFQ event raised in one
+worker has to reach clients connected to the others.  ``ConnectionManager``
+publishes every broadcast to the bus and fans out whatever the bus
+delivers — its own events included — to local subscribers.
+
+Backends:
+
+- ``memory`` (default) — in-process only; right for a single worker and
+  for tests.
+- ``postgres`` — ``pg_notify`` on a shared channel, with one ``LISTEN``
+  connection per worker on a background thread.  NOTIFY payloads are
+  capped at 8000 bytes, so larger events are written to
+  ``ws_broadcast_payloads`` and the notification only carries their
+  sequence number.
+
+The bus also numbers events: ``memory`` counts in process, ``postgres``
+uses the ``ws_broadcast_seq`` database sequence under a transaction-level
+advisory lock, so ``seq`` is global and notifications are delivered in
+``seq`` order whichever worker a client is connected to.
+
+Notifications sent while a worker's ``LISTEN`` connection is down are lost
+to that worker.  Each time the listener (re)connects it reports the
+sequence value at that moment to the bus's gap handlers (see
+``subscribe_gaps``), so consumers can treat everything up to it as
+possibly missed.
+
+Configurable via env vars:
+    WS_PUBSUB_BACKEND    ``memory`` | ``postgres`` (default memory)
+    WS_PUBSUB_CHANNEL    Default ``ws_events``
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import re
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.engine import Engine
+
+from app.core.logging import get_logger
+from app.models.ws_broadcast import WSBroadcastPayload
+
+logger = get_logger()
+
+BACKEND_MEMORY = "memory"
+BACKEND_POSTGRES = "postgres"
+
+_MAX_NOTIFY_BYTES = 7900
+_SPILL_RETENTION = timedelta(hours=1)
+_ADVISORY_LOCK_KEY = 0x57534251  # "WSBQ"
+_CHANNEL_RE = re.compile(r"^[a-z_][a-z0-9_]{0,62}$")
+
+
+@dataclass(frozen=True)
+class BroadcastEvent:
+    """One broadcast, as carried between workers."""
+
+    topic: str
+    topic_id: str
+    event: str
+    data: dict[str, Any]
+    seq: int
+    timestamp: str
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw: str) -> BroadcastEvent:
+        return cls(**json.loads(raw))
+
+
+Handler = Callable[[BroadcastEvent], None]
+GapHandler = Callable[[int], None]
+
+
+class PubSub:
+    """Numbers broadcast events and delivers them to every subscriber.
+
+    Handlers run on whatever thread the backend delivers on and must not
+    block.
+    """
+
+    #: ``publish`` does network I/O — async callers should run it in a thread.
+    blocking = False
+    #: Events published by other worker processes are delivered here too.
+    shared = False
+
+    def __init__(self) -> None:
+        self._handlers: list[Handler] = []
+        self._gap_handlers: list[GapHandler] = []
+        self._handlers_lock = threading.Lock()
+
+    def subscribe(self, handler: Handler) -> None:
+        with self._handlers_lock:
+            self._handlers.append(handler)
+        self._start()
+
+    def subscribe_gaps(self, handler: GapHandler) -> None:
+        """Call *handler* with a ``seq`` high-water mark whenever events up
+        to it may not have been delivered (never, for in-process backends).
+        """
+        with self._handlers_lock:
+            self._gap_handlers.append(handler)
+
+    def publish(
+        self, topic: str, topic_id: str, event: str, data: dict[str, Any]
+    ) -> BroadcastEvent:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Stop background delivery (no-op for in-process backends)."""
+
+    def _start(self) -> None:
+        """Begin background delivery once something subscribes."""
+
+    def _dispatch(self, evt: BroadcastEvent) -> None:
+        for handler in list(self._handlers):
+            try:
+                handler(evt)
+            except Exception:
+                logger.warning("ws_pubsub_handler_failed", seq=evt.seq, exc_info=True)
+
+    def _dispatch_gap(self, seq: int) -> None:
+        for handler in list(self._gap_handlers):
+            try:
+                handler(seq)
+            except Exception:
+                logger.warning("ws_pubsub_gap_handler_failed", seq=seq, exc_info=True)
+
+
+class MemoryPubSub(PubSub):
+    """In-process bus; delivery is synchronous and in ``seq`` order."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._seq = itertools.count(1)
+        self._publish_lock = threading.Lock()
+
+    def publish(
+        self, topic: str, topic_id: str, event: str, data: dict[str, Any]
+    ) -> BroadcastEvent:
+        with self._publish_lock:
+            evt = BroadcastEvent(topic, topic_id, event, data, next(self._seq), _iso_now())
+            self._dispatch(evt)
+        return evt
+
+
+class PostgresPubSub(PubSub):
+    """``LISTEN`` / ``NOTIFY`` bus shared by every worker on the database."""
+
+    blocking = True
+    shared = True
+
+    def __init__(self, engine: Engine, channel: str = "ws_events") -> None:
+        super().__init__()
+        if not _CHANNEL_RE.match(channel):
+            raise ValueError(f"invalid WS_PUBSUB_CHANNEL: {channel!r}")
+        self._engine = engine
+        self._channel = channel
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def publish(
+        self, topic: str, topic_id: str, event: str, data: dict[str, Any]
+    ) -> BroadcastEvent:
+        with self._engine.begin() as conn:
+            # Held until commit, so NOTIFY delivery order matches seq order.
+            conn.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+            )
+            seq = conn.execute(text("SELECT nextval('ws_broadcast_seq')")).scalar_one()
+            evt = BroadcastEvent(topic, topic_id, event, data, seq, _iso_now())
+            body = evt.to_json()
+            if len(body.encode()) > _MAX_NOTIFY_BYTES:
+                conn.execute(insert(WSBroadcastPayload).values(seq=seq, body=body))
+                conn.execute(
+                    delete(WSBroadcastPayload).where(
+                        WSBroadcastPayload.created_at
+                        < datetime.now(UTC) - _SPILL_RETENTION
+                    )
+                )
+                body = json.dumps({"ref": seq})
+            conn.execute(
+                text("SELECT pg_notify(:channel, :body)"),
+                {"channel": self._channel, "body": body},
+            )
+        return evt
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._listen, name="ws-pubsub-listen", daemon=True
+            )
+            self._thread.start()
+
+    def _listen(self) -> None:
+        import psycopg
+
+        dsn = self._engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {self._channel}")
+                    backoff = 1.0
+                    self._dispatch_gap(self._high_water(conn))
+                    while not self._stop.is_set():
+                        for note in conn.notifies(timeout=1.0):
+                            self._on_notify(note.payload)
+            except Exception:
+                logger.warning("ws_pubsub_listen_failed", exc_info=True)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    @staticmethod
+    def _high_water(conn) -> int:
+        # Once the advisory lock is ours every seq at or below last_value is
+        # committed, and anything committed after LISTEN reaches us — so only
+        # events up to this value can have been missed.
+        with conn.transaction():
+            conn.execute("SELECT pg_advisory_xact_lock(%s)", (_ADVISORY_LOCK_KEY,))
+            return conn.execute("SELECT last_value FROM ws_broadcast_seq").fetchone()[0]
+
+    def _on_notify(self, payload: str) -> None:
+        raw = json.loads(payload)
+        if set(raw) == {"ref"}:
+            with self._engine.connect() as conn:
+                body = conn.execute(
+                    select(WSBroadcastPayload.body).where(
+                        WSBroadcastPayload.seq == raw["ref"]
+                    )
+                ).scalar()
+            if body is None:
+                logger.warning("ws_pubsub_payload_missing", seq=raw["ref"])
+                return
+            raw = json.loads(body)
+        self._dispatch(BroadcastEvent(**raw))
+
+
+def _iso_now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+_pubsub: PubSub | None = None
+_pubsub_lock = threading.Lock()
+
+
+def get_ws_pubsub() -> PubSub:
+    """Return the process-wide bus, creating it on first use."""
+    global _pubsub  # noqa: PLW0603
+    with _pubsub_lock:
+        if _pubsub is None:
+            _pubsub = _create_pubsub()
+        return _pubsub
+
+
+def _create_pubsub() -> PubSub:
+    return create_pubsub(os.getenv("WS_PUBSUB_CHANNEL", "ws_events"))
+
+
+def create_pubsub(channel: str) -> PubSub:
+    """A new bus on *channel*, with the backend chosen by ``WS_PUBSUB_BACKEND``.
+
+    For other cross-worker notifications that should not go through the
+    WebSocket fan-out (and its replay history).
+    """
+    backend = os.getenv("WS_PUBSUB_BACKEND", BACKEND_MEMORY).strip().lower()
+    if backend != BACKEND_POSTGRES:
+        return MemoryPubSub()
+    from app.core.database import engine
+
+    if engine.dialect.name != "postgresql":
+        logger.warning("ws_pubsub_postgres_unavailable", dialect=engine.dialect.name)
+        return MemoryPubSub()
+    return PostgresPubSub(engine, channel)
+
+
+def shutdown_ws_pubsub() -> None:
+    """Stop the bus's listener (FastAPI lifespan shutdown) and forget it."""
+    global _pubsub
+    with _pubsub_lock:
+        pubsub, _pubsub = _pubsub, None
+    if pubsub is not None:
+        pubsub.close()
@@ -0,0 +1,30 @@
+"""Scheduled task — seals closed windows of audit events into Merkle batches.
+
+Configurable via env vars:
+    AUDIT_BATCH_SEAL_MINUTES   Default 15 — interval between runs.
+"""
+
+from __future__ import annotations
+
+from app.core.database import SessionLocal
+from app.core.logging import get_logger
+from app.services.audit_batch_service import AuditBatchService
+
+logger = get_logger()
+
+
+def run_audit_batch_seal() -> None:
+    """Entry-point called by APScheduler every ``AUDIT_BATCH_SEAL_MINUTES``."""
+    session = SessionLocal()
+    try:
+        sealed = AuditBatchService.seal_pending(session)
+        if sealed:
+            logger.info(
+                "audit_batch_task_done",
+                batches=len(sealed),
+                events=sum(b.event_count for b in sealed),
+            )
+    except Exception:
+        logger.exception("audit_batch_task_error")
+    finally:
+        session.close()
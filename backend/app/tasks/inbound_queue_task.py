@@ -0,0 +1,27 @@
+"""Scheduled task — polls the durable inbound message queue.
+
+Only scheduled when ``INBOUND_QUEUE_BACKEND=database``.  Webhooks pump the
+pool of the worker that received them; this poll lets every other worker
+pick up its share, and reclaims messages whose visibility timeout expired
+(e.g. the claiming worker crashed) or whose retry backoff elapsed.
+
+Configurable via env vars:
+    INBOUND_QUEUE_POLL_SECONDS   Default 5 — poll interval.
+"""
+
+from __future__ import annotations
+
+from app.core.logging import get_logger
+from app.services.inbound_worker_pool import get_inbound_pool
+
+logger = get_logger()
+
+
+def run_inbound_queue_poll() -> None:
+    """Entry-point called by APScheduler every few seconds."""
+    try:
+        claimed = get_inbound_pool().pump()
+        if claimed:
+            logger.info("inbound_queue_poll_claimed", claimed=claimed)
+    except Exception:
+        logger.exception("inbound_queue_poll_error")
@@ -7,6 +7,9 @@ import os
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from app.core.logging import get_logger
+from app.services.inbound_worker_pool import BACKEND_DATABASE, get_queue_backend
+from app.tasks.audit_batch_task import run_audit_batch_seal
+from app.tasks.inbound_queue_task import run_inbound_queue_poll
 from app.tasks.rfq_timeout_task import run_rfq_timeout_check
 from app.tasks.westmetall_task import run_westmetall_ingestion
 
@@ -47,6 +50,25 @@ def start_scheduler() -> None:
         replace_existing=True,
         misfire_grace_time=900,  # allow up to 15 min late execution
     )
+    _scheduler.add_job(
+        run_audit_batch_seal,
+        trigger="interval",
+        minutes=int(os.getenv("AUDIT_BATCH_SEAL_MINUTES", "15")),
+        id="audit_batch_seal",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+    if get_queue_backend() == BACKEND_DATABASE:
+        _scheduler.add_job(
+            run_inbound_queue_poll,
+            trigger="interval",
+            seconds=int(os.getenv("INBOUND_QUEUE_POLL_SECONDS", "5")),
+            id="inbound_queue_poll",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
     _scheduler.start()
     logger.info(
         "scheduler_started",
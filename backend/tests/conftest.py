@@ -8,6 +8,9 @@ from fastapi.testclient import TestClient
 
 os.environ.setdefault("DATABASE_URL", "sqlite+pysqlite:///:memory:")
 os.environ.setdefault("SCHEDULER_DISABLED", "1")
+os.environ.setdefault("WS_LIVE_AGGREGATES_DISABLED", "1")
+# Audit events written inline so requests can read them back immediately
+os.environ.setdefault("AUDIT_WRITER_MODE", "sync")
 os.environ.setdefault(
     "JWT_ISSUER",
     "https://login.microsoftonline.com/e75d5f00-51bd-48c1-adb6-b5df988e2685/v2.0",
@@ -20,6 +23,9 @@ os.environ.setdefault(
 # Low rate limits for testability (per-endpoint, reset between tests)
 os.environ.setdefault("RATE_LIMIT_MUTATION", "5/minute")
 os.environ.setdefault("RATE_LIMIT_SCRAPING", "5/minute")
+# No outbound WhatsApp pacing; scheduler tests build their own instances
+os.environ.setdefault("WHATSAPP_PROVIDER_RATE", "0")
+os.environ.setdefault("WHATSAPP_DESTINATION_RATE", "0")
 
 from app.core.auth import get_current_user
 from app.core.database import engine, SessionLocal
@@ -44,6 +50,16 @@ def reset_database() -> None:
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def reset_data_versions() -> None:
+    """Start every test with fresh data versions (new ETag epoch): the
+    database is recreated without going through the session events."""
+    from app.services.data_versions import shutdown_data_versions
+
+    shutdown_data_versions()
+    yield
+
+
 @pytest.fixture()
 def client() -> TestClient:
     app.dependency_overrides[get_current_user] = lambda: {
@@ -85,6 +101,36 @@ def _clear_webhook_dedup():
     _message_queue.clear()
 
 
+@pytest.fixture(autouse=True)
+def _clear_ranking_cache():
+    """Drop cached RFQ rankings so each test starts from the database."""
+    from app.services.rfq_ranking_cache import ranking_cache
+
+    ranking_cache.clear()
+    yield
+    ranking_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_phone_index():
+    """Drop memoised sender → RFQ matches; the database is rebuilt per test."""
+    from app.services.rfq_phone_index import get_phone_index
+
+    get_phone_index().clear()
+    yield
+    get_phone_index().clear()
+
+
+@pytest.fixture(autouse=True)
+def _clear_llm_cache():
+    """Forget cached LLM responses so mocked replies never leak across tests."""
+    from app.services.llm_cache import get_llm_cache
+
+    get_llm_cache().clear()
+    yield
+    get_llm_cache().clear()
+
+
 @pytest.fixture(autouse=True)
 def mock_whatsapp(request):
     """Mock WhatsApp service to always succeed in tests.
@@ -103,17 +149,23 @@ def mock_whatsapp(request):
     from unittest.mock import patch
     from app.schemas.whatsapp import WhatsAppSendResult
 
-    def _mock_send(phone: str, text: str) -> WhatsAppSendResult:
+    def _mock_send(phone: str, text: str, priority=None) -> WhatsAppSendResult:
         return WhatsAppSendResult(
             success=True,
             provider_message_id=f"mock-{phone}",
         )
 
+    async def _mock_send_async(
+        phone: str, text: str, priority=None
+    ) -> WhatsAppSendResult:
+        return _mock_send(phone, text)
+
+    service = __import__(
+        "app.services.whatsapp_service", fromlist=["WhatsAppService"]
+    ).WhatsAppService
     with patch.object(
-        __import__(
-            "app.services.whatsapp_service", fromlist=["WhatsAppService"]
-        ).WhatsAppService,
-        "send_text_message",
-        staticmethod(_mock_send),
+        service, "send_text_message", staticmethod(_mock_send)
+    ), patch.object(
+        service, "send_text_message_async", staticmethod(_mock_send_async)
     ):
         yield
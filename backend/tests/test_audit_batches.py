@@ -0,0 +1,160 @@
+"""Tests for Merkle batches of audit events and range verification."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import status
+from sqlalchemy import insert, update
+
+from app.models.audit import AuditBatch, AuditEvent
+from app.services.audit_batch_service import (
+    AuditBatchService,
+    inclusion_proof,
+    leaf_hash,
+    merkle_levels,
+    verify_inclusion,
+)
+from app.services.audit_trail_service import (
+    AuditTrailService,
+    _reset_signing_key_cache,
+)
+
+TEST_KEY = "test-signing-key-for-audit-batches"
+T0 = datetime(2026, 3, 2, 10, 0, tzinfo=UTC)
+HOUR = timedelta(hours=1)
+
+
+@pytest.fixture(autouse=True)
+def _signing_key():
+    _reset_signing_key_cache()
+    os.environ["AUDIT_SIGNING_KEY"] = TEST_KEY
+    yield
+    os.environ.pop("AUDIT_SIGNING_KEY", None)
+    _reset_signing_key_cache()
+
+
+def _insert_events(session, *timestamps: datetime) -> list[uuid.UUID]:
+    rows = []
+    for ts in timestamps:
+        row = AuditTrailService.build_row(
+            event_id=uuid.uuid4(),
+            entity_type="order",
+            entity_id=uuid.uuid4(),
+            event_type="created",
+            payload_raw='{"a":1}',
+            payload_obj={"a": 1},
+        )
+        row["timestamp_utc"] = ts
+        rows.append(row)
+    session.execute(insert(AuditEvent), rows)
+    session.commit()
+    return [row["id"] for row in rows]
+
+
+def _seal(session, now: datetime = T0 + 4 * HOUR) -> list[AuditBatch]:
+    return AuditBatchService.seal_pending(
+        session, window=HOUR, grace=timedelta(minutes=5), now=now
+    )
+
+
+def test_proofs_verify_for_every_leaf_count() -> None:
+    for count in range(1, 10):
+        leaves = [hashlib.sha256(bytes([i])).digest() for i in range(count)]
+        levels = merkle_levels(leaves)
+        root = levels[-1][0].hex()
+        for index, leaf in enumerate(leaves):
+            assert verify_inclusion(leaf, inclusion_proof(levels, index), root)
+        assert not verify_inclusion(b"\x00" * 32, inclusion_proof(levels, 0), root)
+
+
+def test_closed_windows_are_sealed_once(session) -> None:
+    _insert_events(
+        session,
+        T0 + timedelta(minutes=5),
+        T0 + timedelta(minutes=50),
+        T0 + HOUR + timedelta(minutes=1),
+        T0 + 2 * HOUR + timedelta(minutes=58),  # window still inside the grace
+    )
+
+    batches = _seal(session, now=T0 + 3 * HOUR + timedelta(minutes=1))
+    assert [b.event_count for b in batches] == [2, 1]
+    assert all(b.signature is not None for b in batches)
+    assert _seal(session, now=T0 + 3 * HOUR + timedelta(minutes=1)) == []
+
+    # A late event for an already sealed window gets a batch of its own.
+    _insert_events(session, T0 + timedelta(minutes=30))
+    late, last = _seal(session, now=T0 + 3 * HOUR + timedelta(minutes=10))
+    assert late.window_start.replace(tzinfo=UTC) == T0
+    assert late.event_count == 1
+    assert last.window_start.replace(tzinfo=UTC) == T0 + 2 * HOUR
+
+
+def test_range_verification_and_proofs(client, session) -> None:
+    ids = _insert_events(
+        session, *(T0 + timedelta(minutes=7 * i) for i in range(20))
+    )
+    _seal(session)
+    unbatched = _insert_events(session, T0 + 2 * HOUR + timedelta(minutes=1))
+
+    response = client.get(
+        "/audit/verify-range",
+        params={
+            "start": T0.isoformat(),
+            "end": (T0 + 3 * HOUR).isoformat(),
+            "include_proofs": True,
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    body = response.json()
+    assert body["valid"] is True
+    assert body["events_verified"] == 21
+    assert body["unbatched_event_count"] == 1
+    assert len(body["batches"]) == 3
+    assert {p["event_id"] for p in body["proofs"]} == {str(i) for i in ids}
+
+    proof = client.get(f"/audit/events/{ids[3]}/proof")
+    assert proof.status_code == status.HTTP_200_OK
+    assert proof.json()["valid"] is True
+    event = session.get(AuditEvent, ids[3])
+    leaf = leaf_hash(event.id, event.checksum)
+    assert verify_inclusion(leaf, proof.json()["path"], proof.json()["merkle_root"])
+
+    not_sealed = client.get(f"/audit/events/{unbatched[0]}/proof")
+    assert not_sealed.status_code == status.HTTP_409_CONFLICT
+
+
+def test_tampering_is_detected(client, session) -> None:
+    ids = _insert_events(session, T0, T0 + timedelta(minutes=1), T0 + HOUR)
+    _seal(session)
+    session.execute(
+        update(AuditEvent)
+        .where(AuditEvent.id == ids[1])
+        .values(checksum=hashlib.sha256(b"forged").hexdigest())
+    )
+    session.commit()
+
+    body = client.get(
+        "/audit/verify-range",
+        params={"start": T0.isoformat(), "end": (T0 + 2 * HOUR).isoformat()},
+    ).json()
+    assert body["valid"] is False
+    first, second = body["batches"]
+    assert first["root_valid"] is False
+    assert first["invalid_event_ids"] == [str(ids[1])]
+    assert second["root_valid"] is True and second["signature_valid"] is True
+    assert body["proofs"] is None
+
+
+def test_verify_range_without_key_returns_503(client) -> None:
+    os.environ.pop("AUDIT_SIGNING_KEY", None)
+    _reset_signing_key_cache()
+    response = client.get(
+        "/audit/verify-range",
+        params={"start": T0.isoformat(), "end": (T0 + HOUR).isoformat()},
+    )
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
@@ -0,0 +1,164 @@
+"""Tests for the batched background audit writer."""
+
+from __future__ import annotations
+
+import json
+import os
+import uuid
+
+import pytest
+from fastapi import status
+from sqlalchemy import func, select
+
+from app.core.database import SessionLocal
+from app.models.audit import AuditEvent
+from app.services import audit_writer
+from app.services.audit_trail_service import AuditTrailService
+from app.services.audit_writer import AuditWriter
+
+
+def _row() -> dict:
+    return AuditTrailService.build_row(
+        event_id=uuid.uuid4(),
+        entity_type="order",
+        entity_id=uuid.uuid4(),
+        event_type="created",
+        payload_raw='{"a":1}',
+        payload_obj={"a": 1},
+    )
+
+
+def _count() -> int:
+    with SessionLocal() as session:
+        return session.scalar(select(func.count()).select_from(AuditEvent))
+
+
+def test_events_are_written_in_batches() -> None:
+    writer = AuditWriter(SessionLocal, batch_size=3, flush_interval=0.05)
+    sizes: list[int] = []
+    write = writer._write
+    writer._write = lambda rows: (sizes.append(len(rows)), write(rows))
+    try:
+        for _ in range(7):
+            writer.submit(_row())
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close()
+
+    assert _count() == 7
+    assert sum(sizes) == 7
+    assert max(sizes) <= 3
+
+
+def test_full_queue_writes_inline_and_close_drains() -> None:
+    writer = AuditWriter(SessionLocal, max_queue=1)
+    writer.start = lambda: None  # no background thread
+    writer.submit(_row())
+    writer.submit(_row())
+    assert _count() == 1
+
+    writer.close()
+    assert _count() == 2
+    assert writer.flush(timeout=0)
+
+
+def _own_wal(base) -> str:
+    return f"{base}.{os.getpid()}"
+
+
+def test_wal_is_replayed_once_after_a_crash(tmp_path) -> None:
+    wal = tmp_path / "audit.wal"
+    crashed = AuditWriter(SessionLocal, wal_path=str(wal))
+    crashed.start = lambda: None
+    crashed.submit(_row())
+    crashed.submit(_row())
+    assert _count() == 0
+    with open(_own_wal(wal)) as fh:
+        lines = fh.read()
+    assert len(lines.splitlines()) == 2
+    crashed._wal_file.close()  # the OS drops the lock when a process dies
+
+    AuditWriter(SessionLocal, wal_path=str(wal)).close()
+    assert _count() == 2
+    assert not os.path.exists(_own_wal(wal))
+
+    # Replaying the same events again (here from the unsuffixed file of an
+    # older version) does not duplicate them.
+    wal.write_text(lines + '{"torn":')
+    AuditWriter(SessionLocal, wal_path=str(wal)).close()
+    assert _count() == 2
+    assert not wal.exists()
+
+
+def test_wal_files_of_other_processes(tmp_path) -> None:
+    fcntl = pytest.importorskip("fcntl")
+    wal = tmp_path / "audit.wal"
+    dead, live = tmp_path / "audit.wal.1", tmp_path / "audit.wal.2"
+    dead_rows = [_row(), _row()]
+    dead.write_text(
+        "".join(json.dumps(audit_writer._encode_row(r)) + "\n" for r in dead_rows)
+    )
+    live.write_text(json.dumps(audit_writer._encode_row(_row())) + "\n")
+
+    with open(live) as held:
+        fcntl.flock(held.fileno(), fcntl.LOCK_EX)
+        AuditWriter(SessionLocal, wal_path=str(wal)).close()
+
+    assert _count() == 2
+    assert not dead.exists()
+    assert live.exists()
+
+
+def test_failed_inline_write_does_not_pin_the_wal(tmp_path) -> None:
+    wal = tmp_path / "audit.wal"
+    writer = AuditWriter(SessionLocal, max_queue=1, wal_path=str(wal))
+    writer.start = lambda: None
+    writer.submit(_row())  # queued
+    write = writer._write
+    writer._write = lambda rows: (_ for _ in ()).throw(RuntimeError("db down"))
+    with pytest.raises(RuntimeError):
+        writer.submit(_row())  # queue full, inline write fails
+    writer._write = write
+
+    writer.close()
+    assert _count() == 1
+    assert not os.path.exists(_own_wal(wal))
+
+
+def test_wal_is_truncated_once_events_are_committed(tmp_path) -> None:
+    wal = tmp_path / "audit.wal"
+    writer = AuditWriter(SessionLocal, flush_interval=0.01, wal_path=str(wal))
+    try:
+        row = _row()
+        writer.submit(row)
+        assert writer.flush(timeout=5)
+        with open(_own_wal(wal)) as fh:
+            assert fh.read() == ""
+    finally:
+        writer.close()
+
+    with SessionLocal() as session:
+        stored = session.get(AuditEvent, row["id"])
+        assert stored.checksum == row["checksum"]
+        assert stored.payload == {"a": 1}
+
+
+@pytest.fixture()
+def async_writer(monkeypatch):
+    writer = AuditWriter(SessionLocal, flush_interval=0.2)
+    monkeypatch.setattr(audit_writer, "_writer", writer)
+    yield writer
+    writer.close()
+
+
+def test_dependency_hands_events_to_the_writer(client, async_writer) -> None:
+    response = client.post(
+        "/orders/sales", json={"price_type": "variable", "quantity_mt": 5.0}
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+    assert async_writer.flush(timeout=5)
+    with SessionLocal() as session:
+        event = session.scalars(select(AuditEvent)).one()
+    assert str(event.entity_id) == response.json()["id"]
+    assert event.entity_type == "order"
@@ -0,0 +1,190 @@
+"""Tests for the JWKS cache and the verified-claims cache."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+from app.core import auth
+from app.core.auth import AuthSettings, JWKSCache, VerifiedClaimsCache, verify_token
+
+_SETTINGS = AuthSettings(
+    issuer="https://issuer.test", audience="api://test", jwks_url="https://jwks.test"
+)
+
+
+def _keypair(kid: str) -> tuple[bytes, dict]:
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public = jwk.construct(pem, "RS256").public_key().to_dict()
+    return pem, {**public, "kid": kid, "use": "sig"}
+
+
+_PEM, _JWK = _keypair("k1")
+_PEM2, _JWK2 = _keypair("k2")
+
+
+def _token(pem: bytes = _PEM, kid: str = "k1", exp: float | None = None) -> str:
+    claims = {
+        "sub": "u1",
+        "aud": "api://test",
+        "iss": "https://issuer.test",
+        "exp": int(exp if exp is not None else time.time() + 3600),
+    }
+    return jwt.encode(claims, pem, algorithm="RS256", headers={"kid": kid})
+
+
+def _fetcher(calls: list[str], delay: float = 0.0):
+    def fetch(url: str) -> dict:
+        calls.append(url)
+        time.sleep(delay)
+        return {"keys": [_JWK]}
+
+    return fetch
+
+
+def test_public_key_is_built_once_per_kid() -> None:
+    calls: list[str] = []
+    cache = JWKSCache()
+    with patch.object(JWKSCache, "_fetch_jwks", staticmethod(_fetcher(calls))):
+        key = cache.public_key(_SETTINGS, "k1")
+        assert cache.public_key(_SETTINGS, "k1") is key
+    assert calls == ["https://jwks.test"]
+
+    token = jwt.encode(
+        {"sub": "u1", "aud": "api://test", "iss": "https://issuer.test"},
+        _PEM,
+        algorithm="RS256",
+        headers={"kid": "k1"},
+    )
+    claims = jwt.decode(
+        token, key, algorithms=["RS256"], audience="api://test", issuer="https://issuer.test"
+    )
+    assert claims["sub"] == "u1"
+
+
+def test_unknown_kid_is_rejected() -> None:
+    cache = JWKSCache()
+    with patch.object(JWKSCache, "_fetch_jwks", staticmethod(_fetcher([]))):
+        with pytest.raises(HTTPException) as exc_info:
+            cache.public_key(_SETTINGS, "other")
+    assert exc_info.value.status_code == 401
+
+
+def test_concurrent_async_refreshes_fetch_once_off_loop() -> None:
+    calls: list[str] = []
+    fetch_threads: set[int] = set()
+    cache = JWKSCache()
+
+    def fetch(url: str) -> dict:
+        fetch_threads.add(threading.get_ident())
+        return _fetcher(calls, delay=0.05)(url)
+
+    async def scenario() -> list[dict]:
+        return await asyncio.gather(*(cache.get_async(_SETTINGS) for _ in range(8)))
+
+    loop = asyncio.new_event_loop()
+    try:
+        with patch.object(JWKSCache, "_fetch_jwks", staticmethod(fetch)):
+            results = loop.run_until_complete(scenario())
+    finally:
+        loop.close()
+
+    assert calls == ["https://jwks.test"]
+    assert all(r == {"keys": [_JWK]} for r in results)
+    assert threading.get_ident() not in fetch_threads
+
+
+def test_expired_key_set_is_served_while_refreshing_in_background() -> None:
+    now = [0.0]
+    key_sets = [{"keys": [_JWK]}, {"keys": [_JWK, _JWK2]}]
+    release = threading.Event()
+
+    def fetch(url: str) -> dict:
+        if len(key_sets) == 1:
+            assert release.wait(2)
+        return key_sets.pop(0)
+
+    cache = JWKSCache(ttl_seconds=300, clock=lambda: now[0])
+    with patch.object(JWKSCache, "_fetch_jwks", staticmethod(fetch)):
+        assert cache.get(_SETTINGS) == {"keys": [_JWK]}
+        now[0] = 301
+        # Stale set returned at once while the refresh waits on its fetch.
+        assert cache.get(_SETTINGS) == {"keys": [_JWK]}
+        assert cache.get(_SETTINGS) == {"keys": [_JWK]}
+        release.set()
+        deadline = time.time() + 2
+        while not cache.is_fresh() and time.time() < deadline:
+            time.sleep(0.01)
+        assert cache.knows("k2")
+    assert key_sets == []
+
+
+def test_unknown_kid_forces_rate_limited_refresh() -> None:
+    now = [0.0]
+    calls: list[str] = []
+    key_sets = [{"keys": [_JWK]}, {"keys": [_JWK, _JWK2]}]
+
+    def fetch(url: str) -> dict:
+        calls.append(url)
+        return key_sets[min(len(calls), len(key_sets)) - 1]
+
+    cache = JWKSCache(forced_refresh_seconds=30, clock=lambda: now[0])
+    with patch.object(JWKSCache, "_fetch_jwks", staticmethod(fetch)):
+        cache.public_key(_SETTINGS, "k1")
+        assert cache.public_key(_SETTINGS, "k2") is not None
+        assert len(calls) == 2
+
+        with pytest.raises(HTTPException):
+            cache.public_key(_SETTINGS, "k3")
+        assert len(calls) == 2  # within the forced-refresh interval
+
+        now[0] = 31
+        with pytest.raises(HTTPException):
+            cache.public_key(_SETTINGS, "k3")
+        assert len(calls) == 3
+
+
+def test_verified_claims_are_cached_until_exp() -> None:
+    now = [time.time()]
+    exp = now[0] + 60
+    claims_cache = VerifiedClaimsCache(clock=lambda: now[0])
+    token = _token(exp=exp)
+    with patch.object(auth, "_claims_cache", claims_cache), patch.object(
+        auth, "_jwks_cache", JWKSCache()
+    ), patch.object(JWKSCache, "_fetch_jwks", staticmethod(_fetcher([]))), patch.object(
+        auth.jwt, "decode", wraps=jwt.decode
+    ) as decode:
+        assert verify_token(token, _SETTINGS)["sub"] == "u1"
+        assert verify_token(token, _SETTINGS)["sub"] == "u1"
+        assert decode.call_count == 1
+
+        now[0] = exp
+        assert verify_token(token, _SETTINGS)["sub"] == "u1"
+        assert decode.call_count == 2
+
+
+def test_claims_cache_is_bounded_and_rejects_bad_tokens() -> None:
+    claims_cache = VerifiedClaimsCache(max_entries=2)
+    with patch.object(auth, "_claims_cache", claims_cache), patch.object(
+        auth, "_jwks_cache", JWKSCache()
+    ), patch.object(JWKSCache, "_fetch_jwks", staticmethod(_fetcher([]))):
+        for _ in range(3):
+            verify_token(_token(exp=time.time() + 3600 + _), _SETTINGS)
+        assert len(claims_cache._entries) == 2
+
+        with pytest.raises(HTTPException) as exc_info:
+            verify_token(_token(pem=_PEM2), _SETTINGS)
+        assert exc_info.value.status_code == 401
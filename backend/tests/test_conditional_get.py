@@ -0,0 +1,149 @@
+"""Tests for data versions and ETag / conditional GET on read endpoints."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from fastapi import status
+from sqlalchemy import insert
+
+from app.core.database import SessionLocal
+from app.models.counterparty import Counterparty
+from app.models.orders import Order
+from app.services.audit_trail_service import AuditTrailService
+from app.services.data_versions import DataVersions, get_data_versions
+from app.services.order_service import OrderService
+from app.services.ws_pubsub import MemoryPubSub
+
+
+@pytest.fixture(autouse=True)
+def _conditional_get_on(monkeypatch):
+    # The test app runs a single worker on the in-process bus.
+    monkeypatch.setenv("HTTP_CONDITIONAL_GET", "on")
+
+
+def _create_order(client) -> None:
+    response = client.post(
+        "/orders/sales", json={"price_type": "variable", "quantity_mt": 5.0}
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError("endpoint should not run")
+
+
+def test_unchanged_data_answers_304(client, monkeypatch) -> None:
+    _create_order(client)
+    first = client.get("/orders")
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    monkeypatch.setattr(OrderService, "list_orders", _fail)
+    again = client.get("/orders", headers={"If-None-Match": etag})
+    assert again.status_code == status.HTTP_304_NOT_MODIFIED
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+
+
+def test_cached_body_is_served_without_running_the_endpoint(
+    client, monkeypatch
+) -> None:
+    _create_order(client)
+    first = client.get("/orders")
+
+    monkeypatch.setattr(OrderService, "list_orders", _fail)
+    again = client.get("/orders")
+    assert again.status_code == status.HTTP_200_OK
+    assert again.json() == first.json()
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+
+def test_auto_mode_is_off_without_a_shared_bus(client, monkeypatch) -> None:
+    monkeypatch.setenv("HTTP_CONDITIONAL_GET", "auto")
+    assert get_data_versions().shared is False
+    response = client.get("/orders")
+    assert response.status_code == status.HTTP_200_OK
+    assert "ETag" not in response.headers
+    assert client.get("/orders", headers={"If-None-Match": "*"}).status_code == 200
+
+
+def test_commit_changes_the_etag(client) -> None:
+    etag = client.get("/orders").headers["ETag"]
+    _create_order(client)
+
+    after = client.get("/orders", headers={"If-None-Match": etag})
+    assert after.status_code == status.HTTP_200_OK
+    assert after.headers["ETag"] != etag
+    assert len(after.json()["items"]) == 1
+
+
+def test_etag_covers_query_params_in_any_order(client) -> None:
+    a = client.get("/orders?order_type=SO&limit=10").headers["ETag"]
+    b = client.get("/orders?limit=10&order_type=SO").headers["ETag"]
+    c = client.get("/orders?limit=11&order_type=SO").headers["ETag"]
+    assert a == b != c
+
+
+def test_only_relevant_committed_writes_bump_versions() -> None:
+    versions = get_data_versions()
+    before = versions.get(["orders", "counterparties"])
+
+    with SessionLocal() as session:
+        session.add(Counterparty(type="customer", name="ACME", country="BRA"))
+        session.flush()
+        session.rollback()
+    assert versions.get(["orders", "counterparties"]) == before
+
+    with SessionLocal() as session:
+        AuditTrailService.record(
+            session,
+            event_id=uuid.uuid4(),
+            entity_type="order",
+            entity_id=uuid.uuid4(),
+            event_type="created",
+            payload_raw="{}",
+            payload_obj={},
+        )
+    assert versions.get(["orders", "counterparties"]) == before
+
+    with SessionLocal() as session:
+        session.add(Counterparty(type="customer", name="ACME", country="BRA"))
+        session.commit()
+    after = versions.get(["orders", "counterparties"])
+    assert after["orders"] == before["orders"]
+    assert after["counterparties"] > before["counterparties"]
+
+
+def test_bulk_orm_insert_bumps_versions(session) -> None:
+    versions = get_data_versions()
+    before = versions.get(["orders"])["orders"]
+    session.execute(
+        insert(Order),
+        [{"order_type": "SO", "price_type": "variable", "quantity_mt": 1.0}],
+    )
+    session.commit()
+    assert versions.get(["orders"])["orders"] > before
+
+
+def test_workers_on_one_bus_share_versions() -> None:
+    bus = MemoryPubSub()
+    a, b = DataVersions(bus), DataVersions(bus)
+    a.bump(["orders"])
+    assert b.get(["orders"]) == a.get(["orders"]) == {"orders": 1}
+    assert b.get(["counterparties"]) == {"counterparties": 0}
+
+
+def test_listener_gap_raises_every_version() -> None:
+    bus = MemoryPubSub()
+    versions = DataVersions(bus)
+    versions.bump(["orders"])
+    before = versions.token(["orders", "counterparties"])
+    bus._dispatch_gap(40)
+    assert versions.get(["orders", "counterparties"]) == {
+        "counterparties": 40,
+        "orders": 40,
+    }
+    assert versions.token(["orders", "counterparties"]) != before
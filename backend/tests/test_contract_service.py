@@ -1,6 +1,7 @@
 """Tests for ContractService — unit tests for the contract business logic."""
 
 import uuid
+from datetime import date
 
 import pytest
 from sqlalchemy.orm import Session
@@ -334,3 +335,31 @@ def test_delete_nonexistent_raises_404(session: Session) -> None:
     with pytest.raises(HTTPException) as exc:
         ContractService.delete(session, uuid.uuid4())
     assert exc.value.status_code == 404
+
+
+# ── Settlement-date backfill ─────────────────────────────────────────────
+
+
+def test_backfill_settlement_dates(session: Session) -> None:
+    avg = ContractService.create(session, _make_payload())
+    avg.float_pricing_convention = "avg"
+    avg.pricing_period_month, avg.pricing_period_year = 1, 2026
+    c2r = ContractService.create(session, _make_payload())
+    c2r.float_pricing_convention = "c2r"
+    c2r.fixing_date = date(2026, 3, 13)
+    unknown = ContractService.create(session, _make_payload())
+    unknown.float_pricing_convention = "avginter"
+    preset = ContractService.create(
+        session, _make_payload(settlement_date=date(2026, 6, 1))
+    )
+    preset.float_pricing_convention = "c2r"
+    preset.fixing_date = date(2026, 3, 13)
+    session.commit()
+
+    assert ContractService.backfill_settlement_dates(session, chunk_size=2) == 2
+
+    # 2nd business day of Feb 2026; fixing Fri 13 Mar + 2 business days
+    assert avg.settlement_date == date(2026, 2, 3)
+    assert c2r.settlement_date == date(2026, 3, 17)
+    assert unknown.settlement_date is None
+    assert preset.settlement_date == date(2026, 6, 1)
@@ -117,3 +117,50 @@ class TestGetRunDetail:
     def test_detail_not_found(self, client):
         r = client.get(f"{ENDPOINT}/runs/{uuid.uuid4()}")
         assert r.status_code == 404
+
+
+class TestStepTimings:
+    """Each step exposes duration, query count and swallowed-error counters."""
+
+    def test_detail_includes_timings(self, client):
+        r = client.post(f"{ENDPOINT}/run", json={"run_date": "2025-07-20"})
+        run_id = r.json()["id"]
+        body = client.get(f"{ENDPOINT}/runs/{run_id}").json()
+        for step in body["steps"]:
+            timings = step["timings"]
+            assert timings["duration_ms"] is not None
+            assert timings["duration_ms"] >= 0
+            assert timings["errors_swallowed"] == 0
+        market = body["steps"][0]
+        assert market["step_name"] == "market_snapshot"
+        assert market["timings"]["query_count"] >= 1
+
+    def test_swallowed_errors_counted(self, client):
+        with patch(
+            "app.services.cashflow_baseline_service.create_cashflow_baseline_snapshot",
+            side_effect=RuntimeError("no baseline"),
+        ):
+            r = client.post(f"{ENDPOINT}/run", json={"run_date": "2025-07-21"})
+        assert r.json()["status"] == "completed"
+        body = client.get(f"{ENDPOINT}/runs/{r.json()['id']}").json()
+        baseline = next(s for s in body["steps"] if s["step_name"] == "cashflow_baseline")
+        assert baseline["records_processed"] == 0
+        assert baseline["timings"]["errors_swallowed"] == 1
+        assert baseline["timings"]["record_latency_max_ms"] is not None
+
+    def test_prometheus_series_recorded(self, client):
+        from prometheus_client import REGISTRY
+
+        before = (
+            REGISTRY.get_sample_value(
+                "finance_pipeline_step_duration_seconds_count",
+                {"step": "market_snapshot"},
+            )
+            or 0
+        )
+        client.post(f"{ENDPOINT}/run", json={"run_date": "2025-07-22"})
+        after = REGISTRY.get_sample_value(
+            "finance_pipeline_step_duration_seconds_count",
+            {"step": "market_snapshot"},
+        )
+        assert after == before + 1
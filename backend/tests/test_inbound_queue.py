@@ -0,0 +1,202 @@
+"""Unit tests for the durable inbound message queue."""
+
+from __future__ import annotations
+
+import os
+import uuid
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from app.core.database import SessionLocal
+from app.core.utils import now_utc
+from app.models.inbound_queue import InboundQueueItem, InboundQueueStatus
+from app.schemas.whatsapp import WhatsAppInboundMessage
+from app.services.inbound_queue import InboundQueue
+from app.services.inbound_worker_pool import BACKEND_DATABASE, InboundWorkerPool
+
+
+def _msg(phone: str, text: str, message_id: str | None = None) -> WhatsAppInboundMessage:
+    return WhatsAppInboundMessage(
+        message_id=message_id or f"wamid.{uuid.uuid4().hex[:10]}",
+        from_phone=phone,
+        timestamp=now_utc(),
+        text=text,
+    )
+
+
+def _enqueue(session, *msgs: WhatsAppInboundMessage) -> None:
+    for msg in msgs:
+        InboundQueue.enqueue(session, msg)
+    session.commit()
+
+
+def _item(session, message_id: str) -> InboundQueueItem:
+    session.expire_all()
+    return (
+        session.query(InboundQueueItem)
+        .filter(InboundQueueItem.message_id == message_id)
+        .one()
+    )
+
+
+def test_enqueue_is_idempotent_on_message_id(session) -> None:
+    msg = _msg("+5511999990001", "2450", message_id="wamid.dup")
+    assert InboundQueue.enqueue(session, msg) is True
+    assert InboundQueue.enqueue(session, msg) is False
+    session.commit()
+    assert InboundQueue.depth(session) == 1
+
+
+def test_claim_marks_processing_in_enqueue_order(session) -> None:
+    a = _msg("+5511999990001", "2450")
+    b = _msg("+5511999990002", "2455")
+    _enqueue(session, a, b)
+
+    claimed = InboundQueue.claim(session, "w1", limit=10)
+    assert [c.message.message_id for c in claimed] == [a.message_id, b.message_id]
+    assert all(c.attempts == 1 for c in claimed)
+
+    row = _item(session, a.message_id)
+    assert row.status == InboundQueueStatus.processing
+    assert row.locked_by == "w1"
+    assert InboundQueue.claim(session, "w2", limit=10) == []
+
+
+def test_claim_skips_sender_with_message_in_flight(session) -> None:
+    first = _msg("+5511999990001", "2450")
+    refresh = _msg("+5511999990001", "2440")
+    other = _msg("+5511999990002", "2455")
+    _enqueue(session, first, refresh, other)
+
+    assert [c.message.message_id for c in InboundQueue.claim(session, "w1", 1)] == [
+        first.message_id
+    ]
+    # Another worker must not overtake the sender's first quote.
+    assert [c.message.message_id for c in InboundQueue.claim(session, "w2", 10)] == [
+        other.message_id
+    ]
+
+
+def test_two_claimers_never_split_a_sender(session) -> None:
+    first = _msg("+5511999990001", "2450")
+    refresh = _msg("+5511999990001", "2440")
+    other = _msg("+5511999990002", "2455")
+    _enqueue(session, first, refresh, other)
+
+    # A batch never holds two messages of one sender...
+    batch_a = InboundQueue.claim(session, "w1", 10)
+    assert [c.message.message_id for c in batch_a] == [
+        first.message_id,
+        other.message_id,
+    ]
+    # ...and while the first is unsettled nobody else gets the refresh.
+    with SessionLocal() as other_session:
+        assert InboundQueue.claim(other_session, "w2", 10) == []
+
+        # A retry keeps the refresh waiting behind it.
+        InboundQueue.fail(session, batch_a[0], "boom")
+        assert InboundQueue.claim(other_session, "w2", 10) == []
+
+        row = _item(session, first.message_id)
+        row.available_at = now_utc()
+        session.commit()
+        retried = InboundQueue.claim(other_session, "w2", 10)
+        assert [c.message.message_id for c in retried] == [first.message_id]
+        InboundQueue.complete(other_session, retried[0].item_id)
+
+        assert [
+            c.message.message_id for c in InboundQueue.claim(session, "w1", 10)
+        ] == [refresh.message_id]
+
+
+def test_expired_visibility_timeout_is_reclaimed(session) -> None:
+    msg = _msg("+5511999990001", "2450")
+    _enqueue(session, msg)
+
+    with patch.dict(os.environ, {"INBOUND_VISIBILITY_TIMEOUT_SECONDS": "0"}):
+        assert len(InboundQueue.claim(session, "crashed", 1)) == 1
+
+    reclaimed = InboundQueue.claim(session, "w2", 1)
+    assert [c.attempts for c in reclaimed] == [2]
+    assert _item(session, msg.message_id).locked_by == "w2"
+
+
+def test_fail_retries_with_backoff_then_dead_letters(session) -> None:
+    msg = _msg("+5511999990001", "2450")
+    _enqueue(session, msg)
+
+    with patch.dict(os.environ, {"INBOUND_MAX_ATTEMPTS": "2"}):
+        claimed = InboundQueue.claim(session, "w1", 1)[0]
+        assert InboundQueue.fail(session, claimed, "boom") == InboundQueueStatus.pending
+
+        row = _item(session, msg.message_id)
+        assert row.last_error == "boom"
+        assert row.locked_by is None
+        # Backing off: not claimable yet.
+        assert InboundQueue.claim(session, "w1", 1) == []
+
+        row.available_at = now_utc()
+        session.commit()
+        claimed = InboundQueue.claim(session, "w1", 1)[0]
+        assert claimed.attempts == 2
+        assert InboundQueue.fail(session, claimed, "boom") == InboundQueueStatus.dead
+
+    assert _item(session, msg.message_id).status == InboundQueueStatus.dead
+    assert InboundQueue.depth(session) == 0
+
+
+def test_pool_database_backend_settles_rows(session) -> None:
+    ok = _msg("+5511999990001", "2450")
+    bad = _msg("+5511999990002", "boom")
+    _enqueue(session, ok, bad)
+    seen: list[str] = []
+
+    def handler(_session, msg):
+        if msg.text == "boom":
+            raise RuntimeError("LLM exploded")
+        seen.append(msg.message_id)
+        return {"status": "quote_created"}
+
+    pool = InboundWorkerPool(
+        max_workers=1,
+        handler=handler,
+        session_factory=SessionLocal,
+        backend=BACKEND_DATABASE,
+    )
+    assert pool.pump() == 2
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+
+    assert seen == [ok.message_id]
+    assert _item(session, ok.message_id).status == InboundQueueStatus.done
+    failed = _item(session, bad.message_id)
+    assert failed.status == InboundQueueStatus.pending
+    assert failed.attempts == 1
+    assert "LLM exploded" in failed.last_error
+
+
+@patch.dict(
+    os.environ, {"WHATSAPP_APP_SECRET": "", "INBOUND_QUEUE_BACKEND": "database"}
+)
+@patch("app.api.routes.webhooks._process_queue_in_background")
+def test_webhook_persists_to_database_backend(
+    _mock_bg, client: TestClient, session
+) -> None:
+    from app.services.webhook_processor import queue_depth
+
+    form = {
+        "MessageSid": "SM0001",
+        "From": "whatsapp:+5511999990001",
+        "Body": "2450 USD/MT",
+    }
+    with patch(
+        "app.api.routes.webhooks.get_provider_name", return_value="twilio"
+    ), patch.dict(os.environ, {"TWILIO_AUTH_TOKEN": ""}):
+        resp = client.post("/webhooks/whatsapp", data=form)
+        client.post("/webhooks/whatsapp", data=form)  # redelivery
+
+    assert resp.status_code == 200
+    assert queue_depth() == 0
+    assert InboundQueue.depth(session) == 1
+    assert _item(session, "SM0001").text == "2450 USD/MT"
@@ -0,0 +1,145 @@
+"""Unit tests for the inbound worker pool — concurrency and per-sender order."""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from unittest.mock import MagicMock
+
+from app.core.utils import now_utc
+from app.schemas.whatsapp import WhatsAppInboundMessage
+from app.services.inbound_worker_pool import InboundWorkerPool, sender_key
+from app.services.webhook_processor import enqueue_message, queue_depth
+
+
+def _msg(phone: str, text: str) -> WhatsAppInboundMessage:
+    return WhatsAppInboundMessage(
+        message_id=f"wamid.{uuid.uuid4().hex[:10]}",
+        from_phone=phone,
+        timestamp=now_utc(),
+        text=text,
+    )
+
+
+def _pool(handler, **kwargs) -> InboundWorkerPool:
+    return InboundWorkerPool(
+        handler=handler, session_factory=MagicMock, **kwargs
+    )
+
+
+def test_sender_key_collapses_phone_formats() -> None:
+    assert sender_key("+5511999990001") == sender_key("5511999990001")
+    assert sender_key("+5511999990001") == sender_key("+551199990001")
+    assert sender_key("+14155238886") != sender_key("+5511999990001")
+
+
+def test_preserves_order_per_sender() -> None:
+    processed: dict[str, list[str]] = {}
+    lock = threading.Lock()
+
+    def handler(session, msg):
+        time.sleep(0.002)
+        with lock:
+            processed.setdefault(msg.from_phone, []).append(msg.text)
+        return {"status": "ok"}
+
+    phones = [f"+55119999900{i:02d}" for i in range(4)]
+    for n in range(10):
+        for phone in phones:
+            enqueue_message(_msg(phone, str(n)))
+
+    pool = _pool(handler, max_workers=4)
+    pool.pump()
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+
+    for phone in phones:
+        assert processed[phone] == [str(n) for n in range(10)]
+
+
+def test_different_senders_run_concurrently() -> None:
+    # Both handlers must be inside the barrier at once, or it times out.
+    barrier = threading.Barrier(2, timeout=2)
+    outcomes: list[str] = []
+
+    def handler(session, msg):
+        barrier.wait()
+        outcomes.append(msg.from_phone)
+        return {"status": "ok"}
+
+    enqueue_message(_msg("+5511999990001", "2450"))
+    enqueue_message(_msg("+5511999990002", "2455"))
+
+    pool = _pool(handler, max_workers=2)
+    pool.pump()
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+    assert sorted(outcomes) == ["+5511999990001", "+5511999990002"]
+
+
+def test_concurrency_is_bounded() -> None:
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def handler(session, msg):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight -= 1
+        return {"status": "ok"}
+
+    for i in range(8):
+        enqueue_message(_msg(f"+55119999901{i:02d}", "2450"))
+
+    pool = _pool(handler, max_workers=2)
+    pool.pump()
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+    assert peak <= 2
+
+
+def test_backpressure_leaves_excess_in_webhook_queue() -> None:
+    release = threading.Event()
+    seen: list[str] = []
+
+    def handler(session, msg):
+        release.wait(timeout=5)
+        seen.append(msg.text)
+        return {"status": "ok"}
+
+    for i in range(5):
+        enqueue_message(_msg("+5511999990001", str(i)))
+
+    pool = _pool(handler, max_workers=1, max_buffered=2)
+    assert pool.pump() == 2
+    assert queue_depth() == 3
+
+    release.set()
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+    assert seen == ["0", "1", "2", "3", "4"]
+    assert queue_depth() == 0
+
+
+def test_handler_error_does_not_stall_sender() -> None:
+    seen: list[str] = []
+
+    def handler(session, msg):
+        if msg.text == "boom":
+            raise RuntimeError("LLM exploded")
+        seen.append(msg.text)
+        return {"status": "ok"}
+
+    enqueue_message(_msg("+5511999990001", "boom"))
+    enqueue_message(_msg("+5511999990001", "2450"))
+
+    pool = _pool(handler, max_workers=1)
+    pool.pump()
+    assert pool.wait_idle(timeout=5)
+    pool.shutdown()
+    assert seen == ["2450"]
@@ -0,0 +1,191 @@
+"""Tests for the exposure / MTM aggregates pushed over WebSocket."""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.core.database import SessionLocal
+from app.core.utils import now_utc
+from app.models.contracts import (
+    HedgeClassification,
+    HedgeContract,
+    HedgeContractStatus,
+    HedgeLegSide,
+)
+from app.models.market_data import CashSettlementPrice
+from app.services import live_aggregates
+from app.services.live_aggregates import LiveAggregates
+from app.services.ws_pubsub import MemoryPubSub
+
+
+@pytest.fixture()
+def pushed(monkeypatch):
+    events: list[tuple[str, str, str, dict]] = []
+    aggregates = LiveAggregates(
+        SessionLocal, lambda *evt: events.append(evt), background=False
+    )
+    monkeypatch.setattr(live_aggregates, "_aggregates", aggregates)
+    yield aggregates, events
+
+
+def _insert_price(price_usd: float) -> None:
+    with SessionLocal() as session:
+        session.add(
+            CashSettlementPrice(
+                source="westmetall",
+                symbol="LME_ALU_CASH_SETTLEMENT_DAILY",
+                settlement_date=now_utc().date() - timedelta(days=1),
+                price_usd=price_usd,
+                source_url="https://example.test/source",
+                html_sha256="0" * 64,
+                fetched_at=datetime(2026, 2, 1, tzinfo=UTC),
+            )
+        )
+        session.commit()
+
+
+def _insert_contract(quantity_mt: float, entry_price: float = 100.0) -> uuid.UUID:
+    with SessionLocal() as session:
+        contract = HedgeContract(
+            commodity="LME_AL",
+            quantity_mt=quantity_mt,
+            fixed_leg_side=HedgeLegSide.buy,
+            variable_leg_side=HedgeLegSide.sell,
+            classification=HedgeClassification.long,
+            fixed_price_value=entry_price,
+            fixed_price_unit="USD/MT",
+            float_pricing_convention="avg",
+            status=HedgeContractStatus.active,
+        )
+        session.add(contract)
+        session.commit()
+        return contract.id
+
+
+def _events(events, topic: str, topic_id: str) -> list[dict]:
+    return [data for t, i, _, data in events if (t, i) == (topic, topic_id)]
+
+
+def test_commit_marks_affected_topics(pushed) -> None:
+    aggregates, _ = pushed
+    _insert_price(110.0)
+    assert aggregates.pending == {"mtm"}
+
+    _insert_contract(5.0)
+    assert aggregates.pending == {"mtm", "exposure"}
+
+
+def test_rolled_back_write_marks_nothing(pushed) -> None:
+    aggregates, _ = pushed
+    with SessionLocal() as session:
+        session.add(
+            HedgeContract(
+                commodity="LME_AL",
+                quantity_mt=5.0,
+                fixed_leg_side=HedgeLegSide.buy,
+                variable_leg_side=HedgeLegSide.sell,
+                classification=HedgeClassification.long,
+                status=HedgeContractStatus.active,
+            )
+        )
+        session.flush()
+        session.rollback()
+    assert aggregates.pending == frozenset()
+
+
+def test_only_changed_rows_are_pushed(pushed) -> None:
+    aggregates, events = pushed
+    _insert_price(110.0)
+    first = _insert_contract(5.0)
+    second = _insert_contract(2.0)
+    aggregates.flush_pending()
+
+    (mtm,) = _events(events, "mtm", "hedge_contracts")
+    assert {row["object_id"] for row in mtm["rows"]} == {str(first), str(second)}
+    (net,) = _events(events, "exposure", "net")
+    assert [row["long_tons"] for row in net["rows"]] == [7.0]
+    assert _events(events, "exposure", "global")
+
+    events.clear()
+    aggregates.refresh({"exposure", "mtm"})
+    assert events == []
+
+    with SessionLocal() as session:
+        session.get(HedgeContract, second).quantity_mt = 3.0
+        session.commit()
+    aggregates.flush_pending()
+
+    (mtm,) = _events(events, "mtm", "hedge_contracts")
+    assert [row["object_id"] for row in mtm["rows"]] == [str(second)]
+    assert float(mtm["rows"][0]["mtm_value"]) == 30.0
+    assert mtm["removed"] == []
+    (net,) = _events(events, "exposure", "net")
+    assert net["rows"][0]["long_tons"] == 8.0
+
+
+def test_closed_contract_is_reported_removed(pushed) -> None:
+    aggregates, events = pushed
+    _insert_price(110.0)
+    contract_id = _insert_contract(5.0)
+    aggregates.flush_pending()
+    events.clear()
+
+    with SessionLocal() as session:
+        session.get(HedgeContract, contract_id).status = HedgeContractStatus.settled
+        session.commit()
+    aggregates.flush_pending()
+
+    (mtm,) = _events(events, "mtm", "hedge_contracts")
+    assert mtm["rows"] == []
+    assert mtm["removed"] == [str(contract_id)]
+
+
+def test_background_thread_coalesces_commits() -> None:
+    refreshed: list[set[str]] = []
+    done = threading.Event()
+    aggregates = LiveAggregates(SessionLocal, lambda *evt: None, debounce_seconds=0.05)
+
+    def record(topics: set[str]) -> None:
+        refreshed.append(topics)
+        done.set()
+
+    aggregates.refresh = record
+    try:
+        aggregates.mark_dirty({"mtm"})
+        aggregates.mark_dirty({"exposure"})
+        assert done.wait(2)
+        assert refreshed == [{"mtm", "exposure"}]
+    finally:
+        aggregates.close()
+
+
+def test_push_from_another_worker_makes_the_next_push_full(pushed) -> None:
+    bus = MemoryPubSub()
+    aggregates = LiveAggregates(
+        SessionLocal, lambda *evt: None, background=False, bus=bus
+    )
+    _insert_price(110.0)
+    first = _insert_contract(5.0)
+    second = _insert_contract(2.0)
+    aggregates.refresh({"mtm"})
+
+    pushed_rows: list[dict] = []
+    aggregates._publish = lambda *evt: pushed_rows.append(evt[3])
+    bus.publish("mtm", "hedge_contracts", "mtm_updated", {"origin": "other"})
+    aggregates.refresh({"mtm"})
+    (full,) = pushed_rows
+    assert {row["object_id"] for row in full["rows"]} == {str(first), str(second)}
+
+    # Its own pushes, echoed by the bus, leave the baseline alone.
+    pushed_rows.clear()
+    bus.publish("mtm", "hedge_contracts", "mtm_updated", {"origin": full["origin"]})
+    aggregates.refresh({"mtm"})
+    assert pushed_rows == []
+
+    bus._dispatch_gap(7)
+    aggregates.refresh({"mtm"})
+    assert [len(data["rows"]) for data in pushed_rows] == [2]
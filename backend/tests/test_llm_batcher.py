@@ -0,0 +1,144 @@
+"""Unit tests for LLM call micro-batching."""
+
+from __future__ import annotations
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.llm_agent import (
+    LLMResponseError,
+    LLMUnavailableError,
+    _call_openai_batch,
+)
+from app.services.llm_batcher import LLMBatcher
+
+
+class _FakeLLM:
+    def __init__(self, drop: set[str] | None = None, fail: bool = False) -> None:
+        self.single_calls: list[str] = []
+        self.batches: list[list[str]] = []
+        self._drop = drop or set()
+        self._fail = fail
+        self._lock = threading.Lock()
+
+    def single(self, _system: str, prompt: str) -> dict:
+        with self._lock:
+            self.single_calls.append(prompt)
+        return {"echo": prompt, "batched": False}
+
+    def batch(self, _system: str, prompts: list[str]) -> list[dict | None]:
+        with self._lock:
+            self.batches.append(prompts)
+        if self._fail:
+            raise LLMUnavailableError("down")
+        return [
+            None if p in self._drop else {"echo": p, "batched": True} for p in prompts
+        ]
+
+
+def _call_all(batcher: LLMBatcher, prompts: list[str]) -> list:
+    with ThreadPoolExecutor(max_workers=len(prompts)) as pool:
+        futures = [pool.submit(batcher.call, "sys", p) for p in prompts]
+        return [f.exception() or f.result() for f in futures]
+
+
+def test_concurrent_calls_share_one_request() -> None:
+    llm = _FakeLLM()
+    batcher = LLMBatcher(llm.single, llm.batch, max_batch_size=4, window_seconds=5)
+
+    results = _call_all(batcher, ["a", "b", "c", "d"])
+
+    # The size cap flushes long before the 5 s window.
+    assert len(llm.batches) == 1 and sorted(llm.batches[0]) == ["a", "b", "c", "d"]
+    assert [r["echo"] for r in results] == ["a", "b", "c", "d"]
+    assert all(r["batched"] for r in results)
+    assert llm.single_calls == []
+
+
+def test_window_flushes_partial_batch() -> None:
+    llm = _FakeLLM()
+    batcher = LLMBatcher(llm.single, llm.batch, max_batch_size=16, window_seconds=0.1)
+
+    results = _call_all(batcher, ["a", "b", "c"])
+
+    assert len(llm.batches) == 1
+    assert [r["echo"] for r in results] == ["a", "b", "c"]
+
+
+def test_lone_call_is_made_directly() -> None:
+    llm = _FakeLLM()
+    batcher = LLMBatcher(llm.single, llm.batch, max_batch_size=16, window_seconds=0.01)
+
+    assert batcher.call("sys", "a") == {"echo": "a", "batched": False}
+    assert llm.batches == []
+
+
+def test_malformed_items_fall_back_to_single_calls() -> None:
+    llm = _FakeLLM(drop={"b"})
+    batcher = LLMBatcher(llm.single, llm.batch, max_batch_size=3, window_seconds=5)
+
+    results = _call_all(batcher, ["a", "b", "c"])
+
+    assert [r["batched"] for r in results] == [True, False, True]
+    assert llm.single_calls == ["b"]
+
+
+def test_batch_failure_reaches_every_caller() -> None:
+    llm = _FakeLLM(fail=True)
+    batcher = LLMBatcher(llm.single, llm.batch, max_batch_size=2, window_seconds=5)
+
+    results = _call_all(batcher, ["a", "b"])
+
+    assert all(isinstance(r, LLMUnavailableError) for r in results)
+    assert llm.single_calls == []
+
+
+@patch("app.services.llm_agent._call_openai")
+def test_call_openai_batch_demultiplexes_by_id(mock_openai: MagicMock) -> None:
+    mock_openai.return_value = {
+        "results": [
+            {"id": 1, "output": {"intent": "REJECTION"}},
+            {"id": 0, "output": {"intent": "QUOTE"}},
+            {"id": 2, "output": "not an object"},
+            {"id": 7, "output": {"intent": "OTHER"}},
+        ]
+    }
+
+    outputs = _call_openai_batch("sys", ["2450", "sem interesse", "??"])
+
+    assert outputs == [{"intent": "QUOTE"}, {"intent": "REJECTION"}, None]
+    system_prompt, payload = mock_openai.call_args.args
+    assert '"results"' in system_prompt
+    assert '"sem interesse"' in payload
+    assert mock_openai.call_args.kwargs["max_tokens"] == 3 * 520
+
+
+@pytest.mark.parametrize("response", [{}, {"results": "nope"}])
+@patch("app.services.llm_agent._call_openai")
+def test_call_openai_batch_unusable_response(mock_openai: MagicMock, response) -> None:
+    mock_openai.return_value = response
+    assert _call_openai_batch("sys", ["a", "b"]) == [None, None]
+
+
+@patch("app.services.llm_agent._call_openai")
+def test_call_openai_batch_unreadable_response_falls_back(mock_openai: MagicMock) -> None:
+    mock_openai.side_effect = LLMResponseError("not JSON")
+    assert _call_openai_batch("sys", ["a", "b"]) == [None, None]
+
+
+@patch("app.services.llm_agent._call_openai")
+def test_call_openai_batch_splits_what_does_not_fit(mock_openai: MagicMock) -> None:
+    mock_openai.side_effect = lambda _sp, payload, max_tokens: {
+        "results": [{"id": i, "output": {"n": i}} for i in range(len(json.loads(payload)))]
+    }
+
+    outputs = _call_openai_batch("sys", [str(i) for i in range(40)])
+
+    assert len(outputs) == 40 and None not in outputs
+    budgets = [c.kwargs["max_tokens"] for c in mock_openai.call_args_list]
+    assert len(budgets) == 2
+    assert all(budget <= 16384 for budget in budgets)
@@ -0,0 +1,109 @@
+"""Unit tests for the LLM response cache."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+from app.core.database import SessionLocal
+from app.models.llm_cache import LLMResponseCacheEntry
+from app.services.llm_agent import LLMAgent
+from app.services.llm_cache import LLMResponseCache, make_key, normalize_text
+
+_QUOTE = {
+    "intent": "QUOTE",
+    "confidence": 0.95,
+    "fixed_price_value": 2450,
+    "fixed_price_unit": "USD/MT",
+    "counterparty_name": "Trader",
+}
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_normalize_text_folds_case_and_whitespace() -> None:
+    assert normalize_text("  Sem   Interesse\n") == "sem interesse"
+    assert make_key("classify", "v1", "FLAT ") == make_key("classify", "v1", "flat")
+    assert make_key("classify", "v1", "flat") != make_key("classify", "v2", "flat")
+    assert make_key("parse", "v1", "2450", "RFQ-1") != make_key(
+        "parse", "v1", "2450", "RFQ-2"
+    )
+
+
+def test_lru_evicts_oldest_and_ttl_expires() -> None:
+    clock = _Clock()
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.put("classify", "a", "v1", {"intent": "QUOTE"})
+    cache.put("classify", "b", "v1", {"intent": "OTHER"})
+    assert cache.get("classify", "a") == {"intent": "QUOTE"}  # a is now newest
+    cache.put("classify", "c", "v1", {"intent": "REJECTION"})
+
+    assert cache.get("classify", "b") is None
+    assert cache.get("classify", "a") is not None
+
+    clock.now = 11
+    assert cache.get("classify", "a") is None
+    assert len(cache) == 1  # only c left, and it is stale too
+
+
+def test_hit_returns_a_copy() -> None:
+    cache = LLMResponseCache()
+    cache.put("parse", "k", "v1", {"notes": None})
+    cache.get("parse", "k")["notes"] = "mutated"
+    assert cache.get("parse", "k") == {"notes": None}
+
+
+def test_persistent_tier_survives_a_new_process() -> None:
+    first = LLMResponseCache(persist=True, session_factory=SessionLocal)
+    first.put("parse", "k", "v1", _QUOTE)
+
+    restarted = LLMResponseCache(persist=True, session_factory=SessionLocal)
+    assert restarted.get("parse", "k") == _QUOTE
+    with SessionLocal() as session:
+        row = session.get(LLMResponseCacheEntry, "k")
+        assert row.prompt_version == "v1"
+
+
+def test_persistent_tier_ignores_expired_rows() -> None:
+    writer = LLMResponseCache(ttl_seconds=0.001, persist=True, session_factory=SessionLocal)
+    writer.put("parse", "k", "v1", _QUOTE)
+
+    reader = LLMResponseCache(persist=True, session_factory=SessionLocal)
+    assert reader.get("parse", "k") is None
+    with SessionLocal() as session:
+        assert session.get(LLMResponseCacheEntry, "k") is None
+
+
+@patch("app.services.llm_agent._call_openai")
+def test_agent_reuses_responses_for_repeated_messages(mock_openai: MagicMock) -> None:
+    mock_openai.return_value = {"intent": "REJECTION", "confidence": 0.9}
+    assert LLMAgent.classify_intent("Sem interesse").intent.value == "REJECTION"
+    assert LLMAgent.classify_intent("  sem   INTERESSE ").intent.value == "REJECTION"
+    assert mock_openai.call_count == 1
+
+    mock_openai.return_value = _QUOTE
+    for _ in range(2):
+        LLMAgent.parse_quote_message("RFQ: RFQ-001", "2450", sender_name="Trader")
+    assert mock_openai.call_count == 2
+
+    # A different RFQ context is a different question.
+    LLMAgent.parse_quote_message("RFQ: RFQ-002", "2450", sender_name="Trader")
+    assert mock_openai.call_count == 3
+
+
+@patch("app.services.llm_agent._call_openai")
+def test_agent_does_not_cache_failures(mock_openai: MagicMock) -> None:
+    from app.services.llm_agent import LLMUnavailableError
+
+    mock_openai.side_effect = [LLMUnavailableError("down"), _QUOTE]
+    try:
+        LLMAgent.classify_intent("2450")
+    except LLMUnavailableError:
+        pass
+    assert LLMAgent.classify_intent("2450").intent.value == "QUOTE"
+    assert mock_openai.call_count == 2
@@ -0,0 +1,158 @@
+"""Tests for the Azure OpenAI circuit breaker, concurrency limit and deadline."""
+
+from __future__ import annotations
+
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from tenacity import wait_none
+
+from app.services import llm_agent
+from app.services.llm_agent import (
+    CB_FAILURE_THRESHOLD,
+    LLMCircuitOpenError,
+    LLMUnavailableError,
+    _call_openai,
+    _call_openai_with_retry,
+    reset_circuit_breaker,
+)
+
+_ENV = {
+    "AZURE_OPENAI_ENDPOINT": "https://example.openai.azure.com",
+    "AZURE_OPENAI_API_KEY": "test-key",
+}
+
+
+@pytest.fixture(autouse=True)
+def _reset_cb():
+    reset_circuit_breaker()
+    yield
+    reset_circuit_breaker()
+
+
+@pytest.fixture(autouse=True)
+def _no_retry_wait():
+    original_wait = _call_openai_with_retry.retry.wait
+    _call_openai_with_retry.retry.wait = wait_none()
+    yield
+    _call_openai_with_retry.retry.wait = original_wait
+
+
+def _ok_response() -> MagicMock:
+    resp = MagicMock(spec=httpx.Response)
+    resp.raise_for_status = MagicMock()
+    resp.json.return_value = {
+        "choices": [{"message": {"content": '{"intent": "QUOTE"}'}}]
+    }
+    return resp
+
+
+def _trip_breaker(mock_post: MagicMock) -> None:
+    mock_post.side_effect = httpx.ConnectError("connection refused")
+    for _ in range(CB_FAILURE_THRESHOLD):
+        with pytest.raises(LLMUnavailableError):
+            _call_openai("sys", "2450")
+
+
+@patch.dict(os.environ, _ENV)
+@patch("app.services.llm_agent.httpx.post")
+def test_breaker_opens_and_fails_fast(mock_post: MagicMock) -> None:
+    _trip_breaker(mock_post)
+    calls = mock_post.call_count
+
+    with pytest.raises(LLMCircuitOpenError):
+        _call_openai("sys", "2450")
+    assert mock_post.call_count == calls
+
+
+@patch.dict(os.environ, _ENV)
+@patch("app.services.llm_agent.httpx.post")
+def test_half_open_probe_closes_breaker(mock_post: MagicMock) -> None:
+    _trip_breaker(mock_post)
+
+    llm_agent._CB_OPEN_UNTIL = 1.0  # cooldown elapsed
+    mock_post.side_effect = None
+    mock_post.return_value = _ok_response()
+    assert _call_openai("sys", "2450") == {"intent": "QUOTE"}
+
+    assert llm_agent._CB_OPEN_UNTIL == 0.0
+    assert _call_openai("sys", "2450") == {"intent": "QUOTE"}
+
+
+@patch.dict(os.environ, _ENV)
+def test_half_open_admits_a_single_probe() -> None:
+    with patch.object(llm_agent, "_CB_OPEN_UNTIL", 1.0):
+        llm_agent._cb_check()  # becomes the probe
+        with pytest.raises(LLMCircuitOpenError):
+            llm_agent._cb_check()
+
+
+@patch.dict(os.environ, _ENV)
+@patch("app.services.llm_agent.httpx.post")
+def test_malformed_payload_does_not_count_as_outage(mock_post: MagicMock) -> None:
+    resp = _ok_response()
+    resp.json.return_value = {"choices": [{"message": {"content": "not json"}}]}
+    mock_post.return_value = resp
+
+    for _ in range(CB_FAILURE_THRESHOLD + 1):
+        with pytest.raises(LLMUnavailableError) as exc_info:
+            _call_openai("sys", "2450")
+        assert not isinstance(exc_info.value, LLMCircuitOpenError)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [{"choices": []}, {"choices": [{"message": {"content": None}}]}, ["odd"]],
+)
+@patch.dict(os.environ, _ENV)
+@patch("app.services.llm_agent.httpx.post")
+def test_odd_payload_during_probe_releases_it(mock_post: MagicMock, payload) -> None:
+    resp = _ok_response()
+    resp.json.return_value = payload
+    mock_post.return_value = resp
+
+    with patch.object(llm_agent, "_CB_OPEN_UNTIL", 1.0):
+        with pytest.raises(LLMUnavailableError):
+            _call_openai("sys", "2450")
+        assert llm_agent._CB_PROBING is False
+
+
+@patch.dict(os.environ, _ENV)
+@patch("app.services.llm_agent.httpx.post")
+def test_unexpected_error_during_probe_counts_as_failure(mock_post: MagicMock) -> None:
+    mock_post.side_effect = RuntimeError("boom")
+
+    with patch.object(llm_agent, "_CB_OPEN_UNTIL", 1.0):
+        with pytest.raises(RuntimeError):
+            _call_openai("sys", "2450")
+        assert llm_agent._CB_PROBING is False
+    assert llm_agent._CB_FAILURE_COUNT == 1
+
+
+@patch.dict(os.environ, {**_ENV, "LLM_CALL_DEADLINE_SECONDS": "0.5"})
+@patch("app.services.llm_agent.httpx.post")
+def test_deadline_stops_retries(mock_post: MagicMock) -> None:
+    mock_post.side_effect = httpx.ReadTimeout("slow")
+
+    with pytest.raises(LLMUnavailableError):
+        _call_openai("sys", "2450")
+
+    # The next 1 s backoff would overrun the 0.5 s budget.
+    assert mock_post.call_count == 1
+    assert mock_post.call_args.kwargs["timeout"] <= 0.5
+
+
+@patch.dict(os.environ, {**_ENV, "LLM_CALL_DEADLINE_SECONDS": "0.05"})
+@patch("app.services.llm_agent.httpx.post")
+def test_concurrency_limit_gives_up_at_deadline(mock_post: MagicMock) -> None:
+    full = threading.BoundedSemaphore(1)
+    full.acquire()
+    with patch.object(llm_agent, "_semaphore", full):
+        with pytest.raises(LLMUnavailableError) as exc_info:
+            _call_openai("sys", "2450")
+
+    assert not isinstance(exc_info.value, LLMCircuitOpenError)
+    mock_post.assert_not_called()
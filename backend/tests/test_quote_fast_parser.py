@@ -0,0 +1,105 @@
+"""Unit tests for the deterministic fast-path quote parser."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+
+from app.services.quote_fast_parser import QuoteFastParser, numbers_in_text, to_decimal
+
+
+@pytest.mark.parametrize(
+    "token, expected",
+    [
+        ("2450", "2450"),
+        ("2450.5", "2450.5"),
+        ("2450,50", "2450.50"),
+        ("2.450", "2450"),
+        ("2,450", "2450"),
+        ("2.450,50", "2450.50"),
+        ("2,450.50", "2450.50"),
+        ("1.234.567", "1234567"),
+    ],
+)
+def test_to_decimal_handles_both_locales(token: str, expected: str) -> None:
+    assert to_decimal(token) == Decimal(expected)
+
+
+@pytest.mark.parametrize(
+    "text, price, unit, convention",
+    [
+        ("2450 USD", "2450", "USD/MT", None),
+        ("$2.450,50", "2450.50", "USD/MT", None),
+        ("2450 USD/MT", "2450", "USD/MT", None),
+        ("US$ 2.450,50/t", "2450.50", "USD/MT", None),
+        ("Preço: 2450 usd pmt.", "2450", "USD/MT", None),
+        ("2550 USD/MT avg", "2550", "USD/MT", "avg"),
+        ("2550 usd média", "2550", "USD/MT", "avg"),
+        ("offer 2,450.00 usd per ton c2r", "2450.00", "USD/MT", "c2r"),
+    ],
+)
+def test_fixed_prices(text: str, price: str, unit: str | None, convention: str | None) -> None:
+    parsed = QuoteFastParser.parse(text, sender_name="Trader")
+    assert parsed is not None
+    assert parsed.fixed_price_value == Decimal(price)
+    assert parsed.premium_discount is None
+    assert parsed.fixed_price_unit == unit
+    assert parsed.float_pricing_convention == convention
+    assert parsed.confidence >= 0.85
+    assert parsed.counterparty_name == "Trader"
+
+
+@pytest.mark.parametrize(
+    "text, premium",
+    [
+        ("+15 USD/MT", "15"),
+        ("-10", "-10"),
+        ("+12,5", "12.5"),
+        ("premium 20", "20"),
+        ("prêmio: 20 usd/mt", "20"),
+        ("desconto 8", "-8"),
+        ("flat", "0"),
+        ("Flat avg", "0"),
+        ("premio flat", "0"),
+    ],
+)
+def test_premiums(text: str, premium: str) -> None:
+    parsed = QuoteFastParser.parse(text)
+    assert parsed is not None
+    assert parsed.fixed_price_value is None
+    assert parsed.premium_discount == Decimal(premium)
+    assert parsed.confidence >= 0.85
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "15",  # unsigned and small: premium or price? Let the LLM decide.
+        "2450",  # no currency: could be a price, a quantity or a year
+        "2024",
+        "12345678",
+        "2.450,50",
+        "1500 toneladas",  # a quantity
+        "500 mt",
+        "2450/t",
+        "12345678 USD",  # implausible magnitudes
+        "USD 99",
+        "+1500",
+        "Ofereço 2450 USD/MT baseado na média mensal",
+        "2450 ou 2460",
+        "não temos interesse",
+        "2450 for 50 mt",
+        "",
+    ],
+)
+def test_falls_back_to_llm(text: str) -> None:
+    assert QuoteFastParser.parse(text) is None
+
+
+def test_numbers_in_text_reads_grouped_numbers() -> None:
+    assert numbers_in_text("2.450,50 or 2,460.00 or 2470") == {
+        Decimal("2450.50"),
+        Decimal("2460.00"),
+        Decimal("2470"),
+    }
@@ -14,11 +14,21 @@ Covers:
 - Preview-text API endpoint
 """
 
-from datetime import date
+from datetime import date, timedelta
 
 import pytest
 
-from app.services.lme_calendar import LMECalendar, add_business_days, second_business_day_of_next_month
+from app.services.lme_calendar import (
+    HORIZON_END,
+    LMECalendar,
+    add_business_days,
+    business_days_between,
+    count_business_days,
+    last_business_day_of_month,
+    nth_business_day_of_month,
+    second_business_day_of_next_month,
+    subtract_business_days,
+)
 from app.services.rfq_engine import (
     Leg,
     OrderInstruction,
@@ -31,8 +41,10 @@ from app.services.rfq_engine import (
     build_execution_instruction,
     build_expected_payoff_text,
     build_leg_text,
+    compute_leg_dates_batch,
     compute_ppt_for_leg,
     compute_trade_ppt_dates,
+    compute_trade_ppt_dates_batch,
     fmt_date_short,
     fmt_qty,
     generate_rfq_text,
@@ -111,6 +123,56 @@ class TestLMECalendar:
         cal.add_holidays(["2025-06-02"])
         assert not cal.is_business_day(date(2025, 6, 2))
 
+    def test_add_holidays_rebuilds_precomputed_days(self):
+        cal = _cal()
+        assert add_business_days(date(2025, 5, 30), 1, cal) == date(2025, 6, 2)
+        cal.add_holidays(["2025-06-02"])
+        assert add_business_days(date(2025, 5, 30), 1, cal) == date(2025, 6, 3)
+
+    def test_subtract_business_days_skips_holidays(self):
+        cal = _cal_with_holidays()
+        # 2025-01-07 (Tue) - 2 biz = Mon(6), then skip Fri(3), Thu(2) → Wed(1)
+        assert subtract_business_days(date(2025, 1, 7), 2, cal) == date(2025, 1, 1)
+        assert add_business_days(date(2025, 1, 7), -2, cal) == date(2025, 1, 1)
+
+    def test_add_business_days_crosses_horizon_end(self):
+        cal = _cal()
+        # 2035-12-31 (Mon) + 2 biz = 2036-01-02 (Wed), beyond the precomputed table
+        assert add_business_days(HORIZON_END, 2, cal) == date(2036, 1, 2)
+        assert subtract_business_days(date(2036, 1, 2), 2, cal) == HORIZON_END
+
+    def test_nth_business_day_of_month(self):
+        cal = _cal_with_holidays()
+        # Jan 2025: Wed 1, (Thu 2, Fri 3 holidays), Mon 6
+        assert nth_business_day_of_month(2025, 0, 2, cal) == date(2025, 1, 6)
+        assert nth_business_day_of_month(2025, 0, -1, cal) == date(2025, 1, 31)
+        assert last_business_day_of_month(2025, 4, cal) == date(2025, 5, 30)
+        with pytest.raises(ValueError):
+            nth_business_day_of_month(2025, 0, 30, cal)
+
+    def test_count_business_days_inclusive(self):
+        cal = _cal_with_holidays()
+        # Jan 1-10 2025: 8 weekdays minus 2 holidays
+        assert count_business_days(date(2025, 1, 1), date(2025, 1, 10), cal) == 6
+        assert count_business_days(date(2025, 1, 10), date(2025, 1, 1), cal) == 0
+        assert business_days_between(date(2025, 1, 1), date(2025, 1, 7), cal) == [
+            date(2025, 1, 1),
+            date(2025, 1, 6),
+            date(2025, 1, 7),
+        ]
+
+    def test_count_business_days_spans_outside_horizon(self):
+        cal = _cal()
+        # Dec 2024 + 2025-2035 + Jan 2036 must agree with the day-by-day count
+        start, end = date(2024, 12, 1), date(2036, 1, 31)
+        expected = sum(
+            1
+            for k in range((end - start).days + 1)
+            if (start + timedelta(days=k)).weekday() < 5
+        )
+        assert count_business_days(start, end, cal) == expected
+        assert len(business_days_between(start, end, cal)) == expected
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Formatting
@@ -522,6 +584,68 @@ class TestPairOverrides:
         assert ppts["trade_ppt"] == max(ppts["leg1_ppt"], ppts["leg2_ppt"])
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Batch computation
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestBatchComputation:
+    def test_leg_dates_avg_window(self):
+        cal = _cal_with_holidays()
+        leg = Leg(side=Side.BUY, price_type=PriceType.AVG, quantity_mt=10,
+                  month_name="January", year=2025)
+        (dates,) = compute_leg_dates_batch([leg], cal=cal)
+        assert dates.ppt == date(2025, 2, 4)
+        assert dates.window_start == date(2025, 1, 1)
+        assert dates.window_end == date(2025, 1, 31)
+        assert dates.fixing_date == date(2025, 1, 31)
+        # 23 weekdays minus the two test holidays
+        assert dates.window_business_days == 21
+
+    def test_leg_dates_avginter_and_fix(self):
+        cal = _cal()
+        avginter = Leg(side=Side.BUY, price_type=PriceType.AVG_INTER, quantity_mt=10,
+                       start_date=date(2025, 1, 6), end_date=date(2025, 1, 17))
+        fix = Leg(side=Side.SELL, price_type=PriceType.FIX, quantity_mt=10,
+                  fixing_date=date(2025, 1, 15))
+        d1, d2 = compute_leg_dates_batch([avginter, fix], cal=cal)
+        assert d1.window_business_days == 10
+        assert d1.ppt == compute_ppt_for_leg(avginter, cal)
+        assert d2.ppt == date(2025, 1, 17)
+        assert d2.window_start is None and d2.window_business_days == 0
+
+    def test_trade_batch_matches_single_trade_api(self):
+        cal = _cal()
+        trades = [
+            RfqTrade(
+                trade_type=TradeType.SWAP,
+                leg1=Leg(side=Side.BUY, price_type=PriceType.FIX, quantity_mt=q),
+                leg2=Leg(side=Side.SELL, price_type=PriceType.AVG, quantity_mt=q,
+                         month_name=month, year=2025),
+            )
+            for q in (10, 20)
+            for month in ("January", "February", "January")
+        ]
+        batch = compute_trade_ppt_dates_batch(trades, cal=cal)
+        for trade, result in zip(trades, batch):
+            assert result == {**compute_trade_ppt_dates(trade, cal=cal), "error": None}
+
+    def test_trade_batch_reports_invalid_trades_inline(self):
+        cal = _cal()
+        good = RfqTrade(
+            trade_type=TradeType.FORWARD,
+            leg1=Leg(side=Side.BUY, price_type=PriceType.C2R, quantity_mt=10,
+                     fixing_date=date(2025, 1, 15)),
+        )
+        bad = RfqTrade(
+            trade_type=TradeType.FORWARD,
+            leg1=Leg(side=Side.BUY, price_type=PriceType.C2R, quantity_mt=10),
+        )
+        ok, err = compute_trade_ppt_dates_batch([good, bad], cal=cal)
+        assert ok["trade_ppt"] == date(2025, 1, 17) and ok["error"] is None
+        assert err["trade_ppt"] is None
+        assert err["error"] == "Please provide a fixing date."
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Message builder
 # ─────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,108 @@
+"""Database-side latest-quote-per-counterparty selection.
+
+``RFQService.select_latest_quotes_by_counterparty`` (pure Python) is the
+reference implementation; the windowed query must agree with it.
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from datetime import UTC, date, datetime, timedelta
+
+from app.core.utils import now_utc
+from app.models.quotes import RFQQuote
+from app.models.rfqs import RFQ, RFQDirection, RFQIntent, RFQState
+from app.services.rfq_service import RFQService
+
+
+def _create_rfq(session, rfq_number: str) -> RFQ:
+    rfq = RFQ(
+        id=uuid.uuid4(),
+        rfq_number=rfq_number,
+        intent=RFQIntent.global_position,
+        commodity="ALUMINUM",
+        quantity_mt=10.0,
+        delivery_window_start=date(2026, 1, 1),
+        delivery_window_end=date(2026, 1, 31),
+        direction=RFQDirection.buy,
+        commercial_active_mt=0.0,
+        commercial_passive_mt=0.0,
+        commercial_net_mt=0.0,
+        commercial_reduction_applied_mt=0.0,
+        exposure_snapshot_timestamp=now_utc(),
+        state=RFQState.quoted,
+    )
+    session.add(rfq)
+    session.flush()
+    return rfq
+
+
+def _add_quote(session, rfq_id, cp: str, received_at, created_at, price: float):
+    quote = RFQQuote(
+        rfq_id=rfq_id,
+        counterparty_id=cp,
+        fixed_price_value=price,
+        fixed_price_unit="USD/MT",
+        float_pricing_convention="avg",
+        received_at=received_at,
+        created_at=created_at,
+    )
+    session.add(quote)
+    return quote
+
+
+def test_window_query_matches_python_reference(session) -> None:
+    rng = random.Random(27)
+    base = datetime(2026, 1, 5, 10, 0, tzinfo=UTC)
+    rfqs = [_create_rfq(session, f"RFQ-LQ-{i:03d}") for i in range(4)]
+    counterparties = [f"cp-{i}" for i in range(5)]
+    for rfq in rfqs[:3]:
+        for _ in range(60):
+            # Coarse timestamps force ties on received_at and created_at,
+            # exercising the id tiebreaker.
+            received = base + timedelta(minutes=rng.randint(0, 5))
+            created = base + timedelta(minutes=rng.randint(0, 2))
+            _add_quote(
+                session,
+                rfq.id,
+                rng.choice(counterparties),
+                received,
+                created,
+                2400 + rng.random() * 100,
+            )
+    session.commit()
+
+    batched = RFQService.get_latest_quotes_for_rfqs(session, [r.id for r in rfqs])
+
+    for rfq in rfqs:
+        all_quotes = session.query(RFQQuote).filter(RFQQuote.rfq_id == rfq.id).all()
+        expected = RFQService.select_latest_quotes_by_counterparty(all_quotes)
+        assert {cp: q.id for cp, q in batched[rfq.id].items()} == {
+            cp: q.id for cp, q in expected.items()
+        }
+        single = RFQService.get_latest_trade_quotes(session, rfq.id)
+        assert {cp: q.id for cp, q in single.items()} == {
+            cp: q.id for cp, q in expected.items()
+        }
+
+    assert batched[rfqs[3].id] == {}
+
+
+def test_latest_quote_wins_over_earlier_refresh(session) -> None:
+    rfq = _create_rfq(session, "RFQ-LQ-100")
+    t0 = datetime(2026, 2, 1, 9, 0, tzinfo=UTC)
+    _add_quote(session, rfq.id, "cp-a", t0, t0, 2500.0)
+    newest = _add_quote(
+        session, rfq.id, "cp-a", t0 + timedelta(minutes=3), t0, 2490.0
+    )
+    other = _add_quote(session, rfq.id, "cp-b", t0, t0, 2510.0)
+    session.commit()
+
+    latest = RFQService.get_latest_trade_quotes(session, rfq.id)
+    assert latest["cp-a"].id == newest.id
+    assert latest["cp-b"].id == other.id
+
+
+def test_empty_rfq_list(session) -> None:
+    assert RFQService.get_latest_quotes_for_rfqs(session, []) == {}
@@ -4,13 +4,14 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime, timedelta, timezone, date
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
 from app.core.utils import now_utc
+from app.models.quotes import RFQQuote
 from app.models.rfqs import (
     RFQ,
     RFQDirection,
@@ -22,8 +23,9 @@ from app.models.rfqs import (
 )
 from app.schemas.llm import LLMClassifyResult, MessageIntent, ParsedQuote
 from app.schemas.whatsapp import WhatsAppInboundMessage, WhatsAppSendResult
-from app.services.llm_agent import LLMUnavailableError
+from app.services.llm_agent import LLMCircuitOpenError, LLMUnavailableError
 from app.services.rfq_orchestrator import RFQOrchestrator
+from app.services.whatsapp_send_scheduler import SendPriority
 
 
 # ── helpers ──────────────────────────────────────────────────────────────
@@ -130,7 +132,10 @@ def _parsed_quote(
 # ── dispatch_whatsapp_invitations ────────────────────────────────────────
 
 
-@patch("app.services.rfq_orchestrator.WhatsAppService.send_text_message")
+@patch(
+    "app.services.rfq_orchestrator.WhatsAppService.send_text_message_async",
+    new_callable=AsyncMock,
+)
 def test_dispatch_sends_queued_whatsapp(mock_send):
     mock_send.return_value = _send_result(True)
 
@@ -146,7 +151,10 @@ def test_dispatch_sends_queued_whatsapp(mock_send):
     mock_send.assert_called_once()
 
 
-@patch("app.services.rfq_orchestrator.WhatsAppService.send_text_message")
+@patch(
+    "app.services.rfq_orchestrator.WhatsAppService.send_text_message_async",
+    new_callable=AsyncMock,
+)
 def test_dispatch_marks_failed_on_error(mock_send):
     mock_send.return_value = _send_result(False)
 
@@ -161,7 +169,10 @@ def test_dispatch_marks_failed_on_error(mock_send):
     assert results["+5511999990001"] == "failed"
 
 
-@patch("app.services.rfq_orchestrator.WhatsAppService.send_text_message")
+@patch(
+    "app.services.rfq_orchestrator.WhatsAppService.send_text_message_async",
+    new_callable=AsyncMock,
+)
 def test_dispatch_ignores_already_sent(mock_send):
     mock_send.return_value = _send_result(True)
 
@@ -286,6 +297,86 @@ def test_process_llm_unavailable(mock_classify, mock_parse):
     assert result["status"] == "llm_unavailable"
 
 
+@patch("app.services.rfq_orchestrator.LLMAgent.parse_quote_message")
+@patch("app.services.rfq_orchestrator.LLMAgent.classify_intent")
+def test_process_fast_path_skips_llm(mock_classify, mock_parse):
+    with SessionLocal() as session:
+        rfq = _create_rfq(session, state=RFQState.sent)
+        _create_invitation(session, rfq, status=RFQInvitationStatus.sent)
+        session.commit()
+
+        msg = _make_inbound(phone="+5511999990001", text="2.550,50 USD/MT")
+        result = RFQOrchestrator._process_single_message(session, msg)
+        quote = session.get(RFQQuote, uuid.UUID(result["quote_id"]))
+
+        assert result["status"] == "auto_quote_created"
+        assert float(quote.fixed_price_value) == 2550.5
+    mock_classify.assert_not_called()
+    mock_parse.assert_not_called()
+
+
+@patch("app.services.rfq_orchestrator.LLMAgent.parse_quote_message")
+@patch("app.services.rfq_orchestrator.LLMAgent.classify_intent")
+def test_process_flat_reply_is_not_booked_as_zero_price(mock_classify, mock_parse):
+    mock_classify.return_value = LLMClassifyResult(
+        intent=MessageIntent.quote, confidence=0.95, raw_reasoning=None
+    )
+    premium = _parsed_quote(confidence=0.95, price=None)
+    mock_parse.return_value = premium.model_copy(update={"premium_discount": 0})
+
+    with SessionLocal() as session:
+        rfq = _create_rfq(session, state=RFQState.sent)
+        _create_invitation(session, rfq, status=RFQInvitationStatus.sent)
+        session.commit()
+
+        msg = _make_inbound(phone="+5511999990001", text="flat")
+        result = RFQOrchestrator._process_single_message(session, msg)
+
+        assert result["status"] == "hallucinated_price_blocked"
+        assert session.query(RFQQuote).filter_by(rfq_id=rfq.id).count() == 0
+    mock_classify.assert_called_once()
+    mock_parse.assert_called_once()
+
+
+@pytest.mark.parametrize("text", ["-10", "+15 USD/MT", "premio flat"])
+@patch("app.services.rfq_orchestrator.LLMAgent.parse_quote_message")
+@patch("app.services.rfq_orchestrator.LLMAgent.classify_intent")
+def test_process_premium_replies_go_through_the_llm(mock_classify, mock_parse, text):
+    mock_classify.return_value = LLMClassifyResult(
+        intent=MessageIntent.question, confidence=0.9, raw_reasoning=None
+    )
+
+    with SessionLocal() as session:
+        rfq = _create_rfq(session, state=RFQState.sent)
+        _create_invitation(session, rfq, status=RFQInvitationStatus.sent)
+        session.commit()
+
+        msg = _make_inbound(phone="+5511999990001", text=text)
+        result = RFQOrchestrator._process_single_message(session, msg)
+
+        assert result["status"] == "counterparty_question"
+        assert session.query(RFQQuote).filter_by(rfq_id=rfq.id).count() == 0
+    mock_classify.assert_called_once()
+
+
+@patch("app.services.rfq_orchestrator.LLMAgent.parse_quote_message")
+@patch("app.services.rfq_orchestrator.LLMAgent.classify_intent")
+def test_process_llm_circuit_open_routes_to_human_review(mock_classify, mock_parse):
+    mock_classify.side_effect = LLMCircuitOpenError("open")
+
+    with SessionLocal() as session:
+        rfq = _create_rfq(session, state=RFQState.sent)
+        _create_invitation(session, rfq, status=RFQInvitationStatus.sent)
+        session.commit()
+
+        msg = _make_inbound(phone="+5511999990001")
+        result = RFQOrchestrator._process_single_message(session, msg)
+
+    assert result["status"] == "needs_human_review"
+    assert result["reason"] == "llm_circuit_open"
+    mock_parse.assert_not_called()
+
+
 @patch("app.services.rfq_orchestrator.RFQService.submit_quote")
 @patch("app.services.rfq_orchestrator.LLMAgent.should_auto_create_quote")
 @patch("app.services.rfq_orchestrator.LLMAgent.parse_quote_message")
@@ -307,7 +398,10 @@ def test_process_auto_quote_created(mock_classify, mock_parse, mock_auto, mock_s
         _create_invitation(session, rfq, status=RFQInvitationStatus.sent)
         session.commit()
 
-        msg = _make_inbound(phone="+5511999990001", text="2550 USD/MT avg")
+        # Free text, so the fast-path parser defers to the LLM.
+        msg = _make_inbound(
+            phone="+5511999990001", text="Podemos fazer 2550 USD/MT na média"
+        )
         result = RFQOrchestrator._process_single_message(session, msg)
 
     assert result["status"] == "auto_quote_created"
@@ -398,6 +492,7 @@ def test_notify_award_sends_message(mock_gen, mock_send):
     mock_send.assert_called_once_with(
         phone="+5511999990001",
         text="Congratulations! You won the RFQ.",
+        priority=SendPriority.award,
     )
 
 
@@ -442,10 +537,21 @@ def test_notify_reject_sends_to_all(mock_gen, mock_send):
 # ── check_rfq_timeouts ──────────────────────────────────────────────────
 
 
-@patch("app.services.rfq_orchestrator.RFQService.get_latest_trade_quotes")
-def test_check_rfq_timeouts_flags_stale(mock_quotes):
-    mock_quotes.return_value = {}  # no quotes
+def _create_quote(session: Session, rfq: RFQ, counterparty_id: uuid.UUID) -> None:
+    session.add(
+        RFQQuote(
+            rfq_id=rfq.id,
+            counterparty_id=str(counterparty_id),
+            fixed_price_value=2550.0,
+            fixed_price_unit="USD/MT",
+            float_pricing_convention="avg",
+            received_at=now_utc(),
+        )
+    )
+    session.flush()
+
 
+def test_check_rfq_timeouts_flags_stale():
     with SessionLocal() as session:
         old_time = now_utc() - timedelta(hours=48)
         rfq = _create_rfq(
@@ -464,8 +570,28 @@ def test_check_rfq_timeouts_flags_stale(mock_quotes):
     assert stale[0]["has_quotes"] is False
 
 
-@patch("app.services.rfq_orchestrator.RFQService.get_latest_trade_quotes")
-def test_check_rfq_timeouts_ignores_recent(mock_quotes):
+def test_check_rfq_timeouts_counts_latest_quotes_per_counterparty():
+    with SessionLocal() as session:
+        rfq = _create_rfq(
+            session,
+            state=RFQState.sent,
+            rfq_number="RFQ-STALE-003",
+            created_at=now_utc() - timedelta(hours=48),
+        )
+        cp_a, cp_b = uuid.uuid4(), uuid.uuid4()
+        _create_quote(session, rfq, cp_a)
+        _create_quote(session, rfq, cp_a)  # refresh from the same counterparty
+        _create_quote(session, rfq, cp_b)
+        session.commit()
+
+        flagged = RFQOrchestrator.check_rfq_timeouts(session, timeout_hours=24)
+
+    stale = [f for f in flagged if f["rfq_number"] == "RFQ-STALE-003"]
+    assert stale[0]["quotes_count"] == 2
+    assert stale[0]["has_quotes"] is True
+
+
+def test_check_rfq_timeouts_ignores_recent():
     with SessionLocal() as session:
         rfq = _create_rfq(
             session,
@@ -484,10 +610,7 @@ def test_check_rfq_timeouts_ignores_recent(mock_quotes):
 # ── check_low_response_rfqs ─────────────────────────────────────────────
 
 
-@patch("app.services.rfq_orchestrator.RFQService.get_latest_trade_quotes")
-def test_check_low_response_flags_no_quotes(mock_quotes):
-    mock_quotes.return_value = {}
-
+def test_check_low_response_flags_no_quotes():
     with SessionLocal() as session:
         rfq = _create_rfq(session, state=RFQState.sent, rfq_number="RFQ-LOW-001")
         _create_invitation(session, rfq, phone="+5511000000001")
@@ -502,19 +625,16 @@ def test_check_low_response_flags_no_quotes(mock_quotes):
     assert len(low) == 1
     assert low[0]["response_rate"] == 0.0
     assert low[0]["total_recipients"] == 2
+    assert low[0]["non_responders"] == 2
 
 
-@patch("app.services.rfq_orchestrator.RFQService.get_latest_trade_quotes")
-def test_check_low_response_ok_when_all_replied(mock_quotes):
-    mock_quotes.return_value = {
-        "+5511000000001": MagicMock(),
-        "+5511000000002": MagicMock(),
-    }
-
+def test_check_low_response_ok_when_all_replied():
     with SessionLocal() as session:
         rfq = _create_rfq(session, state=RFQState.sent, rfq_number="RFQ-OK-002")
-        _create_invitation(session, rfq, phone="+5511000000001")
-        _create_invitation(session, rfq, phone="+5511000000002")
+        inv_a = _create_invitation(session, rfq, phone="+5511000000001")
+        inv_b = _create_invitation(session, rfq, phone="+5511000000002")
+        _create_quote(session, rfq, inv_a.counterparty_id)
+        _create_quote(session, rfq, inv_b.counterparty_id)
         session.commit()
 
         flagged = RFQOrchestrator.check_low_response_rfqs(
@@ -525,6 +645,42 @@ def test_check_low_response_ok_when_all_replied(mock_quotes):
     assert len(ok) == 0
 
 
+def test_check_low_response_aggregates_many_rfqs_in_one_query():
+    from sqlalchemy import event
+
+    from app.core.database import engine
+
+    with SessionLocal() as session:
+        for i in range(5):
+            rfq = _create_rfq(session, state=RFQState.sent, rfq_number=f"RFQ-AGG-{i}")
+            inv = _create_invitation(session, rfq, phone=f"+551100000010{i}")
+            _create_invitation(session, rfq, phone=f"+551100000020{i}")
+            _create_invitation(session, rfq, phone=f"+551100000030{i}")
+            if i % 2 == 0:
+                _create_quote(session, rfq, inv.counterparty_id)
+        session.commit()
+
+        statements: list[str] = []
+
+        def _count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            flagged = RFQOrchestrator.check_low_response_rfqs(
+                session, min_response_rate=0.5
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+
+    assert len(statements) == 1
+    by_number = {f["rfq_number"]: f for f in flagged}
+    assert set(by_number) == {f"RFQ-AGG-{i}" for i in range(5)}
+    assert by_number["RFQ-AGG-0"]["responded"] == 1
+    assert by_number["RFQ-AGG-0"]["non_responders"] == 2
+    assert by_number["RFQ-AGG-1"]["responded"] == 0
+
+
 # ── Anti-hallucination guards ────────────────────────────────────────────
 
 
@@ -600,6 +756,10 @@ class TestPriceAppearsInText:
     def test_none_price(self):
         assert RFQOrchestrator._price_appears_in_text(None, "some text") is False
 
+    def test_thousands_separated_price_found(self):
+        assert RFQOrchestrator._price_appears_in_text(2450.5, "2.450,50 USD/MT")
+        assert RFQOrchestrator._price_appears_in_text(2450.5, "2,450.50 USD/MT")
+
 
 # ── Hallucinated price blocking (integration) ───────────────────────────
 
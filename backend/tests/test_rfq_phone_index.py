@@ -0,0 +1,173 @@
+"""Unit tests for the phone → active RFQ index."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.utils import now_utc
+from app.models.rfqs import (
+    RFQ,
+    RFQDirection,
+    RFQIntent,
+    RFQInvitation,
+    RFQInvitationChannel,
+    RFQInvitationStatus,
+    RFQPhoneIndexEntry,
+    RFQState,
+)
+from app.services.rfq_phone_index import RFQPhoneIndex, get_phone_index
+from app.services.ws_pubsub import MemoryPubSub
+
+
+def _rfq(session: Session, number: str, created_at: datetime | None = None) -> RFQ:
+    rfq = RFQ(
+        id=uuid.uuid4(),
+        rfq_number=number,
+        intent=RFQIntent.commercial_hedge,
+        commodity="COPPER",
+        quantity_mt=100.0,
+        delivery_window_start=date(2026, 1, 1),
+        delivery_window_end=date(2026, 3, 31),
+        direction=RFQDirection.buy,
+        commercial_active_mt=100.0,
+        commercial_passive_mt=0.0,
+        commercial_net_mt=100.0,
+        commercial_reduction_applied_mt=0.0,
+        exposure_snapshot_timestamp=now_utc(),
+        state=RFQState.sent,
+        created_at=created_at or now_utc(),
+    )
+    session.add(rfq)
+    session.flush()
+    return rfq
+
+
+def _invite(session: Session, rfq: RFQ, phone: str) -> RFQInvitation:
+    inv = RFQInvitation(
+        id=uuid.uuid4(),
+        rfq_id=rfq.id,
+        rfq_number=rfq.rfq_number,
+        counterparty_id=uuid.uuid4(),
+        recipient_name="Counterparty A",
+        recipient_phone=phone,
+        channel=RFQInvitationChannel.whatsapp,
+        message_body="RFQ",
+        provider_message_id="",
+        send_status=RFQInvitationStatus.sent,
+        sent_at=now_utc(),
+        idempotency_key=f"idem-{uuid.uuid4()}",
+    )
+    session.add(inv)
+    session.flush()
+    return inv
+
+
+def test_refresh_invitations_keep_one_row_per_rfq() -> None:
+    with SessionLocal() as session:
+        rfq = _rfq(session, "RFQ-1")
+        _invite(session, rfq, "+5511999990001")
+        refresh = _invite(session, rfq, "5511999990001")
+        session.commit()
+
+        rows = session.scalars(select(RFQPhoneIndexEntry)).all()
+        assert len(rows) == 1
+        assert rows[0].phone_key == "551199990001"
+        assert rows[0].invitation_id == refresh.id
+        assert rows[0].rfq_state == RFQState.sent
+
+
+def test_matches_both_brazilian_mobile_formats_newest_first() -> None:
+    with SessionLocal() as session:
+        older = _rfq(session, "RFQ-1", created_at=now_utc() - timedelta(hours=1))
+        newer = _rfq(session, "RFQ-2")
+        _invite(session, older, "+5511999990001")
+        _invite(session, newer, "+5511999990001")
+        session.commit()
+
+        matches = get_phone_index().active_matches(session, "+551199990001")
+        assert [m.rfq_id for m in matches] == [newer.id, older.id]
+
+
+def test_state_transition_updates_index_and_memo() -> None:
+    with SessionLocal() as session:
+        rfq = _rfq(session, "RFQ-1")
+        _invite(session, rfq, "+5511999990001")
+        session.commit()
+        index = get_phone_index()
+        assert len(index.active_matches(session, "+5511999990001")) == 1
+
+        rfq.state = RFQState.closed
+        session.commit()
+
+        assert index.active_matches(session, "+5511999990001") == []
+        row = session.scalars(select(RFQPhoneIndexEntry)).one()
+        assert row.rfq_state == RFQState.closed
+
+
+def test_rolled_back_transition_keeps_memo() -> None:
+    with SessionLocal() as session:
+        rfq = _rfq(session, "RFQ-1")
+        _invite(session, rfq, "+5511999990001")
+        session.commit()
+        index = get_phone_index()
+        before = index.active_matches(session, "+5511999990001")
+
+        rfq.state = RFQState.closed
+        session.flush()
+        session.rollback()
+
+        assert index.active_matches(session, "+5511999990001") == before
+
+
+def test_memo_serves_repeat_lookups_until_ttl() -> None:
+    now = [0.0]
+    index = RFQPhoneIndex(ttl_seconds=10, clock=lambda: now[0])
+    with SessionLocal() as session:
+        rfq = _rfq(session, "RFQ-1")
+        _invite(session, rfq, "+5511999990001")
+        session.commit()
+        assert len(index.active_matches(session, "+5511999990001")) == 1
+
+        # Changed behind the index's back (e.g. by another worker).
+        session.execute(delete(RFQPhoneIndexEntry))
+        session.commit()
+        assert len(index.active_matches(session, "+5511999990001")) == 1
+
+        now[0] = 11
+        assert index.active_matches(session, "+5511999990001") == []
+
+
+def test_invalidation_reaches_other_workers() -> None:
+    bus = MemoryPubSub()
+    here, there = RFQPhoneIndex(bus=bus), RFQPhoneIndex(bus=bus)
+    with SessionLocal() as session:
+        rfq = _rfq(session, "RFQ-1")
+        _invite(session, rfq, "+5511999990001")
+        session.commit()
+        assert len(there.active_matches(session, "+5511999990001")) == 1
+
+        # Closed by "here"; "there" only hears of it on the bus.
+        session.execute(delete(RFQPhoneIndexEntry))
+        session.commit()
+        here.invalidate({"551199990001"})
+        assert there.active_matches(session, "+5511999990001") == []
+
+
+def test_listener_gap_clears_the_memo() -> None:
+    bus = MemoryPubSub()
+    index = RFQPhoneIndex(bus=bus)
+    with SessionLocal() as session:
+        rfq = _rfq(session, "RFQ-1")
+        _invite(session, rfq, "+5511999990001")
+        session.commit()
+        assert len(index.active_matches(session, "+5511999990001")) == 1
+
+        session.execute(delete(RFQPhoneIndexEntry))
+        session.commit()
+        bus._dispatch_gap(3)
+        assert index.active_matches(session, "+5511999990001") == []
@@ -0,0 +1,224 @@
+"""In-memory RFQ ranking cache — consistency with the uncached ranking."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+from uuid import UUID
+
+from app.models.rfqs import RFQ
+from app.schemas.rfq import FloatPricingConvention, RFQQuoteCreate
+from app.services.rfq_ranking_cache import RFQRankingCache, ranking_cache
+from app.services.rfq_service import RFQService
+from app.services.ws_pubsub import MemoryPubSub
+
+
+def _create_counterparty(client, name: str, phone: str) -> str:
+    resp = client.post(
+        "/counterparties",
+        json={"type": "broker", "name": name, "country": "BRA", "whatsapp_phone": phone},
+    )
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _create_trade_rfq(client, direction: str = "BUY") -> str:
+    cp_id = _create_counterparty(client, "Broker", "+5511999990001")
+    resp = client.post(
+        "/rfqs",
+        json={
+            "intent": "GLOBAL_POSITION",
+            "commodity": "LME_AL",
+            "quantity_mt": 5.0,
+            "delivery_window_start": "2026-03-01",
+            "delivery_window_end": "2026-03-31",
+            "direction": direction,
+            "order_id": None,
+            "invitations": [{"counterparty_id": cp_id}],
+        },
+    )
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _quote(client, rfq_id: str, cp: str, price: float, received_at: str, unit="USD/MT"):
+    resp = client.post(
+        f"/rfqs/{rfq_id}/quotes",
+        json={
+            "rfq_id": rfq_id,
+            "counterparty_id": cp,
+            "fixed_price_value": price,
+            "fixed_price_unit": unit,
+            "float_pricing_convention": "avg",
+            "received_at": received_at,
+        },
+    )
+    assert resp.status_code == 201
+    return resp.json()
+
+
+def _uncached_ranking(session, rfq_id: str) -> dict:
+    rfq = session.get(RFQ, UUID(rfq_id))
+    latest = RFQService.get_latest_trade_quotes(session, rfq.id)
+    return RFQService.compute_trade_ranking(rfq, latest).model_dump(mode="json")
+
+
+def test_cached_ranking_tracks_quote_submissions(client, session) -> None:
+    rfq_id = _create_trade_rfq(client, "BUY")
+    # Prime the cache before any quotes exist
+    assert client.get(f"/rfqs/{rfq_id}/trade-ranking").json()["failure_code"] == (
+        "NO_ELIGIBLE_QUOTES"
+    )
+
+    _quote(client, rfq_id, "cp-a", 2500.0, "2026-01-05T10:00:00Z")
+    _quote(client, rfq_id, "cp-b", 2490.0, "2026-01-05T10:01:00Z")
+    body = client.get(f"/rfqs/{rfq_id}/trade-ranking").json()
+    assert body["status"] == "SUCCESS"
+    assert [e["quote"]["counterparty_id"] for e in body["ranking"]] == ["cp-b", "cp-a"]
+
+    # cp-a refreshes below cp-b; an older late-arriving cp-b quote is ignored
+    _quote(client, rfq_id, "cp-a", 2480.0, "2026-01-05T10:05:00Z")
+    _quote(client, rfq_id, "cp-b", 2470.0, "2026-01-05T09:00:00Z")
+    body = client.get(f"/rfqs/{rfq_id}/trade-ranking").json()
+    assert [e["quote"]["fixed_price_value"] for e in body["ranking"]] == [2480.0, 2490.0]
+    assert body == _uncached_ranking(session, rfq_id)
+
+
+def test_cached_ranking_keeps_failure_codes(client, session) -> None:
+    rfq_id = _create_trade_rfq(client, "SELL")
+    _quote(client, rfq_id, "cp-a", 2500.0, "2026-01-05T10:00:00Z")
+    client.get(f"/rfqs/{rfq_id}/trade-ranking")
+
+    _quote(client, rfq_id, "cp-b", 2500.0, "2026-01-05T10:01:00Z")
+    body = client.get(f"/rfqs/{rfq_id}/trade-ranking").json()
+    assert body["failure_code"] == "TIE"
+    assert body == _uncached_ranking(session, rfq_id)
+
+    _quote(client, rfq_id, "cp-b", 2501.0, "2026-01-05T10:02:00Z", unit="USD/LB")
+    body = client.get(f"/rfqs/{rfq_id}/trade-ranking").json()
+    assert body["failure_code"] == "NON_COMPARABLE"
+    assert body == _uncached_ranking(session, rfq_id)
+
+
+def test_reject_quote_invalidates_cached_ranking(client, session) -> None:
+    rfq_id = _create_trade_rfq(client, "BUY")
+    cp_id = _create_counterparty(client, "Bank", "+5511999990002")
+    _quote(client, rfq_id, cp_id, 2500.0, "2026-01-05T10:00:00Z")
+    newer = _quote(client, rfq_id, cp_id, 2450.0, "2026-01-05T10:05:00Z")
+    assert client.get(f"/rfqs/{rfq_id}/trade-ranking").json()["ranking"][0]["quote"][
+        "id"
+    ] == newer["id"]
+
+    with patch("app.api.routes.ws.manager.broadcast_nowait") as push:
+        resp = client.post(
+            f"/rfqs/{rfq_id}/actions/reject-quote",
+            params={"quote_id": newer["id"]},
+            json={"user_id": "trader-1"},
+        )
+    assert resp.status_code == 200
+    pushed = [c.args for c in push.call_args_list if c.args[2] == "ranking_updated"]
+    assert len(pushed) == 1
+    assert pushed[0][3]["ranking"][0]["quote"]["fixed_price_value"] == 2500.0
+
+    body = client.get(f"/rfqs/{rfq_id}/trade-ranking").json()
+    assert body["ranking"][0]["quote"]["fixed_price_value"] == 2500.0
+    assert body == _uncached_ranking(session, rfq_id)
+
+
+def test_rolled_back_quote_never_reaches_cache(client, session) -> None:
+    rfq_id = _create_trade_rfq(client, "BUY")
+    _quote(client, rfq_id, "cp-a", 2500.0, "2026-01-05T10:00:00Z")
+    client.get(f"/rfqs/{rfq_id}/trade-ranking")
+
+    RFQService.submit_quote(
+        session,
+        UUID(rfq_id),
+        RFQQuoteCreate(
+            rfq_id=UUID(rfq_id),
+            counterparty_id="cp-b",
+            fixed_price_value=1.0,
+            fixed_price_unit="USD/MT",
+            float_pricing_convention=FloatPricingConvention.avg,
+            received_at="2026-01-05T10:01:00Z",
+        ),
+    )
+    session.rollback()
+
+    body = client.get(f"/rfqs/{rfq_id}/trade-ranking").json()
+    assert [e["quote"]["counterparty_id"] for e in body["ranking"]] == ["cp-a"]
+
+
+def test_quote_submission_pushes_ranking_over_websocket(client) -> None:
+    rfq_id = _create_trade_rfq(client, "BUY")
+    with patch(
+        "app.api.routes.ws.manager.broadcast_nowait"
+    ) as push:
+        _quote(client, rfq_id, "cp-a", 2500.0, "2026-01-05T10:00:00Z")
+    push.assert_called_once()
+    topic, topic_id, event, data = push.call_args.args
+    assert (topic, topic_id, event) == ("rfq", rfq_id, "ranking_updated")
+    assert data["status"] == "SUCCESS"
+    assert data["ranking"][0]["quote"]["counterparty_id"] == "cp-a"
+
+
+def test_spread_ranking_dropped_when_leg_changes(client) -> None:
+    buy_id = _create_trade_rfq(client, "BUY")
+    sell_id = _create_trade_rfq(client, "SELL")
+    resp = client.post(
+        "/rfqs",
+        json={
+            "intent": "SPREAD",
+            "commodity": "LME_AL",
+            "quantity_mt": 5.0,
+            "delivery_window_start": "2026-03-01",
+            "delivery_window_end": "2026-03-31",
+            "direction": "BUY",
+            "order_id": None,
+            "buy_trade_id": buy_id,
+            "sell_trade_id": sell_id,
+            "invitations": [],
+        },
+    )
+    spread_id = resp.json()["id"]
+    assert client.get(f"/rfqs/{spread_id}/ranking").json()["failure_code"] == (
+        "NO_ELIGIBLE_QUOTES"
+    )
+
+    _quote(client, buy_id, "cp-a", 2400.0, "2026-01-05T10:00:00Z")
+    _quote(client, sell_id, "cp-a", 2450.0, "2026-01-05T10:00:00Z")
+    body = client.get(f"/rfqs/{spread_id}/ranking").json()
+    assert body["status"] == "SUCCESS"
+    assert body["ranking"][0]["spread_value"] == 50.0
+    assert ranking_cache._spreads[UUID(spread_id)][0].status == "SUCCESS"
+
+
+def test_changes_on_other_workers_drop_cached_ranking(client, session, monkeypatch) -> None:
+    monkeypatch.setenv("RFQ_RANKING_CACHE_TTL_SECONDS", "0")
+    bus = MemoryPubSub()
+    here, there = RFQRankingCache(bus=bus), RFQRankingCache(bus=bus)
+    rfq_id = _create_trade_rfq(client, "BUY")
+    _quote(client, rfq_id, "cp-a", 2500.0, "2026-01-05T10:00:00Z")
+    rfq = session.get(RFQ, UUID(rfq_id))
+    here.get_trade_ranking(session, rfq)
+    there.get_trade_ranking(session, rfq)
+
+    there._drop(rfq.id)
+    assert rfq.id not in here._books
+
+    here.get_trade_ranking(session, rfq)
+    bus._dispatch_gap(1)
+    assert not here._books
+
+
+def test_entries_expire_without_a_shared_bus(client, session, monkeypatch) -> None:
+    monkeypatch.setenv("RFQ_RANKING_CACHE_TTL_SECONDS", "0.05")
+    cache = RFQRankingCache(bus=MemoryPubSub())
+    rfq_id = _create_trade_rfq(client, "BUY")
+    rfq = session.get(RFQ, UUID(rfq_id))
+    assert cache.get_trade_ranking(session, rfq).failure_code == "NO_ELIGIBLE_QUOTES"
+
+    # Written through the app's cache, as if by another worker.
+    _quote(client, rfq_id, "cp-a", 2500.0, "2026-01-05T10:00:00Z")
+    assert cache.get_trade_ranking(session, rfq).failure_code == "NO_ELIGIBLE_QUOTES"
+    time.sleep(0.06)
+    assert cache.get_trade_ranking(session, rfq).status == "SUCCESS"
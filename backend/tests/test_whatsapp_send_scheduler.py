@@ -0,0 +1,188 @@
+"""Unit tests for the outbound WhatsApp send scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.schemas.whatsapp import WhatsAppSendResult
+from app.services.whatsapp_providers import FakeWhatsAppProvider
+from app.services.whatsapp_send_scheduler import (
+    OutboundScheduler,
+    SendPriority,
+    TokenBucket,
+    is_throttled,
+)
+from app.services.whatsapp_service import WhatsAppService
+
+pytestmark = pytest.mark.no_mock_whatsapp
+
+
+def _run_loop(coro):
+    # A private loop: asyncio.run() would clear the thread's default loop,
+    # which test_ws.py relies on.
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+# ── TokenBucket ──────────────────────────────────────────────────────────
+
+
+def test_token_bucket_refills_at_rate() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock)
+
+    for _ in range(2):
+        assert bucket.wait_time() == 0
+        bucket.consume()
+    assert bucket.wait_time() == pytest.approx(0.5)
+
+    clock.now = 0.5
+    assert bucket.wait_time() == 0
+
+
+def test_token_bucket_hold_blocks_even_when_unlimited() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(rate=0, capacity=1, clock=clock)
+    assert bucket.wait_time() == 0
+
+    bucket.hold(3.0)
+    assert bucket.wait_time() == pytest.approx(3.0)
+    clock.now = 3.0
+    assert bucket.wait_time() == 0
+
+
+def test_is_throttled_codes() -> None:
+    assert is_throttled(WhatsAppSendResult(success=False, error_code="130429"))
+    assert is_throttled(WhatsAppSendResult(success=False, error_code="20429"))
+    assert not is_throttled(WhatsAppSendResult(success=False, error_code="131030"))
+    assert not is_throttled(WhatsAppSendResult(success=True))
+
+
+# ── OutboundScheduler ────────────────────────────────────────────────────
+
+
+def test_priority_lanes_grant_award_and_reject_first() -> None:
+    scheduler = OutboundScheduler(
+        provider_rate=50, provider_burst=1, destination_rate=0
+    )
+    granted: list[str] = []
+
+    async def _send(name: str, priority: SendPriority) -> None:
+        await scheduler.acquire("fake", f"+55119999900{len(name)}", priority)
+        granted.append(name)
+
+    async def _run() -> None:
+        # Use up the only token so everything below has to queue.
+        await scheduler.acquire("fake", "+5511999990000", SendPriority.refresh)
+        await asyncio.gather(
+            _send("refresh", SendPriority.refresh),
+            _send("invite", SendPriority.invitation),
+            _send("reject", SendPriority.reject),
+            _send("award", SendPriority.award),
+        )
+
+    _run_loop(_run())
+    assert granted == ["award", "reject", "invite", "refresh"]
+
+
+def test_destination_bucket_paces_same_recipient_only() -> None:
+    scheduler = OutboundScheduler(
+        provider_rate=0, destination_rate=5, destination_burst=1
+    )
+    granted_at: dict[str, list[float]] = {"a": [], "b": []}
+
+    async def _send(key: str, phone: str) -> None:
+        await scheduler.acquire("fake", phone, SendPriority.invitation)
+        granted_at[key].append(time.monotonic())
+
+    async def _run() -> float:
+        started = time.monotonic()
+        await asyncio.gather(
+            _send("a", "+5511999990001"),
+            _send("a", "+5511999990001"),
+            _send("b", "+5511999990002"),
+        )
+        return started
+
+    started = _run_loop(_run())
+    assert granted_at["b"][0] - started < 0.1
+    assert granted_at["a"][1] - granted_at["a"][0] >= 0.15
+
+
+def test_throttled_sends_are_deferred_and_retried() -> None:
+    provider = FakeWhatsAppProvider(max_per_window=2, window_seconds=0.2)
+    scheduler = OutboundScheduler(
+        provider_rate=0,
+        destination_rate=0,
+        max_retries=5,
+        retry_base_seconds=0.1,
+    )
+
+    async def _run() -> list[WhatsAppSendResult]:
+        return await asyncio.gather(
+            *(
+                scheduler.send(
+                    "fake",
+                    phone,
+                    SendPriority.invitation,
+                    lambda phone=phone: provider.send_text_message_async(phone, "RFQ"),
+                )
+                for phone in ("+5511999990001", "+5511999990002", "+5511999990003")
+            )
+        )
+
+    results = _run_loop(_run())
+    assert all(r.success for r in results)
+
+
+def test_throttled_send_gives_up_after_max_retries() -> None:
+    provider = FakeWhatsAppProvider(max_per_window=0)
+    scheduler = OutboundScheduler(
+        provider_rate=0, destination_rate=0, max_retries=1, retry_base_seconds=0.01
+    )
+    calls = 0
+
+    async def _send() -> WhatsAppSendResult:
+        nonlocal calls
+        calls += 1
+        return await provider.send_text_message_async("+5511999990001", "RFQ")
+
+    result = _run_loop(
+        scheduler.send("fake", "+5511999990001", SendPriority.refresh, _send)
+    )
+    assert result.error_code == "130429"
+    assert calls == 2
+
+
+def test_whatsapp_service_sync_send_retries_throttled_provider() -> None:
+    provider = FakeWhatsAppProvider(max_per_window=1, window_seconds=0.2)
+    scheduler = OutboundScheduler(
+        provider_rate=0, destination_rate=0, max_retries=5, retry_base_seconds=0.1
+    )
+
+    with patch(
+        "app.services.whatsapp_service.get_provider", return_value=provider
+    ), patch(
+        "app.services.whatsapp_service.get_send_scheduler", return_value=scheduler
+    ):
+        first = WhatsAppService.send_text_message("+5511999990001", "Award")
+        second = WhatsAppService.send_text_message(
+            "+5511999990002", "Award", priority=SendPriority.award
+        )
+
+    assert first.success and second.success
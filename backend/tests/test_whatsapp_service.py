@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
@@ -22,6 +23,7 @@ from app.services.whatsapp_providers import (
     FakeWhatsAppProvider,
     get_provider,
     get_provider_name,
+    run_outbound,
 )
 
 
@@ -491,3 +493,132 @@ def test_fake_provider_send_template():
         "+5511999990001", "rfq_invite", params=["A"]
     )
     assert result.success is True
+
+
+# ── async sends — shared client + concurrent fan-out ────────────────────
+
+
+class _SlowProvider(FakeWhatsAppProvider):
+    """Fake provider whose async send takes one simulated round-trip."""
+
+    def __init__(self, delay: float = 0.1) -> None:
+        super().__init__()
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+
+    async def send_text_message_async(self, phone: str, text: str):
+        import asyncio
+
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if text == "boom":
+                raise RuntimeError("boom")
+            return self.send_text_message(phone, text)
+        finally:
+            self.in_flight -= 1
+
+
+def test_send_text_messages_fans_out_concurrently():
+    import time
+
+    provider = _SlowProvider(delay=0.1)
+    messages = [(f"+55119999900{i:02d}", "RFQ") for i in range(12)]
+
+    with patch("app.services.whatsapp_service.get_provider", return_value=provider):
+        started = time.monotonic()
+        results = WhatsAppService.send_text_messages(messages, max_concurrency=12)
+        elapsed = time.monotonic() - started
+
+    assert [r.provider_message_id for r in results] == [
+        f"fake-{phone}" for phone, _ in messages
+    ]
+    # About one round-trip, not twelve.
+    assert elapsed < 0.6
+    assert provider.peak == 12
+
+
+def test_send_text_messages_respects_concurrency_cap():
+    provider = _SlowProvider(delay=0.02)
+    messages = [(f"+55119999900{i:02d}", "RFQ") for i in range(6)]
+
+    with patch("app.services.whatsapp_service.get_provider", return_value=provider):
+        results = WhatsAppService.send_text_messages(messages, max_concurrency=2)
+
+    assert all(r.success for r in results)
+    assert provider.peak == 2
+
+
+def test_send_text_messages_reports_exceptions_per_message():
+    provider = _SlowProvider(delay=0)
+    messages = [("+5511999990001", "boom"), ("+5511999990002", "RFQ")]
+
+    with patch("app.services.whatsapp_service.get_provider", return_value=provider):
+        results = WhatsAppService.send_text_messages(messages)
+
+    assert results[0].success is False
+    assert results[0].error_code == "INTERNAL"
+    assert results[1].success is True
+
+
+def test_meta_async_send_uses_shared_client():
+    client = MagicMock()
+    client.post = AsyncMock(return_value=_success_response("wamid.async1"))
+
+    with patch.dict(os.environ, _ENV_META), patch(
+        "app.services.whatsapp_providers.get_async_client", return_value=client
+    ):
+        results = WhatsAppService.send_text_messages(
+            [("+5511999990001", "Hello"), ("+5511999990002", "Hello")]
+        )
+
+    assert [r.provider_message_id for r in results] == ["wamid.async1"] * 2
+    assert client.post.await_count == 2
+    assert client.post.call_args.kwargs["json"]["text"] == {"body": "Hello"}
+
+
+def test_twilio_async_send_retries_brazilian_variant():
+    client = MagicMock()
+    client.post = AsyncMock(
+        side_effect=[
+            _twilio_error_response(400, 63015, "Not in sandbox"),
+            _twilio_success_response("SM_retry"),
+        ]
+    )
+    env = {**_ENV_TWILIO, "TWILIO_WHATSAPP_FROM": "whatsapp:+15550001111"}
+
+    with patch.dict(os.environ, env), patch(
+        "app.services.whatsapp_providers.get_async_client", return_value=client
+    ):
+        (result,) = WhatsAppService.send_text_messages([("+5511999990001", "Hi")])
+
+    assert result.success is True
+    assert result.provider_message_id == "SM_retry"
+    retried_to = client.post.call_args_list[1].kwargs["data"]["To"]
+    assert retried_to == "whatsapp:+551199990001"
+
+
+def test_run_outbound_times_out_and_cancels():
+    cancelled = []
+
+    async def stuck():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(TimeoutError):
+        run_outbound(stuck(), timeout=0.05)
+    assert run_outbound(asyncio.sleep(0, result="ok")) == "ok"
+    assert cancelled == [True]
+
+
+def test_run_outbound_refuses_the_outbound_loop_itself():
+    async def nested():
+        return run_outbound(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError, match="outbound loop"):
+        run_outbound(nested())
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import asyncio
 import json
+import threading
+import time
 from unittest.mock import AsyncMock, patch
 from uuid import uuid4
 
@@ -12,6 +14,7 @@ from starlette.testclient import WebSocketDisconnect
 
 from app.api.routes.ws import manager, _ConnState
 import app.api.routes.ws as ws_module
+from app.services.ws_pubsub import MemoryPubSub, shutdown_ws_pubsub
 
 
 VALID_CLAIMS = {"sub": "test-user", "roles": ["trader"]}
@@ -19,12 +22,20 @@ VALID_CLAIMS = {"sub": "test-user", "roles": ["trader"]}
 
 @pytest.fixture(autouse=True)
 def _reset_ws_state():
-    """Reset the WS manager and sequence counter between tests."""
+    """Reset the WS manager and its bus (and so the seq counter) between tests."""
     manager._connections.clear()
-    ws_module._seq_counter = 0
+    manager._topics.clear()
+    manager._history.clear()
+    manager._replay_floor = None
+    shutdown_ws_pubsub()
+    manager._pubsub = None
     yield
     manager._connections.clear()
-    ws_module._seq_counter = 0
+    manager._topics.clear()
+    manager._history.clear()
+    manager._replay_floor = None
+    shutdown_ws_pubsub()
+    manager._pubsub = None
 
 
 def _patch_validate_token(return_value):
@@ -106,6 +117,25 @@ def test_subscribe_missing_id(client):
             assert "missing" in resp["reason"].lower()
 
 
+def test_aggregate_topics_need_risk_roles(client):
+    with _patch_validate_token(VALID_CLAIMS):
+        with client.websocket_connect("/ws") as ws:
+            _authenticate(ws)
+            for topic, topic_id in (("mtm", "orders"), ("exposure", "global")):
+                ws.send_json({"action": "subscribe", "topic": topic, "id": topic_id})
+                resp = ws.receive_json()
+                assert resp["type"] == "subscription_error"
+                assert resp["reason"] == "forbidden"
+            ws.send_json({"action": "subscribe", "topic": "exposure", "id": "net"})
+            assert ws.receive_json()["type"] == "subscription_ack"
+
+    with _patch_validate_token({"sub": "risk", "roles": ["risk_manager"]}):
+        with client.websocket_connect("/ws") as ws:
+            _authenticate(ws)
+            ws.send_json({"action": "subscribe", "topic": "mtm", "id": "orders"})
+            assert ws.receive_json()["type"] == "subscription_ack"
+
+
 # ─── 6. Unsubscribe → ack ─────────────────────────────────────────
 
 def test_unsubscribe_ack(client):
@@ -277,3 +307,401 @@ def test_auth_timeout_closes_1008(client):
                 with client.websocket_connect("/ws") as ws:
                     ws.receive_json()  # triggers disconnect
             assert exc_info.value.code == 1008
+
+
+# ─── 14. Fan-out index and slow consumers ───────────────────────────
+
+class _FakeSocket:
+    """Minimal WebSocket stand-in whose sends can be stalled."""
+
+    def __init__(self, stalled: bool = False) -> None:
+        self.sent: list[dict] = []
+        self.closed_with: int | None = None
+        self.client_state = ws_module.WebSocketState.CONNECTED
+        self._gate = asyncio.Event()
+        if not stalled:
+            self._gate.set()
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, text: str) -> None:
+        await self._gate.wait()
+        self.sent.append(json.loads(text))
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self._gate.wait()
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        self.closed_with = code
+        self.client_state = ws_module.WebSocketState.DISCONNECTED
+
+
+def _run(coro_fn):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro_fn())
+    finally:
+        pending = asyncio.all_tasks(loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.wait(pending))
+        loop.close()
+
+
+async def _subscribed(mgr, sock, rfq_id):
+    await mgr.connect(sock)
+    mgr._connections[sock].authenticated = True
+    await mgr.subscribe(sock, "rfq", rfq_id)
+
+
+def test_stalled_client_does_not_block_others():
+    rfq_id = str(uuid4())
+
+    async def scenario():
+        mgr = ws_module.ConnectionManager(
+            max_queue=2, slow_consumer_policy="close", pubsub=MemoryPubSub(),
+            coalesce_ms=0,
+        )
+        fast, stalled = _FakeSocket(), _FakeSocket(stalled=True)
+        await _subscribed(mgr, fast, rfq_id)
+        await _subscribed(mgr, stalled, rfq_id)
+        for i in range(5):
+            await mgr.broadcast("rfq", rfq_id, "quote_received", {"i": i})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        return mgr, fast, stalled
+
+    mgr, fast, stalled = _run(scenario)
+    assert [m["data"]["i"] for m in fast.sent] == [0, 1, 2, 3, 4]
+    # The stalled client's queue filled up, so it was evicted with 1013.
+    assert stalled.closed_with == 1013
+    assert stalled not in mgr._connections
+    assert mgr._topics[("rfq", rfq_id)] == {fast}
+
+
+def test_drop_policy_flags_missed_messages():
+    rfq_id = str(uuid4())
+
+    async def scenario():
+        mgr = ws_module.ConnectionManager(
+            max_queue=2, slow_consumer_policy="drop", pubsub=MemoryPubSub(),
+            coalesce_ms=0,
+        )
+        sock = _FakeSocket(stalled=True)
+        await _subscribed(mgr, sock, rfq_id)
+        for i in range(5):
+            await mgr.broadcast("rfq", rfq_id, "quote_received", {"i": i})
+        sock._gate.set()
+        await asyncio.sleep(0.01)
+        await mgr.broadcast("rfq", rfq_id, "quote_received", {"i": 5})
+        await asyncio.sleep(0.01)
+        return sock
+
+    sock = _run(scenario)
+    assert sock.closed_with is None
+    # 0 and 1 fill the queue; 2-4 are dropped and flagged before 5.
+    assert [m["data"]["i"] for m in sock.sent[:2]] == [0, 1]
+    assert sock.sent[2] == {"type": "messages_dropped", "count": 3}
+    assert sock.sent[3]["data"]["i"] == 5
+
+
+def test_disconnect_removes_topic_index():
+    rfq_id = str(uuid4())
+
+    async def scenario():
+        mgr = ws_module.ConnectionManager(pubsub=MemoryPubSub(), coalesce_ms=0)
+        sock = _FakeSocket()
+        await _subscribed(mgr, sock, rfq_id)
+        await mgr.disconnect(sock)
+        return mgr
+
+    mgr = _run(scenario)
+    assert mgr._topics == {}
+    assert mgr.active_count == 0
+
+
+def test_bus_reaches_sockets_on_every_manager():
+    """Two managers on one bus stand in for two uvicorn workers."""
+    rfq_id = str(uuid4())
+
+    async def scenario():
+        bus = MemoryPubSub()
+        worker_a = ws_module.ConnectionManager(pubsub=bus, coalesce_ms=0)
+        worker_b = ws_module.ConnectionManager(pubsub=bus, coalesce_ms=0)
+        sock_a, sock_b = _FakeSocket(), _FakeSocket()
+        await _subscribed(worker_a, sock_a, rfq_id)
+        await _subscribed(worker_b, sock_b, rfq_id)
+        await worker_a.broadcast("rfq", rfq_id, "quote_received", {"i": 0})
+        worker_b.broadcast_nowait("rfq", rfq_id, "quote_received", {"i": 1})
+        await asyncio.sleep(0.01)
+        return sock_a, sock_b
+
+    sock_a, sock_b = _run(scenario)
+    assert [m["seq"] for m in sock_a.sent] == [1, 2]
+    assert sock_a.sent == sock_b.sent
+
+
+# ─── 15. Resume / replay ───────────────────────────────────────────
+
+def test_resume_replays_missed_events(client):
+    rfq_id = str(uuid4())
+    with _patch_validate_token(VALID_CLAIMS):
+        with client.websocket_connect("/ws") as ws:
+            _authenticate(ws)
+            ws.send_json({"action": "subscribe", "topic": "rfq", "id": rfq_id})
+            ws.receive_json()
+            for i in range(3):
+                asyncio.get_event_loop().run_until_complete(
+                    manager.broadcast("rfq", rfq_id, "quote_received", {"i": i})
+                )
+                ws.receive_json()
+
+        # Reconnect having only seen seq 1.
+        with client.websocket_connect("/ws") as ws:
+            _authenticate(ws)
+            ws.send_json({"action": "subscribe", "topic": "rfq", "id": rfq_id})
+            ws.receive_json()
+            ws.send_json({"action": "resume", "since_seq": 1})
+            replayed = [ws.receive_json(), ws.receive_json()]
+            ack = ws.receive_json()
+
+    assert [m["seq"] for m in replayed] == [2, 3]
+    assert [m["data"]["i"] for m in replayed] == [1, 2]
+    assert ack == {"type": "resume_ack", "since_seq": 1, "replayed": 2, "resync": []}
+
+
+def test_resume_invalid_since_seq(client):
+    with _patch_validate_token(VALID_CLAIMS):
+        with client.websocket_connect("/ws") as ws:
+            _authenticate(ws)
+            ws.send_json({"action": "resume", "since_seq": "abc"})
+            resp = ws.receive_json()
+            assert resp == {"type": "error", "reason": "invalid since_seq"}
+
+
+def test_resume_past_buffer_requires_resync():
+    rfq_id, other_id = str(uuid4()), str(uuid4())
+
+    async def scenario():
+        mgr = ws_module.ConnectionManager(pubsub=MemoryPubSub(), coalesce_ms=0)
+        mgr._replay_size = 2
+        sock = _FakeSocket()
+        await _subscribed(mgr, sock, rfq_id)
+        await mgr.subscribe(sock, "rfq", other_id)
+        for i in range(4):
+            await mgr.broadcast("rfq", rfq_id, "quote_received", {"i": i})
+        await mgr.broadcast("rfq", other_id, "quote_received", {"i": 4})
+        await asyncio.sleep(0.01)
+
+        # A fresh connection resumes from seq 1: rfq_id only kept 3-4.
+        late = _FakeSocket()
+        await _subscribed(mgr, late, rfq_id)
+        await mgr.subscribe(late, "rfq", other_id)
+        mgr.resume(late, 1)
+        await asyncio.sleep(0.01)
+        return late
+
+    late = _run(scenario)
+    *replayed, ack = late.sent
+    assert [m["seq"] for m in replayed] == [5]
+    assert ack["resync"] == [{"topic": "rfq", "id": rfq_id}]
+
+
+def test_resume_skips_events_already_pushed_live():
+    rfq_id = str(uuid4())
+
+    async def scenario():
+        mgr = ws_module.ConnectionManager(pubsub=MemoryPubSub(), coalesce_ms=0)
+        early = _FakeSocket()
+        await _subscribed(mgr, early, rfq_id)
+        await mgr.broadcast("rfq", rfq_id, "quote_received", {"i": 0})
+        sock = _FakeSocket()
+        await _subscribed(mgr, sock, rfq_id)
+        await mgr.broadcast("rfq", rfq_id, "quote_received", {"i": 1})
+        mgr.resume(sock, 0)
+        await asyncio.sleep(0.01)
+        return sock
+
+    sock = _run(scenario)
+    # seq 2 arrived live; only seq 1 is replayed.
+    assert [m.get("seq") for m in sock.sent] == [2, 1, None]
+    assert sock.sent[-1]["replayed"] == 1
+
+
+def test_resume_past_newest_seq_requires_resync():
+    rfq_id = str(uuid4())
+
+    async def scenario():
+        mgr = ws_module.ConnectionManager(pubsub=MemoryPubSub(), coalesce_ms=0)
+        sock = _FakeSocket()
+        await _subscribed(mgr, sock, rfq_id)
+        await mgr.broadcast("rfq", rfq_id, "quote_received", {"i": 0})
+        # The client saw seq 5000 before a restart renumbered the bus.
+        mgr.resume(sock, 5000)
+        await asyncio.sleep(0.01)
+        return sock
+
+    sock = _run(scenario)
+    assert sock.sent[-1]["resync"] == [{"topic": "rfq", "id": rfq_id}]
+
+
+def test_bus_gap_raises_replay_floor():
+    rfq_id = str(uuid4())
+    bus = MemoryPubSub()
+
+    async def scenario():
+        mgr = ws_module.ConnectionManager(pubsub=bus, coalesce_ms=0)
+        sock = _FakeSocket()
+        await _subscribed(mgr, sock, rfq_id)
+        await mgr.broadcast("rfq", rfq_id, "quote_received", {"i": 0})
+        # The listener reconnected; events up to seq 3 may have been missed.
+        bus._dispatch_gap(3)
+        await asyncio.sleep(0.01)
+        mgr.resume(sock, 1)
+        mgr.resume(sock, 3)
+        await asyncio.sleep(0.01)
+        return sock
+
+    sock = _run(scenario)
+    _, missed, replayable = sock.sent
+    assert missed["resync"] == [{"topic": "rfq", "id": rfq_id}]
+    assert replayable["resync"] == []
+
+
+# ─── 16. Coalescing and encodings ──────────────────────────────────
+
+def _coalesced_frames(batch=None):
+    rfq_id = str(uuid4())
+
+    async def scenario():
+        mgr = ws_module.ConnectionManager(pubsub=MemoryPubSub(), coalesce_ms=20)
+        sock = _FakeSocket()
+        await mgr.connect(sock)
+        mgr._connections[sock].authenticated = True
+        await mgr.subscribe(sock, "rfq", rfq_id, batch=batch)
+        await mgr.broadcast("rfq", rfq_id, "ranking_updated", {"v": 1})
+        await mgr.broadcast("rfq", rfq_id, "quote_received", {"price": 2450})
+        await mgr.broadcast("rfq", rfq_id, "ranking_updated", {"v": 2})
+        await asyncio.sleep(0.05)
+        await mgr.broadcast("rfq", rfq_id, "status_changed", {"status": "QUOTED"})
+        await asyncio.sleep(0.05)
+        return sock
+
+    return _run(scenario).sent
+
+
+def test_coalescing_keeps_latest_ranking_in_separate_frames():
+    frames = _coalesced_frames()
+    # The superseded ranking is gone; each event is still a plain object.
+    assert [(m["event"], m["seq"]) for m in frames] == [
+        ("quote_received", 2),
+        ("ranking_updated", 3),
+        ("status_changed", 4),
+    ]
+    assert frames[1]["data"] == {"v": 2}
+
+
+def test_coalescing_batches_events_when_negotiated():
+    batch, single = _coalesced_frames(batch=True)
+    # One array frame for the first window; a lone event stays an object.
+    assert [(m["event"], m["seq"]) for m in batch] == [
+        ("quote_received", 2),
+        ("ranking_updated", 3),
+    ]
+    assert single["event"] == "status_changed"
+
+
+def test_subscribe_acks_batch_and_rejects_non_boolean(client):
+    with _patch_validate_token(VALID_CLAIMS):
+        with client.websocket_connect("/ws") as ws:
+            _authenticate(ws)
+            ws.send_json({"action": "subscribe", "topic": "rfq", "id": "x", "batch": 1})
+            assert ws.receive_json() == {
+                "type": "subscription_error",
+                "reason": "invalid batch",
+            }
+            ws.send_json(
+                {"action": "subscribe", "topic": "rfq", "id": "x", "batch": True}
+            )
+            assert ws.receive_json()["batch"] is True
+
+
+def test_coalesced_ranking_still_replayable():
+    rfq_id = str(uuid4())
+
+    async def scenario():
+        mgr = ws_module.ConnectionManager(pubsub=MemoryPubSub(), coalesce_ms=20)
+        sock = _FakeSocket()
+        await _subscribed(mgr, sock, rfq_id)
+        await mgr.broadcast("rfq", rfq_id, "ranking_updated", {"v": 1})
+        await mgr.broadcast("rfq", rfq_id, "ranking_updated", {"v": 2})
+        await asyncio.sleep(0.05)
+        return mgr
+
+    mgr = _run(scenario)
+    assert [seq for seq, _ in mgr._history[("rfq", rfq_id)].events] == [1, 2]
+
+
+def test_subscribe_rejects_unknown_encoding(client):
+    with _patch_validate_token(VALID_CLAIMS):
+        with client.websocket_connect("/ws") as ws:
+            _authenticate(ws)
+            ws.send_json(
+                {"action": "subscribe", "topic": "rfq", "id": "x", "encoding": "xml"}
+            )
+            resp = ws.receive_json()
+            assert resp["type"] == "subscription_error"
+            assert "encoding" in resp["reason"]
+
+
+def test_msgpack_encoding_sends_binary_frames():
+    msgpack = pytest.importorskip("msgpack")
+    rfq_id = str(uuid4())
+
+    async def scenario():
+        mgr = ws_module.ConnectionManager(pubsub=MemoryPubSub(), coalesce_ms=0)
+        sock = _FakeSocket()
+        await mgr.connect(sock)
+        mgr._connections[sock].authenticated = True
+        await mgr.subscribe(sock, "rfq", rfq_id, encoding="msgpack")
+        await mgr.broadcast("rfq", rfq_id, "quote_received", {"price": 2450})
+        await asyncio.sleep(0.01)
+        return sock
+
+    sock = _run(scenario)
+    (frame,) = sock.sent
+    assert msgpack.unpackb(frame)["data"] == {"price": 2450}
+
+
+def test_handshake_concurrency_is_bounded():
+    active = [0]
+    peak = [0]
+    lock = threading.Lock()
+
+    def slow_validate(token):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return VALID_CLAIMS
+
+    async def scenario():
+        mgr = ws_module.ConnectionManager(
+            pubsub=MemoryPubSub(), coalesce_ms=0, auth_concurrency=2
+        )
+        socks = [_FakeSocket() for _ in range(6)]
+        for sock in socks:
+            await mgr.connect(sock)
+        results = await asyncio.gather(*(mgr.authenticate(s, "jwt") for s in socks))
+        return mgr, socks, results
+
+    with patch("app.api.routes.ws._validate_token", side_effect=slow_validate):
+        mgr, socks, results = _run(scenario)
+    assert results == [True] * 6
+    assert peak[0] == 2
+    assert all(mgr.is_authenticated(s) for s in socks)
@@ -0,0 +1,92 @@
+"""Unit tests for the cross-worker WebSocket pub/sub bus."""
+
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+from app.core.database import SessionLocal, engine
+from app.models.ws_broadcast import WSBroadcastPayload
+from app.services.ws_pubsub import (
+    BroadcastEvent,
+    MemoryPubSub,
+    PostgresPubSub,
+)
+
+
+def test_memory_bus_numbers_and_delivers_to_every_subscriber() -> None:
+    bus = MemoryPubSub()
+    worker_a: list[BroadcastEvent] = []
+    worker_b: list[BroadcastEvent] = []
+    bus.subscribe(worker_a.append)
+    bus.subscribe(worker_b.append)
+
+    first = bus.publish("rfq", "r1", "quote_received", {"price": 2450.0})
+    bus.publish("rfq", "r2", "status_changed", {"status": "SENT"})
+
+    assert first.seq == 1
+    assert [e.seq for e in worker_a] == [1, 2]
+    assert worker_a == worker_b
+    assert worker_a[0].data == {"price": 2450.0}
+
+
+def test_memory_bus_delivers_in_seq_order_across_threads() -> None:
+    bus = MemoryPubSub()
+    seen: list[int] = []
+    bus.subscribe(lambda evt: seen.append(evt.seq))
+
+    threads = [
+        threading.Thread(
+            target=lambda: [bus.publish("rfq", "r1", "e", {}) for _ in range(50)]
+        )
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert seen == list(range(1, 201))
+
+
+def test_failing_handler_does_not_block_others() -> None:
+    bus = MemoryPubSub()
+    seen: list[int] = []
+
+    def broken(_evt: BroadcastEvent) -> None:
+        raise RuntimeError("boom")
+
+    bus.subscribe(broken)
+    bus.subscribe(lambda evt: seen.append(evt.seq))
+    bus.publish("rfq", "r1", "e", {})
+
+    assert seen == [1]
+
+
+def test_event_json_round_trip() -> None:
+    evt = BroadcastEvent("rfq", "r1", "ranking_updated", {"a": [1, 2]}, 42, "ts")
+    assert BroadcastEvent.from_json(evt.to_json()) == evt
+
+
+def test_postgres_bus_resolves_spilled_payloads() -> None:
+    evt = BroadcastEvent("rfq", "r1", "ranking_updated", {"rows": ["x" * 10]}, 7, "ts")
+    with SessionLocal() as session:
+        session.add(WSBroadcastPayload(seq=7, body=evt.to_json()))
+        session.commit()
+
+    bus = PostgresPubSub(engine)
+    received: list[BroadcastEvent] = []
+    bus._handlers.append(received.append)  # no listener thread
+
+    bus._on_notify(json.dumps({"ref": 7}))
+    bus._on_notify(evt.to_json())
+    bus._on_notify(json.dumps({"ref": 8}))  # already pruned → skipped
+
+    assert received == [evt, evt]
+
+
+def test_postgres_bus_rejects_unsafe_channel_names() -> None:
+    with pytest.raises(ValueError):
+        PostgresPubSub(engine, channel="events; DROP TABLE rfqs")